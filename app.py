@@ -35,12 +35,15 @@ from xmonitor.services.intent_service import (
     is_short_reply_intent_signal as _is_short_reply_intent_signal_impl,
     llm_intent_analysis as _llm_intent_analysis_impl,
     rule_based_intent_analysis as _rule_based_intent_analysis_impl,
+    rule_only_intent_result as _rule_only_intent_result_impl,
+    scan_intent_keyword_families as _scan_intent_keyword_families_impl,
     should_notify_voice_by_intent as _should_notify_voice_by_intent_impl,
 )
 from xmonitor.services.dm_llm_service import (
     build_dm_llm_rewrite_prompt as _build_dm_llm_rewrite_prompt_impl,
     dm_rewrite_contains_forbidden_phrase as _dm_rewrite_contains_forbidden_phrase_impl,
     dm_rewrite_is_too_similar as _dm_rewrite_is_too_similar_impl,
+    dm_llm_rewrite_near_duplicate_score as _dm_llm_rewrite_near_duplicate_score_impl,
     dm_rewrite_longest_common_substring_len as _dm_rewrite_longest_common_substring_len_impl,
     dm_rewrite_similarity_score as _dm_rewrite_similarity_score_impl,
     extract_dm_rewrite_forbidden_phrases as _extract_dm_rewrite_forbidden_phrases_impl,
@@ -49,6 +52,17 @@ from xmonitor.services.dm_llm_service import (
     normalize_dm_rewrite_signature as _normalize_dm_rewrite_signature_impl,
     record_dm_llm_rewrite_signature as _record_dm_llm_rewrite_signature_impl,
 )
+from xmonitor.services.intent_classifier import (
+    local_intent_verdict as _local_intent_verdict_impl,
+    record_intent_training_sample as _record_intent_training_sample_impl,
+    schedule_local_intent_training as _schedule_local_intent_training_impl,
+)
+from xmonitor.services.dm_rewrite_pool import (
+    DmRewritePool,
+    schedule_dm_rewrite_refill as _schedule_dm_rewrite_refill_impl,
+    take_pregenerated_dm_text as _take_pregenerated_dm_text_impl,
+    warm_dm_rewrite_pool as _warm_dm_rewrite_pool_impl,
+)
 from xmonitor.services.diagnostics_service import (
     as_json_safe as _as_json_safe_impl,
     capture_runtime_diagnostic as _capture_runtime_diagnostic_impl,
@@ -56,10 +70,13 @@ from xmonitor.services.diagnostics_service import (
 )
 from xmonitor.services.llm_client import (
     call_ollama_native_json as _call_ollama_native_json_impl,
+    LLM_MAX_TOKENS_CAP as _LLM_MAX_TOKENS_CAP,
     call_openai_compatible_filter_api as _call_openai_compatible_filter_api_impl,
+    call_openai_compatible_filter_api_many as _call_openai_compatible_filter_api_many_impl,
     call_openai_compatible_json as _call_openai_compatible_json_impl,
     guess_ollama_native_endpoint as _guess_ollama_native_endpoint_impl,
     parse_json_object_from_text as _parse_json_object_from_text_impl,
+    stream_openai_compatible_text as _stream_openai_compatible_text_impl,
 )
 from xmonitor.browser.browser_options import init_browser_options as _init_browser_options_impl
 from xmonitor.services.tts_service import (
@@ -86,9 +103,9 @@ from xmonitor.services.filter_service import (
     normalize_content_for_dedupe as _normalize_content_for_dedupe_impl,
     normalize_content_for_filter as _normalize_content_for_filter_impl,
     prune_content_dedupe as _prune_content_dedupe_impl,
-    prune_llm_filter_cache as _prune_llm_filter_cache_impl,
     reorder_articles_for_scan as _reorder_articles_for_scan_impl,
     should_skip_by_llm_filter as _should_skip_by_llm_filter_impl,
+    should_skip_by_llm_filter_many as _should_skip_by_llm_filter_many_impl,
     should_skip_content_by_policy as _should_skip_content_by_policy_impl,
     should_skip_duplicate_content as _should_skip_duplicate_content_impl,
 )
@@ -136,8 +153,6 @@ from xmonitor.services.dm_runtime import (
 from xmonitor.services.dm_common import (
     build_dm_message_probes as _build_dm_message_probes,
     confirm_dm_message_sent as _confirm_dm_message_sent,
-    count_dm_probe_occurrence as _count_dm_probe_occurrence,
-    count_dm_sent_markers as _count_dm_sent_markers,
     extract_status_id_candidates_from_text as _extract_status_id_candidates_from_text,
     get_dm_conversation_text as _get_dm_conversation_text,
     is_link_only_message as _is_link_only_message,
@@ -147,6 +162,7 @@ from xmonitor.services.dm_common import (
     normalize_text_for_compare as _normalize_text_for_compare,
     pick_best_status_id as _pick_best_status_id,
     sanitize_dm_message_text as _sanitize_dm_message_text,
+    snapshot_dm_send_baseline as _snapshot_dm_send_baseline,
 )
 from xmonitor.services.notification_extract import (
     collect_notification_hrefs as _collect_notification_hrefs_impl,
@@ -161,7 +177,15 @@ from xmonitor.browser.notification_tab_service import (
     ensure_notification_tab as _ensure_notification_tab_impl,
     init_notification_tab as _init_notification_tab_impl,
 )
+from xmonitor.services.card_cache import ParsedCardCache
+from xmonitor.services.llm_batcher import LlmMicroBatcher
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+from xmonitor.services.llm_transport import LlmTransport
+from xmonitor.services.text_similarity import MinHashIndex
 from xmonitor.services.notification_match import (
+    article_card_fingerprint as _article_card_fingerprint_impl,
+    article_card_fingerprints as _article_card_fingerprints_impl,
+    cached_card_status_info as _cached_card_status_info_impl,
     extract_status_id_from_notification_item as _extract_status_id_from_notification_item_impl,
     extract_status_ids_from_article as _extract_status_ids_from_article_impl,
     is_reply_to_me_notification_item as _is_reply_to_me_notification_item_impl,
@@ -215,6 +239,7 @@ from xmonitor.storage.state_io import (
     save_processed_users as _save_processed_users_impl,
     save_state as _save_state_impl,
 )
+from xmonitor.storage.llm_verdict_cache import LlmVerdictMemory
 from xmonitor.storage.repositories import MonitorTasksRepository, PendingResultsRepository, ProcessedUsersRepository
 from xmonitor.storage.notify_state_facade import NotifyStateFacade
 from xmonitor.browser.browser_manager import (
@@ -241,6 +266,16 @@ from xmonitor.runtime.timing_helpers import (
     get_random_task_parallel as _get_random_task_parallel_impl,
     schedule_next_notification_refresh_interval as _schedule_next_notification_refresh_interval_impl,
 )
+from xmonitor.runtime.intent_worker import (
+    apply_provisional_intent as _apply_provisional_intent_impl,
+    submit_intent_upgrade as _submit_intent_upgrade_impl,
+)
+from xmonitor.runtime.task_scheduler import (
+    pick_due_tasks as _pick_due_tasks_impl,
+    prune_task_schedule as _prune_task_schedule_impl,
+    record_task_scan_result as _record_task_scan_result_impl,
+    seconds_until_next_task_due as _seconds_until_next_task_due_impl,
+)
 from xmonitor.runtime.action_throttle import (
     throttle_dm_action_if_needed as _throttle_dm_action_if_needed_impl,
     throttle_reply_action_if_needed as _throttle_reply_action_if_needed_impl,
@@ -258,18 +293,38 @@ from xmonitor.runtime.dm_critical import (
 )
 from xmonitor.services.dm_state_service import (
     clear_dm_unavailable_cache as _clear_dm_unavailable_cache_impl,
+    ensure_dm_handle_state_loaded as _ensure_dm_handle_state_loaded_impl,
+    forget_dm_conversation_url as _forget_dm_conversation_url_impl,
     get_status_link_from_item as _get_status_link_from_item_impl,
     is_dm_unavailable_cached as _is_dm_unavailable_cached_impl,
+    lookup_dm_conversation_url as _lookup_dm_conversation_url_impl,
     mark_dm_unavailable as _mark_dm_unavailable_impl,
+    notify_dm_cooldown_remaining as _notify_dm_cooldown_remaining_impl,
+    persist_notify_dm_user_cooldown as _persist_notify_dm_user_cooldown_impl,
+    remember_dm_conversation_url as _remember_dm_conversation_url_impl,
     reply_humanized_idle as _reply_humanized_idle_impl,
 )
-from xmonitor.browser.work_tab_service import ensure_reply_work_tab as _ensure_reply_work_tab_impl
+from xmonitor.browser.dm_tab_pool import DmTabPool
+from xmonitor.browser.reply_warm_tab import ReplyWarmTab
+from xmonitor.browser.work_tab_service import (
+    ensure_dm_worker_tab as _ensure_dm_worker_tab_impl,
+    ensure_reply_warm_tab as _ensure_reply_warm_tab_impl,
+    ensure_reply_work_tab as _ensure_reply_work_tab_impl,
+)
 from xmonitor.services.dm_context_service import ensure_dm_session_ready_for_handle as _ensure_dm_session_ready_for_handle_impl
 from xmonitor.services.template_utils import (
     normalize_keyword_lines as _normalize_keyword_lines_impl,
     render_llm_prompt_template as _render_llm_prompt_template_impl,
     sanitize_template_list as _sanitize_template_list_impl,
 )
+from xmonitor.runtime.reply_jobs import (
+    NotifyReplyJobStore,
+    mark_notify_reply_pending as _mark_notify_reply_pending_impl,
+    next_notify_reply_attempt,
+    publish_notify_reply_progress as _publish_notify_reply_progress_impl,
+    submit_notify_reply_batch as _submit_notify_reply_batch_impl,
+    submit_notify_reply_job as _submit_notify_reply_job_impl,
+)
 from xmonitor.runtime.event_bus import (
     drain_msg_queue as _drain_msg_queue_impl,
     publish_new_data_event as _publish_new_data_event_impl,
@@ -287,9 +342,15 @@ from xmonitor.services.dm_flow_service import (
 )
 from xmonitor.services.reply_ops import (
     match_target_card as _match_target_card_impl,
+    open_status_page_target as _open_status_page_target_impl,
     prepare_notifications_view as _prepare_notifications_view_impl,
     send_reply_from_button as _send_reply_from_button_impl,
 )
+from xmonitor.services.reply_warm_service import (
+    claim_reply_warm_target as _claim_reply_warm_target_impl,
+    release_reply_warm_tab as _release_reply_warm_tab_impl,
+    schedule_reply_warm_preload as _schedule_reply_warm_preload_impl,
+)
 from xmonitor.services.reply_runtime import (
     is_reply_flow_active as _is_reply_flow_active_impl,
     record_reply_outcome as _record_reply_outcome_impl,
@@ -494,6 +555,16 @@ except Exception:
 NOTIFICATION_REPLY_ONLY_MODE = str(
     os.environ.get("XMONITOR_NOTIFY_REPLY_ONLY", "1")
 ).strip().lower() not in {"0", "false", "no", "off"}
+try:
+    NOTIFICATION_CARD_CACHE_MAX = int(os.environ.get("XMONITOR_NOTIFY_CARD_CACHE_MAX", "1024"))
+except Exception:
+    NOTIFICATION_CARD_CACHE_MAX = 1024
+NOTIFICATION_CARD_CACHE_MAX = max(64, min(20000, NOTIFICATION_CARD_CACHE_MAX))
+try:
+    NOTIFICATION_CARD_CACHE_TTL_SEC = float(os.environ.get("XMONITOR_NOTIFY_CARD_CACHE_TTL_SEC", "900"))
+except Exception:
+    NOTIFICATION_CARD_CACHE_TTL_SEC = 900.0
+NOTIFICATION_CARD_CACHE_TTL_SEC = max(30.0, min(6 * 3600.0, NOTIFICATION_CARD_CACHE_TTL_SEC))
 ENGINE_VERSION = "v11.3"
 REPLY_ACTION_GAP_MIN_SEC = 1.0
 REPLY_ACTION_GAP_MAX_SEC = 2.0
@@ -538,6 +609,14 @@ DM_HUMAN_SCROLL_CHANCE = 0.18
 DM_SEND_FOLLOWUP_TEXT = str(
     os.environ.get("XMONITOR_DM_SEND_FOLLOWUP_TEXT", "1")
 ).strip().lower() not in {"0", "false", "no", "off"}
+DM_CONVERSATION_CACHE_ENABLED = str(
+    os.environ.get("XMONITOR_DM_CONVERSATION_CACHE", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
+try:
+    DM_CONVERSATION_CACHE_TTL_SEC = int(os.environ.get("XMONITOR_DM_CONVERSATION_CACHE_TTL_SEC", str(30 * 24 * 3600)))
+except Exception:
+    DM_CONVERSATION_CACHE_TTL_SEC = 30 * 24 * 3600
+DM_CONVERSATION_CACHE_TTL_SEC = max(3600, min(365 * 24 * 3600, DM_CONVERSATION_CACHE_TTL_SEC))
 DM_ENTRY_MODE = str(
     os.environ.get("XMONITOR_DM_ENTRY_MODE", "profile_first")
 ).strip().lower()
@@ -591,6 +670,19 @@ try:
     )
 except Exception:
     REPLY_STATUS_FALLBACK_MIN_SCORE = 75
+# 预热标签页：回复进行中时后台打开队列里下一条目标的状态页（同样受 REPLY_STATUS_FALLBACK_POLICY 约束）
+# 状态页直达：有扫描时预解析的状态页链接时直接打开状态页定位（同样受 REPLY_STATUS_FALLBACK_POLICY 约束）
+REPLY_DIRECT_STATUS_PATH = str(
+    os.environ.get("XMONITOR_REPLY_DIRECT_STATUS_PATH", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
+REPLY_WARM_TAB_ENABLED = str(
+    os.environ.get("XMONITOR_REPLY_WARM_TAB", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
+try:
+    REPLY_WARM_TAB_MAX_AGE_SEC = float(os.environ.get("XMONITOR_REPLY_WARM_TAB_MAX_AGE_SEC", "180"))
+except Exception:
+    REPLY_WARM_TAB_MAX_AGE_SEC = 180.0
+REPLY_WARM_TAB_MAX_AGE_SEC = max(30.0, min(900.0, REPLY_WARM_TAB_MAX_AGE_SEC))
 REPLY_ADAPTIVE_THROTTLE = str(
     os.environ.get("XMONITOR_REPLY_ADAPTIVE_THROTTLE", "1")
 ).strip().lower() not in {"0", "false", "no", "off"}
@@ -661,6 +753,9 @@ HEADFUL_NOTIFY_DISCONNECT_RESTART = str(
     os.environ.get("XMONITOR_HEADFUL_NOTIFY_DISCONNECT_RESTART", "0")
 ).strip().lower() in {"1", "true", "yes", "on"}
 DM_UNAVAILABLE_CACHE_TTL_SEC = 12 * 3600
+DM_HANDLE_STATE_PERSIST = str(
+    os.environ.get("XMONITOR_DM_STATE_PERSIST", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
 CONTENT_DEDUPE_TTL_SEC = 72 * 3600
 CONTENT_DEDUPE_MAX_ENTRIES = 40000
 MAINTENANCE_INTERVAL_MIN_SEC = 40 * 60
@@ -671,6 +766,60 @@ TASK_SUBMIT_JITTER_MIN_SEC = 0.18
 TASK_SUBMIT_JITTER_MAX_SEC = 0.95
 TASK_BATCH_GAP_MIN_SEC = 1.0
 TASK_BATCH_GAP_MAX_SEC = 3.2
+# 热帖最快 20s（与原固定 20-40s 轮询下限一致），每轮约 1 条新捕获的任务约 30s 一轮
+try:
+    TASK_POLL_MIN_SEC = float(os.environ.get("XMONITOR_TASK_POLL_MIN_SEC", "20"))
+except Exception:
+    TASK_POLL_MIN_SEC = 20.0
+TASK_POLL_MIN_SEC = max(10.0, min(600.0, TASK_POLL_MIN_SEC))
+try:
+    TASK_POLL_BASE_SEC = float(os.environ.get("XMONITOR_TASK_POLL_BASE_SEC", "60"))
+except Exception:
+    TASK_POLL_BASE_SEC = 60.0
+TASK_POLL_BASE_SEC = max(TASK_POLL_MIN_SEC, min(3600.0, TASK_POLL_BASE_SEC))
+try:
+    TASK_POLL_MAX_SEC = float(os.environ.get("XMONITOR_TASK_POLL_MAX_SEC", "1800"))
+except Exception:
+    TASK_POLL_MAX_SEC = 1800.0
+TASK_POLL_MAX_SEC = max(TASK_POLL_BASE_SEC, min(6 * 3600.0, TASK_POLL_MAX_SEC))
+try:
+    TASK_POLL_BACKOFF_FACTOR = float(os.environ.get("XMONITOR_TASK_POLL_BACKOFF_FACTOR", "1.6"))
+except Exception:
+    TASK_POLL_BACKOFF_FACTOR = 1.6
+TASK_POLL_BACKOFF_FACTOR = max(1.0, min(4.0, TASK_POLL_BACKOFF_FACTOR))
+TASK_POLL_RATE_ALPHA = 0.5
+TASK_POLL_IDLE_CHECK_SEC = 30
+try:
+    INTENT_WORKER_COUNT = int(os.environ.get("XMONITOR_INTENT_WORKERS", "3"))
+except Exception:
+    INTENT_WORKER_COUNT = 3
+INTENT_WORKER_COUNT = max(1, min(16, INTENT_WORKER_COUNT))
+try:
+    NOTIFY_REPLY_WORKERS = int(os.environ.get("XMONITOR_NOTIFY_REPLY_WORKERS", "2"))
+except Exception:
+    NOTIFY_REPLY_WORKERS = 2
+NOTIFY_REPLY_WORKERS = max(1, min(4, NOTIFY_REPLY_WORKERS))
+try:
+    INTENT_WORKER_QUEUE_MAX = int(os.environ.get("XMONITOR_INTENT_QUEUE_MAX", "200"))
+except Exception:
+    INTENT_WORKER_QUEUE_MAX = 200
+INTENT_WORKER_QUEUE_MAX = max(10, min(5000, INTENT_WORKER_QUEUE_MAX))
+INTENT_LOCAL_MODEL_ENABLED = str(
+    os.environ.get("XMONITOR_INTENT_LOCAL_MODEL", "1")
+).strip().lower() in {"1", "true", "yes", "on"}
+try:
+    INTENT_LOCAL_CONFIDENCE = float(os.environ.get("XMONITOR_INTENT_LOCAL_CONFIDENCE", "0.9"))
+except Exception:
+    INTENT_LOCAL_CONFIDENCE = 0.9
+INTENT_LOCAL_CONFIDENCE = max(0.6, min(0.99, INTENT_LOCAL_CONFIDENCE))
+try:
+    INTENT_LOCAL_MIN_SAMPLES = int(os.environ.get("XMONITOR_INTENT_LOCAL_MIN_SAMPLES", "200"))
+except Exception:
+    INTENT_LOCAL_MIN_SAMPLES = 200
+INTENT_LOCAL_MIN_SAMPLES = max(50, min(100000, INTENT_LOCAL_MIN_SAMPLES))
+INTENT_LOCAL_MIN_PRECISION = 0.95  # 留出集上置信区间判定的最低准确率，未达标则不启用本地层
+INTENT_LOCAL_MAX_SAMPLES = 5000
+INTENT_LOCAL_RETRAIN_EVERY = 50
 TAB_OPEN_JITTER_MIN_SEC = 0.2
 TAB_OPEN_JITTER_MAX_SEC = 1.2
 ARTICLE_REORDER_CHUNK_MIN = 3
@@ -705,6 +854,9 @@ DM_LLM_REWRITE_DEFAULT_PROMPT = (
 DM_LLM_REWRITE_ENABLED = str(
     os.environ.get("XMONITOR_DM_LLM_REWRITE_ENABLED", "1")
 ).strip().lower() not in {"0", "false", "no", "off"}
+DM_LLM_REWRITE_STREAM = str(
+    os.environ.get("XMONITOR_DM_LLM_REWRITE_STREAM", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
 DM_LLM_REWRITE_PROMPT_TEMPLATE = str(
     os.environ.get("XMONITOR_DM_LLM_REWRITE_PROMPT_TEMPLATE", DM_LLM_REWRITE_DEFAULT_PROMPT) or DM_LLM_REWRITE_DEFAULT_PROMPT
 ).strip()
@@ -743,6 +895,17 @@ try:
 except Exception:
     DM_LLM_REWRITE_MAX_SHARED_RUN = 14
 DM_LLM_REWRITE_MAX_SHARED_RUN = max(6, min(28, DM_LLM_REWRITE_MAX_SHARED_RUN))
+try:
+    DM_LLM_REWRITE_NEAR_DUP_JACCARD = float(os.environ.get("XMONITOR_DM_LLM_REWRITE_NEAR_DUP_JACCARD", "0.6"))
+except Exception:
+    DM_LLM_REWRITE_NEAR_DUP_JACCARD = 0.6
+DM_LLM_REWRITE_NEAR_DUP_JACCARD = max(0.3, min(0.95, DM_LLM_REWRITE_NEAR_DUP_JACCARD))
+try:
+    DM_REWRITE_POOL_SIZE = int(os.environ.get("XMONITOR_DM_REWRITE_POOL_SIZE", "2"))
+except Exception:
+    DM_REWRITE_POOL_SIZE = 2
+DM_REWRITE_POOL_SIZE = max(0, min(8, DM_REWRITE_POOL_SIZE))
+DM_REWRITE_POOL_TTL_SEC = 6 * 3600
 DM_CLOSED_FALLBACK_REPLY_TEXT = "大佬 您的私信是关闭的，如果有需要可以给我私信呀"
 DM_REJECT_NEW_MESSAGE_OVERLAY = str(
     os.environ.get("XMONITOR_DM_REJECT_NEW_MESSAGE_OVERLAY", "1")
@@ -764,11 +927,30 @@ try:
 except Exception:
     DM_CRITICAL_MAX_HOLD_SEC = 120.0
 DM_CRITICAL_MAX_HOLD_SEC = max(30.0, min(900.0, float(DM_CRITICAL_MAX_HOLD_SEC)))
+try:
+    DM_WORKER_TABS = int(os.environ.get("XMONITOR_DM_WORKER_TABS", "1"))
+except Exception:
+    DM_WORKER_TABS = 1
+DM_WORKER_TABS = max(0, min(4, DM_WORKER_TABS))  # 0 = 私信沿用回复工作标签页（旧行为）
+try:
+    DM_WORKER_TAB_WAIT_SEC = float(os.environ.get("XMONITOR_DM_WORKER_TAB_WAIT_SEC", "120"))
+except Exception:
+    DM_WORKER_TAB_WAIT_SEC = 120.0
+DM_WORKER_TAB_WAIT_SEC = max(10.0, min(600.0, DM_WORKER_TAB_WAIT_SEC))
 try:
     DM_SEND_CONFIRM_WAIT_SEC = float(os.environ.get("XMONITOR_DM_SEND_CONFIRM_WAIT_SEC", "3.0"))
 except Exception:
     DM_SEND_CONFIRM_WAIT_SEC = 3.0
 DM_SEND_CONFIRM_WAIT_SEC = max(0.8, min(8.0, float(DM_SEND_CONFIRM_WAIT_SEC)))
+# 分段输入：Python 生成人类化输入计划，页面内一次 run_js 逐段插入并自校验；失败回退整段输入
+DM_CHUNKED_TYPING = str(
+    os.environ.get("XMONITOR_DM_CHUNKED_TYPING", "1")
+).strip().lower() not in {"0", "false", "no", "off"}
+try:
+    DM_TYPING_MAX_SEC = float(os.environ.get("XMONITOR_DM_TYPING_MAX_SEC", "6"))
+except Exception:
+    DM_TYPING_MAX_SEC = 6.0
+DM_TYPING_MAX_SEC = max(1.0, min(30.0, DM_TYPING_MAX_SEC))
 # 私信口令（Enter Passcode）自动处理默认启用，可用环境变量覆盖
 DM_PASSCODE = str(os.environ.get("XMONITOR_DM_PASSCODE", "1234") or "").strip()
 PROXY_ENV_KEYS = (
@@ -961,14 +1143,51 @@ def clamp_llm_timeout(raw_timeout):
 
 
 LLM_FILTER_TIMEOUT_SEC = clamp_llm_timeout(LLM_FILTER_TIMEOUT_SEC)
-try:
-    LLM_FILTER_CACHE_TTL_SEC = int(os.environ.get("XMONITOR_LLM_CACHE_TTL_SEC", str(6 * 3600)))
-except Exception:
-    LLM_FILTER_CACHE_TTL_SEC = 6 * 3600
 try:
     LLM_FILTER_CACHE_MAX_ENTRIES = int(os.environ.get("XMONITOR_LLM_CACHE_MAX", "5000"))
 except Exception:
     LLM_FILTER_CACHE_MAX_ENTRIES = 5000
+try:
+    LLM_BATCH_MAX_ITEMS = int(os.environ.get("XMONITOR_LLM_BATCH_MAX", "6"))
+except Exception:
+    LLM_BATCH_MAX_ITEMS = 6
+LLM_BATCH_MAX_ITEMS = max(1, min(16, LLM_BATCH_MAX_ITEMS))
+try:
+    LLM_BATCH_WINDOW_SEC = float(os.environ.get("XMONITOR_LLM_BATCH_WINDOW_SEC", "0.25"))
+except Exception:
+    LLM_BATCH_WINDOW_SEC = 0.25
+LLM_BATCH_WINDOW_SEC = max(0.0, min(2.0, LLM_BATCH_WINDOW_SEC))
+try:
+    LLM_VERDICT_CACHE_TTL_SEC = int(os.environ.get("XMONITOR_LLM_VERDICT_TTL_SEC", str(7 * 24 * 3600)))
+except Exception:
+    LLM_VERDICT_CACHE_TTL_SEC = 7 * 24 * 3600
+LLM_VERDICT_CACHE_TTL_SEC = max(600, min(90 * 24 * 3600, LLM_VERDICT_CACHE_TTL_SEC))
+try:
+    LLM_VERDICT_CACHE_MAX_ROWS = int(os.environ.get("XMONITOR_LLM_VERDICT_MAX_ROWS", "50000"))
+except Exception:
+    LLM_VERDICT_CACHE_MAX_ROWS = 50000
+LLM_VERDICT_CACHE_MAX_ROWS = max(1000, min(1000000, LLM_VERDICT_CACHE_MAX_ROWS))
+LLM_VERDICT_PRUNE_EVERY = 500
+try:
+    LLM_BREAKER_ERROR_RATE = float(os.environ.get("XMONITOR_LLM_BREAKER_ERROR_RATE", "0.5"))
+except Exception:
+    LLM_BREAKER_ERROR_RATE = 0.5
+LLM_BREAKER_ERROR_RATE = max(0.1, min(1.0, LLM_BREAKER_ERROR_RATE))
+try:
+    LLM_BREAKER_SLOW_P95_SEC = float(os.environ.get("XMONITOR_LLM_BREAKER_SLOW_P95_SEC", "20"))
+except Exception:
+    LLM_BREAKER_SLOW_P95_SEC = 20.0
+LLM_BREAKER_SLOW_P95_SEC = max(1.0, min(300.0, LLM_BREAKER_SLOW_P95_SEC))
+try:
+    LLM_BREAKER_OPEN_SEC = float(os.environ.get("XMONITOR_LLM_BREAKER_OPEN_SEC", "30"))
+except Exception:
+    LLM_BREAKER_OPEN_SEC = 30.0
+LLM_BREAKER_OPEN_SEC = max(5.0, min(600.0, LLM_BREAKER_OPEN_SEC))
+LLM_BREAKER_WINDOW_SIZE = 20
+LLM_BREAKER_MIN_CALLS = 5
+LLM_VERDICT_CACHE_PERSIST = str(
+    os.environ.get("XMONITOR_LLM_VERDICT_PERSIST", "1")
+).strip().lower() in {"1", "true", "yes", "on"}
 LLM_HARD_FILTER_ENABLED = str(
     os.environ.get("XMONITOR_LLM_HARD_FILTER_ENABLED", "0")
 ).strip().lower() in {"1", "true", "yes", "on"}
@@ -983,6 +1202,8 @@ reply_action_lock = threading.Lock()
 reply_rate_limit_lock = threading.Lock()
 reply_work_tab = None
 reply_work_tab_lock = threading.Lock()
+reply_warm_tab = ReplyWarmTab(REPLY_WARM_TAB_MAX_AGE_SEC)
+reply_warm_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="reply-warm")
 reply_flow_state_lock = threading.Lock()
 reply_flow_active = False
 dm_passcode_warmed = False
@@ -994,6 +1215,9 @@ dm_critical_depth = 0
 dm_critical_started_at = 0.0
 dm_critical_last_skip_log_ts = 0.0
 dm_critical_last_timeout_warn_ts = 0.0
+dm_worker_critical_depth = 0
+dm_worker_critical_started_at = 0.0
+dm_tab_pool = DmTabPool(DM_WORKER_TABS)
 reply_metrics_lock = threading.Lock()
 notify_reply_templates = list(DEFAULT_NOTIFY_REPLY_TEMPLATES)
 dm_message_templates = list(DEFAULT_DM_TEMPLATES)
@@ -1007,13 +1231,38 @@ notify_dm_user_cooldown = {}  # {handle: {"until": float, "task_key": str}}
 notify_dm_user_cooldown_lock = threading.Lock()
 dm_unavailable_cache = {}  # {handle: expire_ts}
 dm_unavailable_cache_lock = threading.Lock()
-llm_filter_cache = {}  # {signature: {"ts": float, "skip": bool, "reason": str}}
-llm_filter_cache_lock = threading.Lock()
+dm_handle_state_loaded = False  # 不可私信缓存/用户冷却是否已从 SQLite 懒加载
+dm_handle_state_load_lock = threading.Lock()
+llm_filter_batcher = LlmMicroBatcher(LLM_BATCH_MAX_ITEMS, LLM_BATCH_WINDOW_SEC)  # 过滤请求微批
+llm_intent_batcher = LlmMicroBatcher(LLM_BATCH_MAX_ITEMS, LLM_BATCH_WINDOW_SEC)  # 意向请求微批
+llm_verdict_memory = LlmVerdictMemory(LLM_FILTER_CACHE_MAX_ENTRIES)  # LLM 判定缓存内存层（SQLite 持久层之前）
+llm_verdict_lock = threading.Lock()
+llm_transport = LlmTransport()  # LLM keep-alive 连接池 + endpoint 调用方式记忆
+llm_breaker = LlmCircuitBreaker(
+    window_size=LLM_BREAKER_WINDOW_SIZE,
+    min_calls=LLM_BREAKER_MIN_CALLS,
+    error_rate_threshold=LLM_BREAKER_ERROR_RATE,
+    slow_p95_sec=LLM_BREAKER_SLOW_P95_SEC,
+    open_sec=LLM_BREAKER_OPEN_SEC,
+    max_open_sec=max(LLM_BREAKER_OPEN_SEC, 300.0),
+)  # LLM 熔断器：故障/过慢时直接回退规则结果
 dm_llm_rewrite_history = deque(maxlen=DM_LLM_REWRITE_DEDUPE_SIZE)  # 最近改写签名
 dm_llm_rewrite_lock = threading.Lock()
+dm_llm_rewrite_minhash_index = MinHashIndex(DM_LLM_REWRITE_DEDUPE_SIZE)  # 最近改写 MinHash 近重复索引
+dm_rewrite_pool = DmRewritePool(DM_REWRITE_POOL_SIZE, ttl_sec=DM_REWRITE_POOL_TTL_SEC)  # 私信改写预生成池
 
 # --- 线程池 (根据任务数动态调整) ---
 task_executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+intent_executor = concurrent.futures.ThreadPoolExecutor(max_workers=INTENT_WORKER_COUNT, thread_name_prefix="intent")
+intent_worker_inflight = 0  # 已提交但未完成的异步意向分析数
+intent_worker_lock = threading.Lock()
+local_intent_model = None  # 本地 n-gram 意向模型（训练并通过校验后才非空）
+local_intent_lock = threading.Lock()
+local_intent_new_samples = 0  # 上次训练后新增的 LLM 判定样本数
+local_intent_training = False
+dm_rewrite_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="dm-rewrite")
+notify_reply_executor = concurrent.futures.ThreadPoolExecutor(max_workers=NOTIFY_REPLY_WORKERS, thread_name_prefix="notify-reply")
+notify_reply_jobs = NotifyReplyJobStore()  # /api/notify_reply 异步任务登记表
 
 # --- 持久通知标签页 ---
 notification_tab = None
@@ -1021,10 +1270,13 @@ notification_tab_lock = threading.Lock()
 monitor_thread = None
 monitor_thread_lock = threading.Lock()
 content_dedupe = {}  # {signature: last_seen_ts}
+task_schedule_state = {}  # {url: {"next_due": float, "capture_rate": float, "idle_streak": int, ...}}
+task_schedule_lock = threading.Lock()
 notification_refresh_interval = random.uniform(NOTIFICATION_REFRESH_INTERVAL_MIN_SEC, NOTIFICATION_REFRESH_INTERVAL_MAX_SEC)
 notification_last_refresh_at = 0.0
 notification_disconnect_streak = 0
 notification_empty_article_streak = 0
+notification_card_cache = ParsedCardCache(NOTIFICATION_CARD_CACHE_MAX, NOTIFICATION_CARD_CACHE_TTL_SEC)  # 卡片指纹 -> 解析结果
 
 runtime_state = _build_runtime_state_impl(sys.modules[__name__])
 monitor_tasks_repo = MonitorTasksRepository(sys.modules[__name__])
@@ -1039,16 +1291,16 @@ def _get_runtime_attr(name, default=None):
     return _get_runtime_attr_impl(sys.modules[__name__], name, default=default)
 
 
-def _enter_dm_critical(section='dm_send'):
-    return _enter_dm_critical_impl(sys.modules[__name__], section=section)
+def _enter_dm_critical(section='dm_send', worker_tab=False):
+    return _enter_dm_critical_impl(sys.modules[__name__], section=section, worker_tab=worker_tab)
 
 
-def _leave_dm_critical():
-    return _leave_dm_critical_impl(sys.modules[__name__])
+def _leave_dm_critical(worker_tab=False):
+    return _leave_dm_critical_impl(sys.modules[__name__], worker_tab=worker_tab)
 
 
-def _is_dm_critical_active():
-    return _is_dm_critical_active_impl(sys.modules[__name__])
+def _is_dm_critical_active(include_worker_tabs=True):
+    return _is_dm_critical_active_impl(sys.modules[__name__], include_worker_tabs=include_worker_tabs)
 
 
 def _maybe_log_dm_critical_skip():
@@ -1251,6 +1503,24 @@ def get_random_task_parallel(task_count):
     return _get_random_task_parallel_impl(task_count, sys.modules[__name__])
 
 
+def pick_due_tasks(tasks):
+    """返回已到期需扫描的推文任务（按逾期时间排序）。"""
+    return _pick_due_tasks_impl(tasks, sys.modules[__name__])
+
+
+def record_task_scan_result(task, captured):
+    """记录任务捕获数并按热度安排下次轮询。"""
+    return _record_task_scan_result_impl(task, captured, sys.modules[__name__])
+
+
+def seconds_until_next_task_due(tasks):
+    return _seconds_until_next_task_due_impl(tasks, sys.modules[__name__])
+
+
+def prune_task_schedule(tasks):
+    return _prune_task_schedule_impl(tasks, sys.modules[__name__])
+
+
 def reorder_articles_for_scan(articles):
     return _reorder_articles_for_scan_impl(articles, sys.modules[__name__])
 
@@ -1333,10 +1603,6 @@ def _synthesize_doubao_tts_audio_base64(text):
     return _synthesize_doubao_tts_audio_base64_impl(text, sys.modules[__name__])
 
 
-def _prune_llm_filter_cache(now_ts=None):
-    return _prune_llm_filter_cache_impl(sys.modules[__name__], now_ts=now_ts)
-
-
 def _parse_json_object_from_text(raw_text):
     return _parse_json_object_from_text_impl(raw_text)
 
@@ -1351,6 +1617,7 @@ def _call_openai_compatible_json(
     timeout_sec=None,
     max_tokens=120,
     temperature=0.0,
+    max_tokens_cap=_LLM_MAX_TOKENS_CAP,
 ):
     return _call_openai_compatible_json_impl(
         system_prompt,
@@ -1362,6 +1629,33 @@ def _call_openai_compatible_json(
         timeout_sec=timeout_sec,
         max_tokens=max_tokens,
         temperature=temperature,
+        max_tokens_cap=max_tokens_cap,
+    )
+
+
+def _stream_openai_compatible_text(
+    system_prompt,
+    user_prompt,
+    *,
+    on_delta=None,
+    base_url=None,
+    api_key=None,
+    model=None,
+    timeout_sec=None,
+    max_tokens=120,
+    temperature=0.0,
+):
+    return _stream_openai_compatible_text_impl(
+        system_prompt,
+        user_prompt,
+        sys.modules[__name__],
+        on_delta=on_delta,
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        timeout_sec=timeout_sec,
+        max_tokens=max_tokens,
+        temperature=temperature,
     )
 
 
@@ -1408,22 +1702,42 @@ def _dm_rewrite_is_too_similar(source_text, generated_text):
     return _dm_rewrite_is_too_similar_impl(source_text, generated_text, sys.modules[__name__])
 
 
-def _record_dm_llm_rewrite_signature(sig):
-    return _record_dm_llm_rewrite_signature_impl(sig, sys.modules[__name__])
+def _record_dm_llm_rewrite_signature(sig, text=''):
+    return _record_dm_llm_rewrite_signature_impl(sig, sys.modules[__name__], text=text)
 
 
 def _is_dm_llm_rewrite_duplicate(sig):
     return _is_dm_llm_rewrite_duplicate_impl(sig, sys.modules[__name__])
 
 
-def _generate_dm_text_with_llm(template_text):
-    return _generate_dm_text_with_llm_impl(template_text, sys.modules[__name__])
+def _dm_llm_rewrite_near_duplicate_score(text):
+    return _dm_llm_rewrite_near_duplicate_score_impl(text, sys.modules[__name__])
+
+
+def _generate_dm_text_with_llm(template_text, record_signature=True):
+    return _generate_dm_text_with_llm_impl(template_text, sys.modules[__name__], record_signature=record_signature)
+
+
+def _schedule_dm_rewrite_refill(template_text):
+    return _schedule_dm_rewrite_refill_impl(template_text, sys.modules[__name__])
+
+
+def _warm_dm_rewrite_pool():
+    return _warm_dm_rewrite_pool_impl(sys.modules[__name__])
+
+
+def _take_pregenerated_dm_text(template_text):
+    return _take_pregenerated_dm_text_impl(template_text, sys.modules[__name__])
 
 
 def _call_openai_compatible_filter_api(content):
     return _call_openai_compatible_filter_api_impl(content, sys.modules[__name__])
 
 
+def _call_openai_compatible_filter_api_many(contents):
+    return _call_openai_compatible_filter_api_many_impl(contents, sys.modules[__name__])
+
+
 def _score_to_intent_level(score):
     val = int(max(0, min(100, int(score))))
     if val >= 75:
@@ -1477,8 +1791,12 @@ def _is_non_business_meme_signal(content):
     return _is_non_business_meme_signal_impl(content)
 
 
-def _is_business_consult_signal(content):
-    return _is_business_consult_signal_impl(content, sys.modules[__name__])
+def _scan_intent_keyword_families(text_lower):
+    return _scan_intent_keyword_families_impl(text_lower, sys.modules[__name__])
+
+
+def _is_business_consult_signal(content, keyword_hits=None):
+    return _is_business_consult_signal_impl(content, sys.modules[__name__], keyword_hits=keyword_hits)
 
 
 def _rule_based_intent_analysis(content):
@@ -1500,10 +1818,34 @@ def _llm_intent_analysis(content, *, base_url=None, api_key=None, model=None, ti
     )
 
 
+def _local_intent_verdict(content):
+    return _local_intent_verdict_impl(content, sys.modules[__name__])
+
+
+def _record_intent_training_sample(content, llm_result):
+    return _record_intent_training_sample_impl(content, llm_result, sys.modules[__name__])
+
+
+def _schedule_local_intent_training():
+    return _schedule_local_intent_training_impl(sys.modules[__name__])
+
+
 def analyze_comment_intent(content, *, base_url=None, api_key=None, model=None, timeout_sec=None):
     return _analyze_comment_intent_impl(content, sys.modules[__name__], base_url=base_url, api_key=api_key, model=model, timeout_sec=timeout_sec)
 
 
+def _rule_only_intent_result(content):
+    return _rule_only_intent_result_impl(content, sys.modules[__name__])
+
+
+def apply_provisional_intent(item):
+    return _apply_provisional_intent_impl(item, sys.modules[__name__])
+
+
+def submit_intent_upgrade(item):
+    return _submit_intent_upgrade_impl(item, sys.modules[__name__])
+
+
 def _should_notify_voice_by_intent(analysis):
     return _should_notify_voice_by_intent_impl(analysis)
 
@@ -1512,6 +1854,10 @@ def _should_skip_by_llm_filter(content):
     return _should_skip_by_llm_filter_impl(content, sys.modules[__name__])
 
 
+def _should_skip_by_llm_filter_many(contents):
+    return _should_skip_by_llm_filter_many_impl(contents, sys.modules[__name__])
+
+
 def normalize_content_for_dedupe(content):
     return _normalize_content_for_dedupe_impl(content)
 
@@ -1681,6 +2027,20 @@ def is_reply_to_me_notification_item(item):
 def _extract_status_ids_from_article(article):
     return _extract_status_ids_from_article_impl(article, pick_best_status_id_fn=_pick_best_status_id)
 
+def _notification_card_fingerprint(article):
+    return _article_card_fingerprint_impl(article)
+
+def _notification_card_fingerprints(page, articles):
+    return _article_card_fingerprints_impl(page, articles)
+
+def _cached_card_status_info(article):
+    """优先读取卡片解析缓存中的 status 信息。"""
+    return _cached_card_status_info_impl(
+        article,
+        parsed_card_cache=notification_card_cache,
+        extract_notification_status_info_fn=_extract_notification_status_info,
+    )
+
 def _match_reply_target_article(page, status_id, handle, content):
     return _match_reply_target_article_impl(
         page,
@@ -1690,6 +2050,7 @@ def _match_reply_target_article(page, status_id, handle, content):
         extract_status_ids_from_article_fn=_extract_status_ids_from_article,
         normalize_handle_fn=normalize_handle,
         normalize_content_for_dedupe_fn=normalize_content_for_dedupe,
+        parsed_card_cache=notification_card_cache,
     )
 
 def _match_notification_card_for_reply(page, status_id, handle, content):
@@ -1703,6 +2064,7 @@ def _match_notification_card_for_reply(page, status_id, handle, content):
         extract_notification_content_fn=_extract_notification_content,
         normalize_handle_fn=normalize_handle,
         normalize_content_for_dedupe_fn=normalize_content_for_dedupe,
+        parsed_card_cache=notification_card_cache,
     )
 
 def ensure_reply_work_tab(force_recreate=False):
@@ -1710,6 +2072,26 @@ def ensure_reply_work_tab(force_recreate=False):
     return _ensure_reply_work_tab_impl(sys.modules[__name__], force_recreate=force_recreate)
 
 
+def _ensure_reply_warm_tab(force_recreate=False):
+    return _ensure_reply_warm_tab_impl(sys.modules[__name__], force_recreate=force_recreate)
+
+
+def _schedule_reply_warm_preload(current_key):
+    return _schedule_reply_warm_preload_impl(current_key, sys.modules[__name__])
+
+
+def _claim_reply_warm_target(item, status_id):
+    return _claim_reply_warm_target_impl(item, status_id, sys.modules[__name__])
+
+
+def _release_reply_warm_tab(current_key):
+    return _release_reply_warm_tab_impl(current_key, sys.modules[__name__])
+
+
+def _ensure_dm_worker_tab(slot, force_recreate=False):
+    return _ensure_dm_worker_tab_impl(slot, sys.modules[__name__], force_recreate=force_recreate)
+
+
 def _set_reply_flow_active(active):
     return _set_reply_flow_active_deps_impl(active, sys.modules[__name__])
 
@@ -1750,7 +2132,8 @@ def _check_reply_failure_budget(handle):
 
 def _reserve_notify_dm_user_slot(handle, task_key=""):
     """同一用户短时间内只允许一个私信任务，避免重复触发。"""
-    return _reserve_notify_dm_user_slot_impl(
+    _ensure_dm_handle_state_loaded_impl(sys.modules[__name__])
+    slot_ok, slot_wait = _reserve_notify_dm_user_slot_impl(
         handle,
         task_key,
         normalize_handle_fn=normalize_handle,
@@ -1758,6 +2141,13 @@ def _reserve_notify_dm_user_slot(handle, task_key=""):
         cooldown_lock=notify_dm_user_cooldown_lock,
         cooldown_sec=DM_USER_COOLDOWN_SEC,
     )
+    if slot_ok:
+        _persist_notify_dm_user_cooldown_impl(handle, sys.modules[__name__])
+    return slot_ok, slot_wait
+
+
+def _notify_dm_cooldown_remaining(handle, task_key=""):
+    return _notify_dm_cooldown_remaining_impl(handle, sys.modules[__name__], task_key=task_key)
 
 
 def _record_reply_outcome(handle, ok, err=""):
@@ -1791,6 +2181,9 @@ def _humanized_type_dm_text(tab, editor, dm_text):
         dm_text,
         idle_func=_dm_humanized_idle,
         log_debug=log_headless_debug,
+        chunked=DM_CHUNKED_TYPING,
+        humanize_multiplier_fn=_get_humanize_multiplier,
+        max_total_sec=DM_TYPING_MAX_SEC,
     )
 
 
@@ -1895,6 +2288,18 @@ def _clear_dm_unavailable_cache(handle):
     return _clear_dm_unavailable_cache_impl(handle, sys.modules[__name__])
 
 
+def _lookup_dm_conversation_url(handle):
+    return _lookup_dm_conversation_url_impl(handle, sys.modules[__name__])
+
+
+def _remember_dm_conversation_url(handle, page_url):
+    return _remember_dm_conversation_url_impl(handle, page_url, sys.modules[__name__])
+
+
+def _forget_dm_conversation_url(handle):
+    return _forget_dm_conversation_url_impl(handle, sys.modules[__name__])
+
+
 def _get_status_link_from_item(item, matched_status_handle=None, matched_status_id=None):
     return _get_status_link_from_item_impl(item, sys.modules[__name__], matched_status_handle=matched_status_handle, matched_status_id=matched_status_id)
 
@@ -1988,6 +2393,22 @@ def send_notification_reply(item, message, dm_message=""):
     return _send_notification_reply_impl(item, message, sys.modules[__name__], dm_message=dm_message)
 
 
+def submit_notify_reply_job(target, message, dm_message, cur_attempt):
+    return _submit_notify_reply_job_impl(target, message, dm_message, cur_attempt, sys.modules[__name__])
+
+
+def submit_notify_reply_batch(entries):
+    return _submit_notify_reply_batch_impl(entries, sys.modules[__name__])
+
+
+def mark_notify_reply_pending(key, cur_attempt, save=True):
+    return _mark_notify_reply_pending_impl(key, cur_attempt, sys.modules[__name__], save=save)
+
+
+def _publish_notify_reply_progress(key, stage):
+    return _publish_notify_reply_progress_impl(key, stage, sys.modules[__name__])
+
+
 app = create_flask_app(__name__, sys.modules[__name__])
 
 if __name__ == '__main__':
@@ -2015,6 +2436,8 @@ if __name__ == '__main__':
     print("🚀 X Monitor V10.4 (通知监控版) 启动中...")
     print("=" * 60)
     load_state()
+    _schedule_local_intent_training()
+    _warm_dm_rewrite_pool()
     server_port, port_source = resolve_server_port()
     print("=" * 60)
     print(f"✅ 服务已启动: http://127.0.0.1:{server_port}")
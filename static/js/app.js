@@ -1490,6 +1490,27 @@
             }
         }
 
+        function applyNotifyIntentState(row, data) {
+            if(!row || !data) return;
+            const level = String(data.intent_level || '').trim();
+            const score = Number(data.intent_score || 0);
+            const pending = !!data.intent_pending;
+            row.setAttribute('data-intent-level', level);
+            row.setAttribute('data-intent-score', String(score));
+            row.setAttribute('data-intent-pending', pending ? '1' : '0');
+
+            const intentEl = row.querySelector('.flow-intent');
+            if(!intentEl) return;
+            if(!level) {
+                intentEl.textContent = '';
+                intentEl.style.display = 'none';
+                return;
+            }
+            const source = pending ? ' | 规则初判，AI分析中' : (data.llm_used ? ' | AI' : '');
+            intentEl.textContent = `意向: ${level} (${score}分)${source}`;
+            intentEl.style.display = '';
+        }
+
         function applyNotifyReplyState(row, replied, replyTime='') {
             if(!row) return;
             row.setAttribute('data-notify-replied', replied ? '1' : '0');
@@ -1539,53 +1560,154 @@
 
             btn.disabled = true;
             const oldText = btn.textContent;
-            btn.textContent = '发送中...';
+            btn.textContent = '提交中...';
 
             fetch('/api/notify_reply', {
                 method:'POST',
                 headers:{'Content-Type':'application/json'},
                 body:JSON.stringify({key:key, message:message, dm_message:dmMessage})
             }).then(r=>r.json()).then(d => {
-                if(d.status === 'ok') {
-                    const replyTime = (d.reply_time || '').trim();
-                    applyNotifyReplyState(row, true, replyTime);
-                    applyNotifyFlowState(row, {
-                        flow_stage: d.flow_stage || 'done',
-                        attempt: d.attempt || '',
-                        retry_time: d.retry_time || '',
-                        flow_error_code: '',
-                        flow_error_detail: ''
-                    });
-                    alert(`✅ 已回复 ${handle || ''}`);
-                } else if(d.status === 'retry_waiting') {
-                    applyNotifyReplyState(row, false, '');
-                    applyNotifyFlowState(row, {
-                        flow_stage: d.flow_stage || 'retry_waiting',
-                        attempt: d.attempt || '',
-                        retry_time: d.retry_time || '',
-                        flow_error_code: d.flow_error_code || '',
-                        flow_error_detail: d.flow_error_detail || d.msg || ''
-                    });
-                    alert(`⚠ 已加入重试队列: ${d.msg || '稍后自动重试'}`);
-                } else {
-                    applyNotifyFlowState(row, {
-                        flow_stage: d.flow_stage || row.getAttribute('data-flow-stage') || '',
-                        attempt: d.attempt || '',
-                        retry_time: d.retry_time || '',
-                        flow_error_code: d.flow_error_code || '',
-                        flow_error_detail: d.msg || ''
+                if(d.status === 'queued') {
+                    // 回复在后台任务队列执行，进度与结果经 /api/updates 的 notify_reply_job 事件推送
+                    row.setAttribute('data-reply-job', d.job_id || '');
+                    applyNotifyReplyJobEvent({
+                        type: 'notify_reply_job',
+                        key: key,
+                        job_id: d.job_id || '',
+                        job_status: d.job_status || 'queued',
+                        flow_stage: d.flow_stage || 'reply_pending',
+                        attempt: d.attempt || ''
                     });
-                    alert(`回复失败: ${d.msg || '未知错误'}`);
+                    return;
                 }
+                applyNotifyReplyResult(row, handle, d, true);
+                btn.disabled = false;
+                const repliedNow = row ? (row.getAttribute('data-notify-replied') === '1') : false;
+                btn.textContent = repliedNow ? '↩ 再次回复' : oldText;
             }).catch(() => {
                 alert('网络异常，回复失败');
+                btn.disabled = false;
+                btn.textContent = oldText;
+            });
+        }
+
+        function sendNotifyReplyBatch(btn) {
+            // 当前筛选下所有未回复、且已选好回复和私信内容的通知行，一次提交
+            const items = [];
+            getTableRows('notify').forEach(row => {
+                if(row.style.display === 'none') return;
+                if(row.getAttribute('data-notify-replied') === '1' || row.getAttribute('data-reply-job')) return;
+                const key = row.getAttribute('data-key') || '';
+                const replySelect = row.querySelector('.reply-template-select');
+                const dmSelect = row.querySelector('.dm-template-select');
+                const message = replySelect ? (replySelect.value || '').trim() : '';
+                const dmMessage = dmSelect ? (dmSelect.value || '').trim() : '';
+                if(key && message && dmMessage) items.push({key: key, message: message, dm_message: dmMessage});
+            });
+            if(!items.length) {
+                alert('没有可批量回复的通知（需未回复且已选择回复和私信内容）');
+                return;
+            }
+            if(!confirm(`确定批量回复 ${items.length} 条通知吗？`)) return;
+
+            btn.disabled = true;
+            const oldText = btn.textContent;
+            btn.textContent = '提交中...';
+            fetch('/api/notify_reply/batch', {
+                method:'POST',
+                headers:{'Content-Type':'application/json'},
+                body:JSON.stringify({items: items})
+            }).then(r=>r.json()).then(d => {
+                (d.queued || []).forEach(job => {
+                    const row = document.querySelector(`tr[data-key="${job.key}"]`);
+                    if(row) row.setAttribute('data-reply-job', job.job_id || '');
+                    applyNotifyReplyJobEvent({
+                        type: 'notify_reply_job',
+                        key: job.key,
+                        job_id: job.job_id || '',
+                        job_status: job.job_status || 'queued',
+                        flow_stage: 'reply_pending',
+                        attempt: job.attempt || ''
+                    });
+                });
+                const rejected = d.rejected || [];
+                if(rejected.length) {
+                    const lines = rejected.slice(0, 10).map(r => `${r.key || '-'}: ${r.msg || ''}`);
+                    alert(`已排队 ${(d.queued || []).length} 条，未排队 ${rejected.length} 条:\n${lines.join('\n')}`);
+                }
+            }).catch(() => {
+                alert('网络异常，批量回复提交失败');
             }).finally(() => {
                 btn.disabled = false;
-                const repliedNow = row ? (row.getAttribute('data-notify-replied') === '1') : false;
-                btn.textContent = repliedNow ? '↩ 再次回复' : oldText;
+                btn.textContent = oldText;
             });
         }
 
+        function applyNotifyReplyResult(row, handle, d, notify) {
+            if(d.status === 'ok') {
+                const replyTime = (d.reply_time || '').trim();
+                applyNotifyReplyState(row, true, replyTime);
+                applyNotifyFlowState(row, {
+                    flow_stage: d.flow_stage || 'done',
+                    attempt: d.attempt || '',
+                    retry_time: d.retry_time || '',
+                    flow_error_code: '',
+                    flow_error_detail: ''
+                });
+                if(notify) alert(`✅ 已回复 ${handle || ''}`);
+            } else if(d.status === 'retry_waiting') {
+                applyNotifyReplyState(row, false, '');
+                applyNotifyFlowState(row, {
+                    flow_stage: d.flow_stage || 'retry_waiting',
+                    attempt: d.attempt || '',
+                    retry_time: d.retry_time || '',
+                    flow_error_code: d.flow_error_code || '',
+                    flow_error_detail: d.flow_error_detail || d.msg || ''
+                });
+                if(notify) alert(`⚠ 已加入重试队列: ${d.msg || '稍后自动重试'}`);
+            } else {
+                applyNotifyFlowState(row, {
+                    flow_stage: d.flow_stage || row.getAttribute('data-flow-stage') || '',
+                    attempt: d.attempt || '',
+                    retry_time: d.retry_time || '',
+                    flow_error_code: d.flow_error_code || '',
+                    flow_error_detail: d.msg || ''
+                });
+                if(notify) alert(`回复失败: ${d.msg || '未知错误'}`);
+            }
+        }
+
+        function applyNotifyReplyJobEvent(evt) {
+            if(!evt || !evt.key) return;
+            const row = document.querySelector(`tr[data-key="${evt.key}"]`);
+            if(!row) return;
+            const currentJob = row.getAttribute('data-reply-job') || '';
+            if(currentJob && evt.job_id && currentJob !== evt.job_id) return;
+            const btn = row.querySelector('.btn-reply');
+            const status = evt.job_status || '';
+            if(status === 'queued' || status === 'running') {
+                if(btn) {
+                    btn.disabled = true;
+                    btn.textContent = status === 'queued' ? '排队中...' : '发送中...';
+                }
+                applyNotifyFlowState(row, {
+                    flow_stage: evt.flow_stage || 'reply_pending',
+                    attempt: evt.attempt || '',
+                    retry_time: '',
+                    flow_error_code: '',
+                    flow_error_detail: ''
+                });
+                return;
+            }
+            row.removeAttribute('data-reply-job');
+            // 批量排队时只对失败弹窗，成功/进入重试直接体现在行状态上
+            applyNotifyReplyResult(row, evt.handle || row.getAttribute('data-handle') || '', evt, status === 'err');
+            if(btn) {
+                btn.disabled = false;
+                btn.textContent = row.getAttribute('data-notify-replied') === '1' ? '↩ 再次回复' : '↩ 回复';
+            }
+        }
+
         function retryNotifyReply(evt, btn) {
             markActionClick(evt);
             const row = btn.closest('tr');
@@ -1775,6 +1897,7 @@
                 ? `<div class="action-stack">
                         <div class="${replyStateClass}">${replyStateText}</div>
                         <div class="flow-meta">
+                            <div class="flow-intent"></div>
                             <div class="flow-stage"></div>
                             <div class="flow-error"></div>
                             <div class="flow-retry"></div>
@@ -1812,6 +1935,7 @@
                 if(replySelect && savedReplyText) replySelect.value = savedReplyText;
                 if(dmSelect && savedDmText) dmSelect.value = savedDmText;
                 applyNotifyReplyState(tr, isReplied, i.notify_reply_time || i.reply_time || '');
+                applyNotifyIntentState(tr, i);
                 applyNotifyFlowState(tr, {
                     flow_stage: flowStage,
                     flow_error_code: flowErrorCode,
@@ -1841,6 +1965,7 @@
                     }
                     if(!row) return;
                     applyNotifyReplyState(row, isNotifyItemReplied(item), item.notify_reply_time || item.reply_time || '');
+                    applyNotifyIntentState(row, item);
                     applyNotifyFlowState(row, item);
                 });
             }).catch(() => {});
@@ -1852,8 +1977,20 @@
                 .then(d => {
                     if(!d || !Array.isArray(d.new_items)) return;
                     d.new_items.forEach(i => {
-                        addRow(i, true);
-                        if(i && i.source === '通知页面') {
+                        if(i && i.type === 'notify_reply_job') {
+                            applyNotifyReplyJobEvent(i);
+                            return;
+                        }
+                        if(i && i.intent_upgrade) {
+                            // 行已存在时 addRow 会直接返回，这里就地刷新意向结果
+                            const row = document.querySelector(`tr[data-key="${i.key}"]`);
+                            if(row) applyNotifyIntentState(row, i);
+                            else addRow(i, true);
+                        } else {
+                            addRow(i, true);
+                        }
+                        // 异步意向分析未完成的条目等待升级事件(intent_upgrade)再决定是否播报
+                        if(i && i.source === '通知页面' && !i.intent_pending) {
                             enqueueNotifyIntentCheck(i);
                         }
                     });
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 import app
 
@@ -20,6 +21,19 @@ class AppNotifyHelpersTests(unittest.TestCase):
         }
         self.assertFalse(app.is_reply_to_me_notification_item(item))
 
+    def test_rule_based_intent_analysis_scans_keyword_families_once(self):
+        calls = []
+        real_scan = app._scan_intent_keyword_families
+
+        def counting_scan(text_lower):
+            calls.append(text_lower)
+            return real_scan(text_lower)
+
+        with mock.patch.object(app, '_scan_intent_keyword_families', side_effect=counting_scan):
+            result = app._rule_based_intent_analysis('这个产品的价格怎么联系你们的销售了解一下情况')
+        self.assertEqual(len(calls), 1)
+        self.assertIn('intent_score', result)
+
 
 if __name__ == '__main__':
     unittest.main()
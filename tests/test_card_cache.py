@@ -0,0 +1,87 @@
+import types
+import unittest
+
+from xmonitor.services.card_cache import ParsedCardCache
+from xmonitor.services.notification_match import article_card_fingerprint, article_card_fingerprints, match_notification_card_for_reply
+
+
+def _make_article(html, reply_visible=True):
+    reply_btn = types.SimpleNamespace(states=types.SimpleNamespace(is_displayed=reply_visible))
+    return types.SimpleNamespace(
+        html=html,
+        text=html,
+        ele=lambda selector, timeout=0: reply_btn if 'reply' in selector else None,
+    )
+
+
+class ParsedCardCacheTests(unittest.TestCase):
+    def test_put_merges_fields_and_indexes_status(self):
+        cache = ParsedCardCache(max_entries=16, ttl_sec=60)
+        cache.put('fp1', now_ts=100.0, status_id='111', status_handle='@a')
+        cache.put('fp1', now_ts=101.0, handle='@a', content='hello')
+        record = cache.get('fp1', now_ts=102.0)
+        self.assertEqual(record['status_id'], '111')
+        self.assertEqual(record['content'], 'hello')
+        self.assertEqual(cache.fingerprint_for_status('111', now_ts=102.0), 'fp1')
+
+    def test_ttl_and_lru_eviction(self):
+        cache = ParsedCardCache(max_entries=16, ttl_sec=10)
+        cache.put('old', now_ts=100.0, status_id='1')
+        self.assertIsNone(cache.get('old', now_ts=111.0))
+        self.assertEqual(cache.fingerprint_for_status('1', now_ts=111.0), '')
+        for idx in range(20):
+            cache.put(f'fp{idx}', now_ts=200.0, status_id=str(idx))
+        self.assertEqual(len(cache), 16)
+        self.assertIsNone(cache.get('fp0', now_ts=200.0))
+        self.assertEqual(cache.fingerprint_for_status('0', now_ts=200.0), '')
+        self.assertEqual(cache.fingerprint_for_status('19', now_ts=200.0), 'fp19')
+
+
+class CachedReplyMatchTests(unittest.TestCase):
+    def test_match_uses_cached_card_without_reparsing(self):
+        cache = ParsedCardCache()
+        articles = [_make_article(f'<article>card {idx}</article>') for idx in range(5)]
+        target = articles[3]
+        cache.put(article_card_fingerprint(target), status_id='1890000000000000003', status_handle='@bob', handle='@bob', content='多少钱')
+        page = types.SimpleNamespace(eles=lambda selector, timeout=0: articles)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('cached target should not be re-parsed')
+
+        article, reply_btn, score = match_notification_card_for_reply(
+            page,
+            '1890000000000000003',
+            '@bob',
+            '多少钱',
+            extract_notification_status_info_fn=fail,
+            extract_notification_handle_fn=fail,
+            extract_notification_content_fn=fail,
+            normalize_handle_fn=lambda h: str(h or '').strip().lstrip('@').lower(),
+            normalize_content_for_dedupe_fn=lambda t: str(t or '').strip(),
+            parsed_card_cache=cache,
+        )
+        self.assertIs(article, target)
+        self.assertIsNotNone(reply_btn)
+        self.assertEqual(score, 260 + 100 + 80 + 20)
+
+    def test_batch_fingerprints_use_one_js_call(self):
+        calls = []
+
+        def run_js(script, *args):
+            calls.append(len(args))
+            return [f'/bob/status/{idx}' for idx, _ in enumerate(args)]
+
+        page = types.SimpleNamespace(run_js=run_js)
+        first = article_card_fingerprints(page, [_make_article('3分钟前'), _make_article('x')])
+        second = article_card_fingerprints(page, [_make_article('4分钟前'), _make_article('y')])
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], first[1])
+
+        broken = types.SimpleNamespace(run_js=lambda *a: None)
+        article = _make_article('<article>fallback</article>')
+        self.assertEqual(article_card_fingerprints(broken, [article]), [article_card_fingerprint(article)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,8 @@ from xmonitor.runtime.dm_critical import (
     leave_dm_critical,
     maybe_log_dm_critical_skip,
 )
+from xmonitor.browser.dm_tab_pool import DmTabPool
+from xmonitor.services.dm_recovery_service import _acquire_browser_restart, _release_browser_restart
 
 
 class DMCriticalTests(unittest.TestCase):
@@ -22,6 +24,8 @@ class DMCriticalTests(unittest.TestCase):
         deps.dm_critical_started_at = 0.0
         deps.dm_critical_last_skip_log_ts = 0.0
         deps.dm_critical_last_timeout_warn_ts = 0.0
+        deps.dm_worker_critical_depth = 0
+        deps.dm_worker_critical_started_at = 0.0
         deps.logs = []
         deps.log_to_ui = lambda level, msg: deps.logs.append((level, msg))
         return deps
@@ -33,6 +37,42 @@ class DMCriticalTests(unittest.TestCase):
         leave_dm_critical(deps)
         self.assertFalse(is_dm_critical_active(deps))
 
+    def test_worker_tab_section_blocks_maintenance_but_not_notify_scan(self):
+        deps = self._make_deps()
+        self.assertTrue(enter_dm_critical(deps, worker_tab=True))
+        self.assertTrue(is_dm_critical_active(deps))
+        self.assertFalse(is_dm_critical_active(deps, include_worker_tabs=False))
+        # 工作标签页关键区不持有全局锁，其他线程仍可进入共享标签页关键区
+        acquired = []
+        worker = threading.Thread(target=lambda: acquired.append(deps.dm_critical_lock.acquire(timeout=0.5)))
+        worker.start()
+        worker.join()
+        self.assertEqual(acquired, [True])
+        leave_dm_critical(deps, worker_tab=True)
+        self.assertFalse(is_dm_critical_active(deps))
+
+    def test_worker_tab_browser_restart_blocks_notify_scan(self):
+        deps = self._make_deps()
+        deps.reply_action_lock = threading.Lock()
+        deps.dm_tab_pool = DmTabPool(2)
+        deps._enter_dm_critical = lambda section='dm_send', worker_tab=False: enter_dm_critical(deps, section, worker_tab)
+        deps._leave_dm_critical = lambda worker_tab=False: leave_dm_critical(deps, worker_tab)
+        slot = deps.dm_tab_pool.acquire('alice')
+        enter_dm_critical(deps, 'dm_send_recovery', worker_tab=True)
+        self.assertFalse(is_dm_critical_active(deps, include_worker_tabs=False))
+
+        self.assertTrue(_acquire_browser_restart(deps, 1.0))
+        self.assertTrue(is_dm_critical_active(deps, include_worker_tabs=False))
+        self.assertFalse(deps.reply_action_lock.acquire(blocking=False))
+        self.assertIsNone(deps.dm_tab_pool.acquire('bob', timeout=0.05))
+
+        _release_browser_restart(deps)
+        self.assertFalse(is_dm_critical_active(deps, include_worker_tabs=False))
+        self.assertTrue(deps.reply_action_lock.acquire(blocking=False))
+        deps.reply_action_lock.release()
+        leave_dm_critical(deps, worker_tab=True)
+        deps.dm_tab_pool.release(slot, 'alice')
+
     def test_timeout_and_skip_log(self):
         deps = self._make_deps()
         enter_dm_critical(deps)
@@ -0,0 +1,71 @@
+import types
+import unittest
+
+from xmonitor.services.dm_llm_service import (
+    dm_stream_abort_reason,
+    generate_dm_text_with_llm,
+    stream_dm_candidate_text,
+)
+from xmonitor.services.llm_client import parse_json_object_from_text
+
+
+class DmLlmStreamTests(unittest.TestCase):
+    def _make_deps(self, outputs):
+        deps = types.SimpleNamespace()
+        deps.DM_LLM_REWRITE_STREAM = True
+        deps.DM_LLM_REWRITE_MAX_CHARS = 20
+        deps.DM_LLM_REWRITE_MAX_REGEN = 2
+        deps.DM_LLM_REWRITE_TEMPERATURE = 0.7
+        deps.DM_LLM_REWRITE_DEDUPE_SIZE = 50
+        deps.LLM_FILTER_TIMEOUT_SEC = 5.0
+        deps._llm_runtime_ready = lambda: True
+        deps._sanitize_dm_message_text = lambda text: str(text or '').strip()
+        deps._build_dm_llm_rewrite_prompt = lambda template: f'rewrite: {template}'
+        deps._extract_dm_rewrite_forbidden_phrases = lambda template: ['感谢关注']
+        deps._dm_rewrite_contains_forbidden_phrase = lambda text, phrases: next((p for p in phrases if p in text), '')
+        deps._dm_rewrite_is_too_similar = lambda src, dst: (False, 0.1, 10, 2)
+        deps._normalize_dm_rewrite_signature = lambda text: text
+        deps._is_dm_llm_rewrite_duplicate = lambda sig: False
+        deps._record_dm_llm_rewrite_signature = lambda sig, text='': None
+        deps._dm_llm_rewrite_near_duplicate_score = lambda text: None
+        deps._parse_json_object_from_text = parse_json_object_from_text
+        deps.partials = []
+
+        def stream(system_prompt, user_prompt, *, on_delta=None, **kwargs):
+            full = outputs.pop(0)
+            text = ''
+            for ch in full:
+                text += ch
+                deps.partials.append(text)
+                reason = on_delta(text)
+                if reason:
+                    return text, reason
+            return text, ''
+
+        deps._stream_openai_compatible_text = stream
+        return deps
+
+    def test_candidate_text_from_partial_json(self):
+        self.assertEqual(stream_dm_candidate_text('{"text": "你好\\n世'), '你好\n世')
+        self.assertEqual(stream_dm_candidate_text('{"text":"ab\\"c"}'), 'ab"c')
+        self.assertEqual(stream_dm_candidate_text('纯文本'), '纯文本')
+
+    def test_copied_phrase_aborts_stream_and_regenerates(self):
+        deps = self._make_deps(['{"text": "感谢关注我们的产品，欢迎咨询"}', '{"text": "新品上架，欢迎来聊"}'])
+        ok, text, meta = generate_dm_text_with_llm('感谢关注，欢迎咨询', deps)
+        self.assertTrue(ok)
+        self.assertEqual(text, '新品上架，欢迎来聊')
+        self.assertEqual(meta['regen_attempt'], 2)
+        self.assertNotIn('{"text": "感谢关注我们', deps.partials)
+
+    def test_overlong_output_is_cut_short_and_truncated(self):
+        deps = self._make_deps(['{"text": "' + '好' * 60 + '"}'])
+        self.assertEqual(dm_stream_abort_reason('{"text": "' + '好' * 21, [], deps), 'max_chars')
+        ok, text, _ = generate_dm_text_with_llm('模板', deps)
+        self.assertTrue(ok)
+        self.assertEqual(text, '好' * 20)
+        self.assertLess(len(deps.partials[-1]), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import types
+import unittest
+
+from xmonitor.services.dm_rewrite_pool import (
+    DmRewritePool,
+    dm_rewrite_pool_key,
+    schedule_dm_rewrite_refill,
+    take_pregenerated_dm_text,
+    warm_dm_rewrite_pool,
+)
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+
+
+class _InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class DmRewritePoolTests(unittest.TestCase):
+    def _make_deps(self, outputs, per_template=2):
+        deps = types.SimpleNamespace()
+        deps.DM_LLM_REWRITE_ENABLED = True
+        deps.DM_LLM_REWRITE_PROMPT_TEMPLATE = 'prompt'
+        deps.DM_LLM_REWRITE_MAX_CHARS = 200
+        deps.LLM_FILTER_MODEL = 'm'
+        deps.dm_rewrite_pool = DmRewritePool(per_template)
+        deps.dm_rewrite_executor = _InlineExecutor()
+        deps.llm_breaker = LlmCircuitBreaker()
+        deps.intent_worker_inflight = 0
+        deps.history = []
+        deps.generate_calls = []
+        deps._llm_runtime_ready = lambda: True
+        deps._sanitize_dm_message_text = lambda text: str(text or '').strip()
+        deps._normalize_dm_rewrite_signature = lambda text: text
+        deps._is_dm_llm_rewrite_duplicate = lambda sig: sig in deps.history
+        deps._record_dm_llm_rewrite_signature = lambda sig, text='': deps.history.append(sig)
+        deps._dm_llm_rewrite_near_duplicate_score = lambda text: None
+        deps.log_to_ui = lambda level, msg: None
+
+        def generate(template_text, record_signature=True):
+            deps.generate_calls.append(record_signature)
+            if not outputs:
+                return False, '', {'error_code': 'E_DM_LLM_GENERATE_FAILED'}
+            return True, outputs.pop(0), {'llm_used': True, 'latency_ms': 900, 'regen_attempt': 1}
+
+        deps._generate_dm_text_with_llm = generate
+        return deps
+
+    def test_refill_then_take_is_instant_and_recorded_on_use(self):
+        deps = self._make_deps(['v1', 'v1', 'v2', 'v3'])
+        self.assertTrue(schedule_dm_rewrite_refill('模板', deps))
+        self.assertEqual(len(deps.dm_rewrite_pool), 2)
+        self.assertEqual(deps.history, [])
+        self.assertEqual(set(deps.generate_calls), {False})
+        ok, text, meta = take_pregenerated_dm_text('模板', deps)
+        self.assertEqual((ok, text), (True, 'v1'))
+        self.assertTrue(meta['pregenerated'])
+        self.assertEqual(meta['latency_ms'], 0)
+        self.assertEqual(deps.history, ['v1'])
+        self.assertEqual(len(deps.dm_rewrite_pool), 2)
+
+    def test_take_skips_entries_already_in_dedupe_window(self):
+        deps = self._make_deps([])
+        key = dm_rewrite_pool_key('模板', deps)
+        deps.dm_rewrite_pool.push(key, 'used', 'used', {})
+        deps.dm_rewrite_pool.push(key, 'fresh', 'fresh', {})
+        deps.history.append('used')
+        self.assertEqual(take_pregenerated_dm_text('模板', deps)[1], 'fresh')
+        self.assertIsNone(take_pregenerated_dm_text('模板', deps))
+
+    def test_key_changes_with_prompt_and_expired_entries_are_dropped(self):
+        deps = self._make_deps([])
+        key = dm_rewrite_pool_key('模板', deps)
+        deps.DM_LLM_REWRITE_PROMPT_TEMPLATE = 'prompt v2'
+        self.assertNotEqual(key, dm_rewrite_pool_key('模板', deps))
+        pool = DmRewritePool(2, ttl_sec=60)
+        pool.push('k', 'a', 'a', {}, now_ts=0.0)
+        self.assertIsNone(pool.pop('k', now_ts=120.0))
+        self.assertEqual(pool.deficit('k', now_ts=120.0), 2)
+
+    def test_warm_fills_leading_templates_once(self):
+        deps = self._make_deps(['a1', 'a2', 'b1', 'b2'])
+        deps.dm_message_templates = ['模板A', '模板B', '模板C', '模板D']
+        self.assertEqual(warm_dm_rewrite_pool(deps, max_templates=2), 2)
+        self.assertEqual(len(deps.dm_rewrite_pool), 4)
+        self.assertEqual(warm_dm_rewrite_pool(deps, max_templates=2), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import random
+import types
+import unittest
+
+from xmonitor.services.dm_runtime import build_dm_typing_schedule, humanized_type_dm_text
+
+
+class _FakeEditor:
+    def __init__(self):
+        self.inputs = []
+
+    def ele(self, selector, timeout=0):
+        return None
+
+    def click(self):
+        pass
+
+    def input(self, text, clear=True):
+        self.inputs.append(text)
+
+
+class DmRuntimeTypingTests(unittest.TestCase):
+    def test_schedule_reassembles_text_keeps_links_whole_and_respects_cap(self):
+        text = '你好，看到你的评论了，详情见 https://x.com/a/status/123 谢谢'
+        schedule = build_dm_typing_schedule(text, multiplier=1.0, max_total_sec=1.5, rng=random.Random(1))
+        self.assertEqual(''.join(chunk for chunk, _ in schedule), text)
+        self.assertIn('https://x.com/a/status/123', [chunk for chunk, _ in schedule])
+        self.assertEqual(schedule[0][1], 0)
+        self.assertLessEqual(sum(delay for _, delay in schedule), 1500 + len(schedule))
+        self.assertTrue(all(len(chunk) <= 4 for chunk, _ in schedule if not chunk.startswith('http')))
+
+    def test_chunked_typing_uses_single_run_js_and_falls_back_on_mismatch(self):
+        calls = []
+        results = [json.dumps({'ok': True, 'len': 5}), json.dumps({'ok': False, 'len': 2})]
+
+        def run_js(script, *args, timeout=None):
+            calls.append((json.loads(args[1]), timeout))
+            return results[len(calls) - 1]
+
+        tab = types.SimpleNamespace(run_js=run_js)
+        editor = _FakeEditor()
+        kwargs = dict(idle_func=lambda *a: None, log_debug=lambda msg: None, chunked=True, max_total_sec=2.0)
+        self.assertTrue(humanized_type_dm_text(tab, editor, 'hello', **kwargs))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0]['text'], 'hello')
+        self.assertEqual(editor.inputs, [])
+        self.assertTrue(humanized_type_dm_text(tab, editor, 'hello', **kwargs))
+        self.assertEqual(editor.inputs, ['hello'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,38 @@
+import json
 import unittest
 
+from xmonitor.services import dm_common
+from xmonitor.services.dm_common import (
+    confirm_dm_message_sent,
+    diff_dm_bubbles,
+    dm_bubbles_advanced,
+    snapshot_dm_send_baseline,
+)
+
+
+class _FakeTab:
+    def __init__(self, bubbles, watch_outcome='hit', arm_ok=True):
+        self.bubbles = list(bubbles)
+        self.watch_outcome = watch_outcome
+        self.arm_ok = arm_ok
+        self.calls = []
+
+    def run_js(self, script, *args, timeout=None):
+        if script is dm_common._DM_SEND_WATCH_ARM_JS:
+            self.calls.append('arm')
+            if not self.arm_ok:
+                raise RuntimeError('context lost')
+            return json.dumps({'id': 'w1', 'bubbles': self.bubbles})
+        if script is dm_common._DM_SEND_WATCH_AWAIT_JS:
+            self.calls.append(('await', json.loads(args[0])['id'], timeout))
+            return self.watch_outcome
+        self.calls.append('bubbles')
+        return json.dumps(self.bubbles)
+
+
+def _bubble(bubble_id, text):
+    return {'id': bubble_id, 'text': text}
+
 
 class DMSendConfirmationTests(unittest.TestCase):
     def test_text_send_should_not_be_treated_as_success_on_clear_only(self):
@@ -33,5 +66,60 @@ class DMSendConfirmationTests(unittest.TestCase):
         self.assertTrue(success)
 
 
+class DMSendWatchTests(unittest.TestCase):
+    def test_baseline_is_one_snapshot_and_watch_hit_needs_one_call(self):
+        tab = _FakeTab([_bubble('b1', '你好'), _bubble('b2', 'hello world')])
+        probes = ['hello world']
+        baseline = snapshot_dm_send_baseline(tab, probes)
+        self.assertEqual(tab.calls, ['arm'])
+        self.assertEqual((len(baseline['__bubbles']), baseline['__watch_id']), (2, 'w1'))
+        self.assertTrue(confirm_dm_message_sent(tab, baseline, probes, wait_sec=2.0))
+        self.assertEqual(tab.calls[1][:2], ('await', 'w1'))
+        self.assertEqual(len(tab.calls), 2)
+
+    def test_watch_miss_rechecks_once_and_lost_watch_falls_back_to_polling(self):
+        tab = _FakeTab([_bubble('b1', '旧消息')], watch_outcome='miss')
+        baseline = snapshot_dm_send_baseline(tab, ['新消息'])
+        tab.bubbles.append(_bubble('b2', '新消息'))
+        self.assertTrue(confirm_dm_message_sent(tab, baseline, ['新消息'], wait_sec=0.3))
+        self.assertEqual(tab.calls[-1], 'bubbles')
+
+        tab = _FakeTab([_bubble('b1', '旧消息')], arm_ok=False)
+        baseline = snapshot_dm_send_baseline(tab, ['新消息'])
+        self.assertNotIn('__watch_id', baseline)
+        self.assertFalse(confirm_dm_message_sent(tab, baseline, ['新消息'], wait_sec=0.25))
+        self.assertNotIn('await', [c[0] if isinstance(c, tuple) else c for c in tab.calls])
+
+
+class DMBubbleDiffTests(unittest.TestCase):
+    def test_rerendered_old_bubble_is_not_a_new_send(self):
+        before = [_bubble('b1', '你好'), _bubble('b2', '新品上架')]
+        # 同一条旧消息被虚拟列表重新挂载（新 id），但窗口内出现次数没有增加
+        after = [_bubble('b1', '你好'), _bubble('b3', '新品上架')]
+        self.assertEqual(diff_dm_bubbles(before, after), [_bubble('b3', '新品上架')])
+        self.assertFalse(dm_bubbles_advanced(before, after, ['新品上架'], limit=12))
+        after.append(_bubble('b4', '新品上架'))
+        self.assertTrue(dm_bubbles_advanced(before, after, ['新品上架'], limit=12))
+
+    def test_full_window_relies_on_new_bubble_ids(self):
+        before = [_bubble(f'b{i}', '同样的话术') for i in range(3)]
+        after = before[1:] + [_bubble('b9', '同样的话术')]
+        self.assertTrue(dm_bubbles_advanced(before, after, ['同样的话术'], limit=3))
+        self.assertFalse(dm_bubbles_advanced(before, list(before), ['同样的话术'], limit=3))
+        self.assertTrue(dm_bubbles_advanced(before, after[:-1] + [_bubble('b9', 'sent')], ['别的'], limit=3))
+
+    def test_full_window_rerendered_old_bubble_is_not_a_new_send(self):
+        before = [_bubble('b1', '你好'), _bubble('b2', '同样的话术'), _bubble('b3', '好的')]
+        # 窗口已满时中间的旧消息重挂载拿到新 id，不在发送前最后一个气泡之后
+        rerendered = [_bubble('b1', '你好'), _bubble('b7', '同样的话术'), _bubble('b3', '好的')]
+        self.assertFalse(dm_bubbles_advanced(before, rerendered, ['同样的话术'], limit=3))
+        # 最后一个气泡本身重挂载（锚点消失）也不算发送成功
+        before = [_bubble('b1', '你好'), _bubble('b2', '好的'), _bubble('b3', '同样的话术')]
+        rerendered = [_bubble('b1', '你好'), _bubble('b2', '好的'), _bubble('b8', '同样的话术')]
+        self.assertFalse(dm_bubbles_advanced(before, rerendered, ['同样的话术'], limit=3))
+        sent = [_bubble('b2', '好的'), _bubble('b3', '同样的话术'), _bubble('b9', '同样的话术')]
+        self.assertTrue(dm_bubbles_advanced(before, sent, ['同样的话术'], limit=3))
+
+
 if __name__ == '__main__':
     unittest.main()
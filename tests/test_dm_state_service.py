@@ -0,0 +1,97 @@
+import os
+import tempfile
+import threading
+import time
+import types
+import unittest
+
+from xmonitor.services.dm_common import normalize_handle
+from xmonitor.services.dm_state_service import (
+    clear_dm_unavailable_cache,
+    ensure_dm_handle_state_loaded,
+    extract_dm_conversation_url,
+    forget_dm_conversation_url,
+    is_dm_unavailable_cached,
+    lookup_dm_conversation_url,
+    mark_dm_unavailable,
+    persist_notify_dm_user_cooldown,
+    remember_dm_conversation_url,
+)
+
+
+def _make_state_deps(tmpdir):
+    return types.SimpleNamespace(
+        DATA_DIR=tmpdir,
+        SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'),
+        DM_HANDLE_STATE_PERSIST=True,
+        DM_UNAVAILABLE_CACHE_TTL_SEC=3600,
+        dm_unavailable_cache={},
+        dm_unavailable_cache_lock=threading.Lock(),
+        notify_dm_user_cooldown={},
+        notify_dm_user_cooldown_lock=threading.Lock(),
+        dm_handle_state_loaded=False,
+        dm_handle_state_load_lock=threading.Lock(),
+        normalize_handle=normalize_handle,
+        log_headless_debug=lambda msg: None,
+    )
+
+
+class DMHandleStatePersistenceTests(unittest.TestCase):
+    def test_unavailable_cache_survives_restart_until_cleared(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = _make_state_deps(tmpdir)
+            mark_dm_unavailable('@Closed', deps)
+            restarted = _make_state_deps(tmpdir)
+            self.assertTrue(is_dm_unavailable_cached('closed', restarted))
+            self.assertFalse(is_dm_unavailable_cached('other', restarted))
+            clear_dm_unavailable_cache('closed', restarted)
+            self.assertFalse(is_dm_unavailable_cached('closed', _make_state_deps(tmpdir)))
+
+    def test_cooldown_is_restored_lazily_and_expired_rows_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = _make_state_deps(tmpdir)
+            deps.notify_dm_user_cooldown['busy'] = {'until': time.time() + 60, 'task_key': 't1'}
+            deps.notify_dm_user_cooldown['done'] = {'until': time.time() - 1, 'task_key': 't0'}
+            persist_notify_dm_user_cooldown('busy', deps)
+            persist_notify_dm_user_cooldown('done', deps)
+            restarted = _make_state_deps(tmpdir)
+            self.assertEqual(restarted.notify_dm_user_cooldown, {})
+            ensure_dm_handle_state_loaded(restarted)
+            self.assertTrue(restarted.dm_handle_state_loaded)
+            self.assertEqual(set(restarted.notify_dm_user_cooldown), {'busy'})
+            self.assertEqual(restarted.notify_dm_user_cooldown['busy']['task_key'], 't1')
+
+
+class DMConversationCacheTests(unittest.TestCase):
+    def test_extract_only_accepts_concrete_conversations(self):
+        self.assertEqual(
+            extract_dm_conversation_url('https://x.com/messages/123-456?lang=zh'),
+            'https://x.com/messages/123-456',
+        )
+        self.assertEqual(extract_dm_conversation_url('https://x.com/i/chat/abc_1-2'), 'https://x.com/i/chat/abc_1-2')
+        self.assertEqual(extract_dm_conversation_url('https://x.com/messages/compose'), '')
+        self.assertEqual(extract_dm_conversation_url('https://x.com/messages'), '')
+        self.assertEqual(extract_dm_conversation_url('https://x.com/demo'), '')
+
+    def test_remember_lookup_forget_by_normalized_handle(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = types.SimpleNamespace(
+                DATA_DIR=tmpdir,
+                SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'),
+                DM_CONVERSATION_CACHE_ENABLED=True,
+                DM_CONVERSATION_CACHE_TTL_SEC=3600,
+                normalize_handle=normalize_handle,
+                log_headless_debug=lambda msg: None,
+            )
+            self.assertEqual(remember_dm_conversation_url('@Demo', 'https://x.com/Demo', deps), '')
+            self.assertEqual(remember_dm_conversation_url('@Demo', 'https://x.com/messages/1-2', deps), 'https://x.com/messages/1-2')
+            self.assertEqual(lookup_dm_conversation_url('demo', deps), 'https://x.com/messages/1-2')
+            deps.DM_CONVERSATION_CACHE_ENABLED = False
+            self.assertEqual(lookup_dm_conversation_url('demo', deps), '')
+            deps.DM_CONVERSATION_CACHE_ENABLED = True
+            forget_dm_conversation_url('@demo', deps)
+            self.assertEqual(lookup_dm_conversation_url('demo', deps), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
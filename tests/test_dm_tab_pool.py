@@ -0,0 +1,47 @@
+import threading
+import time
+import unittest
+
+from xmonitor.browser.dm_tab_pool import DmTabPool
+
+
+class DmTabPoolTests(unittest.TestCase):
+    def test_acquire_prefers_slot_that_served_same_handle(self):
+        pool = DmTabPool(2)
+        first = pool.acquire('alice')
+        second = pool.acquire('bob')
+        pool.release(second, 'bob')
+        pool.release(first, 'alice')
+        self.assertIs(pool.acquire('bob'), second)
+        self.assertIs(pool.acquire('carol'), first)
+        self.assertEqual(pool.busy_count(), 2)
+
+    def test_acquire_waits_for_release_and_times_out(self):
+        pool = DmTabPool(1)
+        slot = pool.acquire('alice')
+        self.assertIsNone(pool.acquire('bob', timeout=0.05))
+        threading.Timer(0.05, lambda: pool.release(slot, 'alice')).start()
+        started = time.time()
+        self.assertIs(pool.acquire('bob', timeout=2.0), slot)
+        self.assertLess(time.time() - started, 1.5)
+
+    def test_drain_blocks_new_acquire_and_waits_for_other_slots(self):
+        pool = DmTabPool(3)
+        own = pool.acquire('alice')
+        other = pool.acquire('bob')
+        self.assertFalse(pool.drain(keep=1, timeout=0.05))
+        self.assertIsNotNone(pool.acquire('carol', timeout=0.05))
+
+        pool = DmTabPool(3)
+        own = pool.acquire('alice')
+        other = pool.acquire('bob')
+        threading.Timer(0.05, lambda: pool.release(other, 'bob')).start()
+        self.assertTrue(pool.drain(keep=1, timeout=2.0))
+        self.assertIsNone(pool.acquire('carol', timeout=0.05))
+        pool.undrain()
+        self.assertIsNotNone(pool.acquire('carol', timeout=0.05))
+        pool.release(own, 'alice')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,3 @@
-import threading
 import types
 import unittest
 
@@ -6,8 +5,10 @@ from xmonitor.services.filter_service import (
     is_emoji_only_content,
     make_content_signature,
     normalize_content_for_filter,
+    should_skip_by_llm_filter_many,
     should_skip_duplicate_content,
 )
+from xmonitor.services.llm_breaker import LlmCircuitOpenError
 
 
 class FilterServiceTests(unittest.TestCase):
@@ -42,6 +43,35 @@ class FilterServiceTests(unittest.TestCase):
         self.assertTrue(should_skip_duplicate_content('@User', 'Hello world', deps, now_ts=now_ts + 10))
         self.assertFalse(should_skip_duplicate_content('@User', 'Hello world', deps, now_ts=now_ts + deps.CONTENT_DEDUPE_TTL_SEC + 1))
 
+    def test_llm_filter_many_sends_non_empty_contents_in_one_call(self):
+        deps = self._make_deps()
+        deps._llm_filter_is_ready = lambda: True
+        deps._normalize_content_for_filter = normalize_content_for_filter
+        deps.log_to_ui = lambda *args, **kwargs: None
+        calls = []
+
+        def filter_many(texts):
+            calls.append(list(texts))
+            return [(text == 'spam', 'spam' if text == 'spam' else 'normal') for text in texts]
+
+        deps._call_openai_compatible_filter_api_many = filter_many
+        self.assertEqual(
+            should_skip_by_llm_filter_many(['hello', 'spam', ''], deps),
+            [(False, 'normal'), (True, 'spam'), (False, '')],
+        )
+        self.assertEqual(calls, [['hello', 'spam']])
+
+    def test_llm_filter_many_falls_back_on_errors(self):
+        deps = self._make_deps()
+        deps._llm_filter_is_ready = lambda: True
+        deps._normalize_content_for_filter = normalize_content_for_filter
+        logs = []
+        deps.log_to_ui = lambda level, msg: logs.append(msg)
+        deps._call_openai_compatible_filter_api_many = lambda texts: [LlmCircuitOpenError('open'), RuntimeError('boom')]
+        self.assertEqual(should_skip_by_llm_filter_many(['a', 'b'], deps), [(False, ''), (False, '')])
+        self.assertEqual(len(logs), 1)
+        self.assertIn('1/2', logs[0])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import threading
+import types
+import unittest
+
+from xmonitor.services.intent_classifier import (
+    local_intent_verdict,
+    record_intent_training_sample,
+    retrain_local_intent_model,
+    train_intent_classifier,
+)
+from xmonitor.storage.storage_sqlite import save_structured_state
+
+
+_BUYER_TEXTS = ['多少钱', '怎么购买', '求报价', '能试用吗', '私有化部署怎么收费', '企业版价格多少', '想采购几台', '加微信聊聊价格']
+_NOISE_TEXTS = ['哈哈哈', '压力给到了', '笑死我了', '路过', '太搞笑了', '早上好啊', '转发一下', '这个梗绝了']
+
+
+_SUFFIXES = ('', '!', '!!', '?', '。', '～')
+
+
+def _variants(texts):
+    return [f'{text}{suffix}' for text in texts for suffix in _SUFFIXES]
+
+
+class IntentClassifierTests(unittest.TestCase):
+    def _make_deps(self, tmpdir):
+        deps = types.SimpleNamespace()
+        deps.DATA_DIR = tmpdir
+        deps.SQLITE_STATE_FILE = os.path.join(tmpdir, 'state.sqlite3')
+        deps.INTENT_LOCAL_MODEL_ENABLED = True
+        deps.INTENT_LOCAL_CONFIDENCE = 0.9
+        deps.INTENT_LOCAL_MIN_SAMPLES = 50
+        deps.INTENT_LOCAL_MIN_PRECISION = 0.9
+        deps.INTENT_LOCAL_MAX_SAMPLES = 5000
+        deps.INTENT_LOCAL_RETRAIN_EVERY = 10000
+        deps.local_intent_model = None
+        deps.local_intent_lock = threading.Lock()
+        deps.local_intent_new_samples = 0
+        deps.local_intent_training = False
+        deps.normalize_content_for_dedupe = lambda text: str(text or '').strip().lower()
+        deps._score_to_intent_level = lambda score: 'high' if score >= 75 else 'medium' if score >= 50 else 'low' if score >= 25 else 'noise'
+        deps.log_to_ui = lambda level, msg: None
+        return deps
+
+    def test_trained_model_is_confident_on_clear_cases(self):
+        samples = [(text, 1) for text in _variants(_BUYER_TEXTS)] + [(text, 0) for text in _variants(_NOISE_TEXTS)]
+        model, metrics = train_intent_classifier(samples, confidence=0.9, min_precision=0.9)
+        self.assertIsNotNone(model)
+        self.assertGreaterEqual(metrics['holdout_precision'], 0.9)
+        self.assertGreater(model.predict_proba('求报价多少钱'), 0.9)
+        self.assertLess(model.predict_proba('笑死我了哈哈哈'), 0.1)
+
+    def test_gate_rejects_model_without_signal(self):
+        rng = random.Random(3)
+        noisy = [(''.join(rng.choice('甲乙丙丁戊己庚辛') for _ in range(4)), rng.randint(0, 1)) for _ in range(200)]
+        model, metrics = train_intent_classifier(noisy, confidence=0.9, min_precision=0.95)
+        self.assertIsNone(model)
+        self.assertLess(metrics['holdout_precision'], 0.95)
+
+    def test_retrain_from_sqlite_history_and_uncertain_band_escalates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir)
+            pending = [{'key': f'p{idx}', 'content': text, 'intent_level': 'high', 'intent_llm_level': 'high', 'llm_used': True} for idx, text in enumerate(_variants(_BUYER_TEXTS))]
+            pending.append({'key': 'rule', 'content': '规则结果不参与训练', 'intent_level': 'high', 'llm_used': False})
+            save_structured_state(deps, pending, [], {})
+            for text in _variants(_NOISE_TEXTS):
+                record_intent_training_sample(text, {'intent_score': 5, 'intent_level': 'noise'}, deps)
+            self.assertIsNotNone(retrain_local_intent_model(deps))
+            verdict = local_intent_verdict('求报价多少钱', deps)
+            self.assertTrue(verdict['is_intent_user'])
+            self.assertIn(verdict['intent_level'], {'medium', 'high'})
+            self.assertFalse(local_intent_verdict('笑死我了哈哈哈', deps)['is_intent_user'])
+            self.assertIsNone(local_intent_verdict('天气', deps))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import types
+import unittest
+
+from xmonitor.runtime.intent_worker import (
+    apply_provisional_intent,
+    run_intent_upgrade,
+    submit_intent_upgrade,
+)
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+
+
+class _InlineExecutor:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+
+    def run_all(self):
+        for fn, args in self.jobs:
+            fn(*args)
+        self.jobs = []
+
+
+class IntentWorkerTests(unittest.TestCase):
+    def _make_deps(self, llm_ready=True):
+        deps = types.SimpleNamespace()
+        deps.LLM_FILTER_ENABLED = True
+        deps.LLM_FILTER_BASE_URL = 'http://llm'
+        deps.LLM_FILTER_API_KEY = 'k'
+        deps.LLM_FILTER_MODEL = 'm'
+        deps.LLM_FILTER_TIMEOUT_SEC = 5.0
+        deps.INTENT_WORKER_QUEUE_MAX = 1
+        deps.intent_worker_inflight = 0
+        deps.intent_worker_lock = threading.Lock()
+        deps.intent_executor = _InlineExecutor()
+        deps.data_lock = threading.Lock()
+        deps._llm_runtime_ready = lambda base_url=None, model=None: llm_ready
+        deps.llm_breaker = LlmCircuitBreaker()
+        deps._rule_only_intent_result = lambda content: {'intent_score': 20, 'intent_level': 'low', 'reason': 'rule_only', 'signals': []}
+        deps.analyze_comment_intent = lambda content, **kwargs: {'intent_score': 80, 'intent_level': 'high', 'is_intent_user': True, 'llm_used': True, 'reason': 'llm', 'signals': ['buy']}
+        deps._local_intent_verdict = lambda content: None
+        deps._should_notify_voice_by_intent = lambda analysis: analysis.get('intent_level') == 'high'
+        deps.events = []
+        deps.enqueue_new_data = deps.events.append
+        deps.saved = 0
+        deps.save_state = lambda: setattr(deps, 'saved', deps.saved + 1)
+        deps.log_to_ui = lambda level, msg: None
+        return deps
+
+    def test_provisional_then_upgraded_by_worker(self):
+        deps = self._make_deps()
+        item = {'key': 'k1', 'content': '多少钱'}
+        self.assertTrue(apply_provisional_intent(item, deps))
+        self.assertEqual(item['intent_reason'], 'rule_only')
+        self.assertTrue(item['intent_pending'])
+        self.assertTrue(submit_intent_upgrade(item, deps))
+        self.assertEqual(deps.intent_worker_inflight, 1)
+        deps.intent_executor.run_all()
+        self.assertEqual(item['intent_level'], 'high')
+        self.assertNotIn('intent_pending', item)
+        self.assertEqual(deps.intent_worker_inflight, 0)
+        self.assertTrue(deps.events[-1]['intent_upgrade'])
+        self.assertTrue(deps.events[-1]['voice_should_notify'])
+        self.assertEqual(deps.saved, 1)
+
+    def test_rule_only_without_llm_and_backlog_limit(self):
+        deps = self._make_deps(llm_ready=False)
+        item = {'key': 'k1', 'content': 'hi'}
+        self.assertFalse(apply_provisional_intent(item, deps))
+        self.assertNotIn('intent_pending', item)
+
+        deps = self._make_deps()
+        first = {'key': 'a', 'content': 'x', 'intent_pending': True}
+        second = {'key': 'b', 'content': 'y', 'intent_pending': True}
+        self.assertTrue(submit_intent_upgrade(first, deps))
+        self.assertFalse(submit_intent_upgrade(second, deps))
+        self.assertNotIn('intent_pending', second)
+        self.assertEqual(deps.events[-1]['key'], 'b')
+
+    def test_confident_local_model_skips_async_upgrade(self):
+        deps = self._make_deps()
+        deps._local_intent_verdict = lambda content: {'intent_score': 96, 'proba': 0.96}
+        deps.analyze_comment_intent = lambda content, **kwargs: {'intent_score': 96, 'intent_level': 'high', 'is_intent_user': True, 'local_model_used': True, 'reason': 'local_model p=0.96'}
+        item = {'key': 'k1', 'content': '多少钱怎么买'}
+        self.assertFalse(apply_provisional_intent(item, deps))
+        self.assertNotIn('intent_pending', item)
+        self.assertEqual(item['intent_level'], 'high')
+        self.assertEqual(deps.intent_executor.jobs, [])
+
+    def test_llm_failure_keeps_rule_result(self):
+        deps = self._make_deps()
+        deps.analyze_comment_intent = lambda content, **kwargs: (_ for _ in ()).throw(TimeoutError('slow'))
+        item = {'key': 'k1', 'content': 'x', 'intent_level': 'low', 'intent_pending': True}
+        deps.intent_worker_inflight = 1
+        self.assertIsNone(run_intent_upgrade(item, deps))
+        self.assertEqual(item['intent_level'], 'low')
+        self.assertEqual(deps.intent_worker_inflight, 0)
+        self.assertEqual(deps.saved, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from xmonitor.services.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_overlapping_hits_match_substring_semantics(self):
+        matcher = KeywordMatcher((
+            ('short', ('回复', 'ab')),
+            ('long', ('回复了你', 'abc', 'bcd')),
+        ))
+        hits = matcher.scan('XX 回复了你 abcd')
+        self.assertEqual(hits['short'], ['回复', 'ab'])
+        self.assertEqual(hits['long'], ['回复了你', 'abc', 'bcd'])
+        self.assertEqual(matcher.hit_families('只有回复'), {'short'})
+        self.assertEqual(matcher.hit_families(''), set())
+
+    def test_family_order_and_shared_keywords(self):
+        matcher = KeywordMatcher((
+            ('a', ('微信', '价格', '私聊')),
+            ('b', ('私聊', '微信')),
+            ('empty', ()),
+        ))
+        hits = matcher.scan('私聊问下价格，加微信')
+        self.assertEqual(hits['a'], ['微信', '价格', '私聊'])
+        self.assertEqual(hits['b'], ['私聊', '微信'])
+        self.assertEqual(hits['empty'], [])
+
+    def test_cached_matcher_rebuilds_when_keywords_change(self):
+        first = get_keyword_matcher((('x', ['foo']),))
+        self.assertIs(first, get_keyword_matcher((('x', ('foo',)),)))
+        second = get_keyword_matcher((('x', ['foo', 'bar']),))
+        self.assertIsNot(first, second)
+        self.assertEqual(second.hit_families('BAR'), {'x'})
+
+    def test_identity_cache_detects_in_place_mutation(self):
+        keywords = ['alpha']
+        first = get_keyword_matcher((('m', keywords),))
+        self.assertIs(first, get_keyword_matcher((('m', keywords),)))
+        keywords.append('beta')
+        second = get_keyword_matcher((('m', keywords),))
+        self.assertIsNot(first, second)
+        self.assertEqual(second.scan('beta')['m'], ['beta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
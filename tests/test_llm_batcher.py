@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+
+from xmonitor.services.llm_batcher import LlmMicroBatcher, batch_results_by_id
+
+
+class LlmMicroBatcherTests(unittest.TestCase):
+    def _submit_concurrently(self, batcher, items, run_batch_fn, run_single_fn):
+        """先占住一条在途的直通调用，使后续并发请求进入合并窗口。"""
+        results = {}
+        errors = {}
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocker(key, item):
+            started.set()
+            release.wait(5)
+            return 'blocker'
+
+        holder = threading.Thread(target=lambda: batcher.submit('k', '_hold', run_batch_fn=run_batch_fn, run_single_fn=blocker))
+        holder.start()
+        started.wait(5)
+
+        def worker(item):
+            try:
+                results[item] = batcher.submit('k', item, run_batch_fn=run_batch_fn, run_single_fn=run_single_fn)
+            except Exception as err:
+                errors[item] = err
+
+        threads = [threading.Thread(target=worker, args=(item,)) for item in items]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        release.set()
+        holder.join(5)
+        return results, errors
+
+    def test_burst_is_merged_into_one_batch_call(self):
+        batcher = LlmMicroBatcher(max_items=4, window_sec=1.0)
+        batch_calls = []
+
+        def run_batch(key, items):
+            batch_calls.append(list(items))
+            return [f'ok:{item}' for item in items]
+
+        results, errors = self._submit_concurrently(batcher, ['a', 'b', 'c', 'd'], run_batch, lambda key, item: self.fail('no single call expected'))
+        self.assertEqual(errors, {})
+        self.assertEqual(len(batch_calls), 1)
+        self.assertEqual(results, {item: f'ok:{item}' for item in 'abcd'})
+
+    def test_missing_items_fall_back_to_single_calls(self):
+        batcher = LlmMicroBatcher(max_items=3, window_sec=1.0)
+        singles = []
+
+        def run_single(key, item):
+            singles.append(item)
+            if item == 'z':
+                raise ValueError('boom')
+            return f'single:{item}'
+
+        results, errors = self._submit_concurrently(
+            batcher,
+            ['x', 'y', 'z'],
+            lambda key, items: [None if item != 'x' else 'batch:x' for item in items],
+            run_single,
+        )
+        self.assertEqual(results, {'x': 'batch:x', 'y': 'single:y'})
+        self.assertIsInstance(errors['z'], ValueError)
+        self.assertEqual(sorted(singles), ['y', 'z'])
+
+    def test_lone_caller_runs_immediately_without_window(self):
+        batcher = LlmMicroBatcher(max_items=4, window_sec=5.0)
+        started = time.monotonic()
+        values = [
+            batcher.submit('k', item, run_batch_fn=lambda key, items: self.fail('no batch expected'), run_single_fn=lambda key, item: f'single:{item}')
+            for item in 'abc'
+        ]
+        self.assertEqual(values, ['single:a', 'single:b', 'single:c'])
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(batcher.stats['direct_calls'], 3)
+        self.assertEqual(batcher.stats['batches'], 0)
+
+    def test_run_many_chunks_without_waiting(self):
+        batcher = LlmMicroBatcher(max_items=3, window_sec=5.0)
+        batch_calls = []
+
+        def run_batch(key, items):
+            batch_calls.append(list(items))
+            return [f'ok:{item}' for item in items]
+
+        outcomes = batcher.run_many('k', list('abcde'), run_batch_fn=run_batch, run_single_fn=lambda key, item: self.fail('no single expected'))
+        self.assertEqual(batch_calls, [['a', 'b', 'c'], ['d', 'e']])
+        self.assertEqual([value for _, value in outcomes], [f'ok:{item}' for item in 'abcde'])
+
+    def test_batch_results_by_id(self):
+        parsed = batch_results_by_id({'results': [{'id': 2, 'v': 'b'}, {'id': '1', 'v': 'a'}, {'id': 9}]}, 3)
+        self.assertEqual(parsed, [{'id': '1', 'v': 'a'}, {'id': 2, 'v': 'b'}, None])
+        self.assertEqual(batch_results_by_id({'skip': True}, 2), [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from xmonitor.services.llm_breaker import LlmCircuitBreaker, LlmCircuitOpenError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class LlmCircuitBreakerTests(unittest.TestCase):
+    def _make_breaker(self, clock):
+        return LlmCircuitBreaker(window_size=4, min_calls=4, error_rate_threshold=0.5, slow_p95_sec=5.0, open_sec=10.0, clock=clock)
+
+    def test_opens_on_error_rate_and_recovers_through_probe(self):
+        clock = _Clock()
+        breaker = self._make_breaker(clock)
+        for ok in (True, False, True, False):
+            breaker.before_call()
+            breaker.record(ok, 0.2)
+        self.assertTrue(breaker.rejecting())
+        with self.assertRaises(LlmCircuitOpenError):
+            breaker.before_call()
+        clock.now += 11
+        self.assertFalse(breaker.rejecting())
+        breaker.before_call()
+        self.assertTrue(breaker.rejecting())
+        with self.assertRaises(LlmCircuitOpenError):
+            breaker.before_call()
+        breaker.record(True, 0.3)
+        self.assertEqual(breaker.snapshot()['state'], 'closed')
+        breaker.before_call()
+
+    def test_failed_probe_doubles_cooldown(self):
+        clock = _Clock()
+        breaker = self._make_breaker(clock)
+        for _ in range(4):
+            breaker.record(False, 1.0)
+        clock.now += 11
+        breaker.before_call()
+        breaker.record(False, 1.0)
+        clock.now += 11
+        self.assertTrue(breaker.rejecting())
+        clock.now += 10
+        self.assertFalse(breaker.rejecting())
+
+    def test_opens_on_slow_p95_latency(self):
+        clock = _Clock()
+        breaker = self._make_breaker(clock)
+        for latency in (0.5, 6.0, 7.0, 0.4):
+            breaker.record(True, latency)
+        self.assertEqual(breaker.snapshot()['state'], 'open')
+        self.assertIn('p95', breaker.snapshot()['reason'])
+
+
+if __name__ == '__main__':
+    unittest.main()
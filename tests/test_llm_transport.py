@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+import types
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+from xmonitor.services.llm_client import call_openai_compatible_json, stream_openai_compatible_text
+from xmonitor.services.llm_transport import LlmTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])) or b'{}')
+        server = self.server
+        server.requests.append((self.path, payload, self.client_address[1]))
+        if payload.get('stream') and not server.openai_missing:
+            self._stream(['你', '好', '，世', '界'])
+        elif self.path == '/v1/chat/completions' and server.openai_missing:
+            self._reply(404, {'error': '404 page not found'})
+        elif self.path == '/v1/chat/completions' and 'response_format' in payload:
+            self._reply(400, {'error': 'response_format unsupported'})
+        elif self.path == '/api/chat':
+            self._reply(200, {'message': {'content': '{"ok": "ollama"}'}})
+        else:
+            self._reply(200, {'choices': [{'message': {'content': '{"ok": "openai"}'}}]})
+
+    def _stream(self, pieces):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        for piece in pieces:
+            chunk = {'choices': [{'delta': {'content': piece}}]}
+            self.wfile.write(f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(self.server.stream_delay)
+        self.wfile.write(b'data: [DONE]\n\n')
+
+    def _reply(self, status, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LlmTransportTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.requests = []
+        self.server.openai_missing = False
+        self.server.stream_delay = 0.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+        self.transport = LlmTransport()
+        self.env_patch = mock.patch.dict('os.environ', {'no_proxy': '*', 'NO_PROXY': '*'})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _make_deps(self):
+        return types.SimpleNamespace(
+            LLM_FILTER_BASE_URL=self.base_url,
+            LLM_FILTER_MODEL='m',
+            LLM_FILTER_API_KEY='',
+            LLM_FILTER_TIMEOUT_SEC=5.0,
+            clamp_llm_timeout=float,
+            _llm_filter_endpoint=lambda base_url=None: f'{self.base_url}/chat/completions',
+            llm_transport=self.transport,
+            llm_breaker=LlmCircuitBreaker(),
+        )
+
+    def test_connection_is_reused_and_http_errors_keep_urllib_semantics(self):
+        url = f'{self.base_url}/chat/completions'
+        self.transport.post_json(url, {'a': 1}, {'Content-Type': 'application/json'}, 5.0)
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.transport.post_json(url, {'response_format': {}}, {'Content-Type': 'application/json'}, 5.0)
+        self.assertEqual(ctx.exception.code, 400)
+        self.assertIn('unsupported', ctx.exception.read().decode('utf-8'))
+        self.assertEqual(len({port for _, _, port in self.server.requests}), 1)
+        self.assertEqual(self.transport.stats['opened'], 1)
+
+    def test_rejected_json_mode_is_skipped_on_later_calls(self):
+        deps = self._make_deps()
+        self.assertEqual(call_openai_compatible_json('s', 'u', deps)[0], {'ok': 'openai'})
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(call_openai_compatible_json('s', 'u', deps)[0], {'ok': 'openai'})
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertNotIn('response_format', self.server.requests[-1][1])
+
+    def test_ollama_flavour_is_remembered(self):
+        self.server.openai_missing = True
+        deps = self._make_deps()
+        self.assertEqual(call_openai_compatible_json('s', 'u', deps)[0], {'ok': 'ollama'})
+        seen = len(self.server.requests)
+        self.assertEqual(call_openai_compatible_json('s', 'u', deps)[0], {'ok': 'ollama'})
+        self.assertEqual([path for path, _, _ in self.server.requests[seen:]], ['/api/chat'])
+
+    def test_stream_stops_when_validator_aborts(self):
+        deps = self._make_deps()
+        seen = []
+
+        def on_delta(text):
+            seen.append(text)
+            return 'copy_phrase:你好' if '你好' in text else ''
+
+        text, reason = stream_openai_compatible_text('s', 'u', deps, on_delta=on_delta)
+        self.assertEqual((text, reason), ('你好', 'copy_phrase:你好'))
+        self.assertEqual(seen, ['你', '你好'])
+        self.assertEqual(stream_openai_compatible_text('s', 'u', deps), ('你好，世界', ''))
+
+    def test_stream_records_time_to_first_chunk_in_breaker(self):
+        self.server.stream_delay = 0.15
+        deps = self._make_deps()
+        with mock.patch.object(deps.llm_breaker, 'record', wraps=deps.llm_breaker.record) as record:
+            self.assertEqual(stream_openai_compatible_text('s', 'u', deps), ('你好，世界', ''))
+        ok, latency = record.call_args[0]
+        self.assertTrue(ok)
+        self.assertLess(latency, 0.3)
+
+    def test_stream_falls_back_when_endpoint_lacks_streaming(self):
+        self.server.openai_missing = True
+        deps = self._make_deps()
+        text, reason = stream_openai_compatible_text('s', 'u', deps, on_delta=lambda text: '')
+        self.assertEqual((text, reason), ('{"ok": "ollama"}', ''))
+        self.assertFalse(self.transport.profile(deps._llm_filter_endpoint())['stream'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+import types
+import unittest
+from unittest import mock
+
+from xmonitor.services.filter_service import normalize_content_for_dedupe
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+from xmonitor.services.llm_client import (
+    call_openai_compatible_filter_api,
+    call_openai_compatible_filter_api_many,
+    filter_verdict_cache_key,
+)
+from xmonitor.storage.llm_verdict_cache import (
+    LlmVerdictMemory,
+    llm_verdict_key,
+    lookup_llm_verdict,
+    prompt_fingerprint,
+    store_llm_verdict,
+)
+from xmonitor.storage.storage_sqlite import load_llm_verdict, prune_llm_verdicts, save_llm_verdict
+
+
+class LlmVerdictCacheTests(unittest.TestCase):
+    def _make_deps(self, tmpdir, persist=True):
+        return types.SimpleNamespace(
+            DATA_DIR=tmpdir,
+            SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'),
+            LLM_VERDICT_CACHE_TTL_SEC=3600,
+            LLM_VERDICT_CACHE_MAX_ROWS=1000,
+            LLM_VERDICT_PRUNE_EVERY=100,
+            LLM_VERDICT_CACHE_PERSIST=persist,
+            llm_verdict_memory=LlmVerdictMemory(100),
+            llm_verdict_lock=threading.Lock(),
+        )
+
+    def test_key_changes_with_model_and_prompt(self):
+        fp = prompt_fingerprint('filter', 'rules')
+        key = llm_verdict_key('filter', 'hello', 'm1', fp)
+        self.assertEqual(key, llm_verdict_key('filter', 'hello', 'm1', fp))
+        self.assertNotEqual(key, llm_verdict_key('filter', 'hello', 'm2', fp))
+        self.assertNotEqual(key, llm_verdict_key('filter', 'hello', 'm1', prompt_fingerprint('filter', 'rules v2')))
+        self.assertNotEqual(key, llm_verdict_key('intent', 'hello', 'm1', fp))
+        remote = llm_verdict_key('filter', 'hello', 'm1', fp, 'http://a.example/v1')
+        self.assertNotEqual(remote, llm_verdict_key('filter', 'hello', 'm1', fp, 'http://b.example/v1'))
+        self.assertEqual(remote, llm_verdict_key('filter', 'hello', 'm1', fp, 'http://A.example/v1/'))
+
+    def test_verdict_survives_restart_via_sqlite(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir)
+            store_llm_verdict(deps, 'k1', 'intent', {'intent_score': 80}, now_ts=1000.0)
+            restarted = self._make_deps(tmpdir)
+            self.assertEqual(lookup_llm_verdict(restarted, 'k1', now_ts=1100.0), {'intent_score': 80})
+            self.assertEqual(len(restarted.llm_verdict_memory), 1)
+            self.assertIsNone(lookup_llm_verdict(self._make_deps(tmpdir), 'k1', now_ts=1000.0 + 7200))
+
+    def test_prune_drops_expired_and_least_recently_hit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir)
+            save_llm_verdict(deps, 'old', 'filter', {'skip': True}, now_ts=0.0)
+            for idx in range(3):
+                save_llm_verdict(deps, f'k{idx}', 'filter', {'skip': False}, now_ts=5000.0 + idx)
+            load_llm_verdict(deps, 'k0', 3600, now_ts=5010.0)
+            self.assertEqual(prune_llm_verdicts(deps, 3600, 2, now_ts=5020.0), 2)
+            self.assertIsNotNone(load_llm_verdict(deps, 'k0', 3600, now_ts=5030.0))
+            self.assertIsNone(load_llm_verdict(deps, 'k1', 3600, now_ts=5030.0))
+            self.assertIsNotNone(load_llm_verdict(deps, 'k2', 3600, now_ts=5030.0))
+
+    def test_filter_api_reuses_cached_verdict(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir, persist=False)
+            deps.LLM_FILTER_MODEL = 'm'
+            deps.LLM_FILTER_BASE_URL = 'http://a.example/v1'
+            deps.LLM_FILTER_PROMPT_TEMPLATE = ''
+            deps.LLM_BATCH_MAX_ITEMS = 1
+            deps.normalize_content_for_dedupe = normalize_content_for_dedupe
+            store_llm_verdict(deps, filter_verdict_cache_key('Spam  SPAM', deps), 'filter', {'skip': True, 'reason': 'spam'})
+            self.assertEqual(call_openai_compatible_filter_api('spam spam', deps), (True, 'spam'))
+            deps.LLM_FILTER_BASE_URL = 'http://b.example/v1'
+            self.assertIsNone(lookup_llm_verdict(deps, filter_verdict_cache_key('spam spam', deps)))
+
+    def test_filter_api_many_shares_cache_with_single_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir, persist=False)
+            deps.LLM_FILTER_MODEL = 'm'
+            deps.LLM_FILTER_BASE_URL = 'http://a.example/v1'
+            deps.LLM_FILTER_PROMPT_TEMPLATE = 'custom {content}'
+            deps.LLM_BATCH_MAX_ITEMS = 1
+            deps.normalize_content_for_dedupe = normalize_content_for_dedupe
+            deps.llm_breaker = LlmCircuitBreaker()
+            store_llm_verdict(deps, filter_verdict_cache_key('cached', deps), 'filter', {'skip': True, 'reason': 'spam'})
+            calls = []
+
+            def single(content, _deps):
+                calls.append(content)
+                return False, 'normal'
+
+            with mock.patch('xmonitor.services.llm_client.call_openai_compatible_filter_single', side_effect=single):
+                self.assertEqual(
+                    call_openai_compatible_filter_api_many(['cached', 'fresh'], deps),
+                    [(True, 'spam'), (False, 'normal')],
+                )
+                self.assertEqual(call_openai_compatible_filter_api('fresh', deps), (False, 'normal'))
+            self.assertEqual(calls, ['fresh'])
+            self.assertEqual(deps.llm_verdict_memory.stats['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import types
+import unittest
+
+from xmonitor.services.notification_match import (
+    locate_reply_target_by_status,
+    match_notification_card_for_reply,
+    match_reply_target_article,
+)
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError('card scoring should not run when the locator hits')
+
+
+class ReplyTargetLocatorTests(unittest.TestCase):
+    def _make_page(self, located):
+        calls = []
+
+        def run_js(script, *args):
+            calls.append(args)
+            return located
+
+        return types.SimpleNamespace(run_js=run_js, eles=_fail), calls
+
+    def test_locator_skips_card_scoring(self):
+        article = object()
+        reply_btn = object()
+        page, calls = self._make_page([article, reply_btn])
+        result = match_notification_card_for_reply(
+            page,
+            '1890000000000000003',
+            '@bob',
+            'hi',
+            extract_notification_status_info_fn=_fail,
+            extract_notification_handle_fn=_fail,
+            extract_notification_content_fn=_fail,
+            normalize_handle_fn=_fail,
+            normalize_content_for_dedupe_fn=_fail,
+        )
+        self.assertEqual(result, (article, reply_btn, 280))
+        located, score = match_reply_target_article(
+            page,
+            '1890000000000000003',
+            '@bob',
+            'hi',
+            extract_status_ids_from_article_fn=_fail,
+            normalize_handle_fn=_fail,
+            normalize_content_for_dedupe_fn=_fail,
+        )
+        self.assertIs(located, article)
+        self.assertEqual(score, 230)
+        self.assertEqual(calls, [('1890000000000000003',), ('1890000000000000003',)])
+
+    def test_locator_ignores_missing_or_invalid_ids(self):
+        page, calls = self._make_page(None)
+        self.assertEqual(locate_reply_target_by_status(page, '1890000000000000003'), (None, None))
+        self.assertEqual(locate_reply_target_by_status(page, 'abc'), (None, None))
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,13 +28,9 @@ class NotificationTabRuntimeTests(unittest.TestCase):
         deps._schedule_next_notification_refresh_interval = lambda prev=None: 10.0
         deps.scan_notifications_page = lambda tab_obj, blocked, minutes: ([{'key': 'k1', 'handle': '@a', 'content': 'hello'}], None)
         deps.notification_disconnect_streak = 0
-        deps.LLM_FILTER_ENABLED = False
-        deps.LLM_FILTER_BASE_URL = ''
-        deps.LLM_FILTER_MODEL = ''
-        deps.LLM_FILTER_API_KEY = ''
-        deps.LLM_FILTER_TIMEOUT_SEC = 12.0
-        deps.analyze_comment_intent = lambda *args, **kwargs: {'intent_score': 0, 'intent_level': 'noise', 'is_intent_user': False, 'force_notify': False, 'llm_used': False, 'reason': '', 'signals': []}
-        deps._should_notify_voice_by_intent = lambda analysis: False
+        deps.apply_provisional_intent = lambda item: True
+        submitted = []
+        deps.submit_intent_upgrade = submitted.append
         deps.data_lock = threading.Lock()
         deps.history_ids = set()
         deps.should_skip_duplicate_content = lambda handle, content: False
@@ -45,6 +41,7 @@ class NotificationTabRuntimeTests(unittest.TestCase):
         self.assertEqual(scan_persistent_notification_tab([], deps), 1)
         self.assertEqual(len(deps.pending_results), 1)
         self.assertIn('k1', deps.history_ids)
+        self.assertEqual([item['key'] for item in submitted], ['k1'])
 
 
 if __name__ == '__main__':
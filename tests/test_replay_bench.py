@@ -0,0 +1,71 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import types
+import unittest
+
+import app
+from xmonitor.runtime.replay_bench import load_replay_corpus, main, replay_benchmark
+from xmonitor.storage.storage_sqlite import save_structured_state
+
+
+_CORPUS = [
+    {'content': '请问多少钱？', 'intent_level': 'high'},
+    {'content': '这个支持私有化吗？', 'intent_level': 'medium'},
+    {'content': '哈哈哈笑死', 'intent_level': 'noise'},
+    {'content': '互粉互关', 'intent_level': 'noise'},
+    {'content': '😂😂', 'intent_level': 'noise'},
+    {'body': '没有记录判定的评论'},
+]
+
+
+class ReplayBenchTests(unittest.TestCase):
+    def test_cold_then_warm_pass_against_stub_server(self):
+        items = load_replay_corpus_from(_CORPUS)
+        original_memory = app.llm_verdict_memory
+        reports = replay_benchmark(items, app, passes=2, workers=2)
+        cold, warm = reports
+        self.assertEqual(cold['items'], 6)
+        self.assertGreater(cold['llm_requests'], 0)
+        self.assertEqual(cold['emoji_only'], 1)
+        self.assertGreaterEqual(cold['skipped'], 2)
+        self.assertEqual(cold['agreement']['recorded'], 5)
+        self.assertEqual(cold['agreement']['intent'], 1.0)
+        self.assertEqual(warm['llm_requests'], 0)
+        self.assertEqual(warm['cache']['hit_rate'], 1.0)
+        self.assertIn('p99', warm['latency_ms']['intent'])
+        self.assertIs(app.llm_verdict_memory, original_memory)
+
+    def test_corpus_loaders_and_cli(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jsonl_path = os.path.join(tmpdir, 'corpus.jsonl')
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                for row in _CORPUS:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                f.write('not json\n')
+            self.assertEqual(len(load_replay_corpus(jsonl_path)), 6)
+            self.assertEqual(load_replay_corpus(jsonl_path, limit=2)[1]['intent_level'], 'medium')
+
+            deps = types.SimpleNamespace(DATA_DIR=tmpdir, SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'))
+            save_structured_state(deps, [{'key': 'a', 'content': '怎么买', 'intent_level': 'high', 'llm_used': True}, {'key': 'b', 'content': ''}], [], {})
+            self.assertEqual([item['content'] for item in load_replay_corpus(deps.SQLITE_STATE_FILE)], ['怎么买'])
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main([jsonl_path, '--passes', '1', '--stub-latency-ms', '0', '--json'])
+            self.assertEqual(code, 0)
+            self.assertEqual(json.loads(out.getvalue())[0]['items'], 6)
+
+
+def load_replay_corpus_from(rows):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'corpus.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        return load_replay_corpus(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import types
+import unittest
+
+from xmonitor.runtime.reply_jobs import (
+    NotifyReplyJobStore,
+    publish_notify_reply_progress,
+    submit_notify_reply_job,
+)
+
+
+class _DeferredExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn, args))
+
+
+class NotifyReplyJobTests(unittest.TestCase):
+    def _make_deps(self):
+        deps = types.SimpleNamespace()
+        deps.events = []
+        deps.publish_new_data_event = deps.events.append
+        deps.notify_reply_jobs = NotifyReplyJobStore()
+        deps.notify_reply_executor = _DeferredExecutor()
+        deps.log_to_ui = lambda level, msg: None
+        return deps
+
+    def test_same_key_reuses_active_job(self):
+        deps = self._make_deps()
+        target = {'key': 'n1', 'handle': '@a'}
+        first, created = submit_notify_reply_job(target, 'hi', '', 0, deps)
+        self.assertTrue(created)
+        second, created = submit_notify_reply_job(target, 'hi again', '', 0, deps)
+        self.assertFalse(created)
+        self.assertEqual(second['job_id'], first['job_id'])
+        self.assertEqual(len(deps.notify_reply_executor.calls), 1)
+        deps.notify_reply_jobs.update(first['job_id'], status='ok')
+        _, created = submit_notify_reply_job(target, 'hi', '', 0, deps)
+        self.assertTrue(created)
+
+    def test_progress_only_published_for_active_job(self):
+        deps = self._make_deps()
+        publish_notify_reply_progress('n1', 'dm_pending', deps)
+        self.assertEqual(deps.events, [])
+        job, _ = submit_notify_reply_job({'key': 'n1', 'handle': '@a'}, 'hi', '', 0, deps)
+        publish_notify_reply_progress('n1', 'dm_pending', deps)
+        self.assertEqual(deps.events[-1]['flow_stage'], 'dm_pending')
+        self.assertEqual(deps.events[-1]['job_id'], job['job_id'])
+        self.assertEqual(deps.notify_reply_jobs.get(job['job_id'])['flow_stage'], 'dm_pending')
+
+    def test_store_evicts_only_finished_jobs(self):
+        store = NotifyReplyJobStore(max_jobs=10)
+        for idx in range(12):
+            store.add_or_get_active(f'k{idx}', lambda idx=idx: {'job_id': f'j{idx}', 'key': f'k{idx}', 'status': 'queued'})
+        self.assertEqual(store.counts(), {'queued': 12})
+        store.update('j0', status='ok')
+        store.add_or_get_active('k12', lambda: {'job_id': 'j12', 'key': 'k12', 'status': 'queued'})
+        self.assertIsNone(store.get('j0'))
+        self.assertEqual(store.counts(), {'queued': 12})
+
+
+if __name__ == '__main__':
+    unittest.main()
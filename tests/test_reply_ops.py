@@ -0,0 +1,63 @@
+import types
+import unittest
+
+from xmonitor.services.reply_ops import open_status_page_target, status_page_candidate_urls
+
+
+class _FakeTab:
+    def __init__(self):
+        self.visited = []
+        self.wait = types.SimpleNamespace(ele_displayed=lambda selector, timeout=0: True)
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def run_js(self, script):
+        return None
+
+
+class ReplyOpsTests(unittest.TestCase):
+    def _make_deps(self, policy='always'):
+        deps = types.SimpleNamespace()
+        deps.REPLY_DIRECT_STATUS_PATH = True
+        deps.REPLY_STATUS_FALLBACK_POLICY = policy
+        deps.normalize_handle = lambda handle: str(handle or '').strip().lstrip('@').lower()
+        deps._get_status_link_from_item = lambda item: ''
+        deps._prepare_reply_prompt_guard = lambda tab, stage: None
+        deps._wait_document_ready = lambda tab, timeout=5.0: None
+        deps._reply_humanized_idle = lambda tab, low, high, stage: None
+        deps.log_to_ui = lambda level, msg: None
+        deps.log_headless_debug = lambda msg: None
+        reply_btn = types.SimpleNamespace(states=types.SimpleNamespace(is_displayed=True))
+        self.article = types.SimpleNamespace(ele=lambda selector, timeout=0: reply_btn)
+        deps._match_reply_target_article = lambda tab, status_id, handle, content: (self.article, 300)
+        return deps
+
+    def test_candidate_urls_prefer_scan_time_status_url(self):
+        deps = self._make_deps()
+        item = {'status_url': 'https://x.com/bob/status/123', 'status_handle': '@Bob'}
+        self.assertEqual(
+            status_page_candidate_urls(item, '123', deps),
+            ['https://x.com/bob/status/123', 'https://x.com/i/status/123'],
+        )
+
+    def test_direct_status_path_opens_status_url_and_matches(self):
+        deps = self._make_deps()
+        tab = _FakeTab()
+        item = {'status_url': 'https://x.com/bob/status/123', 'status_handle': 'bob', 'handle': '@bob'}
+        result = open_status_page_target(tab, item, '123', deps)
+        self.assertEqual(tab.visited, ['https://x.com/bob/status/123'])
+        self.assertIs(result[0], tab)
+        self.assertIs(result[1], self.article)
+        self.assertEqual(result[3], 300)
+
+    def test_direct_status_path_respects_fallback_policy(self):
+        deps = self._make_deps(policy='off')
+        tab = _FakeTab()
+        item = {'status_url': 'https://x.com/bob/status/123', 'status_handle': 'bob'}
+        self.assertIsNone(open_status_page_target(tab, item, '123', deps))
+        self.assertEqual(tab.visited, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import types
+import unittest
+
+from xmonitor.browser.reply_warm_tab import ReplyWarmTab
+from xmonitor.runtime.reply_jobs import NotifyReplyJobStore
+from xmonitor.services.reply_warm_service import schedule_reply_warm_preload
+
+
+class _RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append(args)
+
+
+class ReplyWarmTabTests(unittest.TestCase):
+    def test_claim_only_matching_fresh_target(self):
+        warm = ReplyWarmTab(max_age_sec=60)
+        warm.tab = object()
+        self.assertTrue(warm.begin_load('111', 'https://x.com/a/status/111', now_ts=0.0))
+        self.assertFalse(warm.begin_load('222', 'https://x.com/b/status/222', now_ts=0.0))
+        warm.finish_load('111', True, now_ts=100.0)
+        self.assertIsNone(warm.claim('222'))
+        self.assertIsNone(warm.claim('111', now_ts=200.0))
+        self.assertIs(warm.claim('111', now_ts=120.0), warm.tab)
+        self.assertFalse(warm.begin_load('222', 'https://x.com/b/status/222'))
+        warm.release()
+        self.assertTrue(warm.begin_load('222', 'https://x.com/b/status/222'))
+
+    def test_claim_waits_for_inflight_load_of_same_target(self):
+        warm = ReplyWarmTab()
+        warm.tab = object()
+        warm.begin_load('111', 'https://x.com/a/status/111')
+        threading.Timer(0.05, lambda: warm.finish_load('111', True)).start()
+        self.assertIs(warm.claim('111', timeout=2.0), warm.tab)
+
+    def test_schedule_preloads_next_pending_job_respecting_policy(self):
+        deps = types.SimpleNamespace()
+        deps.REPLY_WARM_TAB_ENABLED = True
+        deps.REPLY_STATUS_FALLBACK_POLICY = 'always'
+        deps.reply_warm_executor = _RecordingExecutor()
+        deps.notify_reply_jobs = NotifyReplyJobStore()
+        for key in ('n1', 'n2'):
+            deps.notify_reply_jobs.add_or_get_active(key, lambda key=key: {
+                'job_id': key, 'key': key, 'status': 'running', 'flow_stage': 'reply_pending', 'target': {'key': key},
+            })
+        self.assertTrue(schedule_reply_warm_preload('n1', deps))
+        self.assertEqual(deps.reply_warm_executor.calls[0][0], {'key': 'n2'})
+        deps.REPLY_STATUS_FALLBACK_POLICY = 'off'
+        self.assertFalse(schedule_reply_warm_preload('n1', deps))
+        deps.REPLY_STATUS_FALLBACK_POLICY = 'always'
+        deps.notify_reply_jobs.update('n2', flow_stage='dm_opening')
+        self.assertFalse(schedule_reply_warm_preload('n1', deps))
+
+
+if __name__ == '__main__':
+    unittest.main()
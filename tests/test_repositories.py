@@ -39,6 +39,22 @@ class RepositoryTests(unittest.TestCase):
         self.assertEqual(deps.pending_results[0]['notify_dm_text'], 'dm')
         self.assertTrue(deps.pending_results[0]['notify_dm_llm_used'])
 
+    def test_pending_results_repository_batch_update_notify(self):
+        deps = self._make_deps()
+        repo = PendingResultsRepository(deps)
+        rows = repo.update_notify_manual_replies(
+            [
+                {'key': 'n1', 'message': 'reply', 'dm_message': 'dm'},
+                {'key': 't1', 'message': 'x'},
+                {'key': 'missing', 'message': 'x'},
+            ],
+        )
+        self.assertEqual(list(rows), ['n1'])
+        self.assertEqual(rows['n1']['notify_reply_text'], 'reply')
+        self.assertEqual(rows['n1']['notify_flow_stage'], 'reply_pending')
+        self.assertEqual(deps.pending_results[0]['notify_dm_text'], 'dm')
+        self.assertNotIn('notify_reply_text', deps.pending_results[1])
+
     def test_processed_users_repository_clear(self):
         deps = self._make_deps()
         repo = ProcessedUsersRepository(deps)
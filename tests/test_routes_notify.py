@@ -4,12 +4,23 @@ import unittest
 
 from flask import Flask
 
+from xmonitor.runtime.reply_jobs import (
+    NotifyReplyJobStore,
+    mark_notify_reply_pending,
+    next_notify_reply_attempt,
+    submit_notify_reply_batch,
+    submit_notify_reply_job,
+)
 from xmonitor.web.routes_notify import register_notify_routes
 
 
 class FakePendingRepo:
     def __init__(self):
-        self.rows = [{'key': 'n1', 'source': '通知页面', 'handle': '@a', 'content': 'hello', 'notify_flow_attempt': 0}]
+        self.rows = [
+            {'key': 'n1', 'source': '通知页面', 'handle': '@a', 'content': 'hello', 'notify_flow_attempt': 0},
+            {'key': 'n2', 'source': '通知页面', 'handle': '@b', 'content': 'hey', 'notify_flow_attempt': 2},
+            {'key': 'n3', 'source': '通知页面', 'handle': '@b', 'content': 'again', 'notify_flow_attempt': 0},
+        ]
 
     def find_notify_by_key(self, key, copy_row=False):
         for idx, row in enumerate(self.rows):
@@ -28,6 +39,13 @@ class FakePendingRepo:
                 return True
         return False
 
+    def update_notify_manual_replies(self, entries, dm_llm_enabled=False):
+        updated = {}
+        for entry in entries:
+            if self.update_notify_manual_reply(entry['key'], entry['message'], entry['dm_message'], dm_llm_enabled):
+                updated[entry['key']] = dict(self.find_notify_by_key(entry['key'])[1])
+        return updated
+
 
 class FakeNotifyFacade:
     def __init__(self):
@@ -51,6 +69,11 @@ class FakeNotifyFacade:
         return (0, dict(row)) if row else (-1, None)
 
 
+class _InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
 class RoutesNotifyTests(unittest.TestCase):
     def _client(self, send_ok=True):
         deps = types.SimpleNamespace()
@@ -60,7 +83,11 @@ class RoutesNotifyTests(unittest.TestCase):
         deps.UNHANDLED_PROMPT_AUTO_RETRY = 0
         deps.headless_mode = True
         deps._check_reply_failure_budget = lambda handle: (True, '')
-        deps.save_state = lambda: None
+        deps.save_calls = []
+        deps.save_state = lambda: deps.save_calls.append(1)
+        deps.normalize_handle = lambda handle: str(handle or '').strip().lstrip('@').lower()
+        deps.dm_cooldowns = {}
+        deps._notify_dm_cooldown_remaining = lambda handle, task_key='': deps.dm_cooldowns.get(handle, 0.0)
         deps.log_to_ui = lambda level, msg: None
         deps._prepare_reply_prompt_guard = lambda tab, stage: None
         deps.ensure_reply_work_tab = lambda force_recreate=False: types.SimpleNamespace(url='https://x.com/notifications', get=lambda url: None)
@@ -70,6 +97,14 @@ class RoutesNotifyTests(unittest.TestCase):
         deps._split_flow_error = lambda err: ('E_ERR', str(err))
         deps._resolve_notify_resume_stage = lambda item: 'reply_pending'
         deps.send_notification_reply = (lambda item, message, dm_message='': (True, '')) if send_ok else (lambda item, message, dm_message='': (False, 'fail'))
+        deps.events = []
+        deps.publish_new_data_event = deps.events.append
+        deps.notify_reply_jobs = NotifyReplyJobStore()
+        deps.notify_reply_executor = _InlineExecutor()
+        deps.next_notify_reply_attempt = next_notify_reply_attempt
+        deps.mark_notify_reply_pending = lambda key, cur_attempt, save=True: mark_notify_reply_pending(key, cur_attempt, deps, save=save)
+        deps.submit_notify_reply_batch = lambda entries: submit_notify_reply_batch(entries, deps)
+        deps.submit_notify_reply_job = lambda target, message, dm_message, cur_attempt: submit_notify_reply_job(target, message, dm_message, cur_attempt, deps)
         app = Flask(__name__)
         register_notify_routes(app, deps)
         return app.test_client(), deps
@@ -82,9 +117,95 @@ class RoutesNotifyTests(unittest.TestCase):
     def test_notify_reply_success(self):
         client, deps = self._client(send_ok=True)
         resp = client.post('/api/notify_reply', json={'key': 'n1', 'message': 'hi', 'dm_message': 'dm'})
+        self.assertEqual(resp.status_code, 202)
+        body = resp.get_json()
+        self.assertEqual(body['status'], 'queued')
+        self.assertTrue(deps.notify_state_facade.marked)
+        self.assertEqual([e['job_status'] for e in deps.events], ['queued', 'running', 'ok'])
+        job = client.get(f"/api/notify_reply_job?id={body['job_id']}").get_json()
+        self.assertEqual(job['job_status'], 'ok')
+        self.assertEqual(job['result']['flow_stage'], 'done')
+
+    def test_notify_reply_wait_runs_as_registered_job(self):
+        client, deps = self._client(send_ok=True)
+        active_during_send = []
+        deps.send_notification_reply = lambda item, message, dm_message='': (
+            active_during_send.append(deps.notify_reply_jobs.active_for_key('n1')) or True, '')
+        deps.notify_reply_executor = types.SimpleNamespace(
+            submit=lambda fn, *args: threading.Thread(target=fn, args=args).start())
+        resp = client.post('/api/notify_reply', json={'key': 'n1', 'message': 'hi', 'wait': True})
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.get_json()['status'], 'ok')
-        self.assertTrue(deps.notify_state_facade.marked)
+        self.assertTrue(active_during_send[0])
+        self.assertEqual([e['job_status'] for e in deps.events], ['queued', 'running', 'ok'])
+
+    def test_notify_reply_wait_returns_failure_status(self):
+        client, _ = self._client(send_ok=False)
+        resp = client.post('/api/notify_reply', json={'key': 'n1', 'message': 'hi', 'wait': True})
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.get_json()['status'], 'retry_waiting')
+
+    def test_notify_reply_resubmit_returns_active_job_without_mutating_row(self):
+        client, deps = self._client(send_ok=True)
+        deps.notify_reply_executor = types.SimpleNamespace(submit=lambda fn, *args: None)
+        first = client.post('/api/notify_reply', json={'key': 'n2', 'message': 'first', 'dm_message': 'd1'}).get_json()
+        saves = len(deps.save_calls)
+        resp = client.post('/api/notify_reply', json={'key': 'n2', 'message': 'second', 'dm_message': 'd2'})
+        self.assertEqual(resp.status_code, 202)
+        body = resp.get_json()
+        self.assertTrue(body['duplicate'])
+        self.assertEqual(body['job_id'], first['job_id'])
+        self.assertEqual(body['attempt'], 3)
+        row = deps.pending_results_repo.find_notify_by_key('n2')[1]
+        self.assertEqual((row['notify_reply_text'], row['notify_dm_text']), ('first', 'd1'))
+        self.assertEqual(len(deps.save_calls), saves)
+        self.assertEqual(len(deps.notify_state_facade.updated), 1)
+
+    def test_notify_reply_batch_saves_once_and_queues_in_order(self):
+        client, deps = self._client(send_ok=True)
+        sent = []
+        deps.send_notification_reply = lambda item, message, dm_message='': (sent.append(item['key']) or True, '')
+        resp = client.post('/api/notify_reply/batch', json={'items': [
+            {'key': 'n2', 'message': 'r2', 'dm_message': 'd2'},
+            {'key': 'n1', 'message': 'r1', 'dm_message': 'd1'},
+            {'key': 'n3', 'message': 'r3', 'dm_message': 'd3'},
+            {'key': 'n1', 'message': 'dup'},
+            {'key': 'nope', 'message': 'x'},
+            {'key': 'n9'},
+        ]})
+        self.assertEqual(resp.status_code, 202)
+        body = resp.get_json()
+        self.assertEqual([job['key'] for job in body['queued']], ['n2', 'n1'])
+        self.assertEqual(body['queued'][0]['attempt'], 3)
+        self.assertEqual({item['key'] for item in body['rejected']}, {'n3', 'n1', 'nope', 'n9'})
+        self.assertEqual(sent, ['n2', 'n1'])
+        self.assertEqual(len(deps.save_calls), 1)
+        flow_saves = [kwargs.get('save') for _, kwargs in deps.notify_state_facade.updated]
+        self.assertEqual(flow_saves, [False, False])
+
+    def test_notify_reply_batch_rejects_keys_with_active_jobs(self):
+        client, deps = self._client(send_ok=True)
+        deps.notify_reply_executor = types.SimpleNamespace(submit=lambda fn, *args: None)
+        first = client.post('/api/notify_reply', json={'key': 'n1', 'message': 'first'}).get_json()
+        marks = len(deps.notify_state_facade.updated)
+        resp = client.post('/api/notify_reply/batch', json={'items': [
+            {'key': 'n1', 'message': 'second'},
+            {'key': 'n2', 'message': 'r2'},
+        ]})
+        self.assertEqual(resp.status_code, 202)
+        body = resp.get_json()
+        self.assertEqual([job['key'] for job in body['queued']], ['n2'])
+        self.assertEqual(body['rejected'][0]['job_id'], first['job_id'])
+        self.assertEqual(deps.pending_results_repo.find_notify_by_key('n1')[1]['notify_reply_text'], 'first')
+        self.assertEqual(len(deps.notify_state_facade.updated), marks + 1)
+
+    def test_notify_reply_batch_respects_dm_cooldown(self):
+        client, deps = self._client(send_ok=True)
+        deps.dm_cooldowns['@a'] = 30.0
+        resp = client.post('/api/notify_reply/batch', json={'items': [{'key': 'n1', 'message': 'r', 'dm_message': 'd'}]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('冷却', resp.get_json()['rejected'][0]['msg'])
+        self.assertFalse(deps.notify_state_facade.marked)
 
     def test_notify_retry_failure_schedules_retry(self):
         client, _ = self._client(send_ok=False)
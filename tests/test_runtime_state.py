@@ -20,7 +20,6 @@ class RuntimeStateTests(unittest.TestCase):
             notification_refresh_interval=12.5,
             notification_last_refresh_at=34.5,
             notification_empty_article_streak=2,
-            llm_filter_cache={'a': 1},
             dm_llm_rewrite_history=['x'],
             content_dedupe={'sig': 1.0},
             pending_results=[{'k': 1}],
@@ -164,6 +164,23 @@ class StateIOTests(unittest.TestCase):
             self.assertIn('legacy_hist', structured['history_ids'])
             self.assertIn('legacy_sig', structured['content_dedupe'])
 
+    def test_load_state_requeues_pending_intent_upgrades(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = self._make_deps(tmpdir)
+            deps.pending_results = [
+                {'key': 'notif_1', 'handle': '@demo', 'content': 'hello', 'source': '通知页面', 'intent_pending': True},
+                {'key': 'notif_2', 'handle': '@done', 'content': 'bye', 'source': '通知页面'},
+            ]
+            state_io.save_state(deps)
+
+            deps.pending_results = []
+            submitted = []
+            deps.submit_intent_upgrade = submitted.append
+            state_io.load_state(deps)
+
+            self.assertEqual([item['key'] for item in submitted], ['notif_1'])
+            self.assertIs(submitted[0], deps.pending_results[0])
+
 
 if __name__ == '__main__':
     unittest.main()
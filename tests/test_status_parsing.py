@@ -0,0 +1,84 @@
+import types
+import unittest
+
+from xmonitor.services.dm_common import pick_best_status_id
+from xmonitor.services.notification_extract import extract_notification_status_info, extract_status_from_href
+from xmonitor.services.notification_match import extract_status_ids_from_article
+from xmonitor.services.status_parsing import (
+    clear_card_status_links_cache,
+    parse_card_status_links,
+    parse_status_href,
+)
+
+
+CARD_HTML = (
+    '<article><div><a href="/alice" role="link">Alice</a>'
+    '<a href="/alice/status/1890000000000000001" dir="ltr">\n  <time datetime="2026-01-01T00:00:00Z">3m</time></a>'
+    '<a class="x" href="/i/web/status/1890000000000000002/analytics">stats</a>'
+    '<a href="/search?q=x&amp;conversation_id=1890000000000000003">c</a></div></article>'
+)
+
+
+class StatusParsingTests(unittest.TestCase):
+    def setUp(self):
+        clear_card_status_links_cache()
+
+    def test_parse_status_href_variants(self):
+        self.assertEqual(
+            parse_status_href('https://x.com/Bob/status/1890000000000000009', pick_best_status_id_fn=pick_best_status_id),
+            ('@Bob', '1890000000000000009'),
+        )
+        self.assertEqual(
+            parse_status_href('/i/status/1890000000000000009', pick_best_status_id_fn=pick_best_status_id),
+            (None, '1890000000000000009'),
+        )
+        self.assertEqual(parse_status_href('/home', pick_best_status_id_fn=pick_best_status_id), (None, None))
+        self.assertEqual(
+            extract_status_from_href('/web/status/1890000000000000008', pick_best_status_id_fn=pick_best_status_id),
+            (None, '1890000000000000008'),
+        )
+
+    def test_card_links_single_pass_and_cached(self):
+        calls = []
+
+        def counting_pick(*parts):
+            calls.append(parts)
+            return pick_best_status_id(*parts)
+
+        links = parse_card_status_links(CARD_HTML, pick_best_status_id_fn=counting_pick)
+        self.assertEqual(links, (
+            ('@alice', '1890000000000000001', True),
+            (None, '1890000000000000002', False),
+            (None, '1890000000000000003', False),
+        ))
+        first_calls = len(calls)
+        self.assertIs(parse_card_status_links(CARD_HTML, pick_best_status_id_fn=counting_pick), links)
+        self.assertEqual(len(calls), first_calls)
+
+    def test_article_helpers_use_card_html(self):
+        article = types.SimpleNamespace(html=CARD_HTML, eles=lambda *a, **k: self.fail('DOM links should not be scanned'))
+        info = extract_notification_status_info(
+            article,
+            extract_status_from_href_fn=lambda href: extract_status_from_href(href, pick_best_status_id_fn=pick_best_status_id),
+            pick_best_status_id_fn=pick_best_status_id,
+        )
+        self.assertEqual(info, ('@alice', '1890000000000000001'))
+        seen = []
+
+        def custom_href_fn(href):
+            seen.append(href)
+            return ('@custom', '1890000000000000009') if len(seen) == 2 else (None, None)
+
+        info = extract_notification_status_info(
+            article,
+            extract_status_from_href_fn=custom_href_fn,
+            pick_best_status_id_fn=pick_best_status_id,
+        )
+        self.assertEqual(info, ('@custom', '1890000000000000009'))
+        self.assertEqual(len(seen), 2)
+        ids = extract_status_ids_from_article(article, pick_best_status_id_fn=pick_best_status_id)
+        self.assertEqual(ids, {'1890000000000000001', '1890000000000000002', '1890000000000000003'})
+
+
+if __name__ == '__main__':
+    unittest.main()
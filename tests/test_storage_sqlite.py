@@ -4,13 +4,17 @@ import types
 import unittest
 
 from xmonitor.storage.storage_sqlite import (
+    delete_dm_conversation_url,
     has_blob,
     has_processed_users_table,
     has_structured_state,
     load_blob,
+    load_dm_conversation_url,
+    load_intent_training_samples,
     load_processed_users_set,
     load_structured_state,
     save_blob,
+    save_dm_conversation_url,
     save_processed_users_set,
     save_structured_state,
 )
@@ -49,6 +53,20 @@ class StorageSQLiteTests(unittest.TestCase):
             self.assertEqual(set(loaded['history_ids']), history_ids)
             self.assertEqual(loaded['content_dedupe'], content_dedupe)
 
+    def test_training_samples_from_pending_use_raw_llm_level(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = types.SimpleNamespace(
+                DATA_DIR=tmpdir,
+                SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'),
+            )
+            pending = [
+                {'key': 'a', 'content': '融合后升级', 'llm_used': True, 'intent_level': 'high', 'intent_llm_level': 'low'},
+                {'key': 'b', 'content': '旧条目', 'llm_used': True, 'intent_level': 'high'},
+                {'key': 'c', 'content': '想买', 'llm_used': True, 'intent_level': 'medium', 'intent_llm_level': 'medium'},
+            ]
+            save_structured_state(deps, pending, set(), {})
+            self.assertEqual(sorted(load_intent_training_samples(deps, 10)), [('想买', 1), ('融合后升级', 0)])
+
 
 
 
@@ -63,6 +81,19 @@ class StorageSQLiteTests(unittest.TestCase):
             self.assertTrue(has_processed_users_table(deps))
             self.assertEqual(load_processed_users_set(deps), ['@a', '@b'])
 
+    def test_dm_conversation_url_roundtrip_and_expiry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            deps = types.SimpleNamespace(
+                DATA_DIR=tmpdir,
+                SQLITE_STATE_FILE=os.path.join(tmpdir, 'state.sqlite3'),
+            )
+            self.assertEqual(load_dm_conversation_url(deps, 'demo', 3600), '')
+            save_dm_conversation_url(deps, 'demo', 'https://x.com/messages/1-2', now_ts=1000.0)
+            self.assertEqual(load_dm_conversation_url(deps, 'demo', 3600, now_ts=2000.0), 'https://x.com/messages/1-2')
+            self.assertEqual(load_dm_conversation_url(deps, 'demo', 3600, now_ts=9000.0), '')
+            delete_dm_conversation_url(deps, 'demo')
+            self.assertEqual(load_dm_conversation_url(deps, 'demo', 3600, now_ts=2000.0), '')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import types
+import unittest
+from unittest import mock
+
+from xmonitor.runtime.task_scheduler import (
+    pick_due_tasks,
+    prune_task_schedule,
+    record_task_scan_result,
+    seconds_until_next_task_due,
+)
+
+
+class TaskSchedulerTests(unittest.TestCase):
+    def _make_deps(self):
+        deps = types.SimpleNamespace()
+        deps.TASK_POLL_MIN_SEC = 30.0
+        deps.TASK_POLL_BASE_SEC = 120.0
+        deps.TASK_POLL_MAX_SEC = 1800.0
+        deps.TASK_POLL_BACKOFF_FACTOR = 2.0
+        deps.TASK_POLL_RATE_ALPHA = 0.5
+        deps.TASK_SUBMIT_JITTER_MIN_SEC = 0.1
+        deps.TASK_SUBMIT_JITTER_MAX_SEC = 0.5
+        deps.TASK_BATCH_GAP_MIN_SEC = 1.0
+        deps.TASK_BATCH_GAP_MAX_SEC = 1.0
+        deps.task_schedule_state = {}
+        deps.task_schedule_lock = threading.Lock()
+        return deps
+
+    def test_new_tasks_are_due_immediately(self):
+        deps = self._make_deps()
+        tasks = [{'url': 'https://x.com/a/status/1'}, {'url': 'https://x.com/b/status/2'}]
+        due = pick_due_tasks(tasks, deps, now_ts=1000.0)
+        self.assertEqual(len(due), 2)
+        self.assertLessEqual(seconds_until_next_task_due(tasks, deps, now_ts=1000.0), 0.5)
+
+    def test_hot_task_polled_sooner_than_cold_task(self):
+        deps = self._make_deps()
+        hot = {'url': 'https://x.com/hot/status/1'}
+        cold = {'url': 'https://x.com/cold/status/2'}
+        with mock.patch('random.uniform', side_effect=lambda low, high: (low + high) / 2):
+            hot_interval = record_task_scan_result(hot, 6, deps, now_ts=1000.0)
+            cold_first = record_task_scan_result(cold, 0, deps, now_ts=1000.0)
+            cold_second = record_task_scan_result(cold, 0, deps, now_ts=1000.0 + cold_first)
+        self.assertLess(hot_interval, cold_first)
+        self.assertGreater(cold_second, cold_first)
+        self.assertEqual(pick_due_tasks([hot, cold], deps, now_ts=1000.0 + hot_interval + 1), [hot])
+
+    def test_backoff_capped_and_prune(self):
+        deps = self._make_deps()
+        task = {'url': 'https://x.com/dead/status/3'}
+        interval = 0.0
+        for _ in range(20):
+            interval = record_task_scan_result(task, 0, deps, now_ts=1000.0)
+        self.assertLessEqual(interval, deps.TASK_POLL_MAX_SEC * 1.15 + deps.TASK_BATCH_GAP_MAX_SEC)
+        self.assertEqual(prune_task_schedule([], deps), 1)
+        self.assertEqual(deps.task_schedule_state, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from xmonitor.services.text_similarity import MinHashIndex, estimated_jaccard, longest_common_substring_len, minhash_signature
+
+
+def _reference_lcs(src, dst):
+    best = 0
+    dp = [0] * (len(dst) + 1)
+    for i in range(1, len(src) + 1):
+        prev = 0
+        for j in range(1, len(dst) + 1):
+            cur = dp[j]
+            dp[j] = prev + 1 if src[i - 1] == dst[j - 1] else 0
+            best = max(best, dp[j])
+            prev = cur
+    return best
+
+
+class TextSimilarityTests(unittest.TestCase):
+    def test_suffix_automaton_matches_dynamic_programming(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            src = ''.join(rng.choice('abc微信好') for _ in range(rng.randint(0, 40)))
+            dst = ''.join(rng.choice('abc微信好') for _ in range(rng.randint(0, 40)))
+            self.assertEqual(longest_common_substring_len(src, dst), _reference_lcs(src, dst))
+
+    def test_minhash_separates_near_duplicates_from_rewrites(self):
+        base = '新品已经上架了欢迎随时私信我了解详细的价格和使用方式我们提供一对一的安装指导服务'
+        near = base.replace('随时', '随时来')
+        other = '最近刚出的款式很受欢迎有兴趣可以直接找我聊聊具体配置以及售后保障都可以详细说明'
+        self.assertGreaterEqual(estimated_jaccard(minhash_signature(base), minhash_signature(near)), 0.6)
+        self.assertLess(estimated_jaccard(minhash_signature(base), minhash_signature(other)), 0.3)
+
+    def test_index_finds_near_duplicate_and_evicts_oldest(self):
+        base = '新品已经上架了欢迎随时私信我了解详细的价格和使用方式'
+        index = MinHashIndex(max_items=2)
+        index.add(minhash_signature(base))
+        index.add(minhash_signature('最近刚出的款式很受欢迎有兴趣可以直接找我聊聊'))
+        self.assertIsNotNone(index.best_similarity(minhash_signature(base.replace('随时', '随时来')), 0.6))
+        self.assertIsNone(index.best_similarity(minhash_signature('售后保障和安装指导都可以详细说明'), 0.6))
+        index.add(minhash_signature('第三条完全不同的改写内容用于挤掉最早的条目'))
+        self.assertIsNone(index.best_similarity(minhash_signature(base), 0.6))
+        self.assertEqual(len(index), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -135,6 +135,8 @@ def cleanup_global_browser(deps):
                 except Exception:
                     pass
                 deps._set_runtime_attr('reply_work_tab', None)
+        deps.dm_tab_pool.close_all()
+        deps.reply_warm_tab.close()
         with deps.dm_passcode_lock:
             deps.dm_passcode_warmed = False
         if deps.global_browser:
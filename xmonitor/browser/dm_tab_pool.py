@@ -0,0 +1,99 @@
+import threading
+import time
+
+
+class DmTabSlot:
+    """私信工作标签页槽位：tab 由 tab_lock 保护（创建/关闭），占用关系由所属 DmTabPool 管理。"""
+
+    def __init__(self, index):
+        self.index = int(index)
+        self.tab = None
+        self.tab_lock = threading.Lock()
+        self.busy = False
+        self.handle = ''
+        self.last_used_at = 0.0
+
+
+class DmTabPool:
+    """私信专用标签页池：每个标签页同一时间只服务一个私信任务，与回复/通知标签页互不抢占。
+
+    acquire 优先复用上次服务同一 handle 的空闲槽位（会话已打开），其次选最久未用的空闲槽位。
+    drain 期间暂停新的占用，供需要重启浏览器的私信任务等待其他槽位空闲。
+    """
+
+    def __init__(self, size=1):
+        self.slots = [DmTabSlot(idx) for idx in range(1, max(0, int(size)) + 1)]
+        self._cond = threading.Condition()
+        self._draining = False
+
+    @property
+    def size(self):
+        return len(self.slots)
+
+    def _pick_idle(self, handle):
+        idle = [slot for slot in self.slots if not slot.busy]
+        if not idle:
+            return None
+        for slot in idle:
+            if handle and slot.handle == handle:
+                return slot
+        return min(idle, key=lambda slot: slot.last_used_at)
+
+    def acquire(self, handle='', timeout=None):
+        """占用一个空闲槽位；timeout 内都被占用返回 None。"""
+        deadline = None if timeout is None else time.time() + max(0.0, float(timeout))
+        with self._cond:
+            while True:
+                slot = None if self._draining else self._pick_idle(handle)
+                if slot is not None:
+                    slot.busy = True
+                    return slot
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def release(self, slot, handle=''):
+        with self._cond:
+            slot.busy = False
+            slot.handle = str(handle or '')
+            slot.last_used_at = time.time()
+            self._cond.notify_all()
+
+    def busy_count(self):
+        with self._cond:
+            return sum(1 for slot in self.slots if slot.busy)
+
+    def drain(self, keep=1, timeout=None):
+        """暂停新的占用并等待占用中的槽位降到 keep 个（通常只剩调用方自己）。
+
+        成功返回 True，调用方用完后须调用 undrain()；超时则恢复放行并返回 False。
+        """
+        deadline = None if timeout is None else time.time() + max(0.0, float(timeout))
+        with self._cond:
+            self._draining = True
+            while sum(1 for slot in self.slots if slot.busy) > int(keep):
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    self._draining = False
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def undrain(self):
+        with self._cond:
+            self._draining = False
+            self._cond.notify_all()
+
+    def close_all(self):
+        """关闭所有槽位的标签页（浏览器清理时调用），槽位本身保留，下次使用时重建。"""
+        for slot in self.slots:
+            with slot.tab_lock:
+                if slot.tab is not None:
+                    try:
+                        slot.tab.close()
+                    except Exception:
+                        pass
+                    slot.tab = None
+                slot.handle = ''
@@ -0,0 +1,84 @@
+import threading
+import time
+
+
+class ReplyWarmTab:
+    """回复预热标签页：在后台预先打开下一条待回复目标的状态页，轮到该目标时直接在此页定位并回复。
+
+    状态 idle / loading / ready / in_use；tab 由 tab_lock 保护（创建/关闭），状态由内部条件变量保护。
+    """
+
+    def __init__(self, max_age_sec=180.0):
+        self.max_age_sec = max(1.0, float(max_age_sec))
+        self.tab = None
+        self.tab_lock = threading.Lock()
+        self.state = 'idle'
+        self.status_id = ''
+        self.url = ''
+        self.loaded_at = 0.0
+        self._cond = threading.Condition()
+
+    def _fresh(self, now_ts):
+        return (now_ts - self.loaded_at) <= self.max_age_sec
+
+    def begin_load(self, status_id, url, now_ts=None):
+        """登记一次预加载；标签页正在加载/使用中，或已就绪且为同一目标时返回 False。"""
+        status_id = str(status_id or '')
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._cond:
+            if self.state in ('loading', 'in_use'):
+                return False
+            if self.state == 'ready' and self.status_id == status_id and self._fresh(now_ts):
+                return False
+            self.state = 'loading'
+            self.status_id = status_id
+            self.url = str(url or '')
+            return True
+
+    def finish_load(self, status_id, ok, now_ts=None):
+        with self._cond:
+            if self.state == 'loading' and self.status_id == str(status_id or ''):
+                if ok:
+                    self.state = 'ready'
+                    self.loaded_at = time.time() if now_ts is None else now_ts
+                else:
+                    self.state = 'idle'
+                    self.status_id = ''
+                    self.url = ''
+            self._cond.notify_all()
+
+    def claim(self, status_id, timeout=0.0, now_ts=None):
+        """该目标已预热（或正在预热且 timeout 内完成）时占用并返回标签页，否则返回 None。"""
+        status_id = str(status_id or '')
+        if not status_id:
+            return None
+        deadline = time.time() + max(0.0, float(timeout))
+        with self._cond:
+            while self.state == 'loading' and self.status_id == status_id:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            now_ts = time.time() if now_ts is None else now_ts
+            if self.state != 'ready' or self.status_id != status_id or not self._fresh(now_ts) or self.tab is None:
+                return None
+            self.state = 'in_use'
+            return self.tab
+
+    def release(self):
+        with self._cond:
+            self.state = 'idle'
+            self.status_id = ''
+            self.url = ''
+            self._cond.notify_all()
+
+    def close(self):
+        """关闭预热标签页（浏览器清理时调用），下次预加载时重建。"""
+        with self.tab_lock:
+            if self.tab is not None:
+                try:
+                    self.tab.close()
+                except Exception:
+                    pass
+                self.tab = None
+        self.release()
@@ -42,3 +42,8 @@ DM_CONVERSATION_ROOT_SELECTORS = (
     'section[role="region"]',
 )
 
+DM_MESSAGE_BUBBLE_SELECTORS = (
+    '[data-testid="messageEntry"]',
+    '[data-testid="cellInnerDiv"]',
+)
+
@@ -15,3 +15,36 @@ def ensure_reply_work_tab(deps, force_recreate=False):
     )
     deps._set_runtime_attr('reply_work_tab', holder[0])
     return tab
+
+
+def ensure_dm_worker_tab(slot, deps, force_recreate=False):
+    """确保私信工作标签页槽位可用（同一槽位持续复用同一标签页）。"""
+    holder = [slot.tab]
+    tab = ensure_worker_tab(
+        current_tab=holder,
+        tab_lock_obj=slot.tab_lock,
+        browser_factory=deps.init_global_browser,
+        warmup_func=deps._warmup_dm_passcode_if_needed,
+        force_recreate=force_recreate,
+        create_log=lambda: deps.log_to_ui('debug', f'📨 已创建私信工作标签页#{slot.index}（将持续复用）'),
+    )
+    slot.tab = holder[0]
+    if force_recreate:
+        slot.handle = ''
+    return tab
+
+
+def ensure_reply_warm_tab(deps, force_recreate=False):
+    """确保回复预热标签页可用（持续复用，每次预加载只切换页面）。"""
+    warm = deps.reply_warm_tab
+    holder = [warm.tab]
+    tab = ensure_worker_tab(
+        current_tab=holder,
+        tab_lock_obj=warm.tab_lock,
+        browser_factory=deps.init_global_browser,
+        warmup_func=deps._warmup_dm_passcode_if_needed,
+        force_recreate=force_recreate,
+        create_log=lambda: deps.log_to_ui('debug', '🔥 已创建回复预热标签页（将持续复用）'),
+    )
+    warm.tab = holder[0]
+    return tab
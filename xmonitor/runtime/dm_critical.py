@@ -1,10 +1,20 @@
 import time
 
 
-def enter_dm_critical(deps, section='dm_send'):
-    """进入私信关键区，期间尽量避免通知页刷新/切换。"""
+def enter_dm_critical(deps, section='dm_send', worker_tab=False):
+    """进入私信关键区，期间尽量避免通知页刷新/切换。
+
+    worker_tab=True 表示私信在独立的私信工作标签页上执行：只登记占用（阻止浏览器维护），
+    不持有全局关键区锁，也不阻塞通知扫描；同一标签页的互斥由标签页池保证。
+    """
     if not deps.DM_CRITICAL_LOCK_ENABLED:
         return False
+    if worker_tab:
+        with deps.dm_critical_state_lock:
+            deps.dm_worker_critical_depth += 1
+            if deps.dm_worker_critical_depth == 1:
+                deps.dm_worker_critical_started_at = time.time()
+        return True
     deps.dm_critical_lock.acquire()
     with deps.dm_critical_state_lock:
         deps.dm_critical_depth += 1
@@ -13,10 +23,16 @@ def enter_dm_critical(deps, section='dm_send'):
     return True
 
 
-def leave_dm_critical(deps):
+def leave_dm_critical(deps, worker_tab=False):
     """退出私信关键区。"""
     if not deps.DM_CRITICAL_LOCK_ENABLED:
         return
+    if worker_tab:
+        with deps.dm_critical_state_lock:
+            deps.dm_worker_critical_depth = max(0, int(deps.dm_worker_critical_depth) - 1)
+            if deps.dm_worker_critical_depth == 0:
+                deps.dm_worker_critical_started_at = 0.0
+        return
     with deps.dm_critical_state_lock:
         deps.dm_critical_depth = max(0, int(deps.dm_critical_depth) - 1)
         if deps.dm_critical_depth == 0:
@@ -27,10 +43,15 @@ def leave_dm_critical(deps):
         pass
 
 
-def is_dm_critical_active(deps):
+def is_dm_critical_active(deps, include_worker_tabs=True):
+    """是否有私信关键区占用；include_worker_tabs=False 时只看共享标签页上的私信（通知扫描用）。"""
     with deps.dm_critical_state_lock:
         active = int(deps.dm_critical_depth) > 0
         started = float(deps.dm_critical_started_at or 0.0)
+        if include_worker_tabs and int(getattr(deps, 'dm_worker_critical_depth', 0)) > 0:
+            worker_started = float(getattr(deps, 'dm_worker_critical_started_at', 0.0) or 0.0)
+            started = worker_started if not active else min(started, worker_started)
+            active = True
     if not active:
         return False
     if started > 0 and (time.time() - started) > float(deps.DM_CRITICAL_MAX_HOLD_SEC):
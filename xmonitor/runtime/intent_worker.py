@@ -0,0 +1,90 @@
+def _llm_runtime_params(deps):
+    if not deps.LLM_FILTER_ENABLED:
+        return '', '', ''
+    return deps.LLM_FILTER_BASE_URL, deps.LLM_FILTER_API_KEY, deps.LLM_FILTER_MODEL
+
+
+def apply_intent_analysis(item, analysis, deps):
+    """把意向分析结果写回条目字段。"""
+    item['intent_score'] = int(analysis.get('intent_score', 0))
+    item['intent_level'] = str(analysis.get('intent_level', 'noise'))
+    item['is_intent_user'] = bool(analysis.get('is_intent_user', False))
+    item['force_notify'] = bool(analysis.get('force_notify', False))
+    item['llm_used'] = bool(analysis.get('llm_used', False))
+    # 保留与规则融合前的 LLM 原始判定，供本地意向模型作训练标签
+    item['intent_llm_level'] = str(analysis.get('llm_level', '') or '') if item['llm_used'] else ''
+    item['intent_reason'] = str(analysis.get('reason', '') or '')
+    item['intent_signals'] = list(analysis.get('signals', []))[:8]
+    item['voice_should_notify'] = bool(deps._should_notify_voice_by_intent(analysis))
+    return item
+
+
+def apply_provisional_intent(item, deps):
+    """入队前写入意向结果：本地模型有把握时直接给出最终结果；LLM 不可用或熔断中时给出规则结果；
+    否则先写 rule_only 临时结果并返回 True 等待异步升级。"""
+    base_url, api_key, model = _llm_runtime_params(deps)
+    content = item.get('content', '')
+    try:
+        if deps._local_intent_verdict(content) is not None:
+            apply_intent_analysis(item, deps.analyze_comment_intent(content, base_url=base_url, api_key=api_key, model=model), deps)
+            return False
+        llm_ready = bool(deps._llm_runtime_ready(base_url=base_url, model=model)) and not deps.llm_breaker.rejecting()
+        apply_intent_analysis(item, deps._rule_only_intent_result(content), deps)
+    except Exception as analyze_err:
+        deps.log_to_ui('warn', f'🤖 AI意向分析[notify_auto] 失败: {analyze_err}')
+        return False
+    if not llm_ready:
+        return False
+    item['intent_pending'] = True
+    return True
+
+
+def _finish_intent_upgrade(item, analysis, deps):
+    with deps.data_lock:
+        if analysis:
+            apply_intent_analysis(item, analysis, deps)
+        item.pop('intent_pending', None)
+        event = dict(item)
+    event['intent_upgrade'] = True
+    deps.enqueue_new_data(event)
+
+
+def run_intent_upgrade(item, deps):
+    """工作线程：调用 LLM 升级意向结果，完成后推送增量事件。"""
+    analysis = None
+    try:
+        base_url, api_key, model = _llm_runtime_params(deps)
+        analysis = deps.analyze_comment_intent(
+            item.get('content', ''),
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            timeout_sec=deps.LLM_FILTER_TIMEOUT_SEC,
+        )
+    except Exception as analyze_err:
+        deps.log_to_ui('warn', f'🤖 AI意向分析[notify_async] 失败，保留规则结果: {analyze_err}')
+    finally:
+        with deps.intent_worker_lock:
+            deps.intent_worker_inflight = max(0, int(deps.intent_worker_inflight) - 1)
+    _finish_intent_upgrade(item, analysis, deps)
+    if analysis and analysis.get('llm_used'):
+        deps.save_state()
+    return analysis
+
+
+def submit_intent_upgrade(item, deps):
+    """把条目交给意向分析线程池；积压超过上限时保留规则结果并立即结束等待。"""
+    with deps.intent_worker_lock:
+        accepted = int(deps.intent_worker_inflight) < int(deps.INTENT_WORKER_QUEUE_MAX)
+        if accepted:
+            deps.intent_worker_inflight = int(deps.intent_worker_inflight) + 1
+    if accepted:
+        try:
+            deps.intent_executor.submit(run_intent_upgrade, item, deps)
+            return True
+        except RuntimeError:
+            with deps.intent_worker_lock:
+                deps.intent_worker_inflight = max(0, int(deps.intent_worker_inflight) - 1)
+    deps.log_to_ui('warn', f'🤖 意向分析积压已满({deps.INTENT_WORKER_QUEUE_MAX})，本条保留规则结果')
+    _finish_intent_upgrade(item, None, deps)
+    return False
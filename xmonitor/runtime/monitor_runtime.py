@@ -1,4 +1,5 @@
 import concurrent.futures
+import math
 import random
 import threading
 import time
@@ -81,6 +82,10 @@ def monitoring_loop(deps):
             'info',
             f'🧭 行为随机化策略：任务并发{deps.TASK_PARALLEL_MIN}-{deps.TASK_PARALLEL_MAX}随机、提交抖动{deps.TASK_SUBMIT_JITTER_MIN_SEC}-{deps.TASK_SUBMIT_JITTER_MAX_SEC}s、标签页创建抖动{deps.TAB_OPEN_JITTER_MIN_SEC}-{deps.TAB_OPEN_JITTER_MAX_SEC}s',
         )
+        log_to_ui(
+            'info',
+            f'🗓️ 推文轮询策略：按任务捕获率自适应，热帖最快{int(deps.TASK_POLL_MIN_SEC)}s、基准{int(deps.TASK_POLL_BASE_SEC)}s、冷帖退避至{int(deps.TASK_POLL_MAX_SEC)}s',
+        )
 
         while is_active():
             current_tasks = deps.monitor_tasks_repo.snapshot()
@@ -95,7 +100,7 @@ def monitoring_loop(deps):
                     log_to_ui('debug', f'🔁 已自动处理到期重试任务: {retry_done} 条')
 
             if notify_enabled and is_active() and (current_time - last_notification_scan >= notification_interval):
-                if deps._is_dm_critical_active():
+                if deps._is_dm_critical_active(include_worker_tabs=False):
                     deps._maybe_log_dm_critical_skip()
                 else:
                     deps.ensure_notification_tab(blocked_users)
@@ -105,37 +110,44 @@ def monitoring_loop(deps):
                     log_to_ui('debug', f'📬 下次通知扫描间隔: {notification_interval:.1f}s')
 
             if current_tasks:
-                log_to_ui('info', '=' * 60)
-                log_to_ui('info', '🔄 开始推文扫描周期')
-                task_queue = list(current_tasks)
-                random.shuffle(task_queue)
-                parallel_limit = deps.get_random_task_parallel(len(task_queue))
-                log_to_ui('info', f'📊 推文监控: 共 {len(task_queue)} 个任务 (本轮并发≈{parallel_limit})')
-
-                for start_idx in range(0, len(task_queue), parallel_limit):
-                    if not is_active():
-                        break
-                    batch = task_queue[start_idx:start_idx + parallel_limit]
-                    batch_futures = []
-                    for i, task in enumerate(batch):
-                        future = deps.task_executor.submit(deps.scan_task_with_tab, task, blocked_users)
-                        batch_futures.append(future)
-                        if i < len(batch) - 1:
-                            time.sleep(random.uniform(deps.TASK_SUBMIT_JITTER_MIN_SEC, deps.TASK_SUBMIT_JITTER_MAX_SEC))
-
-                    for future in concurrent.futures.as_completed(batch_futures):
-                        try:
-                            future.result()
-                        except Exception as e:
-                            log_to_ui('error', f'任务执行错误: {e}')
-
-                    if start_idx + parallel_limit < len(task_queue):
-                        gap = random.uniform(deps.TASK_BATCH_GAP_MIN_SEC, deps.TASK_BATCH_GAP_MAX_SEC)
-                        log_to_ui('debug', f'⏱️ 批次间隔: {gap:.1f}s')
-                        time.sleep(gap)
-
-                rest = random.randint(20, 40)
-                log_to_ui('info', f'⏱️ 推文扫描结束，将在 {rest}s 后开始下一轮...')
+                deps.prune_task_schedule(current_tasks)
+                due_tasks = deps.pick_due_tasks(current_tasks)
+                if due_tasks:
+                    log_to_ui('info', '=' * 60)
+                    log_to_ui('info', '🔄 开始推文扫描周期')
+                    parallel_limit = deps.get_random_task_parallel(len(due_tasks))
+                    log_to_ui('info', f'📊 推文监控: 到期 {len(due_tasks)}/{len(current_tasks)} 个任务 (本轮并发≈{parallel_limit})')
+
+                    for start_idx in range(0, len(due_tasks), parallel_limit):
+                        if not is_active():
+                            break
+                        batch = due_tasks[start_idx:start_idx + parallel_limit]
+                        batch_futures = {}
+                        for i, task in enumerate(batch):
+                            future = deps.task_executor.submit(deps.scan_task_with_tab, task, blocked_users)
+                            batch_futures[future] = task
+                            if i < len(batch) - 1:
+                                time.sleep(random.uniform(deps.TASK_SUBMIT_JITTER_MIN_SEC, deps.TASK_SUBMIT_JITTER_MAX_SEC))
+
+                        for future in concurrent.futures.as_completed(batch_futures):
+                            task = batch_futures[future]
+                            captured = 0
+                            try:
+                                captured = future.result()
+                            except Exception as e:
+                                log_to_ui('error', f'任务执行错误: {e}')
+                            next_interval = deps.record_task_scan_result(task, captured)
+                            log_to_ui('debug', f"🗓️ 任务下次轮询 {next_interval:.0f}s 后 (本轮+{int(captured or 0)}): {task.get('url', '')}")
+
+                        if start_idx + parallel_limit < len(due_tasks):
+                            gap = random.uniform(deps.TASK_BATCH_GAP_MIN_SEC, deps.TASK_BATCH_GAP_MAX_SEC)
+                            log_to_ui('debug', f'⏱️ 批次间隔: {gap:.1f}s')
+                            time.sleep(gap)
+
+                wait_sec = deps.seconds_until_next_task_due(current_tasks)
+                rest = int(max(1, min(deps.TASK_POLL_IDLE_CHECK_SEC, math.ceil(wait_sec or 0.0))))
+                if due_tasks:
+                    log_to_ui('info', f'⏱️ 推文扫描结束，最早任务约 {int(wait_sec or 0)}s 后到期，先休息 {rest}s...')
 
                 for second in range(rest):
                     if not is_active():
@@ -145,7 +157,7 @@ def monitoring_loop(deps):
                         notify_enabled = bool(deps.notification_monitoring)
                     now_ts = time.time()
                     if notify_enabled and (now_ts - last_notification_scan >= notification_interval):
-                        if deps._is_dm_critical_active():
+                        if deps._is_dm_critical_active(include_worker_tabs=False):
                             deps._maybe_log_dm_critical_skip()
                         else:
                             deps.ensure_notification_tab(blocked_users)
@@ -163,7 +175,8 @@ def monitoring_loop(deps):
                         log_to_ui('info', f'⏳ 倒计时 {rest - second}s...')
                     time.sleep(1)
 
-                log_to_ui('info', '=' * 60)
+                if due_tasks:
+                    log_to_ui('info', '=' * 60)
             elif not notify_enabled:
                 log_to_ui('warn', '⏳ 无任务，等待中...')
                 time.sleep(5)
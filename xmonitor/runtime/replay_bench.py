@@ -0,0 +1,348 @@
+"""离线回放基准：把抓取到的 pending_results / JSONL 语料回放到规则 + LLM 意向/过滤流水线。
+
+LLM 请求打到本地 OpenAI 兼容桩服务（确定性判定 + 可配置延迟），报告吞吐、各阶段延迟分位、
+判定缓存命中率以及与已记录判定的一致率。
+
+用法: python -m xmonitor.runtime.replay_bench data/xmonitor_state.sqlite3 --passes 2 --workers 4
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from xmonitor.services.llm_breaker import LlmCircuitBreaker
+from xmonitor.services.llm_transport import LlmTransport
+from xmonitor.storage.llm_verdict_cache import LlmVerdictMemory
+from xmonitor.storage.storage_sqlite import load_structured_state as _load_structured_state
+
+
+INTENT_LEVELS = ('high', 'medium', 'low', 'noise')
+_CONTENT_FIELDS = ('content', 'text', 'body', 'title')
+_STUB_BUY_WORDS = ('多少钱', '价格', '报价', '购买', '怎么买', '试用', '部署', '采购', '微信', 'vx', '联系')
+_STUB_SKIP_WORDS = ('互粉', '互关', '抽奖', '返现', '领券')
+_BATCH_MARKER = '评论列表: '
+_SINGLE_MARKER = '评论内容: '
+
+
+# ---- corpus ----
+def _corpus_item(raw):
+    if isinstance(raw, str):
+        raw = {'content': raw}
+    if not isinstance(raw, dict):
+        return None
+    content = ''
+    for field in _CONTENT_FIELDS:
+        content = str(raw.get(field) or '').strip()
+        if content:
+            break
+    if not content:
+        return None
+    level = str(raw.get('intent_level') or '').strip().lower()
+    return {
+        'content': content,
+        'intent_level': level if level in INTENT_LEVELS else '',
+        'llm_used': bool(raw.get('llm_used', False)),
+    }
+
+
+def load_replay_corpus(path, limit=0):
+    """读取回放语料：SQLite 状态库（pending_results）、状态 JSON、JSON 数组或 JSONL（content/text/body/title 字段）。"""
+    lower = str(path).lower()
+    if lower.endswith(('.sqlite3', '.sqlite', '.db')):
+        deps = types.SimpleNamespace(SQLITE_STATE_FILE=str(path), DATA_DIR=os.path.dirname(os.path.abspath(path)))
+        state = _load_structured_state(deps) or {}
+        raw_items = state.get('pending_results', [])
+    elif lower.endswith('.jsonl'):
+        raw_items = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    raw_items.append(json.loads(line))
+                except Exception:
+                    continue
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        raw_items = data.get('pending_results', []) if isinstance(data, dict) else data
+    items = [item for item in (_corpus_item(raw) for raw in list(raw_items or [])) if item]
+    return items[:limit] if limit and limit > 0 else items
+
+
+# ---- stub LLM server ----
+def stub_intent_verdict(text):
+    """桩服务的确定性意向判定：购买词 -> high，问句 -> medium，其余 low。"""
+    lower = str(text or '').lower()
+    if any(word in lower for word in _STUB_BUY_WORDS):
+        return {'intent_score': 82, 'intent_level': 'high', 'is_intent_user': True, 'force_notify': True, 'buying_signals': ['stub_buy_word'], 'reason': 'stub'}
+    if '?' in lower or '？' in lower:
+        return {'intent_score': 56, 'intent_level': 'medium', 'is_intent_user': True, 'force_notify': False, 'buying_signals': [], 'reason': 'stub'}
+    return {'intent_score': 20, 'intent_level': 'low', 'is_intent_user': False, 'force_notify': False, 'buying_signals': [], 'reason': 'stub'}
+
+
+def stub_filter_verdict(text):
+    skip = any(word in str(text or '') for word in _STUB_SKIP_WORDS)
+    return {'skip': skip, 'reason': 'stub_spam' if skip else ''}
+
+
+def _stub_answer(user_prompt):
+    """按 prompt 形态给出单条或批量（{"results": [...]}）判定。"""
+    verdict_fn = stub_intent_verdict if 'intent_score: 0-100' in user_prompt else stub_filter_verdict
+    if _BATCH_MARKER in user_prompt:
+        raw = user_prompt.split(_BATCH_MARKER, 1)[1]
+        try:
+            items = json.loads(raw)
+        except Exception:
+            items = []
+        return {'results': [dict(verdict_fn(item.get('text', '')), id=item.get('id')) for item in items if isinstance(item, dict)]}
+    content = user_prompt.rsplit(_SINGLE_MARKER, 1)[-1] if _SINGLE_MARKER in user_prompt else user_prompt
+    return verdict_fn(content)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        messages = payload.get('messages') or []
+        user_prompt = str(messages[-1].get('content', '')) if messages else ''
+        answer = _stub_answer(user_prompt)
+        server = self.server
+        with server.lock:
+            server.stats['requests'] += 1
+            server.stats['items'] += len(answer['results']) if 'results' in answer else 1
+        if server.latency_sec > 0:
+            time.sleep(server.latency_sec)
+        body = json.dumps({'choices': [{'message': {'content': json.dumps(answer, ensure_ascii=False)}}]}, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubLlmServer:
+    """本地 OpenAI 兼容桩服务（/v1/chat/completions），记录请求数与判定条数。"""
+
+    def __init__(self, latency_sec=0.0):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self._server.latency_sec = max(0.0, float(latency_sec))
+        self._server.lock = threading.Lock()
+        self._server.stats = {'requests': 0, 'items': 0}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}/v1'
+
+    @property
+    def stats(self):
+        with self._server.lock:
+            return dict(self._server.stats)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='replay-stub-llm', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ---- replay ----
+@contextlib.contextmanager
+def replay_environment(deps, base_url, data_dir, hard_filter=True):
+    """临时把 deps 指向桩服务与独立的状态库，并换上空缓存/新熔断器；退出时恢复原值。"""
+    overrides = {
+        'LLM_FILTER_ENABLED': True,
+        'LLM_FILTER_BASE_URL': base_url,
+        'LLM_FILTER_API_KEY': 'EMPTY',
+        'LLM_FILTER_MODEL': 'replay-stub',
+        'LLM_FILTER_PROMPT_TEMPLATE': '',
+        'LLM_INTENT_PROMPT_TEMPLATE': '',
+        'LLM_HARD_FILTER_ENABLED': bool(hard_filter),
+        'SQLITE_STATE_FILE': os.path.join(data_dir, 'replay_state.sqlite3'),
+        'llm_verdict_memory': LlmVerdictMemory(max(1, int(deps.LLM_FILTER_CACHE_MAX_ENTRIES))),
+        'llm_transport': LlmTransport(),
+        'llm_breaker': LlmCircuitBreaker(),
+        'local_intent_model': None,
+        'INTENT_LOCAL_MODEL_ENABLED': False,
+        'log_to_ui': lambda level, msg: None,
+    }
+    saved = {name: getattr(deps, name) for name in overrides if hasattr(deps, name)}
+    for name, value in overrides.items():
+        setattr(deps, name, value)
+    try:
+        yield deps
+    finally:
+        deps.llm_transport.close()
+        for name in overrides:
+            if name in saved:
+                setattr(deps, name, saved[name])
+            else:
+                delattr(deps, name)
+
+
+def _percentiles(values_ms):
+    ordered = sorted(values_ms)
+    if not ordered:
+        return {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': round(ordered[-1], 3)}
+
+
+def _replay_item(item, deps):
+    content = item['content']
+    t0 = time.perf_counter()
+    emoji_only = bool(deps._is_emoji_only_content(content))
+    t1 = time.perf_counter()
+    skip, skip_reason = deps.should_skip_content_by_policy(content)
+    t2 = time.perf_counter()
+    analysis = deps.analyze_comment_intent(
+        content,
+        base_url=deps.LLM_FILTER_BASE_URL,
+        api_key=deps.LLM_FILTER_API_KEY,
+        model=deps.LLM_FILTER_MODEL,
+        timeout_sec=deps.LLM_FILTER_TIMEOUT_SEC,
+    )
+    t3 = time.perf_counter()
+    return {
+        'emoji_only': emoji_only,
+        'skip': bool(skip),
+        'skip_reason': skip_reason,
+        'intent_level': str(analysis.get('intent_level', '') or ''),
+        'llm_used': bool(analysis.get('llm_used', False)),
+        'timings_ms': {
+            'emoji': (t1 - t0) * 1000.0,
+            'policy': (t2 - t1) * 1000.0,
+            'intent': (t3 - t2) * 1000.0,
+            'total': (t3 - t0) * 1000.0,
+        },
+    }
+
+
+def run_replay(items, deps, workers=1):
+    """回放一遍语料并返回报告 dict；workers>1 时并发提交，可触发微批合并。"""
+    items = list(items)
+    memory_before = dict(deps.llm_verdict_memory.stats)
+    started = time.perf_counter()
+    if workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='replay') as pool:
+            results = list(pool.map(lambda item: _replay_item(item, deps), items))
+    else:
+        results = [_replay_item(item, deps) for item in items]
+    elapsed = time.perf_counter() - started
+    memory_after = deps.llm_verdict_memory.stats
+    cache = {key: int(memory_after.get(key, 0)) - int(memory_before.get(key, 0)) for key in ('memory_hits', 'disk_hits', 'misses')}
+    lookups = sum(cache.values())
+    cache['hit_rate'] = round((cache['memory_hits'] + cache['disk_hits']) / float(lookups), 4) if lookups else 0.0
+    level_matches = 0
+    bucket_matches = 0
+    recorded = 0
+    for item, result in zip(items, results):
+        expected = item.get('intent_level')
+        if not expected:
+            continue
+        recorded += 1
+        level_matches += int(result['intent_level'] == expected)
+        bucket_matches += int((result['intent_level'] in {'high', 'medium'}) == (expected in {'high', 'medium'}))
+    return {
+        'items': len(items),
+        'elapsed_sec': round(elapsed, 4),
+        'items_per_sec': round(len(items) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': {stage: _percentiles([r['timings_ms'][stage] for r in results]) for stage in ('emoji', 'policy', 'intent', 'total')},
+        'cache': cache,
+        'skipped': sum(1 for r in results if r['skip']),
+        'emoji_only': sum(1 for r in results if r['emoji_only']),
+        'llm_used': sum(1 for r in results if r['llm_used']),
+        'agreement': {
+            'recorded': recorded,
+            'level': round(level_matches / float(recorded), 4) if recorded else None,
+            'intent': round(bucket_matches / float(recorded), 4) if recorded else None,
+        },
+    }
+
+
+def replay_benchmark(items, deps, passes=2, workers=1, stub_latency_sec=0.0, hard_filter=True):
+    """起桩服务 + 独立状态库回放 passes 遍（首遍冷缓存，之后热缓存），返回每遍报告列表。"""
+    reports = []
+    with tempfile.TemporaryDirectory(prefix='xmonitor-replay-') as data_dir:
+        with StubLlmServer(latency_sec=stub_latency_sec) as stub:
+            with replay_environment(deps, stub.base_url, data_dir, hard_filter=hard_filter):
+                for pass_idx in range(max(1, int(passes))):
+                    before = stub.stats
+                    report = run_replay(items, deps, workers=workers)
+                    after = stub.stats
+                    report['pass'] = pass_idx + 1
+                    report['llm_requests'] = after['requests'] - before['requests']
+                    report['llm_items'] = after['items'] - before['items']
+                    reports.append(report)
+    return reports
+
+
+def format_report(report):
+    lat = report['latency_ms']
+    agreement = report['agreement']
+    lines = [
+        f"▶ pass {report.get('pass', 1)}: {report['items']} 条, {report['items_per_sec']} 条/秒, 耗时 {report['elapsed_sec']}s",
+        '  延迟(ms) ' + ' | '.join(f"{stage} p50={lat[stage]['p50']} p90={lat[stage]['p90']} p99={lat[stage]['p99']}" for stage in ('emoji', 'policy', 'intent', 'total')),
+        f"  缓存命中率 {report['cache']['hit_rate']:.1%} (内存 {report['cache']['memory_hits']} / SQLite {report['cache']['disk_hits']} / 未命中 {report['cache']['misses']}), "
+        f"LLM 请求 {report.get('llm_requests', '-')} 次 / {report.get('llm_items', '-')} 条",
+        f"  过滤 {report['skipped']} 条 (纯表情 {report['emoji_only']}), LLM 参与 {report['llm_used']} 条",
+    ]
+    if agreement['recorded']:
+        lines.append(f"  与记录判定一致率: level {agreement['level']:.1%}, 有/无意向 {agreement['intent']:.1%} (样本 {agreement['recorded']})")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='离线回放基准：规则 + LLM 意向/过滤流水线')
+    parser.add_argument('corpus', help='SQLite 状态库、状态 JSON 或 JSONL 语料')
+    parser.add_argument('--limit', type=int, default=0, help='最多回放条数（0 为全部）')
+    parser.add_argument('--passes', type=int, default=2, help='回放遍数，首遍冷缓存')
+    parser.add_argument('--workers', type=int, default=1, help='并发线程数')
+    parser.add_argument('--stub-latency-ms', type=float, default=200.0, help='桩服务每次请求的模拟延迟')
+    parser.add_argument('--no-hard-filter', action='store_true', help='不走 LLM 硬过滤')
+    parser.add_argument('--json', action='store_true', help='输出 JSON 报告')
+    args = parser.parse_args(argv)
+
+    items = load_replay_corpus(args.corpus, limit=args.limit)
+    if not items:
+        print(f'❌ 语料为空: {args.corpus}', file=sys.stderr)
+        return 1
+    import app as deps
+
+    reports = replay_benchmark(
+        items,
+        deps,
+        passes=args.passes,
+        workers=max(1, args.workers),
+        stub_latency_sec=max(0.0, args.stub_latency_ms) / 1000.0,
+        hard_filter=not args.no_hard_filter,
+    )
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            print(format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,357 @@
+import datetime
+import random
+import threading
+import time
+import uuid
+
+
+NOTIFY_REPLY_JOB_ACTIVE = frozenset({'queued', 'running'})
+NOTIFY_REPLY_JOB_KEEP = 500
+NOTIFY_REPLY_BATCH_MAX = 200
+
+
+def next_notify_reply_attempt(target):
+    try:
+        base_attempt = int(target.get('notify_flow_attempt', 0) or 0)
+    except Exception:
+        base_attempt = 0
+    return max(1, base_attempt + 1)
+
+
+def mark_notify_reply_pending(key, cur_attempt, deps, save=True):
+    """手动回复开始前把通知流程重置为 reply_pending（清空错误、重试时间与旧分享链接）。"""
+    return deps.notify_state_facade.update_flow_state(
+        key,
+        stage='reply_pending',
+        attempt=cur_attempt,
+        error='',
+        retry_at=0,
+        extra={
+            'notify_resume_stage': 'reply_pending',
+            'notify_retry_reason': 'manual_notify_reply_execute',
+            'notify_share_link': '',
+        },
+        save=save,
+    )
+
+
+def execute_notify_reply(target, message, dm_message, cur_attempt, deps):
+    """执行一次通知回复（含未处理提示框的自动恢复重试），写回流程状态，返回 (payload, http_status)。"""
+    key = str(target.get('key', '') or '').strip()
+    target_handle = target.get('handle', '')
+    max_attempts = 1 + (max(0, int(deps.UNHANDLED_PROMPT_AUTO_RETRY)) if deps.headless_mode else 0)
+    ok, err = False, '通知回复失败'
+    for attempt in range(1, max_attempts + 1):
+        ok, err = deps.send_notification_reply(target, message, dm_message=dm_message)
+        if ok:
+            break
+        if deps._is_unhandled_prompt_error(err) and attempt < max_attempts:
+            remaining = max_attempts - attempt
+            deps.log_to_ui('warn', f'⚠️ 检测到未处理提示框，自动恢复后重试（剩余{remaining}次）')
+            try:
+                recover_tab = deps.ensure_reply_work_tab(force_recreate=(attempt >= 2))
+                deps._prepare_reply_prompt_guard(recover_tab, f'自动恢复重试{attempt}')
+                try:
+                    now_url = str(recover_tab.url or '')
+                except Exception:
+                    now_url = ''
+                if 'x.com/notifications' not in now_url:
+                    recover_tab.get('https://x.com/notifications')
+                    deps._wait_document_ready(recover_tab, timeout=5.0)
+            except Exception as recover_err:
+                deps.log_to_ui('warn', f'⚠️ 提示框自动恢复失败: {recover_err}')
+            time.sleep(random.uniform(0.45, 1.1))
+            continue
+        break
+
+    deps._record_reply_outcome(target_handle, ok, err if not ok else '')
+    if not ok:
+        flow_err_code, flow_err_detail = deps._split_flow_error(err)
+        scheduled, retry_at, schedule_msg = deps.notify_state_facade.schedule_retry(
+            key,
+            err,
+            attempt=cur_attempt,
+            reason='manual_notify_reply',
+            save=True,
+        )
+        deps.log_to_ui('warn', f'⚠️ 通知回复失败: {err}')
+        if scheduled:
+            return {
+                'status': 'retry_waiting',
+                'msg': schedule_msg,
+                'flow_stage': 'retry_waiting',
+                'flow_error_code': flow_err_code,
+                'flow_error_detail': flow_err_detail,
+                'retry_at': retry_at,
+                'retry_time': datetime.datetime.fromtimestamp(retry_at).strftime('%H:%M:%S'),
+                'attempt': cur_attempt,
+            }, 202
+        return {
+            'status': 'err',
+            'msg': f'{err}（{schedule_msg}）',
+            'flow_stage': 'retry_waiting',
+            'flow_error_code': flow_err_code,
+            'flow_error_detail': flow_err_detail,
+            'retry_at': 0,
+            'retry_time': '',
+            'attempt': cur_attempt,
+        }, 500
+
+    reply_time_text = datetime.datetime.now().strftime('%H:%M:%S')
+    deps.notify_state_facade.mark_reply_success(key, message, dm_message, reply_time_text=reply_time_text, save=True)
+    deps.log_to_ui('success', f'✅ 已发送通知回复: {target_handle} -> {message[:30]}')
+    return {
+        'status': 'ok',
+        'reply_time': reply_time_text,
+        'flow_stage': 'done',
+        'retry_at': 0,
+        'retry_time': '',
+        'attempt': cur_attempt,
+    }, 200
+
+
+class NotifyReplyJobStore:
+    """回复任务登记表：按提交顺序保留最近 max_jobs 个任务（只淘汰已结束的），同一通知同时只有一个进行中的任务。"""
+
+    def __init__(self, max_jobs=NOTIFY_REPLY_JOB_KEEP):
+        self.max_jobs = max(10, int(max_jobs))
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+    def add_or_get_active(self, key, make_job):
+        """同一 key 已有排队/执行中的任务时返回 (该任务副本, False)，否则登记新任务返回 (副本, True)。"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job['key'] == key and job['status'] in NOTIFY_REPLY_JOB_ACTIVE:
+                    return dict(job), False
+            job = make_job()
+            self._jobs[job['job_id']] = job
+            overflow = len(self._jobs) - self.max_jobs
+            if overflow > 0:
+                finished = [job_id for job_id, item in self._jobs.items() if item['status'] not in NOTIFY_REPLY_JOB_ACTIVE]
+                for job_id in finished[:overflow]:
+                    self._jobs.pop(job_id, None)
+            return dict(job), True
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job['updated_at'] = time.time()
+            if job['status'] not in NOTIFY_REPLY_JOB_ACTIVE:
+                self._finished.notify_all()
+            return dict(job)
+
+    def wait_finished(self, job_id, timeout=None):
+        """阻塞等待任务结束并返回其副本；任务不存在返回 None，超时返回仍在进行中的副本。"""
+        deadline = None if timeout is None else time.time() + max(0.0, float(timeout))
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            # 持有任务本身的引用，结束后即使被淘汰出登记表也能读到结果
+            while job['status'] in NOTIFY_REPLY_JOB_ACTIVE:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._finished.wait(remaining)
+            return dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def active_for_key(self, key):
+        with self._lock:
+            for job in self._jobs.values():
+                if job['key'] == key and job['status'] in NOTIFY_REPLY_JOB_ACTIVE:
+                    return job['job_id']
+        return ''
+
+    def next_pending(self, exclude_key=''):
+        """按提交顺序返回第一个尚未开始回复（flow_stage=reply_pending）的进行中任务副本，供预热下一条目标。"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job['key'] == exclude_key or job['status'] not in NOTIFY_REPLY_JOB_ACTIVE:
+                    continue
+                if job.get('flow_stage', '') == 'reply_pending':
+                    return dict(job)
+        return None
+
+    def counts(self):
+        with self._lock:
+            out = {}
+            for job in self._jobs.values():
+                out[job['status']] = out.get(job['status'], 0) + 1
+            return out
+
+
+def publish_notify_reply_job_event(job, deps):
+    """经增量事件通道推送任务状态；前端按 type=notify_reply_job 更新对应通知行。"""
+    event = {
+        'type': 'notify_reply_job',
+        'key': job['key'],
+        'handle': job.get('handle', ''),
+        'job_id': job['job_id'],
+        'job_status': job['status'],
+        'flow_stage': job.get('flow_stage', ''),
+        'attempt': job.get('attempt', 0),
+    }
+    event.update(job.get('result') or {})
+    event['job_status'] = job['status']
+    deps.publish_new_data_event(event)
+
+
+def submit_notify_reply_job(target, message, dm_message, cur_attempt, deps):
+    """登记并提交回复任务，立即返回 (job, created)；同一通知已有进行中的任务时直接返回该任务。"""
+    key = str(target.get('key', '') or '').strip()
+
+    def _make_job():
+        now = time.time()
+        return {
+            'job_id': uuid.uuid4().hex[:12],
+            'key': key,
+            'handle': target.get('handle', ''),
+            'status': 'queued',
+            'flow_stage': 'reply_pending',
+            'attempt': cur_attempt,
+            'target': dict(target),
+            'message': message,
+            'dm_message': dm_message,
+            'result': None,
+            'created_at': now,
+            'updated_at': now,
+        }
+
+    job, created = deps.notify_reply_jobs.add_or_get_active(key, _make_job)
+    if not created:
+        return job, False
+    publish_notify_reply_job_event(job, deps)
+    try:
+        deps.notify_reply_executor.submit(run_notify_reply_job, job['job_id'], deps)
+    except RuntimeError as err:
+        job = deps.notify_reply_jobs.update(
+            job['job_id'],
+            status='err',
+            result={'status': 'err', 'msg': f'回复任务提交失败: {err}', 'flow_stage': 'reply_pending'},
+            http_status=500,
+        )
+        publish_notify_reply_job_event(job, deps)
+    return job, True
+
+
+def run_notify_reply_job(job_id, deps):
+    """工作线程：执行回复任务并推送 running / 结果事件。"""
+    job = deps.notify_reply_jobs.update(job_id, status='running')
+    if job is None:
+        return
+    publish_notify_reply_job_event(job, deps)
+    try:
+        payload, http_status = execute_notify_reply(job['target'], job['message'], job['dm_message'], job['attempt'], deps)
+    except Exception as err:
+        deps.log_to_ui('warn', f"⚠️ 回复任务异常({job['key']}): {err}")
+        payload = {'status': 'err', 'msg': f'回复任务异常: {err}', 'flow_stage': job.get('flow_stage', ''), 'attempt': job['attempt']}
+        http_status = 500
+    job = deps.notify_reply_jobs.update(
+        job_id,
+        status=payload.get('status', 'err'),
+        flow_stage=payload.get('flow_stage', ''),
+        result=payload,
+        http_status=http_status,
+    )
+    publish_notify_reply_job_event(job, deps)
+
+
+def publish_notify_reply_progress(key, stage, deps):
+    """回复流程阶段推进时，若该通知有进行中的任务则推送一次进度事件。"""
+    job_id = deps.notify_reply_jobs.active_for_key(str(key or '').strip())
+    if not job_id:
+        return
+    job = deps.notify_reply_jobs.update(job_id, flow_stage=str(stage or ''))
+    if job is not None:
+        publish_notify_reply_job_event(job, deps)
+
+
+def submit_notify_reply_batch(entries, deps):
+    """批量提交通知回复：一次加锁写入回复内容、一次落盘，再按提交顺序排入回复任务队列。
+
+    已有进行中回复任务的通知在写入前即拒绝；每个 handle 只做一次失败预算检查；
+    带私信的条目在用户私信冷却中、或同批次已有该用户的私信时拒绝，避免排队后在私信阶段才因冷却失败。返回 {'queued': [...], 'rejected': [...]}。
+    """
+    candidates, rejected = [], []
+    seen_keys = set()
+    for idx, raw in enumerate(entries):
+        raw = raw if isinstance(raw, dict) else {}
+        key = str(raw.get('key', '') or '').strip()
+        message = str(raw.get('message', '') or '').strip()
+        dm_message = str(raw.get('dm_message', '') or '').strip()
+        active_job_id = deps.notify_reply_jobs.active_for_key(key) if key else ''
+        if idx >= NOTIFY_REPLY_BATCH_MAX:
+            rejected.append({'key': key, 'msg': f'超出单批上限 {NOTIFY_REPLY_BATCH_MAX}'})
+        elif not key:
+            rejected.append({'key': '', 'msg': 'missing key'})
+        elif not message:
+            rejected.append({'key': key, 'msg': 'missing message'})
+        elif key in seen_keys:
+            rejected.append({'key': key, 'msg': '同一批次内重复的通知'})
+        elif active_job_id:
+            # 进行中的任务仍按旧内容发送，此处拒绝以免改写回复内容、递增尝试次数或重置其流程阶段
+            rejected.append({'key': key, 'msg': '该通知已有进行中的回复任务', 'job_id': active_job_id})
+        else:
+            seen_keys.add(key)
+            candidates.append({'key': key, 'message': message, 'dm_message': dm_message})
+
+    rows = deps.pending_results_repo.update_notify_manual_replies(
+        candidates,
+        dm_llm_enabled=deps.DM_LLM_REWRITE_ENABLED,
+    )
+    budget_cache = {}
+    dm_handles = set()
+    scheduled = []
+    for entry in candidates:
+        key = entry['key']
+        target = rows.get(key)
+        if not target:
+            rejected.append({'key': key, 'msg': '通知记录不存在'})
+            continue
+        target_handle = target.get('handle', '')
+        handle_norm = deps.normalize_handle(target_handle)
+        if handle_norm not in budget_cache:
+            budget_cache[handle_norm] = deps._check_reply_failure_budget(target_handle)
+        allowed, budget_msg = budget_cache[handle_norm]
+        if not allowed:
+            rejected.append({'key': key, 'msg': budget_msg})
+            continue
+        if entry['dm_message'] and handle_norm:
+            if handle_norm in dm_handles:
+                rejected.append({'key': key, 'msg': '同一批次已包含该用户的私信'})
+                continue
+            wait_sec = deps._notify_dm_cooldown_remaining(target_handle, key)
+            if wait_sec > 0:
+                rejected.append({'key': key, 'msg': f'该用户私信冷却中（剩余{wait_sec:.0f}s）'})
+                continue
+            dm_handles.add(handle_norm)
+        cur_attempt = next_notify_reply_attempt(target)
+        mark_notify_reply_pending(key, cur_attempt, deps, save=False)
+        scheduled.append((target, entry, cur_attempt))
+
+    if rows:
+        deps.save_state()
+
+    queued = []
+    for target, entry, cur_attempt in scheduled:
+        job, created = submit_notify_reply_job(target, entry['message'], entry['dm_message'], cur_attempt, deps)
+        queued.append({
+            'key': entry['key'],
+            'job_id': job['job_id'],
+            'job_status': job['status'],
+            'attempt': job.get('attempt', cur_attempt),
+            'duplicate': not created,
+        })
+    if queued or rejected:
+        deps.log_to_ui('info', f'📥 批量回复已排队 {len(queued)} 条，拒绝 {len(rejected)} 条')
+    return {'queued': queued, 'rejected': rejected}
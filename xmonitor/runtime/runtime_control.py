@@ -10,7 +10,9 @@ def start_monitor_thread(deps):
         deps._set_runtime_attr('monitor_active', True)
         deps._set_runtime_attr('monitor_thread', threading.Thread(target=deps.monitoring_loop, daemon=True, name='monitoring_loop'))
         deps.monitor_thread.start()
-        return True
+    # 监控启动是直接运行与 WSGI 部署共用的路径，在此预热私信改写池
+    deps._warm_dm_rewrite_pool()
+    return True
 
 
 def stop_monitor_thread(deps, wait_timeout=15):
@@ -18,7 +18,6 @@ class RuntimeState:
     notification_refresh_interval: float = 0.0
     notification_last_refresh_at: float = 0.0
     notification_empty_article_streak: int = 0
-    llm_filter_cache: Any = None
     dm_llm_rewrite_history: Any = None
     content_dedupe: Any = None
     pending_results: Any = None
@@ -47,7 +46,6 @@ def build_runtime_state(module):
         notification_refresh_interval=float(getattr(module, 'notification_refresh_interval', 0.0) or 0.0),
         notification_last_refresh_at=float(getattr(module, 'notification_last_refresh_at', 0.0) or 0.0),
         notification_empty_article_streak=int(getattr(module, 'notification_empty_article_streak', 0) or 0),
-        llm_filter_cache=getattr(module, 'llm_filter_cache', None),
         dm_llm_rewrite_history=getattr(module, 'dm_llm_rewrite_history', None),
         content_dedupe=getattr(module, 'content_dedupe', None),
         pending_results=getattr(module, 'pending_results', None),
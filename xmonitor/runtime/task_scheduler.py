@@ -0,0 +1,99 @@
+import random
+import time
+
+
+def _task_url(task):
+    return str((task or {}).get('url', '') or '').strip()
+
+
+def compute_task_poll_interval(entry, deps):
+    """根据近期捕获率计算任务下次轮询间隔：热帖缩短，冷帖指数退避。"""
+    low = max(10.0, float(deps.TASK_POLL_MIN_SEC))
+    base = max(low, float(deps.TASK_POLL_BASE_SEC))
+    high = max(base, float(deps.TASK_POLL_MAX_SEC))
+    rate = max(0.0, float(entry.get('capture_rate', 0.0) or 0.0))
+    idle_streak = max(0, int(entry.get('idle_streak', 0) or 0))
+    if idle_streak > 0:
+        backoff = max(1.0, float(deps.TASK_POLL_BACKOFF_FACTOR))
+        interval = base * (backoff ** min(idle_streak, 12))
+    else:
+        interval = base / (1.0 + rate)
+    interval = max(low, min(high, interval))
+    interval *= random.uniform(0.85, 1.15)
+    interval += random.uniform(deps.TASK_BATCH_GAP_MIN_SEC, deps.TASK_BATCH_GAP_MAX_SEC)
+    return round(max(low * 0.8, interval), 2)
+
+
+def record_task_scan_result(task, captured, deps, now_ts=None):
+    """记录任务扫描结果并安排下次到期时间，返回下次间隔（秒）。"""
+    url = _task_url(task)
+    if not url:
+        return 0.0
+    if now_ts is None:
+        now_ts = time.time()
+    try:
+        captured_val = max(0, int(captured or 0))
+    except Exception:
+        captured_val = 0
+    alpha = max(0.05, min(1.0, float(deps.TASK_POLL_RATE_ALPHA)))
+    with deps.task_schedule_lock:
+        entry = dict(deps.task_schedule_state.get(url) or {})
+        prev_rate = float(entry.get('capture_rate', 0.0) or 0.0)
+        entry['capture_rate'] = round(prev_rate * (1.0 - alpha) + captured_val * alpha, 4)
+        entry['idle_streak'] = 0 if captured_val > 0 else int(entry.get('idle_streak', 0) or 0) + 1
+        entry['last_captured'] = captured_val
+        entry['last_scan_at'] = now_ts
+        interval = compute_task_poll_interval(entry, deps)
+        entry['interval'] = interval
+        entry['next_due'] = now_ts + interval
+        deps.task_schedule_state[url] = entry
+    return interval
+
+
+def pick_due_tasks(tasks, deps, now_ts=None):
+    """返回已到期的任务，逾期最久的优先；新任务立即到期但首轮随机错开。"""
+    if now_ts is None:
+        now_ts = time.time()
+    due = []
+    with deps.task_schedule_lock:
+        for task in tasks or []:
+            url = _task_url(task)
+            if not url:
+                continue
+            entry = deps.task_schedule_state.get(url)
+            if entry is None:
+                entry = {'next_due': now_ts + random.uniform(0.0, deps.TASK_SUBMIT_JITTER_MAX_SEC), 'capture_rate': 0.0, 'idle_streak': 0}
+                deps.task_schedule_state[url] = entry
+            next_due = float(entry.get('next_due', 0.0) or 0.0)
+            if next_due <= now_ts + deps.TASK_SUBMIT_JITTER_MAX_SEC:
+                due.append((next_due, task))
+    due.sort(key=lambda pair: pair[0])
+    return [task for _, task in due]
+
+
+def seconds_until_next_task_due(tasks, deps, now_ts=None):
+    """距离最早到期任务的秒数；无任务返回 None。"""
+    if now_ts is None:
+        now_ts = time.time()
+    earliest = None
+    with deps.task_schedule_lock:
+        for task in tasks or []:
+            entry = deps.task_schedule_state.get(_task_url(task))
+            if entry is None:
+                return 0.0
+            next_due = float(entry.get('next_due', 0.0) or 0.0)
+            if earliest is None or next_due < earliest:
+                earliest = next_due
+    if earliest is None:
+        return None
+    return max(0.0, earliest - now_ts)
+
+
+def prune_task_schedule(tasks, deps):
+    """清理已删除任务的调度状态。"""
+    active_urls = {_task_url(task) for task in tasks or []}
+    with deps.task_schedule_lock:
+        stale = [url for url in deps.task_schedule_state if url not in active_urls]
+        for url in stale:
+            deps.task_schedule_state.pop(url, None)
+    return len(stale)
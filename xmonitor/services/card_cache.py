@@ -0,0 +1,96 @@
+import collections
+import threading
+import time
+
+
+class ParsedCardCache:
+    """卡片指纹 -> 解析结果的 LRU 缓存（带过期时间）。
+
+    扫描阶段写入 status/handle/content 等解析结果，回复匹配阶段按指纹直接读取，
+    并维护 status_id -> 指纹 索引，使目标卡片定位退化为一次字典查询 + 一次校验。
+    """
+
+    def __init__(self, max_entries=1024, ttl_sec=900.0):
+        self.max_entries = max(16, int(max_entries))
+        self.ttl_sec = max(1.0, float(ttl_sec))
+        self._entries = collections.OrderedDict()
+        self._status_index = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, entry, now_ts):
+        return (now_ts - entry.get('cached_at', 0.0)) > self.ttl_sec
+
+    def _drop(self, fingerprint):
+        entry = self._entries.pop(fingerprint, None)
+        if not entry:
+            return
+        for sid in entry.get('status_ids', ()):
+            if self._status_index.get(sid) == fingerprint:
+                self._status_index.pop(sid, None)
+
+    def get(self, fingerprint, now_ts=None):
+        if not fingerprint:
+            return None
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            if self._expired(entry, now_ts):
+                self._drop(fingerprint)
+                return None
+            self._entries.move_to_end(fingerprint)
+            return dict(entry)
+
+    def put(self, fingerprint, now_ts=None, **fields):
+        """合并写入解析字段；status_id/article_status_ids 会同步进入索引。"""
+        if not fingerprint:
+            return None
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or self._expired(entry, now_ts):
+                self._drop(fingerprint)
+                entry = {'fingerprint': fingerprint}
+            else:
+                for sid in entry.get('status_ids', ()):
+                    if self._status_index.get(sid) == fingerprint:
+                        self._status_index.pop(sid, None)
+            entry.update(fields)
+            status_ids = set(entry.get('article_status_ids') or ())
+            if entry.get('status_id'):
+                status_ids.add(str(entry['status_id']))
+            entry['status_ids'] = frozenset(status_ids)
+            entry['cached_at'] = now_ts
+            self._entries[fingerprint] = entry
+            self._entries.move_to_end(fingerprint)
+            for sid in status_ids:
+                self._status_index[sid] = fingerprint
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+            return dict(entry)
+
+    def fingerprint_for_status(self, status_id, now_ts=None):
+        sid = str(status_id or '').strip()
+        if not sid:
+            return ''
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            fingerprint = self._status_index.get(sid, '')
+            entry = self._entries.get(fingerprint) if fingerprint else None
+            if entry is None or self._expired(entry, now_ts):
+                if fingerprint:
+                    self._drop(fingerprint)
+                self._status_index.pop(sid, None)
+                return ''
+            return fingerprint
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._status_index.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
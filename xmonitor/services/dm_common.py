@@ -1,6 +1,9 @@
+import json
 import re
 import time
 
+from xmonitor.browser.selectors import DM_CONVERSATION_ROOT_SELECTORS, DM_MESSAGE_BUBBLE_SELECTORS
+
 
 def normalize_handle(handle):
     if not handle:
@@ -151,63 +154,283 @@ def build_dm_message_probes(text):
     return uniq
 
 
+DM_COMPOSER_EXCLUDE_CSS = (
+    '[data-testid="dmComposerTextInput"], [data-testid="dmComposerTextInputRichTextInputContainer"], '
+    '[data-testid="dmComposerTextInput_label"], [data-xm-dm-root], [data-xm-dm-target], [data-xm-dm-send-target], '
+    'textarea, input, [role="textbox"][contenteditable], [contenteditable="true"], [contenteditable="plaintext-only"], '
+    'button[data-testid*="dm-composer-send"], [data-testid*="dm-composer-send"], button[aria-label*="发送"], button[aria-label*="Send"]'
+)
+DM_SENT_MARKERS = ('已发送', 'sent')
+DM_BUBBLE_WINDOW = 12
+
+# 会话容器定位、末尾 N 个消息气泡读取（带稳定 id）与新增判定，供基线快照、监听器与轮询兜底共用
+_DM_SCOPE_JS = r"""
+const cfg = JSON.parse(arguments[0] || '{}');
+const xmNorm = (t) => String(t || '').replace(/[\u200b\ufeff]/g, '').replace(/\s+/g, ' ').trim().toLowerCase();
+const xmRoot = () => {
+  for (const s of (cfg.roots || [])) {
+    try { const el = document.querySelector(s); if (el) return el; } catch (e) {}
+  }
+  return document.querySelector('main') || document.body;
+};
+const xmScopedText = (el) => {
+  if (!el) return '';
+  const clone = el.cloneNode(true);
+  clone.querySelectorAll(cfg.exclude).forEach((node) => { try { node.remove(); } catch (e) {} });
+  return String(clone.innerText || clone.textContent || '');
+};
+const xmCount = (hay, needle) => {
+  if (!needle) return 0;
+  let n = 0;
+  let i = hay.indexOf(needle);
+  while (i !== -1) { n += 1; i = hay.indexOf(needle, i + needle.length); }
+  return n;
+};
+const xmHash = (text) => {
+  let h = 0;
+  for (let i = 0; i < text.length; i += 1) h = ((h << 5) - h + text.charCodeAt(i)) | 0;
+  return (h >>> 0).toString(36);
+};
+const xmBubbles = (root) => {
+  if (!root) return [];
+  let nodes = [];
+  for (const s of (cfg.bubbles || [])) {
+    try { nodes = Array.from(root.querySelectorAll(s)); } catch (e) { nodes = []; }
+    nodes = nodes.filter((el) => !(el.closest && el.closest(cfg.exclude)));
+    if (nodes.length) break;
+  }
+  if (!nodes.length) {
+    const text = xmNorm(xmScopedText(root));
+    return [{ id: 'root:' + text.length + ':' + xmHash(text), text }];
+  }
+  window.__xmDmBubbleSeq = window.__xmDmBubbleSeq || 0;
+  return nodes.slice(-Math.max(1, Number(cfg.limit) || 12)).map((el) => {
+    let id = el.getAttribute('data-xm-bubble-id');
+    if (!id) {
+      window.__xmDmBubbleSeq += 1;
+      id = 'b' + window.__xmDmBubbleSeq;
+      el.setAttribute('data-xm-bubble-id', id);
+    }
+    const raw = el.querySelector(cfg.exclude) ? xmScopedText(el) : (el.innerText || el.textContent || '');
+    return { id, text: xmNorm(raw) };
+  });
+};
+const xmAdvanced = (before, after) => {
+  const seen = new Set(before.map((b) => b.id));
+  const fresh = after.filter((b) => !seen.has(b.id));
+  if (!fresh.length) return false;
+  const full = after.length >= (Number(cfg.limit) || 12);
+  const total = (list, p) => list.reduce((n, b) => n + xmCount(b.text, p), 0);
+  // 与 dm_bubbles_after_anchor 一致：窗口已满时只认排在发送前最后一个气泡之后的新增气泡
+  const anchorIdx = before.length ? after.findIndex((b) => b.id === before[before.length - 1].id) : -1;
+  const tail = anchorIdx >= 0 ? after.slice(anchorIdx + 1).filter((b) => !seen.has(b.id)) : [];
+  if ((cfg.probes || []).some((p) => (full ? tail.some((b) => b.text.includes(p)) : (fresh.some((b) => b.text.includes(p)) && total(after, p) > total(before, p))))) return true;
+  // 与 dm_bubbles_advanced 一致：探针未命中时退回“已发送”标记数增加
+  const markers = (list) => (cfg.markers || []).reduce((n, m) => n + total(list, m), 0);
+  return markers(after) > markers(before);
+};
+"""
+
+_DM_READ_BUBBLES_JS = _DM_SCOPE_JS + """
+return JSON.stringify(xmBubbles(xmRoot()));
+"""
+
+_DM_SEND_WATCH_ARM_JS = _DM_SCOPE_JS + """
+const prev = window.__xmDmSendWatch;
+if (prev) { try { prev.observer.disconnect(); } catch (e) {} (prev.waiters || []).forEach((fn) => fn('lost')); }
+const root = xmRoot();
+const bubbles = xmBubbles(root);
+const watch = {
+  id: 'w' + Date.now().toString(36) + Math.random().toString(36).slice(2, 8),
+  root, hit: false, waiters: [], baseline: bubbles,
+};
+const isComposer = (node) => {
+  const el = node && node.nodeType === 1 ? node : (node ? node.parentElement : null);
+  return !el || !!(el.closest && el.closest(cfg.exclude));
+};
+const finish = (outcome) => {
+  try { watch.observer.disconnect(); } catch (e) {}
+  watch.hit = outcome === 'hit';
+  const waiters = watch.waiters.splice(0);
+  waiters.forEach((fn) => fn(outcome));
+};
+watch.observer = new MutationObserver((records) => {
+  for (const rec of records) {
+    const nodes = rec.type === 'characterData' ? [rec.target] : Array.from(rec.addedNodes || []);
+    for (const node of nodes) {
+      if (isComposer(node)) continue;
+      const t = xmNorm(node.nodeType === 1 ? (node.innerText || node.textContent) : node.textContent);
+      if (!t) continue;
+      const probeHit = (cfg.probes || []).some((p) => t.includes(p));
+      const markerHit = (cfg.markers || []).includes(t);
+      // 虚拟列表重渲染旧消息/旧回执也会触发新增节点，探针与“已发送”标记命中后都按气泡 id 核对一次是否真有新消息
+      if ((probeHit || markerHit) && xmAdvanced(watch.baseline, xmBubbles(root))) { finish('hit'); return; }
+    }
+  }
+});
+watch.observer.observe(root, { childList: true, subtree: true, characterData: true });
+setTimeout(() => finish('expired'), Math.max(5000, Number(cfg.ttl_ms) || 60000));
+window.__xmDmSendWatch = watch;
+return JSON.stringify({ id: watch.id, bubbles });
+"""
+
+_DM_SEND_WATCH_AWAIT_JS = """
+const cfg = JSON.parse(arguments[0] || '{}');
+const watch = window.__xmDmSendWatch;
+if (!watch || watch.id !== cfg.id || !watch.root || !watch.root.isConnected) return 'lost';
+if (watch.hit) return 'hit';
+return new Promise((resolve) => {
+  const timer = setTimeout(() => {
+    const idx = watch.waiters.indexOf(done);
+    if (idx >= 0) watch.waiters.splice(idx, 1);
+    resolve('miss');
+  }, Math.max(100, Number(cfg.timeout_ms) || 1000));
+  function done(outcome) { clearTimeout(timer); resolve(outcome === 'expired' ? 'miss' : outcome); }
+  watch.waiters.push(done);
+});
+"""
+
+
+def _dm_scope_payload(**extra):
+    payload = {
+        'roots': list(DM_CONVERSATION_ROOT_SELECTORS),
+        'bubbles': list(DM_MESSAGE_BUBBLE_SELECTORS),
+        'exclude': DM_COMPOSER_EXCLUDE_CSS,
+        'limit': DM_BUBBLE_WINDOW,
+    }
+    payload.update(extra)
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def _probe_needles(probes):
+    return [normalize_text_for_compare(p).lower() for p in probes or [] if normalize_text_for_compare(p)]
+
+
 def get_dm_conversation_text(tab):
+    """会话容器（找不到时退回 main/body）去掉输入区后的文本。"""
     if not tab:
         return ""
     try:
-        return str(tab.run_js(
-            """
-            const root = document.body;
-            if (!root) return '';
-            const clone = root.cloneNode(true);
-            clone.querySelectorAll(
-              '[data-testid="dmComposerTextInput"], [data-testid="dmComposerTextInputRichTextInputContainer"], [data-testid="dmComposerTextInput_label"], [data-xm-dm-root], [data-xm-dm-target], [data-xm-dm-send-target], textarea, input, [role="textbox"][contenteditable], [contenteditable="true"], [contenteditable="plaintext-only"], button[data-testid*="dm-composer-send"], [data-testid*="dm-composer-send"], button[aria-label*="发送"], button[aria-label*="Send"]'
-            ).forEach((node) => {
-              try { node.remove(); } catch (e) {}
-            });
-            return String(clone.innerText || clone.textContent || '');
-            """
-        ) or "")
+        return str(tab.run_js(_DM_SCOPE_JS + "return xmScopedText(xmRoot());", _dm_scope_payload()) or "")
     except Exception:
         return ""
 
 
-def count_dm_probe_occurrence(tab, probe_text):
-    if not tab or not probe_text:
-        return 0
-    haystack = normalize_text_for_compare(get_dm_conversation_text(tab))
-    needle = normalize_text_for_compare(probe_text)
-    if not haystack or not needle:
-        return 0
-    return haystack.count(needle)
+def read_dm_conversation_bubbles(tab, limit=DM_BUBBLE_WINDOW):
+    """读取当前会话末尾 limit 个消息气泡 [{'id', 'text'}]（id 在节点存续期间稳定，text 已归一化）；失败返回 None。"""
+    if not tab:
+        return None
+    try:
+        bubbles = json.loads(tab.run_js(_DM_READ_BUBBLES_JS, _dm_scope_payload(limit=int(limit))) or 'null')
+    except Exception:
+        return None
+    if not isinstance(bubbles, list):
+        return None
+    return [{'id': str(b.get('id') or ''), 'text': str(b.get('text') or '')} for b in bubbles if isinstance(b, dict)]
+
+
+def diff_dm_bubbles(before, after):
+    """返回 after 中 id 不在 before 里的气泡（按出现顺序）。"""
+    seen = {b['id'] for b in before or []}
+    return [b for b in after or [] if b['id'] not in seen]
+
 
+def dm_bubbles_after_anchor(before, after):
+    """after 中排在发送前最后一个气泡（锚点）之后的新增气泡；锚点不在窗口内时返回空列表。
 
-def count_dm_sent_markers(tab):
-    haystack = normalize_text_for_compare(get_dm_conversation_text(tab))
-    if not haystack:
-        return 0
-    total = 0
-    for marker in ('已发送', 'sent'):
-        total += haystack.count(normalize_text_for_compare(marker))
-    return total
+    窗口已满时旧气泡会滑出、重渲染的旧气泡也会拿到新 id，只有接在锚点后面的新增气泡才可能是刚发出的消息。
+    """
+    if not before:
+        return []
+    anchor = before[-1]['id']
+    ids = [b['id'] for b in after or []]
+    if anchor not in ids:
+        return []
+    return diff_dm_bubbles(before, after[ids.index(anchor) + 1:])
+
+
+def dm_bubbles_advanced(before, after, probes, limit=DM_BUBBLE_WINDOW):
+    """新增气泡中出现探针，且探针在窗口内的出现次数增加；窗口已满时改为要求探针出现在锚点之后的新增气泡中。
+
+    探针未命中时退回“已发送”标记：窗口内标记数增加且确有新增气泡。
+    """
+    before = before or []
+    after = after or []
+    fresh = diff_dm_bubbles(before, after)
+    if not fresh:
+        return False
+    full = len(after) >= int(limit)
+    tail = dm_bubbles_after_anchor(before, after) if full else []
+
+    def total(bubbles, needle):
+        return sum(b['text'].count(needle) for b in bubbles)
+
+    for needle in _probe_needles(probes):
+        if full:
+            if any(needle in b['text'] for b in tail):
+                return True
+        elif any(needle in b['text'] for b in fresh) and total(after, needle) > total(before, needle):
+            return True
+    markers_before = sum(total(before, marker) for marker in DM_SENT_MARKERS)
+    markers_after = sum(total(after, marker) for marker in DM_SENT_MARKERS)
+    return markers_after > markers_before
+
+
+def snapshot_dm_send_baseline(tab, probes):
+    """发送前基线：一次 run_js 读取末尾消息气泡，同时在会话容器上挂 MutationObserver 等待新消息气泡。
+
+    监听器挂载失败时返回不含 __watch_id 的基线，确认阶段退回气泡轮询。
+    """
+    bubbles = None
+    watch_id = ''
+    if tab and probes:
+        try:
+            armed = json.loads(tab.run_js(
+                _DM_SEND_WATCH_ARM_JS,
+                _dm_scope_payload(probes=_probe_needles(probes), markers=list(DM_SENT_MARKERS)),
+            ) or '{}')
+            bubbles = armed.get('bubbles')
+            watch_id = str(armed.get('id') or '')
+        except Exception:
+            bubbles = None
+    if not isinstance(bubbles, list):
+        bubbles = read_dm_conversation_bubbles(tab) or []
+    baseline = {'__bubbles': bubbles}
+    if watch_id:
+        baseline['__watch_id'] = watch_id
+    return baseline
+
+
+def await_dm_send_watch(tab, watch_id, wait_sec):
+    """在页面内等待监听器结论（单次 run_js）：'hit' / 'miss'（超时） / 'lost'（监听器失效或调用失败）。"""
+    try:
+        outcome = tab.run_js(
+            _DM_SEND_WATCH_AWAIT_JS,
+            _dm_scope_payload(id=watch_id, timeout_ms=int(max(0.2, float(wait_sec)) * 1000)),
+            timeout=max(0.2, float(wait_sec)) + 3.0,
+        )
+    except Exception:
+        return 'lost'
+    outcome = str(outcome or '')
+    return outcome if outcome in {'hit', 'miss'} else 'lost'
 
 
 def confirm_dm_message_sent(tab, before_counts, probes, wait_sec=1.15):
+    """确认消息已落到会话中：优先等待页面内监听器结论，超时后再比对一次气泡；监听器不可用时轮询气泡差异。"""
     if not probes:
         return False
-    before_snapshot = normalize_text_for_compare(str((before_counts or {}).get('__snapshot', '') or ''))
-    before_markers = int((before_counts or {}).get('__sent_markers', 0) or 0)
+    before_counts = before_counts or {}
+    before_bubbles = list(before_counts.get('__bubbles') or [])
+    watch_id = str(before_counts.get('__watch_id', '') or '')
+    if watch_id:
+        outcome = await_dm_send_watch(tab, watch_id, wait_sec)
+        if outcome == 'hit':
+            return True
+        if outcome == 'miss':
+            return dm_bubbles_advanced(before_bubbles, read_dm_conversation_bubbles(tab), probes)
     deadline = time.time() + max(0.2, float(wait_sec))
     while time.time() < deadline:
-        current_snapshot = normalize_text_for_compare(get_dm_conversation_text(tab))
-        if current_snapshot:
-            for probe in probes:
-                prev = int(before_counts.get(probe, 0))
-                now = count_dm_probe_occurrence(tab, probe)
-                if now > prev:
-                    return True
-            now_markers = count_dm_sent_markers(tab)
-            if now_markers > before_markers and current_snapshot != before_snapshot:
-                return True
+        if dm_bubbles_advanced(before_bubbles, read_dm_conversation_bubbles(tab), probes):
+            return True
         time.sleep(0.12)
     return False
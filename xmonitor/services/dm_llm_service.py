@@ -1,18 +1,31 @@
+import json
 import random
 import re
 import time
 
+from xmonitor.services.llm_breaker import LlmCircuitOpenError
+from xmonitor.services.text_similarity import longest_common_substring_len, minhash_signature
 
-def normalize_dm_rewrite_signature(text, deps):
+
+def _dm_rewrite_signature_text(text, deps):
     raw = deps.normalize_content_for_dedupe(deps._normalize_text_for_compare(text or ''))
     if not raw:
         return ''
-    raw = re.sub(r'[^0-9a-z\u4e00-\u9fff]+', '', raw.lower())
+    return re.sub(r'[^0-9a-z\u4e00-\u9fff]+', '', raw.lower())
+
+
+def normalize_dm_rewrite_signature(text, deps):
+    raw = _dm_rewrite_signature_text(text, deps)
     if not raw:
         return ''
     return deps.hashlib.md5(raw.encode('utf-8')).hexdigest()
 
 
+def dm_rewrite_fingerprint(text, deps):
+    """近重复检测用的 MinHash 签名，与精确签名使用同一套文本归一化。"""
+    return minhash_signature(_dm_rewrite_signature_text(text, deps))
+
+
 def build_dm_llm_rewrite_prompt(template_text, deps):
     tpl = str(deps.DM_LLM_REWRITE_PROMPT_TEMPLATE or '').strip() or deps.DM_LLM_REWRITE_DEFAULT_PROMPT
     template_clean = deps._sanitize_dm_message_text(template_text)
@@ -30,22 +43,7 @@ def dm_rewrite_longest_common_substring_len(source_text, generated_text, deps):
     dst = re.sub(r'(工程师)?微信\s*[:：]?\s*[0-9a-zA-Z_-]{4,}', '<contact>', dst, flags=re.IGNORECASE)
     src = re.sub(r'\d{6,}', '<num>', src)
     dst = re.sub(r'\d{6,}', '<num>', dst)
-    rows = len(src) + 1
-    cols = len(dst) + 1
-    dp = [0] * cols
-    max_len = 0
-    for i in range(1, rows):
-        prev = 0
-        for j in range(1, cols):
-            cur = dp[j]
-            if src[i - 1] == dst[j - 1]:
-                dp[j] = prev + 1
-                if dp[j] > max_len:
-                    max_len = dp[j]
-            else:
-                dp[j] = 0
-            prev = cur
-    return max_len
+    return longest_common_substring_len(src, dst)
 
 
 def extract_dm_rewrite_forbidden_phrases(template_text, deps, max_items=5):
@@ -111,11 +109,14 @@ def dm_rewrite_is_too_similar(source_text, generated_text, deps):
     return bool(too_similar), score, diff_chars, shared_run
 
 
-def record_dm_llm_rewrite_signature(sig, deps):
+def record_dm_llm_rewrite_signature(sig, deps, text=''):
     if not sig:
         return
+    fingerprint = dm_rewrite_fingerprint(text, deps) if text else ()
     with deps.dm_llm_rewrite_lock:
         deps.dm_llm_rewrite_history.append(sig)
+        if fingerprint:
+            deps.dm_llm_rewrite_minhash_index.add(fingerprint)
 
 
 def is_dm_llm_rewrite_duplicate(sig, deps):
@@ -125,8 +126,51 @@ def is_dm_llm_rewrite_duplicate(sig, deps):
         return sig in deps.dm_llm_rewrite_history
 
 
-def generate_dm_text_with_llm(template_text, deps):
-    """根据模板生成第二条私信文案（总是生成，失败即返回错误）。"""
+def dm_llm_rewrite_near_duplicate_score(text, deps):
+    """与最近改写窗口的估计 Jaccard 相似度（不低于 DM_LLM_REWRITE_NEAR_DUP_JACCARD 时返回，否则 None）。"""
+    fingerprint = dm_rewrite_fingerprint(text, deps)
+    if not fingerprint:
+        return None
+    with deps.dm_llm_rewrite_lock:
+        return deps.dm_llm_rewrite_minhash_index.best_similarity(fingerprint, float(deps.DM_LLM_REWRITE_NEAR_DUP_JACCARD))
+
+
+_STREAM_TEXT_PREFIX_RE = re.compile(r'^\s*(?:```(?:json)?\s*)?\{\s*"(?:text|message|content)"\s*:\s*"')
+_STREAM_TEXT_END_RE = re.compile(r'(?<!\\)"')
+
+
+def stream_dm_candidate_text(raw_text):
+    """从流式累计输出中取出私信正文，兼容尚未闭合的 {"text": "..."}。"""
+    raw = str(raw_text or '')
+    match = _STREAM_TEXT_PREFIX_RE.match(raw)
+    if not match:
+        return raw
+    body = raw[match.end():]
+    end = _STREAM_TEXT_END_RE.search(body)
+    if end:
+        body = body[:end.start()]
+    elif (len(body) - len(body.rstrip('\\'))) % 2:
+        body = body[:-1]
+    try:
+        return json.loads(f'"{body}"')
+    except Exception:
+        return body.replace('\\n', '\n').replace('\\"', '"')
+
+
+def dm_stream_abort_reason(partial_text, forbidden_phrases, deps):
+    """流式增量校验：超出字数上限返回 max_chars（截断后照常使用），复用模板短语返回 copy_phrase:<短语>。"""
+    candidate = deps._sanitize_dm_message_text(stream_dm_candidate_text(partial_text))
+    if len(candidate) > int(deps.DM_LLM_REWRITE_MAX_CHARS):
+        return 'max_chars'
+    phrase = deps._dm_rewrite_contains_forbidden_phrase(candidate, forbidden_phrases)
+    return f'copy_phrase:{phrase}' if phrase else ''
+
+
+def generate_dm_text_with_llm(template_text, deps, record_signature=True):
+    """根据模板生成第二条私信文案（总是生成，失败即返回错误）。
+
+    record_signature=False 时不写入去重窗口（预生成池在真正取用时再记录）。
+    """
     template_clean = deps._sanitize_dm_message_text(template_text)
     if not template_clean:
         return False, '', {
@@ -168,13 +212,29 @@ def generate_dm_text_with_llm(template_text, deps):
         started = time.perf_counter()
         try:
             style_hint = random.choice(style_hints)
-            result_obj, raw_text = deps._call_openai_compatible_json(
+            llm_args = (
                 '你是私信改写助手。只输出JSON，不要输出模板原句。',
                 prompt + f'\n\n补充风格要求：{style_hint}。' + '\n请输出JSON：{"text":"改写后的私信正文"}',
-                max_tokens=min(512, max(96, int(deps.DM_LLM_REWRITE_MAX_CHARS * 2))),
-                timeout_sec=deps.LLM_FILTER_TIMEOUT_SEC,
-                temperature=deps.DM_LLM_REWRITE_TEMPERATURE,
             )
+            llm_kwargs = {
+                'max_tokens': min(512, max(96, int(deps.DM_LLM_REWRITE_MAX_CHARS * 2))),
+                'timeout_sec': deps.LLM_FILTER_TIMEOUT_SEC,
+                'temperature': deps.DM_LLM_REWRITE_TEMPERATURE,
+            }
+            if deps.DM_LLM_REWRITE_STREAM:
+                raw_text, abort_reason = deps._stream_openai_compatible_text(
+                    *llm_args,
+                    on_delta=lambda partial: dm_stream_abort_reason(partial, forbidden_phrases, deps),
+                    **llm_kwargs,
+                )
+                result_obj = deps._parse_json_object_from_text(raw_text) or {'text': stream_dm_candidate_text(raw_text)}
+                if abort_reason.startswith('copy_phrase:'):
+                    latency_ms = int((time.perf_counter() - started) * 1000)
+                    phrase = abort_reason[len('copy_phrase:'):]
+                    last_meta = {'error_code': 'E_DM_LLM_COPY_PHRASE', 'error_detail': f'命中原句短语复用(流式中止): {phrase}', 'llm_used': True, 'latency_ms': latency_ms}
+                    continue
+            else:
+                result_obj, raw_text = deps._call_openai_compatible_json(*llm_args, **llm_kwargs)
             latency_ms = int((time.perf_counter() - started) * 1000)
             generated = ''
             if isinstance(result_obj, dict):
@@ -199,8 +259,16 @@ def generate_dm_text_with_llm(template_text, deps):
             if deps._is_dm_llm_rewrite_duplicate(sig):
                 last_meta = {'error_code': 'E_DM_LLM_DUPLICATE_TEXT', 'error_detail': f'生成文案命中最近{deps.DM_LLM_REWRITE_DEDUPE_SIZE}条去重窗口', 'llm_used': True, 'latency_ms': latency_ms}
                 continue
-            deps._record_dm_llm_rewrite_signature(sig)
+            near_score = deps._dm_llm_rewrite_near_duplicate_score(generated)
+            if near_score is not None:
+                last_meta = {'error_code': 'E_DM_LLM_NEAR_DUPLICATE', 'error_detail': f'生成文案与最近改写近似重复(jaccard≈{near_score:.2f})', 'llm_used': True, 'latency_ms': latency_ms}
+                continue
+            if record_signature:
+                deps._record_dm_llm_rewrite_signature(sig, text=generated)
             return True, generated, {'error_code': '', 'error_detail': '', 'llm_used': True, 'latency_ms': latency_ms, 'regen_attempt': attempt}
+        except LlmCircuitOpenError as e:
+            last_meta = {'error_code': 'E_DM_LLM_CIRCUIT_OPEN', 'error_detail': str(e), 'llm_used': False, 'latency_ms': 0}
+            break
         except Exception as e:
             latency_ms = int((time.perf_counter() - started) * 1000)
             err_text = str(e or '').strip()
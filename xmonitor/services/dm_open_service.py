@@ -16,8 +16,11 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
     _capture_runtime_diagnostic = deps._capture_runtime_diagnostic
     _click_with_prompt_guard = deps._click_with_prompt_guard
     _dm_humanized_idle = deps._dm_humanized_idle
+    _forget_dm_conversation_url = deps._forget_dm_conversation_url
     _handle_dm_passcode_prompt = deps._handle_dm_passcode_prompt
+    _lookup_dm_conversation_url = deps._lookup_dm_conversation_url
     _mark_dm_unavailable = deps._mark_dm_unavailable
+    _remember_dm_conversation_url = deps._remember_dm_conversation_url
     _wait_document_ready = deps._wait_document_ready
     _wait_first_actionable = deps._wait_first_actionable
     _wait_first_visible = deps._wait_first_visible
@@ -138,6 +141,32 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
             time.sleep(0.08)
         return None, ""
 
+    def _opened(editor_found):
+        """打开成功：记录（或刷新）handle → 会话直达链接，下次直接进入。"""
+        try:
+            _remember_dm_conversation_url(handle_norm, tab.url)
+        except Exception:
+            pass
+        return editor_found, ""
+
+    def _try_open_dm_via_cached_conversation(conversation_url):
+        """已知会话直达：跳过资料页与搜索流程，编辑框未就绪时交回常规入口。"""
+        nonlocal entry_path, entry_stage
+        entry_path = "cached_conversation"
+        entry_stage = "open"
+        try:
+            tab.get(conversation_url)
+            _wait_document_ready(tab, timeout=5.2)
+        except Exception as e_open:
+            log_headless_debug(f"会话直达链接打开失败: {e_open}")
+            return None
+        if _handle_dm_passcode_prompt(tab):
+            _dm_humanized_idle(tab, 0.2, 0.45, "会话直达口令处理后等待")
+        editor_now, _ = _wait_editor_or_closed(timeout_sec=2.6)
+        if editor_now:
+            entry_stage = "cached_ready"
+        return editor_now
+
     def _try_open_dm_via_direct_compose():
         """优先走 messages/compose 直达会话，避免资料页按钮点击后落到消息列表小窗。"""
         nonlocal entry_path, entry_stage
@@ -460,10 +489,19 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
             return True
         return False
 
+    cached_conversation_url = _lookup_dm_conversation_url(handle_norm)
+    if cached_conversation_url:
+        editor_cached = _try_open_dm_via_cached_conversation(cached_conversation_url)
+        if editor_cached:
+            log_headless_debug(f"私信会话直达命中: @{handle_norm} -> {cached_conversation_url}")
+            return _opened(editor_cached)
+        # 直达失败（会话被删、链接失效等）不据此判定不可私信，清掉缓存后走常规入口
+        _forget_dm_conversation_url(handle_norm)
+
     if DM_ENTRY_MODE in {"direct_compose_first", "dual_probe"}:
         editor_direct, direct_state = _try_open_dm_via_direct_compose()
         if editor_direct:
-            return editor_direct, ""
+            return _opened(editor_direct)
         if direct_state == "closed":
             _mark_dm_unavailable(handle_norm)
             return None, "该用户当前不可私信（平台限制或对方未开放私信）"
@@ -524,14 +562,14 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
         # 第一轮快速检查：若未进入编辑框，尝试识别并点击消息小窗会话入口。
         editor, editor_state = _wait_editor_or_closed(timeout_sec=1.4)
         if editor:
-            return editor, ""
+            return _opened(editor)
         if editor_state == "closed":
             _mark_dm_unavailable(handle_norm)
             return None, "该用户当前不可私信（平台限制或对方未开放私信）"
         if _try_rescue_dm_popup():
             editor, editor_state = _wait_editor_or_closed(timeout_sec=2.2)
             if editor:
-                return editor, ""
+                return _opened(editor)
             if editor_state == "closed":
                 _mark_dm_unavailable(handle_norm)
                 return None, "该用户当前不可私信（平台限制或对方未开放私信）"
@@ -557,7 +595,7 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
 
         editor, editor_state = _wait_editor_or_closed(timeout_sec=3.6)
         if editor:
-            return editor, ""
+            return _opened(editor)
         if editor_state == "closed":
             _mark_dm_unavailable(handle_norm)
             return None, "该用户当前不可私信（平台限制或对方未开放私信）"
@@ -582,7 +620,7 @@ def open_dm_editor_for_handle(tab, handle, deps, ignore_cached_unavailable=False
         editor_direct_fallback, direct_state = _try_open_dm_via_direct_compose()
         if editor_direct_fallback:
             log_to_ui("debug", f"📨 资料页私信入口失败，已回退直达私信入口: @{handle_norm}")
-            return editor_direct_fallback, ""
+            return _opened(editor_direct_fallback)
         if direct_state == "closed":
             _mark_dm_unavailable(handle_norm)
             return None, "该用户当前不可私信（平台限制或对方未开放私信）"
@@ -9,6 +9,27 @@ def _set_headless_mode(deps, value):
     deps.headless_mode = bool(value)
 
 
+def _acquire_browser_restart(deps, wait_sec):
+    """私信在工作标签页上执行时回复锁已释放，重启浏览器会关掉回复标签页、其他私信槽位与预热标签页。
+
+    先拿回复锁，再暂停私信池新占用并等待只剩本槽位在用；任一步超时即放弃（返回 False），不重启浏览器。
+    成功后进入共享关键区，重启期间通知扫描也会让路（通知标签页同样会被关闭）。
+    """
+    if not deps.reply_action_lock.acquire(timeout=max(0.0, float(wait_sec))):
+        return False
+    if not deps.dm_tab_pool.drain(keep=1, timeout=max(0.0, float(wait_sec))):
+        deps.reply_action_lock.release()
+        return False
+    deps._enter_dm_critical('dm_browser_restart')
+    return True
+
+
+def _release_browser_restart(deps):
+    deps._leave_dm_critical()
+    deps.dm_tab_pool.undrain()
+    deps.reply_action_lock.release()
+
+
 def read_dm_session_state(tab, handle='', deps=None):
     """读取当前私信会话状态，用于发送前闸门判断。"""
     handle_norm = deps.normalize_handle(handle)
@@ -145,19 +166,39 @@ def run_dm_send_with_recovery(
     progress=None,
     dm_text_supplier=None,
 ):
-    """私信发送恢复策略：原标签页 -> 重建标签页 -> 重启浏览器 -> 有头兜底。"""
+    """私信发送恢复策略：原标签页 -> 重建标签页 -> 重启浏览器 -> 有头兜底。
+
+    启用私信工作标签页池时，私信在池中独占的标签页上执行（传入的 tab 不再使用），
+    关键区只登记占用而不阻塞通知扫描。
+    """
     handle_norm = deps.normalize_handle(dm_handle)
     last_err = '发送私信失败'
     work_tab = tab
-    entered_critical = deps._enter_dm_critical('dm_send_recovery')
+    slot = None
+    if deps.dm_tab_pool.size > 0:
+        slot = deps.dm_tab_pool.acquire(handle_norm, timeout=deps.DM_WORKER_TAB_WAIT_SEC)
+        if slot is None:
+            return False, f'E_DM_WORKER_TAB_BUSY: 私信工作标签页全部占用超过{int(deps.DM_WORKER_TAB_WAIT_SEC)}s', False, tab
+    on_worker_tab = slot is not None
+    entered_critical = deps._enter_dm_critical('dm_send_recovery', worker_tab=on_worker_tab)
     progress = dict(progress or {})
     progress.setdefault('link_sent', False)
     progress.setdefault('text_sent', False)
     context_failure_count = 0
 
-    strategies = [('当前标签页', lambda: work_tab)]
+    def _recreate_work_tab():
+        if on_worker_tab:
+            return deps._ensure_dm_worker_tab(slot, force_recreate=True)
+        return deps.ensure_reply_work_tab(force_recreate=True)
+
+    if on_worker_tab:
+        strategies = [(f'私信工作标签页#{slot.index}', lambda: deps._ensure_dm_worker_tab(slot))]
+        recreate_label = '重建私信工作标签页'
+    else:
+        strategies = [('当前标签页', lambda: work_tab)]
+        recreate_label = '重建回复标签页'
     if (not best_effort) and deps.DM_RECOVERY_ENABLE_RECREATE_TAB:
-        strategies.append(('重建回复标签页', lambda: deps.ensure_reply_work_tab(force_recreate=True)))
+        strategies.append((recreate_label, _recreate_work_tab))
 
     try:
         for idx, (label, tab_provider) in enumerate(strategies, start=1):
@@ -225,9 +266,17 @@ def run_dm_send_with_recovery(
             and context_failure_count >= deps.DM_CONTEXT_RESTART_THRESHOLD
         ):
             try:
-                deps.log_to_ui('warn', f'⚠️ 触发上下文阈值恢复：重启浏览器并重建标签页（count={context_failure_count}）')
-                deps.restart_global_browser()
-                work_tab = deps.ensure_reply_work_tab(force_recreate=True)
+                restart_ok = (not on_worker_tab) or _acquire_browser_restart(deps, deps.DM_WORKER_TAB_WAIT_SEC)
+                try:
+                    if restart_ok:
+                        deps.log_to_ui('warn', f'⚠️ 触发上下文阈值恢复：重启浏览器并重建标签页（count={context_failure_count}）')
+                        deps.restart_global_browser()
+                    else:
+                        deps.log_to_ui('warn', f'⚠️ 触发上下文阈值恢复：其他回复/私信流程仍在进行，仅重建本私信工作标签页（count={context_failure_count}）')
+                    work_tab = _recreate_work_tab()
+                finally:
+                    if on_worker_tab and restart_ok:
+                        _release_browser_restart(deps)
                 ok, err, dm_closed = run_dm_send_sequence_once(
                     work_tab,
                     handle_norm,
@@ -266,6 +315,8 @@ def run_dm_send_with_recovery(
             display_ok = bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
             if deps.DM_RECOVERY_HEADFUL_REQUIRE_DISPLAY and not display_ok:
                 deps.log_to_ui('warn', '⚠️ 有头兜底已启用但未检测到 DISPLAY，跳过本次有头兜底')
+            elif on_worker_tab and not _acquire_browser_restart(deps, deps.DM_WORKER_TAB_WAIT_SEC):
+                deps.log_to_ui('warn', '⚠️ 其他回复/私信流程仍在进行，跳过需要重启浏览器的有头兜底')
             else:
                 prev_headless = _get_headless_mode(deps)
                 switched = False
@@ -275,7 +326,7 @@ def run_dm_send_with_recovery(
                         switched = True
                         deps.log_to_ui('warn', '⚠️ 无头私信多次失败，临时切换有头模式执行本条私信兜底')
                         deps.restart_global_browser()
-                    work_tab = deps.ensure_reply_work_tab(force_recreate=True)
+                    work_tab = _recreate_work_tab()
                     ok, err, dm_closed = run_dm_send_sequence_once(
                         work_tab,
                         handle_norm,
@@ -314,7 +365,11 @@ def run_dm_send_with_recovery(
                             deps.log_to_ui('info', '🔄 私信兜底结束，已恢复无头浏览器运行')
                         except Exception as restore_err:
                             deps.log_to_ui('warn', f'⚠️ 恢复无头浏览器失败，请手动重启: {restore_err}')
+                    if on_worker_tab:
+                        _release_browser_restart(deps)
         return False, last_err, False, work_tab
     finally:
         if entered_critical:
-            deps._leave_dm_critical()
+            deps._leave_dm_critical(worker_tab=on_worker_tab)
+        if slot is not None:
+            deps.dm_tab_pool.release(slot, handle_norm)
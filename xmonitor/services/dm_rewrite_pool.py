@@ -0,0 +1,177 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class DmRewritePool:
+    """私信改写预生成池：每个模板保留至多 per_template 条已校验、互不重复的改写，取用时 O(1) 弹出。
+
+    模板键超过 max_templates 时淘汰最久未访问的模板；条目超过 ttl_sec 视为过期丢弃。
+    """
+
+    def __init__(self, per_template=2, max_templates=16, ttl_sec=6 * 3600):
+        self.per_template = max(0, int(per_template))
+        self.max_templates = max(1, int(max_templates))
+        self.ttl_sec = max(60.0, float(ttl_sec))
+        self._ready = OrderedDict()
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'generated': 0, 'dropped': 0}
+
+    def _bucket(self, key):
+        bucket = self._ready.get(key)
+        if bucket is None:
+            bucket = deque()
+            self._ready[key] = bucket
+            while len(self._ready) > self.max_templates:
+                _, evicted = self._ready.popitem(last=False)
+                self.stats['dropped'] += len(evicted)
+        self._ready.move_to_end(key)
+        return bucket
+
+    def _expire(self, bucket, now_ts):
+        while bucket and now_ts - bucket[0]['ts'] > self.ttl_sec:
+            bucket.popleft()
+            self.stats['dropped'] += 1
+
+    def deficit(self, key, now_ts=None):
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            bucket = self._bucket(key)
+            self._expire(bucket, now_ts)
+            return max(0, self.per_template - len(bucket))
+
+    def push(self, key, text, sig, meta, now_ts=None):
+        """放入一条改写；与池内已有条目签名重复或池已满时丢弃并返回 False。"""
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            bucket = self._bucket(key)
+            if len(bucket) >= self.per_template or any(entry['sig'] == sig for entry in bucket):
+                self.stats['dropped'] += 1
+                return False
+            bucket.append({'text': text, 'sig': sig, 'meta': dict(meta or {}), 'ts': float(now_ts)})
+            self.stats['generated'] += 1
+            return True
+
+    def pop(self, key, is_duplicate_fn=None, now_ts=None):
+        """弹出最早生成的可用条目；已过期或 is_duplicate_fn(entry) 为真（已进入去重窗口）的条目跳过。"""
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            bucket = self._bucket(key)
+            self._expire(bucket, now_ts)
+            while bucket:
+                entry = bucket.popleft()
+                if callable(is_duplicate_fn) and is_duplicate_fn(entry):
+                    self.stats['dropped'] += 1
+                    continue
+                self.stats['hits'] += 1
+                return entry
+            self.stats['misses'] += 1
+            return None
+
+    def begin_refill(self, key):
+        with self._lock:
+            if key in self._refilling:
+                return False
+            self._refilling.add(key)
+            return True
+
+    def end_refill(self, key):
+        with self._lock:
+            self._refilling.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._ready.clear()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(bucket) for bucket in self._ready.values())
+
+
+def dm_rewrite_pool_key(template_text, deps):
+    """池键覆盖模板、改写 prompt、字数上限与模型，任一变化后旧预生成条目不再命中。"""
+    raw = '\x1f'.join([
+        str(template_text or ''),
+        str(deps.DM_LLM_REWRITE_PROMPT_TEMPLATE or ''),
+        str(int(deps.DM_LLM_REWRITE_MAX_CHARS)),
+        str(deps.LLM_FILTER_MODEL or ''),
+    ])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _wait_for_llm_idle(deps, max_wait_sec=30.0):
+    """意向分析仍有积压时让路，最多等待 max_wait_sec。"""
+    deadline = time.time() + max_wait_sec
+    while int(deps.intent_worker_inflight) > 0 and time.time() < deadline:
+        time.sleep(0.5)
+
+
+def run_dm_rewrite_refill(template_text, key, deps):
+    """后台线程：为模板补足预生成改写；连续失败或与池内重复 2 次即停止，等待下次触发。"""
+    failures = 0
+    try:
+        while failures < 2 and deps.dm_rewrite_pool.deficit(key) > 0:
+            if deps.llm_breaker.rejecting():
+                break
+            _wait_for_llm_idle(deps)
+            ok_gen, text, meta = deps._generate_dm_text_with_llm(template_text, record_signature=False)
+            sig = deps._normalize_dm_rewrite_signature(text) if ok_gen else ''
+            if ok_gen and deps.dm_rewrite_pool.push(key, text, sig, meta):
+                failures = 0
+            else:
+                failures += 1
+    except Exception as err:
+        deps.log_to_ui('debug', f'🧪 [DMPool] 预生成失败: {err}')
+    finally:
+        deps.dm_rewrite_pool.end_refill(key)
+
+
+def schedule_dm_rewrite_refill(template_text, deps):
+    """LLM 可用且池未满时提交后台补池任务；同一模板同时只有一个补池任务。"""
+    template_clean = deps._sanitize_dm_message_text(template_text)
+    if not template_clean or not deps.DM_LLM_REWRITE_ENABLED or deps.dm_rewrite_pool.per_template <= 0:
+        return False
+    if not deps._llm_runtime_ready() or deps.llm_breaker.rejecting():
+        return False
+    key = dm_rewrite_pool_key(template_clean, deps)
+    if deps.dm_rewrite_pool.deficit(key) <= 0 or not deps.dm_rewrite_pool.begin_refill(key):
+        return False
+    try:
+        deps.dm_rewrite_executor.submit(run_dm_rewrite_refill, template_clean, key, deps)
+    except RuntimeError:
+        deps.dm_rewrite_pool.end_refill(key)
+        return False
+    return True
+
+
+def warm_dm_rewrite_pool(deps, max_templates=3):
+    """为前几个私信模板提交补池任务；启动路径（直接运行与 WSGI 部署）共用，重复调用无副作用。"""
+    scheduled = 0
+    for template_text in list(deps.dm_message_templates or [])[:max(0, int(max_templates))]:
+        if schedule_dm_rewrite_refill(template_text, deps):
+            scheduled += 1
+    return scheduled
+
+
+def take_pregenerated_dm_text(template_text, deps):
+    """取出一条预生成改写并记入去重窗口，返回 (True, text, meta)；池空返回 None。取用后触发补池。"""
+    template_clean = deps._sanitize_dm_message_text(template_text)
+    if not template_clean or deps.dm_rewrite_pool.per_template <= 0:
+        return None
+    key = dm_rewrite_pool_key(template_clean, deps)
+    entry = deps.dm_rewrite_pool.pop(
+        key,
+        is_duplicate_fn=lambda item: (
+            deps._is_dm_llm_rewrite_duplicate(item['sig'])
+            or deps._dm_llm_rewrite_near_duplicate_score(item['text']) is not None
+        ),
+    )
+    schedule_dm_rewrite_refill(template_clean, deps)
+    if entry is None:
+        return None
+    deps._record_dm_llm_rewrite_signature(entry['sig'], text=entry['text'])
+    meta = dict(entry['meta'])
+    meta.update({'latency_ms': 0, 'pregenerated': True})
+    return True, entry['text'], meta
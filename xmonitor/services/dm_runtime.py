@@ -1,8 +1,140 @@
+import json
 import random
+import re
 import time
 
 
-def humanized_type_dm_text(tab, editor, dm_text, idle_func, log_debug):
+_DM_TYPING_TOKEN_RE = re.compile(r'https?://\S+|\s+|[^\s]')
+_DM_TYPING_PAUSE_CHARS = set('，。！？、；：,.!?;:')
+
+# 页面内按计划逐段插入：contenteditable 用 execCommand('insertText')（浏览器原生触发 beforeinput/input），
+# textarea 走原生 value setter + input 事件；结束后在页面内做一次归一化比对，返回 JSON 结论。
+_DM_CHUNKED_TYPE_JS = """
+const root = arguments[0];
+const cfg = JSON.parse(arguments[1] || '{}');
+const resolveTarget = (el) => {
+  if (!el) return null;
+  if (el.value !== undefined || el.isContentEditable || el.getAttribute('contenteditable') === 'true') return el;
+  return el.querySelector(
+    'div[role="textbox"][contenteditable="true"],[data-testid="dmComposerTextInput"] [contenteditable="true"],textarea[data-testid="dm-composer-textarea"],textarea'
+  );
+};
+const el = resolveTarget(root);
+if (!el) return JSON.stringify({ ok: false, reason: 'no_target' });
+const isField = el.value !== undefined;
+const norm = (s) => String(s || '').replace(/\\s+/g, ' ').trim();
+const readText = () => String(isField ? (el.value || '') : (el.innerText || el.textContent || ''));
+const fire = (data) => {
+  try { el.dispatchEvent(new InputEvent('input', { bubbles: true, inputType: 'insertText', data })); } catch (e) {
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+  }
+};
+const setField = (val, data) => {
+  const proto = Object.getPrototypeOf(el);
+  const desc = proto ? Object.getOwnPropertyDescriptor(proto, 'value') : null;
+  if (desc && typeof desc.set === 'function') desc.set.call(el, val); else el.value = val;
+  fire(data);
+};
+const insert = (chunk) => {
+  try { el.focus(); } catch (e) {}
+  if (isField) { setField(String(el.value || '') + chunk, chunk); return; }
+  let ok = false;
+  try { ok = !!document.execCommand('insertText', false, chunk); } catch (e) {}
+  if (!ok) { el.textContent = String(el.textContent || '') + chunk; fire(chunk); }
+};
+const sleep = (ms) => new Promise((r) => setTimeout(r, Math.max(0, ms)));
+return (async () => {
+  try { el.focus(); } catch (e) {}
+  if (isField) {
+    setField('', null);
+  } else {
+    try { document.execCommand('selectAll', false, null); document.execCommand('delete', false, null); } catch (e) {}
+    if (norm(readText())) { el.textContent = ''; fire(null); }
+  }
+  for (const [chunk, delay] of cfg.schedule || []) {
+    if (delay > 0) await sleep(delay);
+    insert(chunk);
+  }
+  try { el.dispatchEvent(new Event('change', { bubbles: true })); } catch (e) {}
+  const finalText = readText();
+  return JSON.stringify({ ok: norm(finalText) === norm(cfg.text), len: finalText.length });
+})();
+"""
+
+
+def build_dm_typing_schedule(text, multiplier=1.0, max_total_sec=6.0, rng=None):
+    """把私信文本切成 1-4 字的输入段并为每段生成人类化间隔，返回 [[chunk, delay_ms], ...]。
+
+    链接整段插入（模拟粘贴），标点后附加短停顿；总时长超过 max_total_sec 时整体等比压缩。
+    """
+    rng = rng or random
+    mult = max(0.3, float(multiplier))
+    tokens = _DM_TYPING_TOKEN_RE.findall(str(text or ''))
+    chunks = []
+    buf = ''
+    limit = rng.randint(1, 4)
+    for token in tokens:
+        if len(token) > 1 and not token.isspace():
+            if buf:
+                chunks.append(buf)
+                buf = ''
+            chunks.append(token)
+            continue
+        buf += token
+        if len(buf) >= limit or token in _DM_TYPING_PAUSE_CHARS or token.isspace():
+            chunks.append(buf)
+            buf = ''
+            limit = rng.randint(1, 4)
+    if buf:
+        chunks.append(buf)
+
+    schedule = []
+    prev = ''
+    for idx, chunk in enumerate(chunks):
+        if idx == 0:
+            delay = 0.0
+        elif chunk.startswith('http'):
+            delay = rng.uniform(0.25, 0.6)
+        else:
+            delay = sum(rng.uniform(0.035, 0.11) for _ in chunk)
+            if prev and prev[-1] in _DM_TYPING_PAUSE_CHARS:
+                delay += rng.uniform(0.12, 0.35)
+        schedule.append([chunk, delay * mult])
+        prev = chunk
+    total = sum(delay for _, delay in schedule)
+    scale = min(1.0, float(max_total_sec) / total) if total > 0 else 1.0
+    return [[chunk, int(round(delay * scale * 1000))] for chunk, delay in schedule]
+
+
+def type_dm_text_chunked(tab, editor, dm_text, schedule):
+    """一次 run_js 在页面内按计划完成整段输入并自校验，返回 (ok, reason)。"""
+    total_sec = sum(delay for _, delay in schedule) / 1000.0
+    try:
+        raw = tab.run_js(
+            _DM_CHUNKED_TYPE_JS,
+            editor,
+            json.dumps({'text': str(dm_text or ''), 'schedule': schedule}, ensure_ascii=False),
+            timeout=total_sec + 5.0,
+        )
+        result = json.loads(raw or '{}')
+    except Exception as err:
+        return False, f'exception: {err}'
+    if result.get('ok'):
+        return True, ''
+    return False, str(result.get('reason') or f"mismatch len={result.get('len', 0)}")
+
+
+def humanized_type_dm_text(
+    tab,
+    editor,
+    dm_text,
+    idle_func,
+    log_debug,
+    *,
+    chunked=False,
+    humanize_multiplier_fn=None,
+    max_total_sec=6.0,
+):
     text = str(dm_text or '')
     if not text:
         return False
@@ -25,6 +157,14 @@ def humanized_type_dm_text(tab, editor, dm_text, idle_func, log_debug):
     except Exception:
         pass
     idle_func(tab, 0.06, 0.22, '私信输入前')
+    if chunked:
+        multiplier = humanize_multiplier_fn() if humanize_multiplier_fn else 1.0
+        schedule = build_dm_typing_schedule(text, multiplier=multiplier, max_total_sec=max_total_sec)
+        typed_ok, reason = type_dm_text_chunked(tab, target, text, schedule)
+        if typed_ok:
+            log_debug(f'私信输入完成(分段脚本模式, chunks={len(schedule)}, len={len(text)})')
+            return True
+        log_debug(f'分段脚本输入未通过校验({reason})，改用整段模式')
     try:
         target.input(text, clear=True)
         log_debug(f'私信输入完成(整段模式, len={len(text)})')
@@ -297,4 +437,5 @@ def is_dm_llm_fallback_allowed(err_code, err_detail):
         'E_DM_LLM_GENERATE_FAILED',
         'E_DM_LLM_TIMEOUT',
         'E_DM_LLM_NOT_READY',
+        'E_DM_LLM_CIRCUIT_OPEN',
     }
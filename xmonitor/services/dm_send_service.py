@@ -677,9 +677,6 @@ def send_dm_message(tab, text, deps):
         deps._throttle_dm_action_if_needed(f'私信发送尝试{attempt}')
         deps._prepare_reply_prompt_guard(tab, f'私信发送尝试{attempt}')
         deps._dm_humanized_idle(tab, 0.04, 0.16, f'私信发送尝试{attempt}')
-        before_counts = {p: deps._count_dm_probe_occurrence(tab, p) for p in probes}
-        before_counts['__snapshot'] = deps._get_dm_conversation_text(tab)
-        before_counts['__sent_markers'] = deps._count_dm_sent_markers(tab)
 
         editor = _find_editor(rounds=2, timeout_each=1.4)
         if not editor:
@@ -729,6 +726,8 @@ def send_dm_message(tab, text, deps):
 
         deps._dm_humanized_idle(tab, 0.04, 0.12, '私信发送前')
         send_btn = _wait_send_button_after_input(editor, dm_text, link_mode=link_only_mode)
+        # 输入完成后、发送动作前才挂监听器，避免查找/点击/输入期间会话重渲染的旧回执被误判为发送成功
+        before_counts = deps._snapshot_dm_send_baseline(tab, probes)
         if send_btn:
             clicked_send, click_err = deps._click_with_prompt_guard(tab, send_btn, '点击私信发送按钮')
             if clicked_send:
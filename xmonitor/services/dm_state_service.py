@@ -1,11 +1,68 @@
+import re
 import time
 
+from xmonitor.storage.storage_sqlite import (
+    delete_dm_conversation_url as _delete_dm_conversation_url,
+    delete_dm_handle_state as _delete_dm_handle_state,
+    load_dm_conversation_url as _load_dm_conversation_url,
+    load_dm_handle_states as _load_dm_handle_states,
+    save_dm_conversation_url as _save_dm_conversation_url,
+    save_dm_handle_state as _save_dm_handle_state,
+)
+
+
+DM_UNAVAILABLE_STATE_KIND = 'dm_unavailable'
+NOTIFY_DM_COOLDOWN_STATE_KIND = 'notify_dm_cooldown'
+
+
+_DM_CONVERSATION_PATH_RE = re.compile(r'/(messages/\d+(?:-\d+)?|i/chat/[A-Za-z0-9_:-]+)(?:[/?#]|$)')
+
+
+def ensure_dm_handle_state_loaded(deps):
+    """首次访问时从 SQLite 载入未过期的不可私信缓存与用户私信冷却（每个进程只读一次，内存中已有的记录优先）。"""
+    if deps.dm_handle_state_loaded:
+        return
+    with deps.dm_handle_state_load_lock:
+        if deps.dm_handle_state_loaded:
+            return
+        unavailable = {}
+        cooldowns = {}
+        if deps.DM_HANDLE_STATE_PERSIST:
+            try:
+                unavailable = _load_dm_handle_states(deps, DM_UNAVAILABLE_STATE_KIND)
+                cooldowns = _load_dm_handle_states(deps, NOTIFY_DM_COOLDOWN_STATE_KIND)
+            except Exception as err:
+                deps.log_headless_debug(f'私信状态缓存读取失败: {err}')
+        with deps.dm_unavailable_cache_lock:
+            for handle_norm, (until_ts, _) in unavailable.items():
+                deps.dm_unavailable_cache.setdefault(handle_norm, until_ts)
+        with deps.notify_dm_user_cooldown_lock:
+            for handle_norm, (until_ts, task_key) in cooldowns.items():
+                deps.notify_dm_user_cooldown.setdefault(handle_norm, {'until': until_ts, 'task_key': task_key})
+        deps.dm_handle_state_loaded = True
+        if unavailable or cooldowns:
+            deps.log_headless_debug(f'已恢复私信状态缓存: 不可私信={len(unavailable)} 冷却={len(cooldowns)}')
+
+
+def _persist_dm_handle_state(deps, kind, handle_norm, until_ts=None, task_key=''):
+    """写穿到 SQLite；until_ts 为 None 表示删除。失败只记调试日志，不影响内存缓存。"""
+    if not deps.DM_HANDLE_STATE_PERSIST:
+        return
+    try:
+        if until_ts is None:
+            _delete_dm_handle_state(deps, kind, handle_norm)
+        else:
+            _save_dm_handle_state(deps, kind, handle_norm, until_ts, task_key)
+    except Exception as err:
+        deps.log_headless_debug(f'私信状态缓存写入失败: {err}')
+
 
 def is_dm_unavailable_cached(handle, deps):
     """检查某用户私信不可达缓存。"""
     handle_norm = deps.normalize_handle(handle)
     if not handle_norm:
         return False
+    ensure_dm_handle_state_loaded(deps)
     now = time.time()
     with deps.dm_unavailable_cache_lock:
         expire_ts = deps.dm_unavailable_cache.get(handle_norm, 0.0)
@@ -20,16 +77,91 @@ def mark_dm_unavailable(handle, deps):
     handle_norm = deps.normalize_handle(handle)
     if not handle_norm:
         return
+    ensure_dm_handle_state_loaded(deps)
+    expire_ts = time.time() + deps.DM_UNAVAILABLE_CACHE_TTL_SEC
     with deps.dm_unavailable_cache_lock:
-        deps.dm_unavailable_cache[handle_norm] = time.time() + deps.DM_UNAVAILABLE_CACHE_TTL_SEC
+        deps.dm_unavailable_cache[handle_norm] = expire_ts
+    _persist_dm_handle_state(deps, DM_UNAVAILABLE_STATE_KIND, handle_norm, expire_ts)
 
 
 def clear_dm_unavailable_cache(handle, deps):
     handle_norm = deps.normalize_handle(handle)
     if not handle_norm:
         return
+    ensure_dm_handle_state_loaded(deps)
     with deps.dm_unavailable_cache_lock:
         deps.dm_unavailable_cache.pop(handle_norm, None)
+    _persist_dm_handle_state(deps, DM_UNAVAILABLE_STATE_KIND, handle_norm)
+
+
+def persist_notify_dm_user_cooldown(handle, deps):
+    """把 reserve 后的用户私信冷却记录写入 SQLite，重启后同一用户仍按剩余冷却处理。"""
+    handle_norm = deps.normalize_handle(handle)
+    if not handle_norm:
+        return
+    with deps.notify_dm_user_cooldown_lock:
+        record = dict(deps.notify_dm_user_cooldown.get(handle_norm) or {})
+    until_ts = float(record.get('until', 0.0) or 0.0)
+    if until_ts > time.time():
+        _persist_dm_handle_state(deps, NOTIFY_DM_COOLDOWN_STATE_KIND, handle_norm, until_ts, record.get('task_key', ''))
+
+
+def notify_dm_cooldown_remaining(handle, deps, task_key=''):
+    """只读查询用户私信冷却剩余秒数（不占用名额），判定与 reserve 一致：冷却无归属或属于同一 task_key 时视为 0。"""
+    handle_norm = deps.normalize_handle(handle)
+    if not handle_norm:
+        return 0.0
+    ensure_dm_handle_state_loaded(deps)
+    with deps.notify_dm_user_cooldown_lock:
+        record = dict(deps.notify_dm_user_cooldown.get(handle_norm) or {})
+    owner_task = str(record.get('task_key', '') or '').strip()
+    if not owner_task or owner_task == str(task_key or '').strip():
+        return 0.0
+    return max(0.0, float(record.get('until', 0.0) or 0.0) - time.time())
+
+
+def extract_dm_conversation_url(url):
+    """从当前页面地址提取会话直达链接（/messages/<id> 或 /i/chat/<id>），不是具体会话时返回空串。"""
+    match = _DM_CONVERSATION_PATH_RE.search(str(url or ''))
+    if not match:
+        return ''
+    return f'https://x.com/{match.group(1)}'
+
+
+def lookup_dm_conversation_url(handle, deps):
+    """查询 handle 对应的会话直达链接；未启用、未命中或过期返回空串。"""
+    handle_norm = deps.normalize_handle(handle)
+    if not handle_norm or not deps.DM_CONVERSATION_CACHE_ENABLED:
+        return ''
+    try:
+        return _load_dm_conversation_url(deps, handle_norm, deps.DM_CONVERSATION_CACHE_TTL_SEC)
+    except Exception as err:
+        deps.log_headless_debug(f'会话直达缓存读取失败: {err}')
+        return ''
+
+
+def remember_dm_conversation_url(handle, page_url, deps):
+    """私信编辑框打开成功后记录 handle → 会话直达链接，返回记录的链接（页面不在具体会话时为空串）。"""
+    handle_norm = deps.normalize_handle(handle)
+    conversation_url = extract_dm_conversation_url(page_url)
+    if not handle_norm or not conversation_url or not deps.DM_CONVERSATION_CACHE_ENABLED:
+        return ''
+    try:
+        _save_dm_conversation_url(deps, handle_norm, conversation_url)
+    except Exception as err:
+        deps.log_headless_debug(f'会话直达缓存写入失败: {err}')
+        return ''
+    return conversation_url
+
+
+def forget_dm_conversation_url(handle, deps):
+    handle_norm = deps.normalize_handle(handle)
+    if not handle_norm:
+        return
+    try:
+        _delete_dm_conversation_url(deps, handle_norm)
+    except Exception as err:
+        deps.log_headless_debug(f'会话直达缓存删除失败: {err}')
 
 
 def get_status_link_from_item(item, deps, matched_status_handle=None, matched_status_id=None):
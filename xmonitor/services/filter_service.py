@@ -5,6 +5,8 @@ import time
 import unicodedata
 import urllib.error
 
+from xmonitor.services.llm_breaker import LlmCircuitOpenError
+
 
 def reorder_articles_for_scan(articles, deps):
     """对文章进行分块随机重排，打散读取顺序但不丢数据。"""
@@ -82,20 +84,6 @@ def llm_filter_is_ready(deps, base_url=None, model=None, enabled=None):
     return bool(enabled_flag and llm_runtime_ready(deps, base_url=base_url, model=model))
 
 
-def prune_llm_filter_cache(deps, now_ts=None):
-    if now_ts is None:
-        now_ts = time.time()
-    expire_before = now_ts - max(60, deps.LLM_FILTER_CACHE_TTL_SEC)
-    expired = [key for key, value in deps.llm_filter_cache.items() if float(value.get('ts', 0)) < expire_before]
-    for key in expired:
-        deps.llm_filter_cache.pop(key, None)
-    if len(deps.llm_filter_cache) > max(100, deps.LLM_FILTER_CACHE_MAX_ENTRIES):
-        overflow = len(deps.llm_filter_cache) - max(100, deps.LLM_FILTER_CACHE_MAX_ENTRIES)
-        old_items = sorted(deps.llm_filter_cache.items(), key=lambda item: float(item[1].get('ts', 0)))[:overflow]
-        for key, _ in old_items:
-            deps.llm_filter_cache.pop(key, None)
-
-
 def normalize_content_for_dedupe(content):
     """标准化内容用于重复检测。"""
     text = re.sub(r'\s+', ' ', content or '').strip().lower()
@@ -143,34 +131,64 @@ def should_skip_duplicate_content(handle, content, deps, now_ts=None):
     return False
 
 
+def _llm_filter_text(content, deps):
+    """返回送去 LLM 过滤的文本；去重签名为空（纯空白/符号）时返回空串，不调用 LLM。"""
+    text = deps._normalize_content_for_filter(content)
+    if not text or not normalize_content_for_dedupe(text):
+        return ''
+    return text
+
+
+def _llm_filter_error(verdict):
+    """判定结果是否为需要记录的调用异常（熔断放行不算异常）。"""
+    return isinstance(verdict, Exception) and not isinstance(verdict, LlmCircuitOpenError)
+
+
+def _llm_filter_outcome(verdict):
+    """把判定或调用异常折算为 (skip, reason)：熔断与接口异常一律放行，回退规则过滤。"""
+    if verdict is None or isinstance(verdict, Exception):
+        return False, ''
+    skip, reason = verdict
+    return bool(skip), str(reason or '')
+
+
 def should_skip_by_llm_filter(content, deps):
+    """单条 LLM 硬过滤；判定缓存由 _call_openai_compatible_filter_api 统一负责。"""
     if not deps._llm_filter_is_ready():
         return False, ''
-    text = deps._normalize_content_for_filter(content)
+    text = _llm_filter_text(content, deps)
     if not text:
         return False, ''
-    sig_raw = normalize_content_for_dedupe(text)
-    if not sig_raw:
-        return False, ''
-    sig = hashlib.md5(sig_raw.encode('utf-8')).hexdigest()
-    now_ts = time.time()
-    with deps.llm_filter_cache_lock:
-        cached = deps.llm_filter_cache.get(sig)
-        if cached and (now_ts - float(cached.get('ts', 0))) <= deps.LLM_FILTER_CACHE_TTL_SEC:
-            return bool(cached.get('skip', False)), str(cached.get('reason', '') or '')
     try:
-        skip, reason = deps._call_openai_compatible_filter_api(text)
-    except urllib.error.URLError as e:
-        deps.log_to_ui('debug', f'🤖 [LLMFilter] 接口不可达，已回退规则过滤: {e}')
-        skip, reason = False, ''
+        verdict = deps._call_openai_compatible_filter_api(text)
     except Exception as e:
-        deps.log_to_ui('debug', f'🤖 [LLMFilter] 调用异常，已回退规则过滤: {e}')
-        skip, reason = False, ''
-    with deps.llm_filter_cache_lock:
-        deps.llm_filter_cache[sig] = {'ts': now_ts, 'skip': bool(skip), 'reason': str(reason or '')}
-        if len(deps.llm_filter_cache) > deps.LLM_FILTER_CACHE_MAX_ENTRIES:
-            prune_llm_filter_cache(deps, now_ts)
-    return bool(skip), str(reason or '')
+        verdict = e
+    if isinstance(verdict, urllib.error.URLError):
+        deps.log_to_ui('debug', f'🤖 [LLMFilter] 接口不可达，已回退规则过滤: {verdict}')
+    elif _llm_filter_error(verdict):
+        deps.log_to_ui('debug', f'🤖 [LLMFilter] 调用异常，已回退规则过滤: {verdict}')
+    return _llm_filter_outcome(verdict)
+
+
+def should_skip_by_llm_filter_many(contents, deps):
+    """批量版 LLM 硬过滤：返回与 contents 等长的 (skip, reason)，未缓存的评论合并为一次（分块）请求。"""
+    contents = list(contents)
+    results = [(False, '')] * len(contents)
+    if not contents or not deps._llm_filter_is_ready():
+        return results
+    pending = [(idx, text) for idx, text in enumerate(_llm_filter_text(content, deps) for content in contents) if text]
+    if not pending:
+        return results
+    try:
+        verdicts = deps._call_openai_compatible_filter_api_many([text for _, text in pending])
+    except Exception as e:
+        verdicts = [e] * len(pending)
+    errors = [v for v in verdicts if _llm_filter_error(v)]
+    if errors:
+        deps.log_to_ui('debug', f'🤖 [LLMFilter] 批量判定 {len(errors)}/{len(pending)} 条异常，已回退规则过滤: {errors[0]}')
+    for (idx, _), verdict in zip(pending, verdicts):
+        results[idx] = _llm_filter_outcome(verdict)
+    return results
 
 
 def should_skip_content_by_policy(content, deps, allow_llm_hard_filter=None):
@@ -0,0 +1,219 @@
+import hashlib
+import math
+import random
+import threading
+import time
+import unicodedata
+import zlib
+
+from xmonitor.storage.storage_sqlite import (
+    load_intent_training_samples as _load_intent_training_samples,
+    save_intent_training_sample as _save_intent_training_sample,
+)
+
+
+_FEATURE_BITS = 18
+_FEATURE_MASK = (1 << _FEATURE_BITS) - 1
+POSITIVE_INTENT_LEVELS = frozenset({'high', 'medium'})
+
+
+def intent_char_features(text):
+    """字符 1-3 gram 特征哈希到 2^18 维稀疏向量（二值、L2 归一化），返回 {index: value}。"""
+    norm = unicodedata.normalize('NFKC', str(text or '')).lower()
+    compact = ''.join(norm.split())
+    if not compact:
+        return {}
+    padded = f'^{compact}$'
+    indexes = set()
+    for width in (1, 2, 3):
+        for idx in range(len(padded) - width + 1):
+            gram = padded[idx: idx + width]
+            indexes.add(zlib.crc32(f'{width}:{gram}'.encode('utf-8')) & _FEATURE_MASK)
+    value = 1.0 / math.sqrt(len(indexes))
+    return {index: value for index in indexes}
+
+
+def _sigmoid(z):
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    ez = math.exp(z)
+    return ez / (1.0 + ez)
+
+
+class IntentNgramClassifier:
+    """字符 n-gram 逻辑回归：用 LLM 历史判定（medium/high 为正例）训练，输出有购买意向的概率。"""
+
+    def __init__(self):
+        self.weights = {}
+        self.bias = 0.0
+        self.metrics = {}
+
+    def fit(self, samples, epochs=10, learning_rate=1.0, l2=1e-5, seed=7):
+        """samples 为 [(text, label)]；SGD + 类别权重平衡正负样本数。"""
+        rows = [(intent_char_features(text), 1 if label else 0) for text, label in samples]
+        rows = [(features, label) for features, label in rows if features]
+        positives = sum(label for _, label in rows)
+        negatives = len(rows) - positives
+        if not positives or not negatives:
+            return self
+        class_weight = {1: len(rows) / (2.0 * positives), 0: len(rows) / (2.0 * negatives)}
+        rng = random.Random(seed)
+        weights = self.weights
+        for epoch in range(epochs):
+            rng.shuffle(rows)
+            lr = learning_rate / (1.0 + epoch)
+            for features, label in rows:
+                z = self.bias + sum(weights.get(index, 0.0) * value for index, value in features.items())
+                grad = (_sigmoid(z) - label) * class_weight[label]
+                for index, value in features.items():
+                    old = weights.get(index, 0.0)
+                    weights[index] = old - lr * (grad * value + l2 * old)
+                self.bias -= lr * grad
+        return self
+
+    def predict_proba(self, text):
+        features = intent_char_features(text)
+        if not features:
+            return None
+        weights = self.weights
+        return _sigmoid(self.bias + sum(weights.get(index, 0.0) * value for index, value in features.items()))
+
+
+def _confident_label(proba, confidence):
+    if proba is None:
+        return None
+    if proba >= confidence:
+        return 1
+    if proba <= 1.0 - confidence:
+        return 0
+    return None
+
+
+def train_intent_classifier(samples, confidence, min_precision, holdout_ratio=0.2, seed=7):
+    """留出集校验后全量训练；置信区间内的留出准确率低于 min_precision 时返回 (None, metrics)。"""
+    samples = [(str(text), 1 if label else 0) for text, label in samples if str(text or '').strip()]
+    rng = random.Random(seed)
+    shuffled = list(samples)
+    rng.shuffle(shuffled)
+    holdout_size = max(1, int(len(shuffled) * holdout_ratio))
+    holdout, train = shuffled[:holdout_size], shuffled[holdout_size:]
+    probe = IntentNgramClassifier().fit(train, seed=seed)
+    confident = 0
+    correct = 0
+    for text, label in holdout:
+        predicted = _confident_label(probe.predict_proba(text), confidence)
+        if predicted is None:
+            continue
+        confident += 1
+        correct += int(predicted == label)
+    metrics = {
+        'samples': len(samples),
+        'positives': sum(label for _, label in samples),
+        'holdout': len(holdout),
+        'holdout_coverage': round(confident / float(len(holdout)), 3),
+        'holdout_precision': round(correct / float(confident), 3) if confident else 0.0,
+    }
+    if not confident or metrics['holdout_precision'] < min_precision:
+        return None, metrics
+    model = IntentNgramClassifier().fit(samples, seed=seed)
+    model.metrics = dict(metrics, trained_at=time.time())
+    return model, metrics
+
+
+def record_intent_training_sample(content, llm_result, deps):
+    """记录一条 LLM 意向判定作为训练样本；累计到 INTENT_LOCAL_RETRAIN_EVERY 条时后台重训。
+
+    只记录真实 LLM 结果，不回灌本地模型自己的判定，避免自我强化。
+    """
+    if not deps.INTENT_LOCAL_MODEL_ENABLED or not isinstance(llm_result, dict):
+        return
+    text = str(content or '').strip()
+    if not text:
+        return
+    level = str(llm_result.get('intent_level', '') or '').strip().lower()
+    label = 1 if level in POSITIVE_INTENT_LEVELS else 0
+    try:
+        sample_key = hashlib.md5(deps.normalize_content_for_dedupe(text).encode('utf-8')).hexdigest()
+        _save_intent_training_sample(deps, sample_key, text, label, int(llm_result.get('intent_score', 0)), level)
+    except Exception as err:
+        deps.log_to_ui('debug', f'🧠 [LocalIntent] 样本写入失败: {err}')
+        return
+    with deps.local_intent_lock:
+        deps.local_intent_new_samples = int(deps.local_intent_new_samples) + 1
+        due = deps.local_intent_new_samples >= int(deps.INTENT_LOCAL_RETRAIN_EVERY)
+    if due:
+        schedule_local_intent_training(deps)
+
+
+def retrain_local_intent_model(deps):
+    """从 SQLite 读取历史判定并重训；样本不足或未通过留出校验时停用本地层（回到全部走 LLM）。"""
+    samples = _load_intent_training_samples(deps, int(deps.INTENT_LOCAL_MAX_SAMPLES))
+    positives = sum(1 for _, label in samples if label)
+    negatives = len(samples) - positives
+    min_per_class = max(10, int(deps.INTENT_LOCAL_MIN_SAMPLES) // 10)
+    if len(samples) < int(deps.INTENT_LOCAL_MIN_SAMPLES) or positives < min_per_class or negatives < min_per_class:
+        deps.log_to_ui('debug', f'🧠 [LocalIntent] 样本不足 total={len(samples)} pos={positives} neg={negatives}，暂不启用')
+        return None
+    model, metrics = train_intent_classifier(
+        samples,
+        float(deps.INTENT_LOCAL_CONFIDENCE),
+        float(deps.INTENT_LOCAL_MIN_PRECISION),
+    )
+    with deps.local_intent_lock:
+        deps.local_intent_model = model
+    if model is None:
+        deps.log_to_ui('info', f"🧠 本地意向模型未通过校验(precision={metrics['holdout_precision']})，继续全部走 LLM")
+    else:
+        deps.log_to_ui('info', f"🧠 本地意向模型已更新 samples={metrics['samples']} precision={metrics['holdout_precision']} coverage={metrics['holdout_coverage']}")
+    return model
+
+
+def _run_local_intent_training(deps):
+    try:
+        retrain_local_intent_model(deps)
+    except Exception as err:
+        deps.log_to_ui('warn', f'🧠 本地意向模型训练失败: {err}')
+    finally:
+        with deps.local_intent_lock:
+            deps.local_intent_training = False
+
+
+def schedule_local_intent_training(deps):
+    """后台线程重训；同一时间只有一个训练任务。"""
+    if not deps.INTENT_LOCAL_MODEL_ENABLED:
+        return False
+    with deps.local_intent_lock:
+        if deps.local_intent_training:
+            return False
+        deps.local_intent_training = True
+        deps.local_intent_new_samples = 0
+    threading.Thread(target=_run_local_intent_training, args=(deps,), name='local-intent-train', daemon=True).start()
+    return True
+
+
+def local_intent_verdict(content, deps):
+    """本地模型置信时返回与 LLM 结果同结构的判定（含 proba），处于不确定区间或模型未就绪时返回 None。"""
+    if not deps.INTENT_LOCAL_MODEL_ENABLED:
+        return None
+    model = deps.local_intent_model
+    if model is None:
+        return None
+    proba = model.predict_proba(content)
+    label = _confident_label(proba, float(deps.INTENT_LOCAL_CONFIDENCE))
+    if label is None:
+        return None
+    score = max(0, min(100, int(round(proba * 100))))
+    level = deps._score_to_intent_level(score)
+    if label:
+        level = level if level in POSITIVE_INTENT_LEVELS else 'medium'
+    elif level in POSITIVE_INTENT_LEVELS:
+        level = 'low'
+    return {
+        'intent_score': score,
+        'intent_level': level,
+        'is_intent_user': bool(label),
+        'force_notify': False,
+        'buying_signals': ['local_model_intent'] if label else [],
+        'reason': f'local_model p={proba:.2f}',
+        'proba': round(proba, 4),
+    }
@@ -1,150 +1,210 @@
+import functools
+import json
 import re
 import unicodedata
 
+from xmonitor.services.keyword_matcher import get_keyword_matcher
+from xmonitor.services.llm_batcher import batch_results_by_id
+from xmonitor.services.llm_breaker import LlmCircuitOpenError
+from xmonitor.services.llm_client import LLM_BATCH_MAX_TOKENS_CAP
+from xmonitor.storage.llm_verdict_cache import (
+    llm_verdict_key,
+    lookup_llm_verdict,
+    prompt_fingerprint,
+    store_llm_verdict,
+)
+
+
+NEGATIVE_INTENT_REASON_KEYWORDS = (
+    'noise',
+    'low',
+    '噪声',
+    '无意向',
+    '无购买',
+    '非购买',
+    '无关',
+    '不相关',
+    '闲聊',
+    '灌水',
+    '段子',
+    '调侃',
+    '吐槽',
+    '副厂配件',
+    '极影相机',
+    '手机壳',
+    'fotorgear',
+)
+
+# 内置信号词族（compact 文本上匹配），与可配置的 INTENT_* 关键词一起编译进同一匹配器
+SIGNAL_KEYWORD_FAMILIES = (
+    ('perf_intent', ('算力舱', '算力仓', '算力', '配置', '规格', '机型', 'cpu', 'gpu')),
+    ('perf_metric', ('速度', '性能', '跑', '并发', '吞吐', '延迟', '带宽')),
+    ('perf_ask', ('多少', '几个', '能跑', '多快', '怎样', '怎么')),
+    ('business_anchor', ('懒猫', 'lazycat', '微服', '算力舱', '云电脑', '内网穿透', '沙箱', 'openclaw', '私有化', '部署')),
+    ('business_question', ('咨询', '了解', '购买', '报价', '价格', '多少钱', '试用', '部署', '合同', '发票', '联系', '怎么', '如何', '支持')),
+    ('meme_hard', ('压力给到了义乌', '压力给到义乌', '压力给到了', '压力给到')),
+    ('meme_consumer', ('副厂配件', '极影相机', 'vivo好', 'iphone', '安卓', '诺基亚', 'fotorgear', '手机壳', '镜头', '掌中宝', 'v998', '338c')),
+    ('meme_token', ('token',)),
+    ('meme_token_context', ('vivo', '发点', '计费', '烧完', '耗尽', '星期几', '问天气')),
+)
+BUSINESS_CONTACT_ACTION_KEYWORDS = ('咨询', '了解', '报价', '价格', '购买', '试用', '部署', '开通', '合作')
+BUSINESS_QMARK_TOPIC_KEYWORDS = ('企业版', '私有化', '部署', '试用', '采购', '算力', '性能')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SHORT_REPLY_RE = re.compile(r'1{1,4}|\+1{1,4}|扣1{1,4}|扣一')
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_signal_text(content):
+    raw = str(content or '').strip()
+    if not raw:
+        return raw, '', ''
+    norm = unicodedata.normalize('NFKC', raw).lower()
+    compact = _WHITESPACE_RE.sub('', norm)
+    return raw, norm, compact
+
+
+@functools.lru_cache(maxsize=2048)
+def _scan_signal_families(compact):
+    return get_keyword_matcher(SIGNAL_KEYWORD_FAMILIES).hit_families(compact)
+
 
 def is_negative_intent_reason(reason_text):
     """根据判定理由识别明显负向（非购买/噪声）语义。"""
     txt = str(reason_text or '').strip().lower()
     if not txt:
         return False
-    negative_keywords = [
-        'noise',
-        'low',
-        '噪声',
-        '无意向',
-        '无购买',
-        '非购买',
-        '无关',
-        '不相关',
-        '闲聊',
-        '灌水',
-        '段子',
-        '调侃',
-        '吐槽',
-        '副厂配件',
-        '极影相机',
-        '手机壳',
-        'fotorgear',
-    ]
-    return any(keyword in txt for keyword in negative_keywords)
+    matcher = get_keyword_matcher((('negative', NEGATIVE_INTENT_REASON_KEYWORDS),))
+    return bool(matcher.matched_keyword_ids(txt))
 
 
 def find_keyword_hits(text_lower, keywords):
-    hits = []
     src = str(text_lower or '').lower()
     if not src:
-        return hits
-    for kw in keywords:
-        kw_norm = str(kw or '').strip().lower()
-        if kw_norm and kw_norm in src and kw_norm not in hits:
-            hits.append(kw_norm)
-    return hits
+        return []
+    return get_keyword_matcher((('hits', keywords),)).scan(src)['hits']
+
+
+def intent_keyword_families(deps):
+    return (
+        ('force', deps.INTENT_FORCE_NOTIFY_KEYWORDS),
+        ('product', deps.INTENT_PRODUCT_KEYWORDS),
+        ('contact', deps.INTENT_CONTACT_KEYWORDS),
+        ('consult', deps.INTENT_CONSULT_KEYWORDS),
+        ('non_target', deps.INTENT_NON_TARGET_TOPIC_KEYWORDS),
+        ('contact_action', BUSINESS_CONTACT_ACTION_KEYWORDS),
+        ('qmark_topic', BUSINESS_QMARK_TOPIC_KEYWORDS),
+    )
+
+
+def scan_intent_keyword_families(text_lower, deps):
+    """一次扫描返回全部意向关键词族命中；关键词配置变化时匹配器自动重建。"""
+    return get_keyword_matcher(intent_keyword_families(deps)).scan(text_lower)
 
 
 def is_short_reply_intent_signal(content):
-    raw = str(content or '').strip()
-    if not raw:
+    _, _, compact = _normalize_signal_text(content)
+    if not compact:
         return False
-    norm = unicodedata.normalize('NFKC', raw).lower()
-    compact = re.sub(r'\s+', '', norm)
-    compact = compact.replace('＋', '+')
-    if re.fullmatch(r'1{1,4}', compact):
-        return True
-    if re.fullmatch(r'\+1{1,4}', compact):
-        return True
-    if re.fullmatch(r'扣1{1,4}', compact) or compact == '扣一':
-        return True
-    return False
+    return bool(_SHORT_REPLY_RE.fullmatch(compact.replace('＋', '+')))
 
 
 def is_performance_consult_signal(content):
-    raw = str(content or '').strip()
-    if not raw:
-        return False
-    norm = unicodedata.normalize('NFKC', raw).lower()
-    compact = re.sub(r'\s+', '', norm)
+    raw, norm, compact = _normalize_signal_text(content)
     if not compact:
         return False
-    intent_anchor = any(k in compact for k in ['算力舱', '算力仓', '算力', '配置', '规格', '机型', 'cpu', 'gpu'])
-    perf_anchor = any(k in compact for k in ['速度', '性能', '跑', '并发', '吞吐', '延迟', '带宽'])
-    ask_anchor = ('?' in norm) or ('？' in raw) or any(k in compact for k in ['多少', '几个', '能跑', '多快', '怎样', '怎么'])
+    families = _scan_signal_families(compact)
+    intent_anchor = 'perf_intent' in families
+    perf_anchor = 'perf_metric' in families
+    ask_anchor = ('?' in norm) or ('？' in raw) or ('perf_ask' in families)
     return bool((intent_anchor and perf_anchor) or (intent_anchor and ask_anchor))
 
 
 def is_non_business_meme_signal(content):
-    raw = str(content or '').strip()
-    if not raw:
-        return False
-    norm = unicodedata.normalize('NFKC', raw).lower()
-    compact = re.sub(r'\s+', '', norm)
+    _, _, compact = _normalize_signal_text(content)
     if not compact:
         return False
-    business_anchors = ['懒猫', 'lazycat', '微服', '算力舱', '云电脑', '内网穿透', '沙箱', 'openclaw', '私有化', '部署']
-    has_business_context = any(k in compact for k in business_anchors)
-    has_business_question = any(
-        k in compact for k in ['咨询', '了解', '购买', '报价', '价格', '多少钱', '试用', '部署', '合同', '发票', '联系', '怎么', '如何', '支持']
-    )
-    hard_meme_patterns = ['压力给到了义乌', '压力给到义乌', '压力给到了', '压力给到']
-    if any(p in compact for p in hard_meme_patterns):
+    families = _scan_signal_families(compact)
+    has_business_context = 'business_anchor' in families
+    has_business_question = 'business_question' in families
+    if 'meme_hard' in families:
         return True
-    consumer_patterns = ['副厂配件', '极影相机', 'vivo好', 'iphone', '安卓', '诺基亚', 'fotorgear', '手机壳', '镜头', '掌中宝', 'v998', '338c']
-    if any(p in compact for p in consumer_patterns) and not (has_business_context and has_business_question):
+    if 'meme_consumer' in families and not (has_business_context and has_business_question):
         return True
-    if 'token' in compact and any(k in compact for k in ['vivo', '发点', '计费', '烧完', '耗尽', '星期几', '问天气']):
+    if 'meme_token' in families and 'meme_token_context' in families:
         if has_business_context and has_business_question:
             return False
         return True
     return False
 
 
-def is_business_consult_signal(content, deps):
+def is_business_consult_signal(content, deps, keyword_hits=None):
+    """keyword_hits 可传入调用方已做过的词族扫描结果，避免同一文本重复扫描。"""
     text = deps._normalize_content_for_filter(content)
     if not text:
         return False
-    text_low = text.lower()
-    consult_hits = find_keyword_hits(text_low, deps.INTENT_CONSULT_KEYWORDS)
-    if not consult_hits:
+    if keyword_hits is None:
+        keyword_hits = deps._scan_intent_keyword_families(text.lower())
+    if not keyword_hits['consult']:
         return False
-    product_hits = find_keyword_hits(text_low, deps.INTENT_PRODUCT_KEYWORDS)
-    contact_hits = find_keyword_hits(text_low, deps.INTENT_CONTACT_KEYWORDS)
     has_qmark = ('?' in text) or ('？' in text)
-    if product_hits:
+    if keyword_hits['product']:
         return True
-    if contact_hits and any(k in text_low for k in ['咨询', '了解', '报价', '价格', '购买', '试用', '部署', '开通', '合作']):
+    if keyword_hits['contact'] and keyword_hits['contact_action']:
         return True
-    if has_qmark and any(k in text_low for k in ['企业版', '私有化', '部署', '试用', '采购', '算力', '性能']):
+    if has_qmark and keyword_hits['qmark_topic']:
         return True
     return False
 
 
+INTENT_PROMPT_FIELDS = (
+    '字段:\n'
+    '- intent_score: 0-100\n'
+    '- intent_level: high|medium|low|noise\n'
+    '- is_intent_user: true/false\n'
+    '- force_notify: true/false\n'
+    '- buying_signals: string[]\n'
+    '- reason: string\n\n'
+)
+INTENT_PROMPT_CONTEXT = (
+    '业务背景（来自 lazycat.cloud 官网）:\n'
+    '懒猫微服（LazyCat）提供应用云电脑、内网穿透、沙箱隔离、一站式部署（含大模型部署）等能力，主打按需付费。\n'
+    '常见购买场景包括：询价/报价、套餐选择、试用开通、企业或教育部署、售后与续费咨询。\n\n'
+    '判定原则(销售线索优先):\n'
+    '1) 明确购买/询价/报价/价格/下单/试用/部署/联系方式咨询（微信/vx/whatsapp）=> medium/high。\n'
+    '2) 仅情绪表达、闲聊、纯表情、无意义灌水 => low/noise。\n'
+    '2.1) 网络梗/段子（例如“压力给到了义乌”）按无业务相关处理，判定 noise。\n'
+    '2.2) 对 token 计费的吐槽、手机品牌讨论（如 vivo）、副厂配件/极影相机等非购买讨论，判定 noise。\n'
+    '2.3) 手机/数码消费品讨论（如 iPhone/安卓/诺基亚/Fotorgear/掌中宝/v998/338c/镜头/手机壳），即使出现价格词，也判定 noise。\n'
+    '3) 出现“多少钱/什么价格/怎么买/购买方式/开票/合同/授权/代理/优惠”等词时，提高意向分。\n'
+    '4) “1/11/111/+1/扣1”这类短回复在“回复你”通知中通常代表愿意沟通，至少判为 medium。\n'
+    '5) force_notify 在强意向线索时设为 true（询价、采购、留联系方式、明确要买/试用/部署）。\n'
+    '6) 若涉及本产品功能/性能/部署/试用等咨询但信息不完整，宁可判为 medium，也不要判 low/noise。\n'
+)
+
+
 def build_intent_analysis_prompt(content, deps):
     default_prompt = (
         '你是销售线索意向识别器。请严格输出JSON对象，不要输出任何解释文本。\n'
-        '字段:\n'
-        '- intent_score: 0-100\n'
-        '- intent_level: high|medium|low|noise\n'
-        '- is_intent_user: true/false\n'
-        '- force_notify: true/false\n'
-        '- buying_signals: string[]\n'
-        '- reason: string\n\n'
-        '业务背景（来自 lazycat.cloud 官网）:\n'
-        '懒猫微服（LazyCat）提供应用云电脑、内网穿透、沙箱隔离、一站式部署（含大模型部署）等能力，主打按需付费。\n'
-        '常见购买场景包括：询价/报价、套餐选择、试用开通、企业或教育部署、售后与续费咨询。\n\n'
-        '判定原则(销售线索优先):\n'
-        '1) 明确购买/询价/报价/价格/下单/试用/部署/联系方式咨询（微信/vx/whatsapp）=> medium/high。\n'
-        '2) 仅情绪表达、闲聊、纯表情、无意义灌水 => low/noise。\n'
-        '2.1) 网络梗/段子（例如“压力给到了义乌”）按无业务相关处理，判定 noise。\n'
-        '2.2) 对 token 计费的吐槽、手机品牌讨论（如 vivo）、副厂配件/极影相机等非购买讨论，判定 noise。\n'
-        '2.3) 手机/数码消费品讨论（如 iPhone/安卓/诺基亚/Fotorgear/掌中宝/v998/338c/镜头/手机壳），即使出现价格词，也判定 noise。\n'
-        '3) 出现“多少钱/什么价格/怎么买/购买方式/开票/合同/授权/代理/优惠”等词时，提高意向分。\n'
-        '4) “1/11/111/+1/扣1”这类短回复在“回复你”通知中通常代表愿意沟通，至少判为 medium。\n'
-        '5) force_notify 在强意向线索时设为 true（询价、采购、留联系方式、明确要买/试用/部署）。\n'
-        '6) 若涉及本产品功能/性能/部署/试用等咨询但信息不完整，宁可判为 medium，也不要判 low/noise。\n'
-        f'评论内容: {content}'
+        + INTENT_PROMPT_FIELDS
+        + INTENT_PROMPT_CONTEXT
+        + f'评论内容: {content}'
     )
     return deps._render_llm_prompt_template(deps.LLM_INTENT_PROMPT_TEMPLATE, content, default_prompt)
 
 
+def build_intent_batch_prompt(contents):
+    """多条评论合并为一个结构化 prompt：业务背景只出现一次，按 id 返回逐条结果。"""
+    items = [{'id': idx, 'text': str(text or '')} for idx, text in enumerate(contents, start=1)]
+    return (
+        '你是销售线索意向识别器。下面给出多条互相独立的评论（JSON 数组，含 id 与 text），请逐条判定。\n'
+        '严格输出JSON对象 {"results": [...]}，每条评论对应一个元素，元素必须包含 id 以及以下字段，reason 不超过20字。\n'
+        + INTENT_PROMPT_FIELDS
+        + INTENT_PROMPT_CONTEXT
+        + f'评论列表: {json.dumps(items, ensure_ascii=False)}'
+    )
+
+
 def should_notify_voice_by_intent(analysis):
     """语音播报门槛：低意向/噪声不播报，强意向或中高分才播报。"""
     if not isinstance(analysis, dict):
@@ -178,17 +238,17 @@ def rule_based_intent_analysis(content, deps):
         return {'intent_score': 62, 'intent_level': 'medium', 'signals': ['short_reply_intent_signal'], 'force_notify': True, 'block_intent': False, 'force_keywords': ['short_reply_signal'], 'non_target_keywords': []}
     if deps._is_performance_consult_signal(text):
         return {'intent_score': 72, 'intent_level': 'medium', 'signals': ['performance_consult_signal'], 'force_notify': True, 'block_intent': False, 'force_keywords': ['performance_consult'], 'non_target_keywords': []}
-    if deps._is_business_consult_signal(text):
+    keyword_hits = deps._scan_intent_keyword_families(text.lower())
+    if deps._is_business_consult_signal(text, keyword_hits=keyword_hits):
         return {'intent_score': 68, 'intent_level': 'medium', 'signals': ['business_consult_signal'], 'force_notify': True, 'block_intent': False, 'force_keywords': ['business_consult'], 'non_target_keywords': []}
     if deps._is_non_business_meme_signal(text):
         return {'intent_score': 8, 'intent_level': 'noise', 'signals': ['non_business_meme_signal'], 'force_notify': False, 'block_intent': True, 'force_keywords': [], 'non_target_keywords': ['meme']}
 
-    text_low = text.lower()
-    force_hits = deps._find_keyword_hits(text_low, deps.INTENT_FORCE_NOTIFY_KEYWORDS)
-    product_hits = deps._find_keyword_hits(text_low, deps.INTENT_PRODUCT_KEYWORDS)
-    contact_hits = deps._find_keyword_hits(text_low, deps.INTENT_CONTACT_KEYWORDS)
-    consult_hits = deps._find_keyword_hits(text_low, deps.INTENT_CONSULT_KEYWORDS)
-    non_target_hits = deps._find_keyword_hits(text_low, deps.INTENT_NON_TARGET_TOPIC_KEYWORDS)
+    force_hits = keyword_hits['force']
+    product_hits = keyword_hits['product']
+    contact_hits = keyword_hits['contact']
+    consult_hits = keyword_hits['consult']
+    non_target_hits = keyword_hits['non_target']
 
     text_len = len(text)
     if text_len <= 2:
@@ -247,17 +307,8 @@ def rule_based_intent_analysis(content, deps):
     }
 
 
-def llm_intent_analysis(content, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
-    prompt = deps._build_intent_analysis_prompt(content)
-    result_obj, _ = deps._call_openai_compatible_json(
-        'You are a strict JSON intent classifier.',
-        prompt,
-        base_url=base_url,
-        api_key=api_key,
-        model=model,
-        timeout_sec=timeout_sec,
-        max_tokens=180,
-    )
+def coerce_llm_intent_result(result_obj, deps):
+    """把模型返回的 JSON 对象规整为意向结果；无效返回 None。"""
     if not isinstance(result_obj, dict) or not result_obj:
         return None
     try:
@@ -305,32 +356,88 @@ def llm_intent_analysis(content, deps, *, base_url=None, api_key=None, model=Non
     }
 
 
-def analyze_comment_intent(content, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
-    _normalize_content_for_filter = deps._normalize_content_for_filter
-    _normalize_one_line = deps._normalize_one_line
-    log_to_ui = deps.log_to_ui
-    _llm_runtime_ready = deps._llm_runtime_ready
-    _is_negative_intent_reason = deps._is_negative_intent_reason
-    INTENT_LLM_PRIMARY_MODE = deps.INTENT_LLM_PRIMARY_MODE
-    _score_to_intent_level = deps._score_to_intent_level
-    _intent_level_rank = deps._intent_level_rank
-    _max_intent_level = deps._max_intent_level
-    text = _normalize_content_for_filter(content)
+def llm_intent_analysis_single(content, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
+    prompt = deps._build_intent_analysis_prompt(content)
+    result_obj, _ = deps._call_openai_compatible_json(
+        'You are a strict JSON intent classifier.',
+        prompt,
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        timeout_sec=timeout_sec,
+        max_tokens=180,
+    )
+    return coerce_llm_intent_result(result_obj, deps)
+
+
+def llm_intent_analysis_batch(contents, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
+    """一次请求判定多条评论，返回与 contents 等长的列表；缺失或无效的条目为 None。"""
+    contents = list(contents)
+    result_obj, _ = deps._call_openai_compatible_json(
+        'You are a strict JSON intent classifier.',
+        build_intent_batch_prompt(contents),
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        timeout_sec=timeout_sec,
+        max_tokens=60 + 120 * len(contents),
+        max_tokens_cap=LLM_BATCH_MAX_TOKENS_CAP,
+    )
+    return [coerce_llm_intent_result(obj, deps) for obj in batch_results_by_id(result_obj, len(contents))]
+
+
+def intent_verdict_cache_key(content, model, deps, base_url=None):
+    prompt_fp = prompt_fingerprint(
+        'intent',
+        deps.LLM_INTENT_PROMPT_TEMPLATE or (INTENT_PROMPT_FIELDS + INTENT_PROMPT_CONTEXT),
+    )
+    model_name = model if model is not None else deps.LLM_FILTER_MODEL
+    endpoint = base_url if base_url is not None else deps.LLM_FILTER_BASE_URL
+    return llm_verdict_key('intent', deps.normalize_content_for_dedupe(content), model_name, prompt_fp, endpoint)
+
+
+def llm_intent_analysis(content, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
+    """意向判定入口：先查持久化判定缓存；未命中时经微批合并请求（自定义 prompt 模板时逐条调用）。
+
+    缓存的是与规则融合前的 LLM 结果，规则关键词调整后仍按新规则重新融合。
+    """
+    cache_key = intent_verdict_cache_key(content, model, deps, base_url=base_url)
+    cached = lookup_llm_verdict(deps, cache_key)
+    if cached is not None:
+        return cached
+    if deps.llm_breaker.rejecting():
+        raise LlmCircuitOpenError('LLM 熔断中，跳过意向判定')
+    params = {'base_url': base_url, 'api_key': api_key, 'model': model, 'timeout_sec': timeout_sec}
+    if deps.LLM_INTENT_PROMPT_TEMPLATE or deps.LLM_BATCH_MAX_ITEMS <= 1:
+        result = llm_intent_analysis_single(content, deps, **params)
+    else:
+        result = deps.llm_intent_batcher.submit(
+            tuple(sorted(params.items())),
+            content,
+            run_batch_fn=lambda key, items: llm_intent_analysis_batch(items, deps, **dict(key)),
+            run_single_fn=lambda key, item: llm_intent_analysis_single(item, deps, **dict(key)),
+        )
+    if isinstance(result, dict):
+        store_llm_verdict(deps, cache_key, 'intent', result)
+        deps._record_intent_training_sample(content, result)
+    return result
+
+
+def rule_only_intent_result(content, deps):
+    """仅规则分析的完整结果结构（reason=rule_only），供 LLM 不可用或异步升级前的临时结果使用。"""
+    text = deps._normalize_content_for_filter(content)
     rule_result = rule_based_intent_analysis(text, deps)
     rule_score = int(rule_result.get('intent_score', 0))
     rule_level = str(rule_result.get('intent_level', 'noise'))
-    rule_signals = list(rule_result.get('signals', []))
     rule_force_notify = bool(rule_result.get('force_notify', False))
-    rule_block_intent = bool(rule_result.get('block_intent', False))
-
-    result = {
+    return {
         'content': text,
         'intent_score': rule_score,
         'intent_level': rule_level,
         'is_intent_user': bool(rule_force_notify or rule_score >= 55),
         'force_notify': bool(rule_force_notify),
-        'block_intent': bool(rule_block_intent),
-        'signals': list(rule_signals),
+        'block_intent': bool(rule_result.get('block_intent', False)),
+        'signals': list(rule_result.get('signals', [])),
         'reason': 'rule_only',
         'rule_score': rule_score,
         'rule_level': rule_level,
@@ -342,21 +449,54 @@ def analyze_comment_intent(content, deps, *, base_url=None, api_key=None, model=
         'llm_level': '',
         'llm_reason': '',
         'llm_error': '',
+        'local_model_used': False,
+        'local_model_proba': None,
     }
+
+
+def analyze_comment_intent(content, deps, *, base_url=None, api_key=None, model=None, timeout_sec=None):
+    _normalize_one_line = deps._normalize_one_line
+    log_to_ui = deps.log_to_ui
+    _llm_runtime_ready = deps._llm_runtime_ready
+    _is_negative_intent_reason = deps._is_negative_intent_reason
+    INTENT_LLM_PRIMARY_MODE = deps.INTENT_LLM_PRIMARY_MODE
+    _score_to_intent_level = deps._score_to_intent_level
+    _intent_level_rank = deps._intent_level_rank
+    _max_intent_level = deps._max_intent_level
+    result = rule_only_intent_result(content, deps)
+    text = result['content']
+    rule_score = result['rule_score']
+    rule_level = result['rule_level']
+    rule_signals = list(result['signals'])
+    rule_force_notify = result['rule_force_notify']
+    rule_block_intent = result['block_intent']
+
     preview = _normalize_one_line(text, 120) if text else ''
     log_to_ui('debug', f'🤖 [Intent] analyze_start len={len(text)} rule_score={rule_score} text={preview}')
-    if not _llm_runtime_ready(base_url=base_url, model=model):
+    local_result = deps._local_intent_verdict(text) if text else None
+    if local_result is not None:
+        llm_result = local_result
+        log_to_ui('debug', f"🤖 [Intent] local_model_confident p={local_result['proba']} -> skip_llm")
+    elif not _llm_runtime_ready(base_url=base_url, model=model):
         log_to_ui('debug', '🤖 [Intent] llm_skip runtime_not_ready -> rule_only')
         return result
-    try:
-        llm_result = llm_intent_analysis(text, deps, base_url=base_url, api_key=api_key, model=model, timeout_sec=timeout_sec)
-        if not llm_result:
-            log_to_ui('debug', '🤖 [Intent] llm_empty_result -> rule_only')
+    else:
+        try:
+            llm_result = llm_intent_analysis(text, deps, base_url=base_url, api_key=api_key, model=model, timeout_sec=timeout_sec)
+            if not llm_result:
+                log_to_ui('debug', '🤖 [Intent] llm_empty_result -> rule_only')
+                return result
+        except LlmCircuitOpenError as e:
+            result['llm_error'] = str(e)
+            log_to_ui('debug', f'🤖 [Intent] llm_circuit_open -> rule_only: {e}')
             return result
-    except Exception as e:
-        result['llm_error'] = str(e)
-        log_to_ui('warn', f'🤖 [Intent] llm_error: {e}')
-        return result
+        except Exception as e:
+            result['llm_error'] = str(e)
+            log_to_ui('warn', f'🤖 [Intent] llm_error: {e}')
+            return result
+    model_fields = {'llm_used': True}
+    if local_result is not None:
+        model_fields = {'llm_used': False, 'local_model_used': True, 'local_model_proba': local_result['proba']}
 
     llm_score = int(llm_result.get('intent_score', 0))
     llm_level = str(llm_result.get('intent_level', 'noise'))
@@ -405,7 +545,7 @@ def analyze_comment_intent(content, deps, *, base_url=None, api_key=None, model=
             'block_intent': bool(final_block),
             'signals': merged_signals[:12],
             'reason': llm_reason or 'llm_primary',
-            'llm_used': True,
+            **model_fields,
             'llm_score': llm_score,
             'llm_level': llm_level,
             'llm_reason': llm_reason,
@@ -439,7 +579,7 @@ def analyze_comment_intent(content, deps, *, base_url=None, api_key=None, model=
         'force_notify': bool(blended_force_notify),
         'signals': merged_signals[:12],
         'reason': llm_reason or 'rule_llm_blended',
-        'llm_used': True,
+        **model_fields,
         'llm_score': llm_score,
         'llm_level': llm_level,
         'llm_reason': llm_reason,
@@ -0,0 +1,130 @@
+import functools
+import re
+
+
+class KeywordMatcher:
+    """多关键词族匹配器：单个预编译交替正则一次扫描返回所有族的命中。
+
+    families 为 ((族名, 关键词序列), ...)；关键词统一 strip + lower。
+    正则先用首字符集快速跳过无关位置，再按“最长优先”做零宽前瞻，同一位置上更短的命中必然是最长命中的前缀，
+    因此预先计算前缀闭包即可补全重叠命中，结果与逐个 `kw in text` 一致。
+    """
+
+    def __init__(self, families):
+        self.family_names = []
+        self._keywords = []
+        self._keyword_owners = []
+        keyword_index = {}
+        for name, keywords in families:
+            if name not in self.family_names:
+                self.family_names.append(name)
+            ordered = []
+            for kw in keywords or ():
+                kw_norm = str(kw or '').strip().lower()
+                if not kw_norm or kw_norm in ordered:
+                    continue
+                ordered.append(kw_norm)
+                idx = keyword_index.get(kw_norm)
+                if idx is None:
+                    idx = len(self._keywords)
+                    keyword_index[kw_norm] = idx
+                    self._keywords.append(kw_norm)
+                    self._keyword_owners.append([])
+                self._keyword_owners[idx].append((name, len(ordered) - 1))
+        self._prefix_closure = {}
+        for kw in self._keywords:
+            self._prefix_closure[kw] = frozenset(
+                keyword_index[kw[:end]] for end in range(1, len(kw) + 1) if kw[:end] in keyword_index
+            )
+        self._family_closure = {
+            kw: frozenset(name for idx in ids for name, _ in self._keyword_owners[idx])
+            for kw, ids in self._prefix_closure.items()
+        }
+        if self._keywords:
+            first_chars = ''.join(sorted({re.escape(kw[0]) for kw in self._keywords}))
+            alternation = '|'.join(re.escape(kw) for kw in sorted(self._keywords, key=len, reverse=True))
+            self._pattern = re.compile(f'(?=[{first_chars}])(?=({alternation}))')
+        else:
+            self._pattern = None
+
+    def _longest_hits(self, text):
+        if self._pattern is None:
+            return set()
+        src = str(text or '').lower()
+        if not src:
+            return set()
+        return {match.group(1) for match in self._pattern.finditer(src)}
+
+    def matched_keyword_ids(self, text):
+        found = set()
+        for kw in self._longest_hits(text):
+            found.update(self._prefix_closure[kw])
+        return found
+
+    def scan(self, text):
+        """返回 {族名: [命中关键词...]}（按族内原始顺序），未命中的族为空列表。"""
+        hits = {name: [] for name in self.family_names}
+        found = self.matched_keyword_ids(text)
+        if not found:
+            return hits
+        ranked = {}
+        for idx in found:
+            for name, order in self._keyword_owners[idx]:
+                ranked.setdefault(name, []).append((order, self._keywords[idx]))
+        for name, pairs in ranked.items():
+            pairs.sort()
+            hits[name] = [kw for _, kw in pairs]
+        return hits
+
+    def hit_families(self, text):
+        families = set()
+        for kw in self._longest_hits(text):
+            families.update(self._family_closure[kw])
+        return families
+
+
+def _freeze_families(families):
+    return tuple((str(name), tuple(keywords or ())) for name, keywords in families)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_keyword_matcher(frozen_families):
+    return KeywordMatcher(frozen_families)
+
+
+_IDENTITY_CACHE_MAX = 64
+_identity_cache = {}
+
+
+def _keywords_snapshot(keywords):
+    if keywords is None or isinstance(keywords, (tuple, frozenset, str)):
+        return keywords
+    return list(keywords)
+
+
+def get_keyword_matcher(families):
+    """按关键词内容缓存编译结果；关键词配置变化时自动重建。
+
+    热路径先按各族关键词序列的对象身份命中缓存（列表再做一次逐元素快照比对以发现原地修改），
+    只有身份未命中时才冻结 + 哈希全部关键词。
+    """
+    families = tuple(families)
+    key = tuple((name, id(keywords)) for name, keywords in families)
+    entry = _identity_cache.get(key)
+    if entry is not None:
+        sources, snapshots, matcher = entry
+        if all(
+            src is keywords and (snap is keywords or snap == keywords)
+            for src, snap, (_, keywords) in zip(sources, snapshots, families)
+        ):
+            return matcher
+    matcher = _build_keyword_matcher(_freeze_families(families))
+    if len(_identity_cache) >= _IDENTITY_CACHE_MAX:
+        _identity_cache.clear()
+    # 保留源对象引用，避免 id 被回收复用后误命中
+    _identity_cache[key] = (
+        tuple(keywords for _, keywords in families),
+        tuple(_keywords_snapshot(keywords) for _, keywords in families),
+        matcher,
+    )
+    return matcher
@@ -0,0 +1,146 @@
+import threading
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.items = []
+        self.results = []
+        self.closed = False
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class LlmMicroBatcher:
+    """LLM 请求微批：同参数请求在已有调用在途时合并为一次调用。
+
+    无人等待且无请求在途时直接执行单条调用，不付出窗口延迟；否则第一个到达的调用方成为 leader，
+    等待 window_sec 或凑满 max_items 后执行批量调用并分发结果，其余调用方阻塞等待。
+    调用方已持有多条请求（如扫描末尾）时用 run_many 直接分块批量执行。
+    批量结果缺失或解析失败的条目逐条回退为单条调用。
+    """
+
+    def __init__(self, max_items=6, window_sec=0.3):
+        self.max_items = max(1, int(max_items))
+        self.window_sec = max(0.0, float(window_sec))
+        self._open = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'batched_items': 0, 'single_fallbacks': 0, 'direct_calls': 0}
+
+    def _enter_flight(self, key):
+        self._inflight[key] = self._inflight.get(key, 0) + 1
+
+    def _leave_flight(self, key):
+        with self._lock:
+            remaining = self._inflight.get(key, 0) - 1
+            if remaining > 0:
+                self._inflight[key] = remaining
+            else:
+                self._inflight.pop(key, None)
+
+    def submit(self, key, item, *, run_batch_fn, run_single_fn):
+        """提交单个请求并返回其结果；run_batch_fn(key, items) 返回与 items 等长的列表，None 表示该项需单条回退。"""
+        if self.max_items <= 1:
+            return run_single_fn(key, item)
+        with self._lock:
+            batch = self._open.get(key)
+            joinable = batch is not None and not batch.closed and len(batch.items) < self.max_items
+            direct = (not joinable) and self._inflight.get(key, 0) <= 0
+            if direct:
+                self._enter_flight(key)
+                self.stats['direct_calls'] += 1
+            else:
+                is_leader = not joinable
+                if is_leader:
+                    batch = _PendingBatch()
+                    self._open[key] = batch
+                index = len(batch.items)
+                batch.items.append(item)
+                if len(batch.items) >= self.max_items:
+                    batch.full.set()
+        if direct:
+            try:
+                return run_single_fn(key, item)
+            finally:
+                self._leave_flight(key)
+        if is_leader:
+            batch.full.wait(self.window_sec)
+            with self._lock:
+                batch.closed = True
+                if self._open.get(key) is batch:
+                    self._open.pop(key, None)
+                self._enter_flight(key)
+            try:
+                self._execute(key, batch, run_batch_fn, run_single_fn)
+            finally:
+                self._leave_flight(key)
+                batch.done.set()
+        else:
+            batch.done.wait()
+        ok, value = batch.results[index]
+        if not ok:
+            raise value
+        return value
+
+    def run_many(self, key, items, *, run_batch_fn, run_single_fn):
+        """一次性执行调用方已持有的多条请求：按 max_items 分块批量调用，不等待窗口。
+
+        返回与 items 等长的 [(ok, 结果或异常)]。
+        """
+        items = list(items)
+        results = []
+        for start in range(0, len(items), self.max_items):
+            batch = _PendingBatch()
+            batch.items = items[start:start + self.max_items]
+            self._execute(key, batch, run_batch_fn, run_single_fn)
+            results.extend(batch.results)
+        return results
+
+    def _run_single(self, key, item, run_single_fn):
+        try:
+            return True, run_single_fn(key, item)
+        except Exception as err:
+            return False, err
+
+    def _execute(self, key, batch, run_batch_fn, run_single_fn):
+        items = list(batch.items)
+        if len(items) == 1:
+            batch.results = [self._run_single(key, items[0], run_single_fn)]
+            return
+        try:
+            batch_values = list(run_batch_fn(key, items) or [])
+        except Exception:
+            batch_values = []
+        if len(batch_values) != len(items):
+            batch_values = [None] * len(items)
+        results = []
+        fallbacks = 0
+        for item, value in zip(items, batch_values):
+            if value is None:
+                fallbacks += 1
+                results.append(self._run_single(key, item, run_single_fn))
+            else:
+                results.append((True, value))
+        batch.results = results
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['batched_items'] += len(items) - fallbacks
+            self.stats['single_fallbacks'] += fallbacks
+
+
+def batch_results_by_id(result_obj, count):
+    """从 {"results": [{"id": n, ...}]} 中按 id(1..count) 取出逐条结果；缺失为 None。"""
+    rows = result_obj.get('results') if isinstance(result_obj, dict) else None
+    if not isinstance(rows, list):
+        return [None] * count
+    by_id = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        try:
+            row_id = int(row.get('id'))
+        except Exception:
+            continue
+        if 1 <= row_id <= count and row_id not in by_id:
+            by_id[row_id] = row
+    return [by_id.get(idx) for idx in range(1, count + 1)]
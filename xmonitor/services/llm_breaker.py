@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+
+
+class LlmCircuitOpenError(RuntimeError):
+    """熔断器打开期间直接拒绝 LLM 调用，调用方按既有异常路径回退规则结果。"""
+
+
+class LlmCircuitBreaker:
+    """LLM 调用熔断器：滚动窗口内错误率或 p95 延迟超阈值即打开，冷却后放行半开探测请求。
+
+    closed: 正常放行并记录结果；open: 冷却期内立即拒绝；half_open: 只放行 half_open_probes 个探测，
+    探测成功则关闭并清空窗口，失败则重新打开且冷却时间翻倍（上限 max_open_sec）。
+    """
+
+    def __init__(
+        self,
+        window_size=20,
+        min_calls=5,
+        error_rate_threshold=0.5,
+        slow_p95_sec=20.0,
+        open_sec=30.0,
+        max_open_sec=300.0,
+        half_open_probes=1,
+        clock=time.monotonic,
+    ):
+        self.min_calls = max(1, int(min_calls))
+        self.error_rate_threshold = max(0.0, min(1.0, float(error_rate_threshold)))
+        self.slow_p95_sec = max(0.1, float(slow_p95_sec))
+        self.open_sec = max(1.0, float(open_sec))
+        self.max_open_sec = max(self.open_sec, float(max_open_sec))
+        self.half_open_probes = max(1, int(half_open_probes))
+        self._clock = clock
+        self._window = deque(maxlen=max(self.min_calls, int(window_size)))
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._open_until = 0.0
+        self._current_open_sec = self.open_sec
+        self._probes_inflight = 0
+        self._last_reason = ''
+
+    def _p95(self):
+        latencies = sorted(latency for _, latency in self._window)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def _trip(self, now, reason):
+        self._state = 'open'
+        self._open_until = now + self._current_open_sec
+        self._probes_inflight = 0
+        self._last_reason = reason
+
+    def rejecting(self):
+        """只读判断：当前是否会拒绝新请求（不占用半开探测名额）。"""
+        with self._lock:
+            if self._state == 'open':
+                return self._clock() < self._open_until
+            if self._state == 'half_open':
+                return self._probes_inflight >= self.half_open_probes
+            return False
+
+    def before_call(self):
+        """请求前调用：放行则返回，拒绝时抛 LlmCircuitOpenError。"""
+        with self._lock:
+            now = self._clock()
+            if self._state == 'open' and now >= self._open_until:
+                self._state = 'half_open'
+                self._probes_inflight = 0
+            if self._state == 'closed':
+                return
+            if self._state == 'half_open' and self._probes_inflight < self.half_open_probes:
+                self._probes_inflight += 1
+                return
+            remain = max(0.0, self._open_until - now)
+            raise LlmCircuitOpenError(f'LLM 熔断中({self._last_reason})，约 {remain:.0f}s 后探测恢复')
+
+    def record(self, ok, latency_sec):
+        """请求结束后记录结果与耗时，并按窗口统计决定状态迁移。"""
+        with self._lock:
+            now = self._clock()
+            if self._state == 'half_open':
+                self._probes_inflight = max(0, self._probes_inflight - 1)
+                if ok and latency_sec < self.slow_p95_sec:
+                    self._state = 'closed'
+                    self._current_open_sec = self.open_sec
+                    self._window.clear()
+                else:
+                    self._current_open_sec = min(self.max_open_sec, self._current_open_sec * 2)
+                    self._trip(now, 'probe_failed' if not ok else 'probe_slow')
+                return
+            if self._state == 'open':
+                return
+            self._window.append((bool(ok), max(0.0, float(latency_sec))))
+            if len(self._window) < self.min_calls:
+                return
+            errors = sum(1 for item_ok, _ in self._window if not item_ok)
+            error_rate = errors / len(self._window)
+            if error_rate >= self.error_rate_threshold:
+                self._trip(now, f'error_rate={error_rate:.2f}')
+            elif self._p95() >= self.slow_p95_sec:
+                self._trip(now, f'p95={self._p95():.1f}s')
+
+    def force_half_open(self):
+        """手动测试连接时立即放行一次探测。"""
+        with self._lock:
+            if self._state == 'open':
+                self._state = 'half_open'
+                self._probes_inflight = 0
+
+    def reset(self):
+        with self._lock:
+            self._state = 'closed'
+            self._window.clear()
+            self._probes_inflight = 0
+            self._current_open_sec = self.open_sec
+            self._last_reason = ''
+
+    def snapshot(self):
+        with self._lock:
+            calls = len(self._window)
+            errors = sum(1 for item_ok, _ in self._window if not item_ok)
+            return {
+                'state': self._state,
+                'reason': self._last_reason,
+                'open_remaining_sec': round(max(0.0, self._open_until - self._clock()), 1) if self._state == 'open' else 0.0,
+                'window_calls': calls,
+                'error_rate': round(errors / calls, 3) if calls else 0.0,
+                'p95_latency_sec': round(self._p95(), 3),
+            }
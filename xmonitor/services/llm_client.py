@@ -1,7 +1,21 @@
 import json
 import re
+import time
 import urllib.error
-import urllib.request
+
+from xmonitor.services.llm_batcher import batch_results_by_id
+from xmonitor.services.llm_breaker import LlmCircuitOpenError
+from xmonitor.storage.llm_verdict_cache import (
+    llm_verdict_key,
+    lookup_llm_verdict,
+    prompt_fingerprint,
+    store_llm_verdict,
+)
+
+
+# 单条请求的 max_tokens 上限；仅批量判定请求放宽，避免单条调用意外放大生成长度
+LLM_MAX_TOKENS_CAP = 512
+LLM_BATCH_MAX_TOKENS_CAP = 2048
 
 
 def parse_json_object_from_text(raw_text):
@@ -57,14 +71,12 @@ def call_ollama_native_json(system_prompt, user_prompt, deps, *, base_url=None,
             {'role': 'user', 'content': str(user_prompt or '').strip()},
         ],
     }
-    req = urllib.request.Request(
+    raw_resp = deps.llm_transport.post_json(
         endpoint,
-        data=json.dumps(payload).encode('utf-8'),
-        headers={'Content-Type': 'application/json'},
-        method='POST',
+        payload,
+        {'Content-Type': 'application/json'},
+        timeout_val,
     )
-    with urllib.request.urlopen(req, timeout=timeout_val) as resp:
-        raw_resp = resp.read().decode('utf-8', errors='ignore')
 
     data = json.loads(raw_resp or '{}')
     msg = data.get('message') or {}
@@ -83,6 +95,7 @@ def call_openai_compatible_json(
     timeout_sec=None,
     max_tokens=120,
     temperature=0.0,
+    max_tokens_cap=LLM_MAX_TOKENS_CAP,
 ):
     endpoint = deps._llm_filter_endpoint(base_url=base_url)
     model_name = str(model if model is not None else deps.LLM_FILTER_MODEL or '').strip()
@@ -94,10 +107,35 @@ def call_openai_compatible_json(
     api_key_val = str(api_key if api_key is not None else deps.LLM_FILTER_API_KEY or 'EMPTY').strip() or 'EMPTY'
     timeout_val = deps.clamp_llm_timeout(timeout_sec if timeout_sec is not None else deps.LLM_FILTER_TIMEOUT_SEC)
 
-    base_payload = {
+    breaker = deps.llm_breaker
+    breaker.before_call()
+    started = time.monotonic()
+    try:
+        result = _request_openai_compatible_json(
+            system_prompt,
+            user_prompt,
+            deps,
+            endpoint=endpoint,
+            base_url=base_url,
+            api_key_val=api_key_val,
+            model_name=model_name,
+            timeout_val=timeout_val,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            max_tokens_cap=max_tokens_cap,
+        )
+    except Exception:
+        breaker.record(False, time.monotonic() - started)
+        raise
+    breaker.record(True, time.monotonic() - started)
+    return result
+
+
+def _build_chat_request(system_prompt, user_prompt, *, model_name, api_key_val, max_tokens, temperature, max_tokens_cap=LLM_MAX_TOKENS_CAP):
+    payload = {
         'model': model_name,
         'temperature': max(0.0, min(1.2, float(temperature))),
-        'max_tokens': int(max(32, min(512, int(max_tokens)))),
+        'max_tokens': int(max(32, min(int(max_tokens_cap), int(max_tokens)))),
         'messages': [
             {'role': 'system', 'content': str(system_prompt or '').strip()},
             {'role': 'user', 'content': str(user_prompt or '').strip()},
@@ -107,21 +145,61 @@ def call_openai_compatible_json(
         'Content-Type': 'application/json',
         'Authorization': f'Bearer {api_key_val}',
     }
+    return payload, headers
+
+
+def _request_openai_compatible_json(
+    system_prompt,
+    user_prompt,
+    deps,
+    *,
+    endpoint,
+    base_url,
+    api_key_val,
+    model_name,
+    timeout_val,
+    max_tokens,
+    temperature,
+    max_tokens_cap=LLM_MAX_TOKENS_CAP,
+):
+    base_payload, headers = _build_chat_request(
+        system_prompt,
+        user_prompt,
+        model_name=model_name,
+        api_key_val=api_key_val,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        max_tokens_cap=max_tokens_cap,
+    )
+
+    transport = deps.llm_transport
+    profile = transport.profile(endpoint)
+    if profile.get('flavor') == 'ollama':
+        return call_ollama_native_json(
+            system_prompt,
+            user_prompt,
+            deps,
+            base_url=base_url,
+            model=model_name,
+            timeout_sec=timeout_val,
+        )
 
     data = {}
     last_err = None
     last_err_body = ''
-    payload_variants = [
-        {**base_payload, 'response_format': {'type': 'json_object'}},
-        dict(base_payload),
-    ]
-    for payload in payload_variants:
+    payload_variants = []
+    if profile.get('json_mode') is not False:
+        payload_variants.append((True, {**base_payload, 'response_format': {'type': 'json_object'}}))
+    payload_variants.append((False, dict(base_payload)))
+    for json_mode, payload in payload_variants:
         try:
-            body = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(endpoint, data=body, headers=headers, method='POST')
-            with urllib.request.urlopen(req, timeout=timeout_val) as resp:
-                raw_resp = resp.read().decode('utf-8', errors='ignore')
+            raw_resp = transport.post_json(endpoint, payload, headers, timeout_val)
             data = json.loads(raw_resp or '{}')
+            # 仅当 response_format 被 400/422 明确拒绝时才记住关闭 JSON 模式，避免偶发 5xx 误判
+            if json_mode or int(getattr(last_err, 'code', 0) or 0) in {400, 422}:
+                transport.remember(endpoint, flavor='openai', json_mode=json_mode)
+            else:
+                transport.remember(endpoint, flavor='openai')
             last_err = None
             break
         except urllib.error.HTTPError as e:
@@ -146,6 +224,7 @@ def call_openai_compatible_json(
                 model=model_name,
                 timeout_sec=timeout_val,
             )
+            transport.remember(endpoint, flavor='ollama')
             return native_obj, native_raw
 
         err_text = f"HTTP {getattr(last_err, 'code', 'error')}"
@@ -165,15 +244,147 @@ def call_openai_compatible_json(
     return parse_json_object_from_text(content_text), content_text
 
 
-def call_openai_compatible_filter_api(content, deps):
+def parse_stream_delta(line):
+    """解析一行 SSE：返回 (增量文本, 是否结束)；非 data 行返回 ('', False)。"""
+    line = str(line or '').strip()
+    if not line.startswith('data:'):
+        return '', False
+    data = line[len('data:'):].strip()
+    if data == '[DONE]':
+        return '', True
+    try:
+        obj = json.loads(data)
+        choice = (obj.get('choices') or [{}])[0]
+        delta = choice.get('delta') or choice.get('message') or {}
+        return str(delta.get('content') or ''), False
+    except Exception:
+        return '', False
+
+
+def stream_openai_compatible_text(
+    system_prompt,
+    user_prompt,
+    deps,
+    *,
+    on_delta=None,
+    base_url=None,
+    api_key=None,
+    model=None,
+    timeout_sec=None,
+    max_tokens=120,
+    temperature=0.0,
+):
+    """流式生成文本，返回 (text, abort_reason)。
+
+    每收到增量即以累计文本调用 on_delta(text)；其返回非空原因时立即断开连接停止生成。
+    endpoint 不支持流式（或已探明为 Ollama 原生接口）时回退为普通请求，整段文本只校验一次。
+    """
+    endpoint = deps._llm_filter_endpoint(base_url=base_url)
+    model_name = str(model if model is not None else deps.LLM_FILTER_MODEL or '').strip()
+    if not endpoint:
+        raise ValueError('LLM Base URL 未配置')
+    if not model_name:
+        raise ValueError('LLM 模型名未配置')
+    api_key_val = str(api_key if api_key is not None else deps.LLM_FILTER_API_KEY or 'EMPTY').strip() or 'EMPTY'
+    timeout_val = deps.clamp_llm_timeout(timeout_sec if timeout_sec is not None else deps.LLM_FILTER_TIMEOUT_SEC)
+    transport = deps.llm_transport
+    profile = transport.profile(endpoint)
+
+    def _non_stream():
+        _, raw_text = call_openai_compatible_json(
+            system_prompt,
+            user_prompt,
+            deps,
+            base_url=base_url,
+            api_key=api_key_val,
+            model=model_name,
+            timeout_sec=timeout_val,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        text = str(raw_text or '')
+        return text, (on_delta(text) if on_delta else '') or ''
+
+    if profile.get('flavor') == 'ollama' or profile.get('stream') is False:
+        return _non_stream()
+
+    payload, headers = _build_chat_request(
+        system_prompt,
+        user_prompt,
+        model_name=model_name,
+        api_key_val=api_key_val,
+        max_tokens=max_tokens,
+        temperature=temperature,
+    )
+    payload['stream'] = True
+    breaker = deps.llm_breaker
+    breaker.before_call()
+    started = time.monotonic()
+    # 熔断器只记首包延迟：整段生成耗时随输出长度增长，长改写会把共享 p95 推过阈值误伤意向/过滤请求
+    first_chunk_sec = None
+    text = ''
+    abort_reason = ''
+    try:
+        lines = transport.stream_lines(endpoint, payload, headers, timeout_val)
+        try:
+            for line in lines:
+                if first_chunk_sec is None:
+                    first_chunk_sec = time.monotonic() - started
+                delta, done = parse_stream_delta(line)
+                if done:
+                    break
+                if not delta:
+                    continue
+                text += delta
+                if on_delta:
+                    abort_reason = on_delta(text) or ''
+                    if abort_reason:
+                        break
+        finally:
+            lines.close()
+    except urllib.error.HTTPError as e:
+        if int(getattr(e, 'code', 0) or 0) in {400, 404, 415, 422}:
+            breaker.record(True, time.monotonic() - started)
+            transport.remember(endpoint, stream=False)
+            return _non_stream()
+        breaker.record(False, time.monotonic() - started)
+        raise
+    except Exception:
+        breaker.record(False, time.monotonic() - started)
+        raise
+    breaker.record(True, first_chunk_sec if first_chunk_sec is not None else time.monotonic() - started)
+    transport.remember(endpoint, stream=True)
+    return text, abort_reason
+
+
+FILTER_PROMPT_RULES = (
+    '规则:\n'
+    '1) 只有在明显垃圾内容、纯表情或完全无意义字符时，才返回 skip=true。\n'
+    '2) 其他情况统一返回 skip=false。\n'
+    '3) reason 使用简短英文下划线词，例如 normal/spam/emoji_or_noise。\n'
+)
+
+
+def coerce_filter_result(result_obj):
+    if not isinstance(result_obj, dict) or not result_obj:
+        return None
+    skip_raw = result_obj.get('skip', False)
+    if isinstance(skip_raw, str):
+        skip = skip_raw.strip().lower() in {'1', 'true', 'yes', 'y'}
+    else:
+        skip = bool(skip_raw)
+    reason = str(result_obj.get('reason', '') or '').strip().lower()
+    if skip and not reason:
+        reason = 'llm_filter'
+    return skip, reason
+
+
+def call_openai_compatible_filter_single(content, deps):
     default_prompt = (
         '你是评论过滤器。只输出JSON对象，不要输出其他文本。\n'
         '返回字段: skip(boolean), reason(string), intent_score(number 0-100)。\n'
-        '规则:\n'
-        '1) 只有在明显垃圾内容、纯表情或完全无意义字符时，才返回 skip=true。\n'
-        '2) 其他情况统一返回 skip=false。\n'
-        '3) reason 使用简短英文下划线词，例如 normal/spam/emoji_or_noise。\n'
-        f'评论内容: {content}'
+        + FILTER_PROMPT_RULES
+        + f'评论内容: {content}'
     )
     prompt = deps._render_llm_prompt_template(
         deps.LLM_FILTER_PROMPT_TEMPLATE,
@@ -186,15 +397,118 @@ def call_openai_compatible_filter_api(content, deps):
         deps,
         max_tokens=80,
     )
-    if not isinstance(result_obj, dict) or not result_obj:
+    return coerce_filter_result(result_obj)
+
+
+def call_openai_compatible_filter_batch(contents, deps):
+    """一次请求过滤多条评论，返回与 contents 等长的 (skip, reason) 列表；缺失条目为 None。"""
+    contents = list(contents)
+    items = [{'id': idx, 'text': str(text or '')} for idx, text in enumerate(contents, start=1)]
+    prompt = (
+        '你是评论过滤器。下面给出多条互相独立的评论（JSON 数组，含 id 与 text），请逐条判定。\n'
+        '只输出JSON对象 {"results": [...]}，每条评论对应一个元素，字段: id(number), skip(boolean), reason(string)。\n'
+        + FILTER_PROMPT_RULES
+        + f'评论列表: {json.dumps(items, ensure_ascii=False)}'
+    )
+    result_obj, _ = call_openai_compatible_json(
+        'You are a strict JSON classifier.',
+        prompt,
+        deps,
+        max_tokens=40 + 30 * len(contents),
+        max_tokens_cap=LLM_BATCH_MAX_TOKENS_CAP,
+    )
+    return [coerce_filter_result(obj) for obj in batch_results_by_id(result_obj, len(contents))]
+
+
+def filter_verdict_cache_key(content, deps):
+    prompt_fp = prompt_fingerprint('filter', deps.LLM_FILTER_PROMPT_TEMPLATE or FILTER_PROMPT_RULES)
+    return llm_verdict_key(
+        'filter',
+        deps.normalize_content_for_dedupe(content),
+        deps.LLM_FILTER_MODEL,
+        prompt_fp,
+        deps.LLM_FILTER_BASE_URL,
+    )
+
+
+def _lookup_filter_verdict(content, deps):
+    """返回 (cache_key, (skip, reason) 或 None)。"""
+    cache_key = filter_verdict_cache_key(content, deps)
+    cached = lookup_llm_verdict(deps, cache_key)
+    if cached is None:
+        return cache_key, None
+    return cache_key, (bool(cached.get('skip', False)), str(cached.get('reason', '') or ''))
+
+
+def _store_filter_verdict(cache_key, verdict, deps):
+    """仅缓存解析成功的判定；解析失败按 (False, '') 返回且不落盘。"""
+    if verdict is None:
         return False, ''
+    skip, reason = bool(verdict[0]), str(verdict[1] or '')
+    store_llm_verdict(deps, cache_key, 'filter', {'skip': skip, 'reason': reason})
+    return skip, reason
 
-    skip_raw = result_obj.get('skip', False)
-    if isinstance(skip_raw, str):
-        skip = skip_raw.strip().lower() in {'1', 'true', 'yes', 'y'}
+
+def _filter_batch_fn(deps):
+    return lambda key, items: call_openai_compatible_filter_batch(items, deps)
+
+
+def _filter_single_fn(deps):
+    return lambda key, item: call_openai_compatible_filter_single(item, deps)
+
+
+def _filter_uses_batch(deps):
+    # 自定义 prompt 模板按单条渲染，不能合并进批量 prompt
+    return not deps.LLM_FILTER_PROMPT_TEMPLATE and deps.LLM_BATCH_MAX_ITEMS > 1
+
+
+def call_openai_compatible_filter_api(content, deps):
+    """过滤判定入口：先查持久化判定缓存；未命中时经微批合并请求（自定义 prompt 模板时逐条调用）。"""
+    cache_key, cached = _lookup_filter_verdict(content, deps)
+    if cached is not None:
+        return cached
+    if deps.llm_breaker.rejecting():
+        raise LlmCircuitOpenError('LLM 熔断中，跳过过滤判定')
+    if _filter_uses_batch(deps):
+        verdict = deps.llm_filter_batcher.submit('filter', content, run_batch_fn=_filter_batch_fn(deps), run_single_fn=_filter_single_fn(deps))
     else:
-        skip = bool(skip_raw)
-    reason = str(result_obj.get('reason', '') or '').strip().lower()
-    if skip and not reason:
-        reason = 'llm_filter'
-    return skip, reason
+        verdict = call_openai_compatible_filter_single(content, deps)
+    return _store_filter_verdict(cache_key, verdict, deps)
+
+
+def _filter_single_outcome(content, deps):
+    try:
+        return True, call_openai_compatible_filter_single(content, deps)
+    except Exception as err:
+        return False, err
+
+
+def call_openai_compatible_filter_api_many(contents, deps):
+    """扫描末尾的批量过滤入口：先按判定缓存分出未命中的评论，再按 LLM_BATCH_MAX_ITEMS 分块一次请求多条。
+
+    缓存查询与写入和单条入口共用；返回与 contents 等长的列表，元素为 (skip, reason) 或该条调用抛出的异常。
+    """
+    contents = list(contents)
+    results = [None] * len(contents)
+    misses = []
+    for idx, content in enumerate(contents):
+        cache_key, cached = _lookup_filter_verdict(content, deps)
+        if cached is None:
+            misses.append((idx, content, cache_key))
+        else:
+            results[idx] = cached
+    if not misses:
+        return results
+    if deps.llm_breaker.rejecting():
+        err = LlmCircuitOpenError('LLM 熔断中，跳过过滤判定')
+        for idx, _, _ in misses:
+            results[idx] = err
+        return results
+    miss_contents = [content for _, content, _ in misses]
+    if _filter_uses_batch(deps):
+        outcomes = deps.llm_filter_batcher.run_many('filter', miss_contents, run_batch_fn=_filter_batch_fn(deps), run_single_fn=_filter_single_fn(deps))
+    else:
+        outcomes = [_filter_single_outcome(content, deps) for content in miss_contents]
+    for (idx, _, cache_key), (ok, value) in zip(misses, outcomes):
+        results[idx] = _store_filter_verdict(cache_key, value, deps) if ok else value
+    return results
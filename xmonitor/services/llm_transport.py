@@ -0,0 +1,189 @@
+import http.client
+import io
+import json
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class LlmTransport:
+    """LLM HTTP 传输层：按 (scheme, host, port) 复用 keep-alive 连接，并记住每个 endpoint 的可用调用方式。
+
+    错误语义与 urllib 保持一致：HTTP 状态码错误抛 urllib.error.HTTPError，网络错误抛 urllib.error.URLError，
+    调用方现有的异常处理无需改动。配置了系统代理的目标回退到 urllib.request.urlopen。
+    """
+
+    def __init__(self, max_idle_per_host=4):
+        self.max_idle_per_host = max(1, int(max_idle_per_host))
+        self._idle = {}
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'reused': 0, 'opened': 0}
+
+    # ---- endpoint profile ----
+    def profile(self, endpoint):
+        """返回 endpoint 已探明的调用方式副本：flavor('openai'/'ollama')、json_mode(True/False/None)。"""
+        with self._lock:
+            return dict(self._profiles.get(endpoint) or {})
+
+    def remember(self, endpoint, **fields):
+        with self._lock:
+            self._profiles.setdefault(endpoint, {}).update(fields)
+
+    def forget(self, endpoint=None):
+        """清除已探明的调用方式（配置变更后调用）；endpoint 为空时全部清除。"""
+        with self._lock:
+            if endpoint is None:
+                self._profiles.clear()
+            else:
+                self._profiles.pop(endpoint, None)
+
+    # ---- connection pool ----
+    def _pool_key(self, parsed):
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        return parsed.scheme, parsed.hostname or '', port
+
+    def _checkout(self, pool_key, timeout):
+        with self._lock:
+            idle = self._idle.get(pool_key) or []
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        scheme, host, port = pool_key
+        conn_cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self.stats['opened'] += 1
+        return conn_cls(host, port, timeout=timeout), False
+
+    def _checkin(self, pool_key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(pool_key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for idle in pools:
+            for conn in idle:
+                conn.close()
+
+    def _uses_proxy(self, parsed):
+        proxies = urllib.request.getproxies()
+        if parsed.scheme not in proxies:
+            return False
+        return not urllib.request.proxy_bypass(parsed.hostname or '')
+
+    def _post_via_urllib(self, url, body, headers, timeout):
+        req = urllib.request.Request(url, data=body, headers=headers, method='POST')
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.read().decode('utf-8', errors='ignore')
+
+    def _open(self, parsed, url, body, headers, timeout):
+        """发出请求并返回 (pool_key, conn, resp)；复用连接已被服务端关闭时换新连接重试一次。"""
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f'{path}?{parsed.query}'
+        pool_key = self._pool_key(parsed)
+        for attempt in range(2):
+            conn, reused = self._checkout(pool_key, timeout)
+            try:
+                conn.request('POST', path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS as err:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise urllib.error.URLError(err)
+            except (OSError, http.client.HTTPException) as err:
+                conn.close()
+                if isinstance(err, socket.timeout):
+                    raise
+                raise urllib.error.URLError(err)
+            if reused:
+                self.stats['reused'] += 1
+            return pool_key, conn, resp
+        raise urllib.error.URLError('connection reset')
+
+    def _release(self, pool_key, conn, resp, reusable=True):
+        if reusable and not resp.will_close:
+            self._checkin(pool_key, conn)
+        else:
+            conn.close()
+
+    def _raise_for_status(self, url, pool_key, conn, resp):
+        if resp.status < 400:
+            return
+        raw = resp.read()
+        self._release(pool_key, conn, resp)
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(raw))
+
+    def _prepare(self, url, payload, headers):
+        parsed = urllib.parse.urlsplit(url)
+        body = json.dumps(payload).encode('utf-8')
+        headers = {**headers, 'Content-Length': str(len(body))}
+        self.stats['requests'] += 1
+        use_urllib = parsed.scheme not in {'http', 'https'} or self._uses_proxy(parsed)
+        return parsed, body, headers, use_urllib
+
+    def post_json(self, url, payload, headers, timeout):
+        """POST JSON 并返回响应文本；非 2xx 抛 HTTPError（可 .read() 读取响应体）。"""
+        parsed, body, headers, use_urllib = self._prepare(url, payload, headers)
+        if use_urllib:
+            return self._post_via_urllib(url, body, headers, timeout)
+        pool_key, conn, resp = self._open(parsed, url, body, headers, timeout)
+        self._raise_for_status(url, pool_key, conn, resp)
+        try:
+            raw = resp.read()
+        except (OSError, http.client.HTTPException) as err:
+            conn.close()
+            if isinstance(err, socket.timeout):
+                raise
+            raise urllib.error.URLError(err)
+        self._release(pool_key, conn, resp)
+        return raw.decode('utf-8', errors='ignore')
+
+    def stream_lines(self, url, payload, headers, timeout):
+        """POST JSON 并逐行产出响应（用于 SSE 流式输出）。
+
+        调用方提前关闭生成器即中止生成：连接直接关闭不回池，服务端随之停止推送。
+        """
+        parsed, body, headers, use_urllib = self._prepare(url, payload, headers)
+        if use_urllib:
+            req = urllib.request.Request(url, data=body, headers=headers, method='POST')
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                for raw_line in resp:
+                    yield raw_line.decode('utf-8', errors='ignore')
+            return
+        pool_key, conn, resp = self._open(parsed, url, body, headers, timeout)
+        self._raise_for_status(url, pool_key, conn, resp)
+        finished = False
+        try:
+            while True:
+                try:
+                    raw_line = resp.readline()
+                except (OSError, http.client.HTTPException) as err:
+                    if isinstance(err, socket.timeout):
+                        raise
+                    raise urllib.error.URLError(err)
+                if not raw_line:
+                    break
+                yield raw_line.decode('utf-8', errors='ignore')
+            finished = True
+        finally:
+            self._release(pool_key, conn, resp, reusable=finished)
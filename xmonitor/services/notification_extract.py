@@ -1,5 +1,7 @@
 import re
 
+from xmonitor.services.status_parsing import parse_card_hrefs, parse_status_href
+
 
 def extract_notification_content(
     article,
@@ -124,37 +126,23 @@ def extract_notification_content(
 
 
 def extract_status_from_href(href, *, pick_best_status_id_fn):
-    raw = str(href or '').strip()
-    if not raw:
-        return None, None
-    match = re.search(r'/(?:i/(?:web/)?status|web/status)/(\d{6,25})', raw)
-    if match:
-        sid = pick_best_status_id_fn(match.group(1), raw)
-        if sid:
-            return None, sid
-    user_matches = list(re.finditer(r'/([A-Za-z0-9_]+)/status/(\d{6,25})', raw))
-    if user_matches:
-        best = None
-        best_len = -1
-        for match in user_matches:
-            uname = str(match.group(1) or '').strip().lower()
-            if uname in {'i', 'web'}:
-                continue
-            sid = pick_best_status_id_fn(match.group(2), raw)
-            if sid and len(sid) > best_len:
-                best = (match.group(1), sid)
-                best_len = len(sid)
-        if best:
-            return f'@{best[0]}', best[1]
-    match = re.search(r'conversation_id=(\d{6,25})', raw)
-    if match:
-        sid = pick_best_status_id_fn(match.group(1), raw)
-        if sid:
-            return None, sid
-    return None, None
+    return parse_status_href(href, pick_best_status_id_fn=pick_best_status_id_fn)
 
 
 def extract_notification_status_info(article, *, extract_status_from_href_fn, pick_best_status_id_fn):
+    try:
+        raw_html = str(article.html or '')
+    except Exception:
+        raw_html = ''
+    if raw_html:
+        for href, _ in parse_card_hrefs(raw_html):
+            status_handle, status_id = extract_status_from_href_fn(href)
+            if status_id:
+                return status_handle, status_id
+        sid = pick_best_status_id_fn(raw_html)
+        if sid:
+            return None, sid
+        return None, None
     try:
         links = article.eles('tag:a', timeout=0)
         for link in links:
@@ -166,28 +154,6 @@ def extract_notification_status_info(article, *, extract_status_from_href_fn, pi
                 return status_handle, status_id
     except Exception:
         pass
-    try:
-        raw_html = str(article.html or '')
-        if raw_html:
-            time_href_matches = re.findall(
-                r'<a[^>]+href=[\'"]([^\'"]+)[\'"][^>]*>\s*<time\b',
-                raw_html,
-                flags=re.IGNORECASE | re.DOTALL,
-            )
-            for href in reversed(time_href_matches):
-                status_handle, status_id = extract_status_from_href_fn(href)
-                if status_id:
-                    return status_handle, status_id
-            href_matches = re.findall(r'href=[\'"]([^\'"]+)[\'"]', raw_html, flags=re.IGNORECASE)
-            for href in reversed(href_matches):
-                status_handle, status_id = extract_status_from_href_fn(href)
-                if status_id:
-                    return status_handle, status_id
-            sid = pick_best_status_id_fn(raw_html)
-            if sid:
-                return None, sid
-    except Exception:
-        pass
     return None, None
 
 
@@ -1,5 +1,11 @@
 import re
 
+from xmonitor.services.status_parsing import card_fingerprint, parse_card_status_links
+
+
+_NOTIF_STATUS_KEY_RE = re.compile(r'^notif_status_(\d+)$')
+_LOWER_HANDLE_RE = re.compile(r'@([a-z0-9_]{1,30})')
+
 
 def extract_status_id_from_notification_item(item, *, pick_best_status_id_fn):
     if not isinstance(item, dict):
@@ -13,7 +19,7 @@ def extract_status_id_from_notification_item(item, *, pick_best_status_id_fn):
     if status_id:
         return status_id
     key = str(item.get('key', '')).strip()
-    match = re.match(r'^notif_status_(\d+)$', key)
+    match = _NOTIF_STATUS_KEY_RE.match(key)
     if match:
         sid = pick_best_status_id_fn(match.group(1))
         return sid or match.group(1)
@@ -36,6 +42,12 @@ def is_reply_to_me_notification_item(item, *, reply_to_you_keywords):
 
 
 def extract_status_ids_from_article(article, *, pick_best_status_id_fn):
+    try:
+        raw_html = str(article.html or '')
+    except Exception:
+        raw_html = ''
+    if raw_html:
+        return {status_id for _, status_id, _ in parse_card_status_links(raw_html, pick_best_status_id_fn=pick_best_status_id_fn)}
     ids = set()
     try:
         links = article.eles('tag:a', timeout=0)
@@ -54,59 +66,200 @@ def extract_status_ids_from_article(article, *, pick_best_status_id_fn):
     return ids
 
 
-def match_reply_target_article(page, status_id, handle, content, *, extract_status_ids_from_article_fn, normalize_handle_fn, normalize_content_for_dedupe_fn):
+_LOCATE_STATUS_REPLY_JS = """
+const sid = String(arguments[0] || '');
+if (!sid) return null;
+const links = Array.from(document.querySelectorAll('a[href*="/status/' + sid + '"]'));
+const ordered = links.filter((a) => a.querySelector('time')).concat(links.filter((a) => !a.querySelector('time')));
+for (const link of ordered) {
+  const m = (link.getAttribute('href') || '').match(/\\/status\\/(\\d+)/);
+  if (!m || m[1] !== sid) continue;
+  const article = link.closest('article');
+  if (!article) continue;
+  const btn = article.querySelector('[data-testid="reply"]');
+  if (!btn) continue;
+  const rect = btn.getBoundingClientRect();
+  if (rect.width <= 0 || rect.height <= 0) continue;
+  return [article, btn];
+}
+return null;
+"""
+
+
+def locate_reply_target_by_status(page, status_id):
+    """单次 run_js：a[href*="/status/<id>"] -> closest(article) -> 回复按钮；未命中返回 (None, None)。"""
+    sid = str(status_id or '').strip()
+    if not sid.isdigit():
+        return None, None
+    try:
+        found = page.run_js(_LOCATE_STATUS_REPLY_JS, sid)
+    except Exception:
+        return None, None
+    if isinstance(found, (list, tuple)) and len(found) == 2 and found[0] and found[1]:
+        return found[0], found[1]
+    return None, None
+
+
+# 卡片稳定键：按文档顺序拼接卡片内全部链接 href（含 /status/<id> 与作者主页），再附正文（tweetText）长度与哈希，
+# 展开“显示更多”、翻译或编辑后指纹随之变化；不含“3分钟前”这类相对时间文本，卡片重渲染后指纹保持不变。
+_CARD_KEY_FN_JS = """
+const xmCardKey = (card) => {
+  if (!card || !card.querySelectorAll) return '';
+  const hrefs = [];
+  for (const link of card.querySelectorAll('a[href]')) {
+    const href = link.getAttribute('href') || '';
+    if (href) hrefs.push(href);
+  }
+  const text = Array.from(card.querySelectorAll('[data-testid="tweetText"]')).map((el) => el.textContent || '').join('\\n');
+  let h = 0;
+  for (let i = 0; i < text.length; i += 1) h = ((h << 5) - h + text.charCodeAt(i)) | 0;
+  return hrefs.join('\\n') + '\\ntext:' + text.length + ':' + (h >>> 0).toString(36);
+};
+"""
+_CARD_KEY_JS = _CARD_KEY_FN_JS + "return xmCardKey(this);"
+_CARD_KEYS_BATCH_JS = _CARD_KEY_FN_JS + "return Array.from(arguments).map(xmCardKey);"
+
+
+def _card_key_fingerprint(card_key):
+    return card_fingerprint('links:' + card_key) if card_key else ''
+
+
+def _html_card_fingerprint(article):
+    try:
+        raw_html = str(article.html or '')
+    except Exception:
+        return ''
+    return card_fingerprint(raw_html) if raw_html else ''
+
+
+def article_card_fingerprint(article):
+    """按卡片链接集合与正文摘要计算稳定指纹；无法执行 JS 时退回整卡 HTML 指纹，读取失败返回空串。"""
+    try:
+        card_key = article.run_js(_CARD_KEY_JS)
+    except Exception:
+        return _html_card_fingerprint(article)
+    return _card_key_fingerprint(str(card_key or ''))
+
+
+def article_card_fingerprints(page, articles):
+    """单次 run_js 批量读取所有卡片的稳定指纹；批量读取失败时逐卡回退。"""
+    articles = list(articles or [])
+    if not articles:
+        return []
+    try:
+        card_keys = page.run_js(_CARD_KEYS_BATCH_JS, *articles)
+    except Exception:
+        card_keys = None
+    if isinstance(card_keys, (list, tuple)) and len(card_keys) == len(articles):
+        return [_card_key_fingerprint(str(card_key or '')) for card_key in card_keys]
+    return [article_card_fingerprint(article) for article in articles]
+
+
+def cached_card_status_info(article, *, parsed_card_cache, extract_notification_status_info_fn):
+    """优先从卡片缓存读取 (status_handle, status_id)，未命中再解析并回填。"""
+    fingerprint = article_card_fingerprint(article) if parsed_card_cache is not None else ''
+    record = parsed_card_cache.get(fingerprint) if fingerprint else None
+    if record and 'status_id' in record:
+        return (record.get('status_handle') or None), (record.get('status_id') or None)
+    status_handle, status_id = extract_notification_status_info_fn(article)
+    if fingerprint:
+        parsed_card_cache.put(fingerprint, status_handle=status_handle or '', status_id=status_id or '')
+    return status_handle, status_id
+
+
+def _visible_reply_button(article):
+    try:
+        reply_btn = article.ele('css:[data-testid="reply"]', timeout=0)
+    except Exception:
+        return None
+    try:
+        return reply_btn if (reply_btn and reply_btn.states.is_displayed) else None
+    except Exception:
+        return None
+
+
+def _content_score(content_norm, card_content_norm, full_score, pivot_score):
+    if not (content_norm and card_content_norm):
+        return 0
+    if (content_norm in card_content_norm) or (card_content_norm in content_norm):
+        return full_score
+    pivot = content_norm[:12]
+    if len(pivot) >= 6 and pivot in card_content_norm:
+        return pivot_score
+    return 0
+
+
+def _reply_target_record(article, fingerprint, parsed_card_cache, extract_status_ids_from_article_fn):
+    record = parsed_card_cache.get(fingerprint) if (parsed_card_cache is not None and fingerprint) else None
+    if record and 'article_status_ids' in record:
+        return record
+    fields = {'article_status_ids': frozenset(extract_status_ids_from_article_fn(article))}
+    try:
+        user_ele = article.ele('css:[data-testid="User-Name"]', timeout=0)
+        user_text = (user_ele.text or '').strip().lower() if user_ele else ''
+        match = _LOWER_HANDLE_RE.search(user_text)
+        fields['author_handle'] = match.group(1) if match else ''
+    except Exception:
+        fields['author_handle'] = ''
+    try:
+        txt_ele = article.ele('css:[data-testid="tweetText"]', timeout=0)
+        fields['tweet_text'] = (txt_ele.text or '').strip() if txt_ele else ''
+    except Exception:
+        fields['tweet_text'] = ''
+    if parsed_card_cache is not None and fingerprint:
+        return parsed_card_cache.put(fingerprint, **fields)
+    return fields
+
+
+def _score_reply_target(record, target_status_id, handle_norm, content_norm, normalize_content_for_dedupe_fn):
+    score = 0
+    article_status_ids = record.get('article_status_ids') or frozenset()
+    if target_status_id:
+        if target_status_id in article_status_ids:
+            score += 220
+        elif article_status_ids:
+            return None
+    article_handle = record.get('author_handle', '')
+    if handle_norm and article_handle:
+        if article_handle == handle_norm:
+            score += 120
+        elif handle_norm in article_handle:
+            score += 60
+    article_content_norm = normalize_content_for_dedupe_fn(record.get('tweet_text', ''))
+    return score + _content_score(content_norm, article_content_norm, 90, 30)
+
+
+def match_reply_target_article(page, status_id, handle, content, *, extract_status_ids_from_article_fn, normalize_handle_fn, normalize_content_for_dedupe_fn, parsed_card_cache=None):
     target_status_id = str(status_id or '').strip()
+    if target_status_id:
+        located_article, located_reply_btn = locate_reply_target_by_status(page, target_status_id)
+        if located_article is not None:
+            return located_article, 220 + 10
     handle_norm = normalize_handle_fn(handle)
     content_norm = normalize_content_for_dedupe_fn(content or '')
-    best_article = None
-    best_score = -1
     try:
         articles = page.eles('tag:article', timeout=2)
     except Exception:
         articles = []
-    for article in articles[:40]:
-        score = 0
-        article_status_ids = extract_status_ids_from_article_fn(article)
-        if target_status_id:
-            if target_status_id in article_status_ids:
-                score += 220
-            elif article_status_ids:
-                continue
-        try:
-            user_ele = article.ele('css:[data-testid="User-Name"]', timeout=0)
-            user_text = (user_ele.text or '').strip().lower() if user_ele else ''
-            match = re.search(r'@([a-z0-9_]{1,30})', user_text)
-            article_handle = match.group(1) if match else ''
-            if handle_norm and article_handle:
-                if article_handle == handle_norm:
-                    score += 120
-                elif handle_norm in article_handle:
-                    score += 60
-        except Exception:
-            pass
-        try:
-            txt_ele = article.ele('css:[data-testid="tweetText"]', timeout=0)
-            article_content = (txt_ele.text or '').strip() if txt_ele else ''
-            article_content_norm = normalize_content_for_dedupe_fn(article_content)
-            if content_norm and article_content_norm:
-                if content_norm in article_content_norm or article_content_norm in content_norm:
-                    score += 90
-                else:
-                    pivot = content_norm[:12]
-                    if len(pivot) >= 6 and pivot in article_content_norm:
-                        score += 30
-        except Exception:
-            pass
-        has_reply_btn = False
-        try:
-            reply_btn = article.ele('css:[data-testid="reply"]', timeout=0)
-            has_reply_btn = bool(reply_btn and reply_btn.states.is_displayed)
-        except Exception:
-            has_reply_btn = False
-        if has_reply_btn:
-            score += 10
-        else:
+    articles = articles[:40]
+    fingerprints = article_card_fingerprints(page, articles) if parsed_card_cache is not None else [''] * len(articles)
+    target_fp = parsed_card_cache.fingerprint_for_status(target_status_id) if (parsed_card_cache is not None and target_status_id) else ''
+    if target_fp and target_fp in fingerprints:
+        article = articles[fingerprints.index(target_fp)]
+        record = _reply_target_record(article, target_fp, parsed_card_cache, extract_status_ids_from_article_fn)
+        score = _score_reply_target(record, target_status_id, handle_norm, content_norm, normalize_content_for_dedupe_fn)
+        if score is not None and _visible_reply_button(article):
+            return article, score + 10
+    best_article = None
+    best_score = -1
+    for article, fingerprint in zip(articles, fingerprints):
+        record = _reply_target_record(article, fingerprint, parsed_card_cache, extract_status_ids_from_article_fn)
+        score = _score_reply_target(record, target_status_id, handle_norm, content_norm, normalize_content_for_dedupe_fn)
+        if score is None:
             continue
+        if not _visible_reply_button(article):
+            continue
+        score += 10
         if score > best_score:
             best_score = score
             best_article = article
@@ -115,53 +268,89 @@ def match_reply_target_article(page, status_id, handle, content, *, extract_stat
     return best_article, best_score
 
 
-def match_notification_card_for_reply(page, status_id, handle, content, *, extract_notification_status_info_fn, extract_notification_handle_fn, extract_notification_content_fn, normalize_handle_fn, normalize_content_for_dedupe_fn):
-    target_status_id = str(status_id or '').strip()
-    handle_norm = normalize_handle_fn(handle)
-    content_norm = normalize_content_for_dedupe_fn(content or '')
-    best_article = None
-    best_reply_btn = None
-    best_score = -1
-    try:
-        articles = page.eles('tag:article', timeout=2)
-    except Exception:
-        articles = []
-    for article in articles[:80]:
+def _notification_card_record(article, fingerprint, parsed_card_cache, target_status_id, extract_notification_status_info_fn, extract_notification_handle_fn, extract_notification_content_fn):
+    record = parsed_card_cache.get(fingerprint) if (parsed_card_cache is not None and fingerprint) else None
+    record = record or {}
+    fields = {}
+    if 'status_id' not in record:
+        status_handle, status_id = extract_notification_status_info_fn(article)
+        fields['status_handle'] = status_handle or ''
+        fields['status_id'] = status_id or ''
+    card_status_id = fields.get('status_id', record.get('status_id', ''))
+    mismatch = bool(target_status_id and card_status_id and card_status_id != target_status_id)
+    if (not mismatch) and 'content' not in record:
         try:
             article_text = article.text or ''
         except Exception:
             article_text = ''
-        score = 0
-        card_status_handle, card_status_id = extract_notification_status_info_fn(article)
-        if target_status_id:
-            if card_status_id == target_status_id:
-                score += 260
-            elif card_status_id:
-                continue
-        card_handle = extract_notification_handle_fn(article, article_text) or card_status_handle or ''
-        card_handle_norm = normalize_handle_fn(card_handle)
-        if handle_norm and card_handle_norm:
-            if card_handle_norm == handle_norm:
-                score += 100
-            elif (handle_norm in card_handle_norm) or (card_handle_norm in handle_norm):
-                score += 50
+        status_handle = fields.get('status_handle', record.get('status_handle', ''))
+        card_handle = extract_notification_handle_fn(article, article_text) or status_handle or ''
         try:
             card_content = extract_notification_content_fn(article, article_text, card_handle or '')
         except Exception:
             card_content = ''
-        card_content_norm = normalize_content_for_dedupe_fn(card_content or '')
-        if content_norm and card_content_norm:
-            if (content_norm in card_content_norm) or (card_content_norm in content_norm):
-                score += 80
-            else:
-                pivot = content_norm[:12]
-                if len(pivot) >= 6 and pivot in card_content_norm:
-                    score += 35
-        try:
-            reply_btn = article.ele('css:[data-testid="reply"]', timeout=0)
-            if not (reply_btn and reply_btn.states.is_displayed):
-                continue
-        except Exception:
+        fields['handle'] = card_handle
+        fields['content'] = card_content or ''
+    if fields:
+        if parsed_card_cache is not None and fingerprint:
+            return parsed_card_cache.put(fingerprint, **fields)
+        record = dict(record)
+        record.update(fields)
+    return record
+
+
+def _score_notification_card(record, target_status_id, handle_norm, content_norm, normalize_handle_fn, normalize_content_for_dedupe_fn):
+    score = 0
+    card_status_id = record.get('status_id', '')
+    if target_status_id:
+        if card_status_id == target_status_id:
+            score += 260
+        elif card_status_id:
+            return None
+    card_handle_norm = normalize_handle_fn(record.get('handle', '') or record.get('status_handle', ''))
+    if handle_norm and card_handle_norm:
+        if card_handle_norm == handle_norm:
+            score += 100
+        elif (handle_norm in card_handle_norm) or (card_handle_norm in handle_norm):
+            score += 50
+    card_content_norm = normalize_content_for_dedupe_fn(record.get('content', '') or '')
+    return score + _content_score(content_norm, card_content_norm, 80, 35)
+
+
+def match_notification_card_for_reply(page, status_id, handle, content, *, extract_notification_status_info_fn, extract_notification_handle_fn, extract_notification_content_fn, normalize_handle_fn, normalize_content_for_dedupe_fn, parsed_card_cache=None):
+    """匹配通知卡片：已知 status_id 时先单次 JS 直达定位，再查卡片缓存，最后才逐卡打分（解析结果回填缓存）。"""
+    target_status_id = str(status_id or '').strip()
+    if target_status_id:
+        located_article, located_reply_btn = locate_reply_target_by_status(page, target_status_id)
+        if located_article is not None:
+            return located_article, located_reply_btn, 260 + 20
+    handle_norm = normalize_handle_fn(handle)
+    content_norm = normalize_content_for_dedupe_fn(content or '')
+    try:
+        articles = page.eles('tag:article', timeout=2)
+    except Exception:
+        articles = []
+    articles = articles[:80]
+    fingerprints = article_card_fingerprints(page, articles) if parsed_card_cache is not None else [''] * len(articles)
+    extract_fns = (extract_notification_status_info_fn, extract_notification_handle_fn, extract_notification_content_fn)
+    target_fp = parsed_card_cache.fingerprint_for_status(target_status_id) if (parsed_card_cache is not None and target_status_id) else ''
+    if target_fp and target_fp in fingerprints:
+        article = articles[fingerprints.index(target_fp)]
+        record = _notification_card_record(article, target_fp, parsed_card_cache, target_status_id, *extract_fns)
+        score = _score_notification_card(record, target_status_id, handle_norm, content_norm, normalize_handle_fn, normalize_content_for_dedupe_fn)
+        reply_btn = _visible_reply_button(article) if score is not None else None
+        if reply_btn:
+            return article, reply_btn, score + 20
+    best_article = None
+    best_reply_btn = None
+    best_score = -1
+    for article, fingerprint in zip(articles, fingerprints):
+        record = _notification_card_record(article, fingerprint, parsed_card_cache, target_status_id, *extract_fns)
+        score = _score_notification_card(record, target_status_id, handle_norm, content_norm, normalize_handle_fn, normalize_content_for_dedupe_fn)
+        if score is None:
+            continue
+        reply_btn = _visible_reply_button(article)
+        if not reply_btn:
             continue
         score += 20
         if score > best_score:
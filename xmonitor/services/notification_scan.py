@@ -41,6 +41,7 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                 f'⚠️ 通知列表过长(total={total_articles})，当前仅扫描前{max_scan_articles}条；可调大 XMONITOR_NOTIFY_MAX_ARTICLES'
             )
         articles = deps.reorder_articles_for_scan(articles)
+        card_fps = deps._notification_card_fingerprints(page, articles)
 
         new_captured = 0
         skipped_old = 0
@@ -101,7 +102,13 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                         trace_logs.append(f'A{idx:02d} skip=reply_only_filter type={notification_type} text={trace_sample}')
                     continue
 
-                status_handle, status_id = deps._extract_notification_status_info(article)
+                card_fp = card_fps[idx - 1]
+                card_record = deps.notification_card_cache.get(card_fp) if card_fp else None
+                if card_record and 'status_id' in card_record:
+                    status_handle = card_record.get('status_handle') or None
+                    status_id = card_record.get('status_id') or None
+                else:
+                    status_handle, status_id = deps._extract_notification_status_info(article)
                 if not status_id and not is_reply_like:
                     skipped_non_reply += 1
                     if idx <= trace_limit:
@@ -151,7 +158,18 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                         )
                     continue
 
-                content = deps._extract_notification_content(article, article_text, handle)
+                if card_record and card_record.get('handle') == handle and 'content' in card_record:
+                    content = card_record['content']
+                else:
+                    content = deps._extract_notification_content(article, article_text, handle)
+                if card_fp:
+                    deps.notification_card_cache.put(
+                        card_fp,
+                        status_handle=(status_handle or '').strip(),
+                        status_id=status_id or '',
+                        handle=handle,
+                        content=content or '',
+                    )
                 if not content:
                     skipped_no_content += 1
                     if idx <= trace_limit:
@@ -160,7 +178,8 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                         )
                     continue
 
-                should_skip_policy, policy_reason = deps.should_skip_content_by_policy(content)
+                # LLM 硬过滤留到循环结束后对全部候选一次批量判定
+                should_skip_policy, policy_reason = deps.should_skip_content_by_policy(content, allow_llm_hard_filter=False)
                 if should_skip_policy:
                     if policy_reason == 'emoji_only':
                         policy_flagged_emoji_only += 1
@@ -198,6 +217,8 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                 seen_in_page.add(unique_key)
 
                 new_captured += 1
+                # 扫描时即算好规范状态页链接，回复流程可直达状态页
+                status_url = deps._normalize_dm_share_link('', status_id=status_id or '', status_handle=status_handle or '')
                 results.append({
                     'handle': handle,
                     'content': content,
@@ -211,11 +232,7 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                     'is_mention_to_me': bool(is_mention_to_me),
                     'notification_text': relation['normalized_text'][:600],
                     'notification_age_minutes': (round(float(age_minutes), 2) if age_minutes is not None else None),
-                    'status_url': (
-                        f"https://x.com/{deps.normalize_handle(status_handle)}/status/{status_id}"
-                        if status_id and status_handle else
-                        (f'https://x.com/i/status/{status_id}' if status_id else '')
-                    )
+                    'status_url': status_url,
                 })
                 if deps.NOTIFICATION_VERBOSE_TRACE:
                     deps.log_to_ui('debug', f'📬 [NotifyCandidate][{notification_type}] {handle} - {content[:20]}...')
@@ -230,6 +247,22 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
                     trace_logs.append(f'A{idx:02d} skip=exception err={deps._normalize_one_line(article_err, 160)}')
                 continue
 
+        policy_flagged_llm = 0
+        if results and deps.LLM_HARD_FILTER_ENABLED:
+            verdicts = deps._should_skip_by_llm_filter_many([item['content'] for item in results])
+            kept = []
+            for item, (llm_skip, llm_reason) in zip(results, verdicts):
+                if llm_skip:
+                    policy_flagged_llm += 1
+                    if trace_limit:
+                        trace_logs.append(
+                            f'skip=policy reason={llm_reason or "llm_filter"} handle={item["handle"]} status_id={item["status_id"]} content={deps._normalize_one_line(item["content"])}'
+                        )
+                    continue
+                kept.append(item)
+            results = kept
+            new_captured = len(results)
+
         if skipped_old > 0:
             deps.log_to_ui('debug', f'📋 [Notify] 跳过旧通知: {skipped_old}')
         if skipped_non_reply > 0:
@@ -252,6 +285,8 @@ def scan_notifications_page(page, blocked_list, max_recent_minutes, deps):
             deps.log_to_ui('debug', f'📋 [Notify] 内容标记(纯表情): {policy_flagged_emoji_only}')
         if policy_flagged_blocked_mention > 0:
             deps.log_to_ui('debug', f'📋 [Notify] 内容标记(指定@): {policy_flagged_blocked_mention}')
+        if policy_flagged_llm > 0:
+            deps.log_to_ui('debug', f'📋 [Notify] 内容标记(LLM过滤): {policy_flagged_llm}')
         if article_errors > 0:
             deps.log_to_ui('debug', f'📋 [Notify] article异常: {article_errors}')
         if new_captured == 0 and len(articles) > 0 and deps.NOTIFICATION_VERBOSE_TRACE:
@@ -1,5 +1,11 @@
 import datetime
-import re
+
+from xmonitor.services.status_parsing import (
+    FIRST_NUMBER_RE,
+    HANDLE_RE,
+    RELATIVE_PROFILE_PATH_RE,
+    RELATIVE_STATUS_PATH_RE,
+)
 
 
 def parse_notification_age_minutes(article):
@@ -19,7 +25,7 @@ def parse_notification_age_minutes(article):
         time_text = (time_ele.text or '').strip().lower()
         if not time_text:
             return None
-        num_match = re.search(r'(\d+)', time_text)
+        num_match = FIRST_NUMBER_RE.search(time_text)
         num = int(num_match.group(1)) if num_match else 0
         if any(k in time_text for k in ['刚刚', 'now', '秒', ' sec', ' s']):
             return 0
@@ -39,7 +45,7 @@ def extract_notification_handle(article, article_text):
         user_ele = article.ele('css:[data-testid="User-Name"]', timeout=0)
         if user_ele:
             user_text = (user_ele.text or '').strip()
-            match = re.search(r'(@[\w_]+)', user_text)
+            match = HANDLE_RE.search(user_text)
             if match:
                 return match.group(1)
     except Exception:
@@ -50,15 +56,15 @@ def extract_notification_handle(article, article_text):
             href = (link.attr('href') or '').strip()
             if not href.startswith('/'):
                 continue
-            status_match = re.match(r'^/([A-Za-z0-9_]+)/status/\d+', href)
+            status_match = RELATIVE_STATUS_PATH_RE.match(href)
             if status_match:
                 return f"@{status_match.group(1)}"
-            profile_match = re.match(r'^/([A-Za-z0-9_]+)$', href)
+            profile_match = RELATIVE_PROFILE_PATH_RE.match(href)
             if profile_match:
                 username = profile_match.group(1).lower()
                 if username not in {'home', 'notifications', 'explore', 'messages', 'compose', 'i'}:
                     return f"@{profile_match.group(1)}"
     except Exception:
         pass
-    match = re.search(r'(@[\w_]+)', article_text or '')
+    match = HANDLE_RE.search(article_text or '')
     return match.group(1) if match else None
@@ -82,31 +82,12 @@ def scan_persistent_notification_tab(blocked_users, deps, max_recent_minutes=Non
                         continue
                     deps.history_ids.add(item['key'])
 
-                try:
-                    runtime_base_url = deps.LLM_FILTER_BASE_URL if deps.LLM_FILTER_ENABLED else ''
-                    runtime_model = deps.LLM_FILTER_MODEL if deps.LLM_FILTER_ENABLED else ''
-                    runtime_api_key = deps.LLM_FILTER_API_KEY if deps.LLM_FILTER_ENABLED else ''
-                    analysis = deps.analyze_comment_intent(
-                        item.get('content', ''),
-                        base_url=runtime_base_url,
-                        api_key=runtime_api_key,
-                        model=runtime_model,
-                        timeout_sec=deps.LLM_FILTER_TIMEOUT_SEC,
-                    )
-                    item['intent_score'] = int(analysis.get('intent_score', 0))
-                    item['intent_level'] = str(analysis.get('intent_level', 'noise'))
-                    item['is_intent_user'] = bool(analysis.get('is_intent_user', False))
-                    item['force_notify'] = bool(analysis.get('force_notify', False))
-                    item['llm_used'] = bool(analysis.get('llm_used', False))
-                    item['intent_reason'] = str(analysis.get('reason', '') or '')
-                    item['intent_signals'] = list(analysis.get('signals', []))[:8]
-                    item['voice_should_notify'] = bool(deps._should_notify_voice_by_intent(analysis))
-                except Exception as analyze_err:
-                    deps.log_to_ui('warn', f'🤖 AI意向分析[notify_auto] 失败: {analyze_err}')
-
+                needs_upgrade = deps.apply_provisional_intent(item)
                 with deps.data_lock:
                     deps.pending_results.append(item)
                 deps.enqueue_new_data(item)
+                if needs_upgrade:
+                    deps.submit_intent_upgrade(item)
                 new_count += 1
 
             if new_count > 0:
@@ -1,5 +1,8 @@
+import functools
 import re
 
+from xmonitor.services.keyword_matcher import get_keyword_matcher
+
 
 NOTIFICATION_LIKE_REPLY_KEYWORDS = (
     '喜欢了你的回复',
@@ -30,25 +33,57 @@ NOTIFICATION_MENTION_YOU_KEYWORDS = (
 )
 
 
+NOTIFICATION_ACTION_KEYWORDS = (
+    'replied to you', 'mentioned you', 'liked', 'retweeted', 'reposted', 'followed you',
+    '回复了你', '提到了你', '点赞了', '转发了', '关注了你'
+)
+
+NOTIFICATION_KEYWORD_FAMILIES = (
+    ('like_reply', NOTIFICATION_LIKE_REPLY_KEYWORDS),
+    ('reply_to_you', NOTIFICATION_REPLY_TO_YOU_KEYWORDS),
+    ('mention_you', NOTIFICATION_MENTION_YOU_KEYWORDS),
+    ('interaction', NOTIFICATION_INTERACTION_SKIP_KEYWORDS),
+    ('action', NOTIFICATION_ACTION_KEYWORDS),
+    ('candidate_penalty', ('replied to you', 'mentioned you', '回复了你', '提到了你')),
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPLY_HINT_RE = re.compile(
+    r'(?:^|\s)回复\s*@[\w_]{1,30}|\breplying to\s+@[\w_]{1,30}|\bin reply to\s+@[\w_]{1,30}',
+    flags=re.IGNORECASE,
+)
+_HANDLE_ONLY_RE = re.compile(r'@\w+')
+_AGE_TOKEN_RE = re.compile(r'\d+[smhd]')
+_AGE_WORD_RE = re.compile(r'\b\d+[smhd]\b', flags=re.IGNORECASE)
+_NON_WORD_RE = re.compile(r'[\W_]+')
+_MEANINGFUL_CHAR_RE = re.compile(r'[\u4e00-\u9fffA-Za-z0-9]')
+_PADDED_HANDLE_RE = re.compile(r'^\s*@\w+\s*$')
+
+
+_NOTIFICATION_MATCHER = get_keyword_matcher(NOTIFICATION_KEYWORD_FAMILIES)
+
+
+@functools.lru_cache(maxsize=4096)
+def notification_keyword_families(text_lower):
+    """一次扫描返回通知文本命中的关键词族集合（同一卡片在分类/打分间重复调用时命中缓存）。"""
+    return frozenset(_NOTIFICATION_MATCHER.hit_families(text_lower))
+
+
 def normalize_notification_text(text):
-    return re.sub(r'\s+', ' ', str(text or '')).strip()
+    return _WHITESPACE_RE.sub(' ', str(text or '')).strip()
 
 
 def classify_notification_type(article_text):
     normalized = normalize_notification_text(article_text or '')
     low = normalized.lower()
-    is_like_reply = any(k in low for k in NOTIFICATION_LIKE_REPLY_KEYWORDS)
-    is_reply_to_me = any(k in low for k in NOTIFICATION_REPLY_TO_YOU_KEYWORDS)
+    families = notification_keyword_families(low)
+    is_like_reply = 'like_reply' in families
+    is_reply_to_me = 'reply_to_you' in families
     if not is_reply_to_me:
-        reply_hint_patterns = (
-            r'(^|\s)回复\s*@['r'\w_]{1,30}',
-            r'\breplying to\s+@[\w_]{1,30}',
-            r'\bin reply to\s+@[\w_]{1,30}',
-        )
-        is_reply_to_me = any(re.search(p, normalized, flags=re.IGNORECASE) for p in reply_hint_patterns)
-    is_mention_to_me = any(k in low for k in NOTIFICATION_MENTION_YOU_KEYWORDS)
+        is_reply_to_me = bool(_REPLY_HINT_RE.search(normalized))
+    is_mention_to_me = 'mention_you' in families
     is_reply_like = is_like_reply or is_reply_to_me or is_mention_to_me
-    is_interaction_only = (not is_like_reply) and any(k in low for k in NOTIFICATION_INTERACTION_SKIP_KEYWORDS)
+    is_interaction_only = (not is_like_reply) and ('interaction' in families)
     if is_reply_to_me:
         notification_type = 'reply_to_you'
     elif is_mention_to_me:
@@ -82,24 +117,20 @@ def is_noise_notification_text(text, handle, user_name_candidates):
     low = text.lower()
     if handle and low == handle.lower():
         return True
-    if re.fullmatch(r'@\w+', text):
+    if _HANDLE_ONLY_RE.fullmatch(text):
         return True
-    if re.fullmatch(r'\d+[smhd]', low):
+    if _AGE_TOKEN_RE.fullmatch(low):
         return True
     if text in {'·', '-', '|'}:
         return True
     if is_display_name_like(text, user_name_candidates):
         return True
-    action_keywords = [
-        'replied to you', 'mentioned you', 'liked', 'retweeted', 'reposted', 'followed you',
-        '回复了你', '提到了你', '点赞了', '转发了', '关注了你'
-    ]
-    if any(k in low for k in action_keywords) and len(text) <= 40:
-        cleaned = re.sub(r'@\w+', ' ', low)
-        cleaned = re.sub(r'\b\d+[smhd]\b', ' ', cleaned, flags=re.IGNORECASE)
-        for keyword in action_keywords:
+    if len(text) <= 40 and 'action' in notification_keyword_families(low):
+        cleaned = _HANDLE_ONLY_RE.sub(' ', low)
+        cleaned = _AGE_WORD_RE.sub(' ', cleaned)
+        for keyword in NOTIFICATION_ACTION_KEYWORDS:
             cleaned = cleaned.replace(keyword, ' ')
-        cleaned = re.sub(r'[\W_]+', ' ', cleaned).strip()
+        cleaned = _NON_WORD_RE.sub(' ', cleaned).strip()
         if len(cleaned) < 2:
             return True
     return False
@@ -122,13 +153,13 @@ def score_notification_candidate(text, source, user_name_candidates):
         score -= 20
     elif length > 240:
         score -= 10
-    if re.search(r'[\u4e00-\u9fffA-Za-z0-9]', text):
+    if _MEANINGFUL_CHAR_RE.search(text):
         score += 8
     if is_display_name_like(text, user_name_candidates):
         score -= 80
-    if re.match(r'^\s*@\w+\s*$', text):
+    if _PADDED_HANDLE_RE.match(text):
         score -= 40
-    if any(k in low for k in ['replied to you', 'mentioned you', '回复了你', '提到了你']):
+    if 'candidate_penalty' in notification_keyword_families(low):
         score -= 25
     return score
 
@@ -136,7 +167,7 @@ def score_notification_candidate(text, source, user_name_candidates):
 def normalize_one_line(text, limit=120):
     if not text:
         return ''
-    compact = re.sub(r'\s+', ' ', str(text)).strip()
+    compact = _WHITESPACE_RE.sub(' ', str(text)).strip()
     if len(compact) > limit:
         return compact[:limit] + '...'
     return compact
@@ -20,16 +20,25 @@ def send_notification_reply(item, message, deps, dm_message=""):
     _reply_humanized_idle = deps._reply_humanized_idle
     _prepare_notifications_view_impl = deps._prepare_notifications_view_impl
     _match_target_card_impl = deps._match_target_card_impl
+    _open_status_page_target_impl = deps._open_status_page_target_impl
     _send_reply_from_button_impl = deps._send_reply_from_button_impl
     _sanitize_dm_message_text = deps._sanitize_dm_message_text
     dm_message_templates = deps.dm_message_templates
     DM_FOLLOWUP_TEXT = deps.DM_FOLLOWUP_TEXT
     DM_LLM_REWRITE_ENABLED = deps.DM_LLM_REWRITE_ENABLED
     _generate_dm_text_with_llm = deps._generate_dm_text_with_llm
+    _schedule_dm_rewrite_refill = deps._schedule_dm_rewrite_refill
+    _take_pregenerated_dm_text = deps._take_pregenerated_dm_text
     _should_use_share_link_quick_path = deps._should_use_share_link_quick_path
     _reserve_notify_dm_user_slot = deps._reserve_notify_dm_user_slot
     normalize_handle = deps.normalize_handle
     _run_dm_send_with_recovery = deps._run_dm_send_with_recovery
+    dm_tab_pool = deps.dm_tab_pool
+    _publish_notify_reply_progress = deps._publish_notify_reply_progress
+    _schedule_reply_warm_preload = deps._schedule_reply_warm_preload
+    _claim_reply_warm_target = deps._claim_reply_warm_target
+    _release_reply_warm_tab = deps._release_reply_warm_tab
+    SHARE_LINK_QUICK_PATH_MODE = deps.SHARE_LINK_QUICK_PATH_MODE
     DM_CLOSED_FALLBACK_REPLY_TEXT = deps.DM_CLOSED_FALLBACK_REPLY_TEXT
     _wait_document_ready = deps._wait_document_ready
     _is_unhandled_prompt_error = deps._is_unhandled_prompt_error
@@ -49,7 +58,9 @@ def send_notification_reply(item, message, deps, dm_message=""):
     handle_hint = item.get("handle", "")
     task_key = str(item.get("key", "") or "").strip()
 
-    with reply_action_lock:
+    reply_action_lock.acquire()
+    reply_tab_released = False
+    try:
         _throttle_reply_action_if_needed()
         _set_reply_flow_active(True)
         flow_started_at = time.perf_counter()
@@ -81,12 +92,51 @@ def send_notification_reply(item, message, deps, dm_message=""):
                 extra=extra,
                 save=save,
             )
+            _publish_notify_reply_progress(task_key, stage_name)
+
+        def _return_reply_tab_to_notifications(reply_tab):
+            try:
+                final_url = str(reply_tab.url or "")
+            except Exception:
+                final_url = ""
+            try:
+                if "x.com/notifications" not in final_url:
+                    reply_tab.get("https://x.com/notifications")
+                    time.sleep(random.uniform(0.3, 0.7))
+            except Exception:
+                pass
+
+        def _release_reply_tab(reply_tab):
+            """私信改在独立工作标签页执行：回复标签页先回通知页并释放回复锁，下一条回复可与本条私信并行。"""
+            nonlocal reply_tab_released
+            _return_reply_tab_to_notifications(reply_tab)
+            _set_reply_flow_active(False)
+            reply_tab_released = True
+            reply_action_lock.release()
+
+        def _reclaim_reply_tab():
+            nonlocal reply_tab_released
+            reply_action_lock.acquire()
+            reply_tab_released = False
+            _set_reply_flow_active(True)
 
         try:
             tab = ensure_reply_work_tab()
         except Exception as e:
             _set_reply_flow_active(False)
             return False, f"回复工作标签页初始化失败: {e}"
+        reply_tab = tab
+        warm_in_use = False
+        _schedule_reply_warm_preload(task_key)
+
+        def _leave_warm_tab():
+            """回复阶段在预热标签页完成后切回回复标签页，并让预热页去加载下一条目标。"""
+            nonlocal tab, warm_in_use
+            if not warm_in_use:
+                return
+            warm_in_use = False
+            tab = reply_tab
+            _release_reply_warm_tab(task_key)
 
         try:
             _prepare_reply_prompt_guard(tab, "回复流程启动")
@@ -118,19 +168,28 @@ def send_notification_reply(item, message, deps, dm_message=""):
 
             _reply_humanized_idle(tab, 0.18, 0.42, "回复流程启动")
 
-            try:
-                current_url = str(tab.url or "")
-            except Exception:
-                current_url = ""
-            if "x.com/notifications" not in current_url:
-                tab.get("https://x.com/notifications")
-                _wait_document_ready(tab, timeout=5.0)
-                _reply_humanized_idle(tab, 0.22, 0.52, "进入通知页后稳定等待")
-            log_to_ui("debug", "💬 已进入通知页，准备定位目标通知卡片")
-            try:
-                tab.wait.ele_displayed('tag:article', timeout=5)
-            except Exception:
-                pass
+            warm_match = None
+            status_match = None
+            if need_reply or need_share:
+                warm_match = _claim_reply_warm_target(item, status_id)
+                status_match = warm_match or _open_status_page_target_impl(tab, item, status_id, deps)
+            if warm_match:
+                tab = warm_match[0]
+                warm_in_use = True
+            if not status_match:
+                try:
+                    current_url = str(tab.url or "")
+                except Exception:
+                    current_url = ""
+                if "x.com/notifications" not in current_url:
+                    tab.get("https://x.com/notifications")
+                    _wait_document_ready(tab, timeout=5.0)
+                    _reply_humanized_idle(tab, 0.22, 0.52, "进入通知页后稳定等待")
+                log_to_ui("debug", "💬 已进入通知页，准备定位目标通知卡片")
+                try:
+                    tab.wait.ele_displayed('tag:article', timeout=5)
+                except Exception:
+                    pass
 
             def _prepare_notifications_view(force_refresh=False):
                 return _prepare_notifications_view_impl(tab, deps, force_refresh=force_refresh)
@@ -147,7 +206,14 @@ def send_notification_reply(item, message, deps, dm_message=""):
             matched_handle = normalize_handle(item.get("status_handle", "") or item.get("handle", ""))
             matched_status_id = str(status_id or "")
 
-            if need_reply or need_share:
+            if status_match:
+                _, target_article, target_reply_btn, target_score = status_match
+                _mark("match_card")
+                _mark_stage("match_card")
+                page_kind = "预热状态页" if warm_match else "状态页"
+                log_to_ui("debug", f"💬 已在{page_kind}定位回复目标 score={target_score}, status_id={matched_status_id}")
+                _reply_humanized_idle(tab, 0.08, 0.22, "定位卡片后稳定等待")
+            elif need_reply or need_share:
                 _prepare_notifications_view(force_refresh=False)
                 log_to_ui("debug", "💬 已准备通知视图，开始定位目标通知卡片")
                 _reply_humanized_idle(tab, 0.1, 0.26, "定位通知卡片前")
@@ -174,11 +240,23 @@ def send_notification_reply(item, message, deps, dm_message=""):
 
             share_link = str(saved_share_link or "").strip()
             if need_share:
-                share_link_fallback = _get_status_link_from_item(item, matched_handle, matched_status_id)
+                # 扫描时已算好规范状态页链接；与实际定位到的状态一致时直接作为分享链接，跳过分享菜单与剪贴板往返
+                scan_status_url = str(item.get("status_url", "") or "").strip()
+                use_scan_status_url = bool(
+                    scan_status_url
+                    and matched_status_id
+                    and "/status/" in scan_status_url
+                    and scan_status_url.rstrip("/").endswith(f"/{matched_status_id}")
+                    and str(SHARE_LINK_QUICK_PATH_MODE or "").strip().lower() != "off"
+                )
+                share_link_fallback = scan_status_url if use_scan_status_url else _get_status_link_from_item(item, matched_handle, matched_status_id)
                 use_quick_share_link = bool(
                     share_link_fallback and "/status/" in share_link_fallback and _should_use_share_link_quick_path()
                 )
-                if use_quick_share_link:
+                if use_scan_status_url:
+                    share_link, share_err = scan_status_url, ""
+                    log_to_ui("debug", "🔗 使用扫描时算好的状态页链接，跳过分享菜单复制")
+                elif use_quick_share_link:
                     share_link, share_err = share_link_fallback, ""
                     log_to_ui("debug", "🔗 已启用快速链接路径（长队列稳定模式）")
                 else:
@@ -227,6 +305,15 @@ def send_notification_reply(item, message, deps, dm_message=""):
                     return False, "断点续跑缺少可用分享链接，请重新执行本条通知"
                 log_to_ui("info", f"🔁 断点续跑：复用已生成链接（stage={resume_stage}）")
 
+            dm_handle = item.get("handle", "")
+            dm_template_text = _sanitize_dm_message_text(dm_message)
+            if not dm_template_text:
+                dm_template_text = (dm_message_templates[0] if dm_message_templates else DM_FOLLOWUP_TEXT)
+            dm_template_text = _sanitize_dm_message_text(dm_template_text)
+            if DM_LLM_REWRITE_ENABLED:
+                # 公开回复期间提前补池，进入私信输入框时直接取用
+                _schedule_dm_rewrite_refill(dm_template_text)
+
             if need_reply:
                 ok_reply, err_reply = _send_reply_from_button(target_reply_btn, target_score, message)
                 if not ok_reply:
@@ -235,12 +322,7 @@ def send_notification_reply(item, message, deps, dm_message=""):
                 _mark_stage("reply_sent", extra={"notify_share_link": share_link}, save=True)
             else:
                 log_to_ui("info", f"🔁 断点续跑：跳过公开回复发送（stage={resume_stage}）")
-
-            dm_handle = item.get("handle", "")
-            dm_template_text = _sanitize_dm_message_text(dm_message)
-            if not dm_template_text:
-                dm_template_text = (dm_message_templates[0] if dm_message_templates else DM_FOLLOWUP_TEXT)
-            dm_template_text = _sanitize_dm_message_text(dm_template_text)
+            _leave_warm_tab()
 
             def _build_dm_text_supplier():
                 def _supplier():
@@ -261,7 +343,12 @@ def send_notification_reply(item, message, deps, dm_message=""):
                         },
                         save=True,
                     )
-                    ok_gen, dm_text_generated, meta = _generate_dm_text_with_llm(dm_template_text)
+                    pregenerated = _take_pregenerated_dm_text(dm_template_text)
+                    if pregenerated:
+                        ok_gen, dm_text_generated, meta = pregenerated
+                        log_to_ui("debug", "📨 使用预生成私信改写")
+                    else:
+                        ok_gen, dm_text_generated, meta = _generate_dm_text_with_llm(dm_template_text)
                     meta = meta or {}
                     if ok_gen:
                         notify_state_facade.update_flow_state(
@@ -307,6 +394,8 @@ def send_notification_reply(item, message, deps, dm_message=""):
             if not slot_ok:
                 return False, f"E_DM_USER_COOLDOWN: @{normalize_handle(dm_handle)} 私信冷却中，请 {slot_wait:.1f}s 后重试"
             _mark_stage("dm_opening", extra={"notify_share_link": share_link}, save=True)
+            if dm_tab_pool.size > 0:
+                _release_reply_tab(tab)
             ok_dm, dm_err, dm_closed, dm_tab = _run_dm_send_with_recovery(
                 tab,
                 dm_handle,
@@ -321,6 +410,8 @@ def send_notification_reply(item, message, deps, dm_message=""):
                     _mark_stage("dm_closed_confirmed", extra={"notify_share_link": share_link}, save=True)
                     _mark("dm_open_failed")
                     log_to_ui("warn", "⚠️ 目标用户未开启私信，准备发送补充评论后结束私信流程")
+                    if reply_tab_released:
+                        _reclaim_reply_tab()
                     try:
                         now_url = str(tab.url or "")
                     except Exception:
@@ -360,6 +451,9 @@ def send_notification_reply(item, message, deps, dm_message=""):
             _mark_stage("done", save=True)
             return True, ""
         except Exception as e:
+            if reply_tab_released:
+                # 回复标签页已交给下一条流程，不再在其上清理提示框/截图
+                return False, f"私信阶段异常: {e}"
             if _is_unhandled_prompt_error(e):
                 diag_before = _capture_runtime_diagnostic(
                     tab,
@@ -403,15 +497,11 @@ def send_notification_reply(item, message, deps, dm_message=""):
             )
             return False, f"回复发送失败: {e}"
         finally:
+            _leave_warm_tab()
             # 无论成功/失败都回到通知页，且保持当前工作标签页不关闭，减少页面抖动
-            try:
-                final_url = str(tab.url or "")
-            except Exception:
-                final_url = ""
-            try:
-                if "x.com/notifications" not in final_url:
-                    tab.get("https://x.com/notifications")
-                    time.sleep(random.uniform(0.3, 0.7))
-            except Exception:
-                pass
-            _set_reply_flow_active(False)
+            if not reply_tab_released:
+                _return_reply_tab_to_notifications(tab)
+                _set_reply_flow_active(False)
+    finally:
+        if not reply_tab_released:
+            reply_action_lock.release()
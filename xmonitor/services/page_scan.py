@@ -1,51 +1,58 @@
 import datetime
 import random
-import re
 import time
 
 
 def scan_task_worker(task, page, blocked_users, deps):
-    log_to_ui = deps.log_to_ui
-    scan_page_content = deps.scan_page_content
-    should_skip_content_by_policy = deps.should_skip_content_by_policy
-    should_skip_duplicate_content = deps.should_skip_duplicate_content
-    enqueue_new_data = deps.enqueue_new_data
-    save_state = deps.save_state
-    monitor_tasks = deps.monitor_tasks
-    pending_results = deps.pending_results
-    history_ids = deps.history_ids
-    data_lock = deps.data_lock
-
-    return _scan_task_worker_impl(task, page, blocked_users, sys.modules[__name__])
+    """执行单个推文任务扫描，返回本轮新增捕获条数。"""
+    url = str(task.get('url', '') or '').strip()
+    if not url:
+        return 0
+    items, err = deps.scan_page_content(page, url, blocked_users)
+    check_time = datetime.datetime.now().strftime('%H:%M:%S')
+    if err:
+        with deps.data_lock:
+            task['last_check'] = f'{check_time} 失败'
+        deps.log_to_ui('warn', f'⚠️ 推文任务扫描失败: {url} ({err})')
+        return 0
+
+    new_count = 0
+    for item in items or []:
+        with deps.data_lock:
+            if item['key'] in deps.history_ids:
+                continue
+            deps.history_ids.add(item['key'])
+            if deps.should_skip_duplicate_content(item.get('handle', ''), item.get('content', '')):
+                continue
+            deps.pending_results.append(item)
+        deps.enqueue_new_data(item)
+        new_count += 1
+
+    with deps.data_lock:
+        task['last_check'] = f'{check_time} (+{new_count})'
+    if new_count > 0:
+        deps.save_state()
+        deps.log_to_ui('success', f'🐦 推文任务新增 {new_count} 条: {url}')
+    return new_count
 
 
 def scan_task_with_tab(task, blocked_users, deps):
-    global_browser = deps.global_browser
-    browser_initialized = deps.browser_initialized
-    log_to_ui = deps.log_to_ui
-    scan_page_content_with_tab = deps.scan_page_content_with_tab
-    should_skip_content_by_policy = deps.should_skip_content_by_policy
-    should_skip_duplicate_content = deps.should_skip_duplicate_content
-    enqueue_new_data = deps.enqueue_new_data
-    save_state = deps.save_state
-    monitor_tasks = deps.monitor_tasks
-    pending_results = deps.pending_results
-    history_ids = deps.history_ids
-    data_lock = deps.data_lock
-    tab_lock = deps.tab_lock
-    TAB_OPEN_JITTER_MIN_SEC = deps.TAB_OPEN_JITTER_MIN_SEC
-    TAB_OPEN_JITTER_MAX_SEC = deps.TAB_OPEN_JITTER_MAX_SEC
-
-    return _scan_task_with_tab_impl(task, blocked_users, sys.modules[__name__])
+    """为任务创建独立标签页扫描，结束后关闭标签页。"""
+    browser = deps.global_browser
+    if not browser or not deps.browser_initialized:
+        return 0
+    time.sleep(random.uniform(deps.TAB_OPEN_JITTER_MIN_SEC, deps.TAB_OPEN_JITTER_MAX_SEC))
+    with deps.tab_lock:
+        tab = browser.new_tab()
+    try:
+        return scan_task_worker(task, tab, blocked_users, deps)
+    finally:
+        with deps.tab_lock:
+            try:
+                tab.close()
+            except Exception:
+                pass
 
 
 def scan_page_content_with_tab(tab, url, blocked_list, deps):
-    reorder_articles_for_scan = deps.reorder_articles_for_scan
-    should_skip_content_by_policy = deps.should_skip_content_by_policy
-    get_effective_delegated_account = deps.get_effective_delegated_account
-    log_to_ui = deps.log_to_ui
-    history_ids = deps.history_ids
-    normalize_handle = deps.normalize_handle
-
-    return _scan_page_content_with_tab_impl(tab, url, blocked_list, sys.modules[__name__])
-
+    return deps.scan_page_content(tab, url, blocked_list)
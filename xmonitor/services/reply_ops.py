@@ -40,73 +40,141 @@ def prepare_notifications_view(tab, deps, *, force_refresh=False):
             pass
 
 
-def match_target_card(tab, item, status_id, deps):
-    def should_allow_status_fallback():
-        policy = str(deps.REPLY_STATUS_FALLBACK_POLICY or 'high_priority_only').strip().lower()
-        if policy == 'always':
-            return True, 'policy=always'
-        if policy == 'off':
-            return False, 'policy=off'
-        intent_level = str(item.get('intent_level', '') or '').strip().lower()
+def status_page_reply_allowed(item, deps):
+    """状态页兜底策略：是否允许直接打开该通知的状态页定位回复目标，返回 (allowed, reason)。"""
+    policy = str(deps.REPLY_STATUS_FALLBACK_POLICY or 'high_priority_only').strip().lower()
+    if policy == 'always':
+        return True, 'policy=always'
+    if policy == 'off':
+        return False, 'policy=off'
+    intent_level = str(item.get('intent_level', '') or '').strip().lower()
+    try:
+        intent_score = int(float(item.get('intent_score', 0) or 0))
+    except Exception:
+        intent_score = 0
+    force_notify_raw = item.get('force_notify', False)
+    if isinstance(force_notify_raw, str):
+        force_notify = force_notify_raw.strip().lower() in {'1', 'true', 'yes', 'y', 'on'}
+    else:
+        force_notify = bool(force_notify_raw)
+    if force_notify:
+        return True, 'force_notify=true'
+    if intent_level == 'high':
+        return True, 'intent_level=high'
+    if intent_score >= int(deps.REPLY_STATUS_FALLBACK_MIN_SCORE):
+        return True, f'intent_score={intent_score}'
+    strong_signal_keys = {
+        'short_reply_intent_signal',
+        'performance_consult_signal',
+        'business_consult_signal',
+        'force_intent_keyword',
+        'product_consult_signal',
+        'product_contact_combo',
+    }
+    raw_signals = item.get('intent_signals', [])
+    if not isinstance(raw_signals, (list, tuple)):
+        raw_signals = [raw_signals]
+    signal_hits = []
+    for sig in raw_signals:
+        sig_norm = str(sig or '').strip().lower()
+        if sig_norm in strong_signal_keys and sig_norm not in signal_hits:
+            signal_hits.append(sig_norm)
+    if signal_hits:
+        return True, f"signal={'|'.join(signal_hits[:3])}"
+    content_low = deps._normalize_content_for_filter(item.get('content', '')).lower()
+    keyword_hits = deps._find_keyword_hits(content_low, deps.INTENT_FORCE_NOTIFY_KEYWORDS)
+    if keyword_hits:
+        return True, f"keyword={'|'.join(keyword_hits[:3])}"
+    return False, f"policy=high_priority_only, unmet (force={force_notify}, level={intent_level or '-'}, score={intent_score})"
+
+
+def status_page_candidate_urls(item, status_id, deps):
+    """状态页候选链接（按优先级去重），用于兜底匹配与预热加载。"""
+    urls = []
+    for cand in [
+        str(item.get('status_url', '') or '').strip(),
+        deps._get_status_link_from_item(item),
+        (
+            f"https://x.com/{deps.normalize_handle(item.get('status_handle', ''))}/status/{status_id}"
+            if status_id and deps.normalize_handle(item.get('status_handle', '')) else ''
+        ),
+        (f'https://x.com/i/status/{status_id}' if status_id else ''),
+    ]:
+        url = str(cand or '').strip()
+        if not url:
+            continue
+        if url.startswith('/'):
+            url = f'https://x.com{url}'
+        elif url.startswith('x.com/'):
+            url = f'https://{url}'
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def match_status_page_target(tab, item, status_id, deps):
+    """在已打开的状态页上定位回复目标，命中返回 (article, reply_btn, score)，否则 (None, None, score)。"""
+    target_article, target_score = deps._match_reply_target_article(
+        tab,
+        status_id,
+        item.get('handle', ''),
+        item.get('content', ''),
+    )
+    if not target_article or target_score < 120:
+        return None, None, target_score
+    try:
+        target_reply_btn = target_article.ele('css:[data-testid="reply"]', timeout=0.6)
+    except Exception:
+        target_reply_btn = None
+    if target_reply_btn and target_reply_btn.states.is_displayed:
+        return target_article, target_reply_btn, target_score
+    return None, None, target_score
+
+
+def open_status_page_target(tab, item, status_id, deps):
+    """直达路径：按扫描时预解析的状态页链接直接打开并定位回复目标，跳过通知页匹配。
+
+    受 REPLY_STATUS_FALLBACK_POLICY 约束；命中返回 (tab, article, reply_btn, score)，否则返回 None 由调用方回到通知页流程。
+    """
+    if not deps.REPLY_DIRECT_STATUS_PATH:
+        return None
+    urls = status_page_candidate_urls(item, status_id, deps) if status_id else []
+    if not urls:
+        return None
+    allowed, reason = status_page_reply_allowed(item, deps)
+    if not allowed:
+        deps.log_headless_debug(f'状态页直达已跳过: {reason}')
+        return None
+    deps._prepare_reply_prompt_guard(tab, '状态页直达')
+    try:
+        tab.get(urls[0])
+        deps._wait_document_ready(tab, timeout=5.2)
+        deps._reply_humanized_idle(tab, 0.2, 0.48, '状态页直达加载')
+    except Exception as err:
+        deps.log_to_ui('debug', f'💬 状态页直达打开失败: {err}')
+        return None
+    try:
+        tab.wait.ele_displayed('tag:article', timeout=4)
+    except Exception:
+        pass
+    target_score = 0
+    for sweep in range(2):
+        target_article, target_reply_btn, target_score = match_status_page_target(tab, item, status_id, deps)
+        if target_article:
+            deps.log_to_ui('debug', f'💬 状态页直达定位成功(score={target_score}, {reason})')
+            return tab, target_article, target_reply_btn, target_score
         try:
-            intent_score = int(float(item.get('intent_score', 0) or 0))
+            tab.run_js('window.scrollBy(0, 760);')
+            deps._reply_humanized_idle(tab, 0.16, 0.4, f'状态页直达滚动{sweep + 1}')
         except Exception:
-            intent_score = 0
-        force_notify_raw = item.get('force_notify', False)
-        if isinstance(force_notify_raw, str):
-            force_notify = force_notify_raw.strip().lower() in {'1', 'true', 'yes', 'y', 'on'}
-        else:
-            force_notify = bool(force_notify_raw)
-        if force_notify:
-            return True, 'force_notify=true'
-        if intent_level == 'high':
-            return True, 'intent_level=high'
-        if intent_score >= int(deps.REPLY_STATUS_FALLBACK_MIN_SCORE):
-            return True, f'intent_score={intent_score}'
-        strong_signal_keys = {
-            'short_reply_intent_signal',
-            'performance_consult_signal',
-            'business_consult_signal',
-            'force_intent_keyword',
-            'product_consult_signal',
-            'product_contact_combo',
-        }
-        raw_signals = item.get('intent_signals', [])
-        if not isinstance(raw_signals, (list, tuple)):
-            raw_signals = [raw_signals]
-        signal_hits = []
-        for sig in raw_signals:
-            sig_norm = str(sig or '').strip().lower()
-            if sig_norm in strong_signal_keys and sig_norm not in signal_hits:
-                signal_hits.append(sig_norm)
-        if signal_hits:
-            return True, f"signal={'|'.join(signal_hits[:3])}"
-        content_low = deps._normalize_content_for_filter(item.get('content', '')).lower()
-        keyword_hits = deps._find_keyword_hits(content_low, deps.INTENT_FORCE_NOTIFY_KEYWORDS)
-        if keyword_hits:
-            return True, f"keyword={'|'.join(keyword_hits[:3])}"
-        return False, f"policy=high_priority_only, unmet (force={force_notify}, level={intent_level or '-'}, score={intent_score})"
+            pass
+    deps.log_to_ui('debug', f'💬 状态页直达未命中(score={target_score})，回到通知页定位')
+    return None
+
 
+def match_target_card(tab, item, status_id, deps):
     def fallback_match_on_status_page():
-        fallback_urls = []
-        for cand in [
-            str(item.get('status_url', '') or '').strip(),
-            deps._get_status_link_from_item(item),
-            (
-                f"https://x.com/{deps.normalize_handle(item.get('status_handle', ''))}/status/{status_id}"
-                if status_id and deps.normalize_handle(item.get('status_handle', '')) else ''
-            ),
-            (f'https://x.com/i/status/{status_id}' if status_id else ''),
-        ]:
-            url = str(cand or '').strip()
-            if not url:
-                continue
-            if url.startswith('/'):
-                url = f'https://x.com{url}'
-            elif url.startswith('x.com/'):
-                url = f'https://{url}'
-            if url not in fallback_urls:
-                fallback_urls.append(url)
+        fallback_urls = status_page_candidate_urls(item, status_id, deps)
         if not fallback_urls:
             return None, None, 0, None, None, '通知页未命中，且缺少可用 status 链接兜底'
         for idx, url in enumerate(fallback_urls, start=1):
@@ -122,22 +190,12 @@ def match_target_card(tab, item, status_id, deps):
             except Exception:
                 pass
             for sweep in range(3):
-                target_article_fb, target_score_fb = deps._match_reply_target_article(
-                    tab,
-                    status_id,
-                    item.get('handle', ''),
-                    item.get('content', ''),
-                )
-                if target_article_fb and target_score_fb >= 120:
-                    try:
-                        target_reply_btn_fb = target_article_fb.ele('css:[data-testid="reply"]', timeout=0.6)
-                    except Exception:
-                        target_reply_btn_fb = None
-                    if target_reply_btn_fb and target_reply_btn_fb.states.is_displayed:
-                        matched_handle_fb = deps.normalize_handle(item.get('status_handle', '') or item.get('handle', ''))
-                        matched_status_id_fb = str(status_id or '')
-                        deps.log_to_ui('info', f'💬 通知页未命中，已回退会话页定位成功(score={target_score_fb}, url={url})')
-                        return target_article_fb, target_reply_btn_fb, target_score_fb, matched_handle_fb, matched_status_id_fb, ''
+                target_article_fb, target_reply_btn_fb, target_score_fb = match_status_page_target(tab, item, status_id, deps)
+                if target_article_fb:
+                    matched_handle_fb = deps.normalize_handle(item.get('status_handle', '') or item.get('handle', ''))
+                    matched_status_id_fb = str(status_id or '')
+                    deps.log_to_ui('info', f'💬 通知页未命中，已回退会话页定位成功(score={target_score_fb}, url={url})')
+                    return target_article_fb, target_reply_btn_fb, target_score_fb, matched_handle_fb, matched_status_id_fb, ''
                 try:
                     tab.run_js('window.scrollBy(0, 760);')
                     deps._reply_humanized_idle(tab, 0.16, 0.4, f'会话页兜底滚动{sweep + 1}')
@@ -172,7 +230,7 @@ def match_target_card(tab, item, status_id, deps):
             pass
 
     if not target_article:
-        allow_fallback, fallback_reason = should_allow_status_fallback()
+        allow_fallback, fallback_reason = status_page_reply_allowed(item, deps)
         if not allow_fallback:
             deps.log_to_ui('debug', f'💬 状态页兜底已跳过: {fallback_reason}')
             return None, None, 0, None, None, f'未在通知页定位到目标评论卡片（已跳过状态页兜底: {fallback_reason}）'
@@ -180,7 +238,7 @@ def match_target_card(tab, item, status_id, deps):
         return fallback_match_on_status_page()
 
     if target_score < required_score:
-        allow_fallback, fallback_reason = should_allow_status_fallback()
+        allow_fallback, fallback_reason = status_page_reply_allowed(item, deps)
         if not allow_fallback:
             deps.log_to_ui('debug', f'💬 状态页兜底已跳过: {fallback_reason}, score={target_score}, required={required_score}')
             return None, None, target_score, None, None, '通知页命中低置信目标且状态页兜底被策略跳过: ' + f'{fallback_reason} (score={target_score}, required={required_score})'
@@ -188,7 +246,7 @@ def match_target_card(tab, item, status_id, deps):
         return fallback_match_on_status_page()
 
     try:
-        matched_handle, matched_status_id = deps._extract_notification_status_info(target_article)
+        matched_handle, matched_status_id = deps._cached_card_status_info(target_article)
     except Exception:
         matched_handle, matched_status_id = None, None
     return target_article, target_reply_btn, target_score, matched_handle, matched_status_id, ''
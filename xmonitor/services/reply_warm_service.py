@@ -0,0 +1,80 @@
+from xmonitor.services.reply_ops import (
+    match_status_page_target,
+    status_page_candidate_urls,
+    status_page_reply_allowed,
+)
+
+
+REPLY_WARM_CLAIM_WAIT_SEC = 6.0
+
+
+def preload_reply_warm_tab(item, deps):
+    """在预热标签页打开 item 的状态页并等待卡片渲染；失败只记调试日志。"""
+    status_id = deps.extract_status_id_from_notification_item(item)
+    urls = status_page_candidate_urls(item, status_id, deps) if status_id else []
+    if not urls:
+        return False
+    warm = deps.reply_warm_tab
+    if not warm.begin_load(status_id, urls[0]):
+        return False
+    ok = False
+    try:
+        tab = deps._ensure_reply_warm_tab()
+        tab.get(urls[0])
+        deps._wait_document_ready(tab, timeout=6.0)
+        try:
+            tab.wait.ele_displayed('tag:article', timeout=5)
+        except Exception:
+            pass
+        ok = True
+        deps.log_to_ui('debug', f"🔥 已预热下一条回复目标: {item.get('handle', '')} -> status {status_id}")
+    except Exception as err:
+        deps.log_headless_debug(f'回复预热加载失败: {err}')
+    finally:
+        warm.finish_load(status_id, ok)
+    return ok
+
+
+def schedule_reply_warm_preload(current_key, deps):
+    """当前回复进行中时，把队列里下一条待回复目标的状态页提交到预热线程加载。"""
+    if not deps.REPLY_WARM_TAB_ENABLED:
+        return False
+    job = deps.notify_reply_jobs.next_pending(exclude_key=str(current_key or '').strip())
+    if not job:
+        return False
+    target = job.get('target') or {}
+    allowed, _ = status_page_reply_allowed(target, deps)
+    if not allowed:
+        return False
+    try:
+        deps.reply_warm_executor.submit(preload_reply_warm_tab, target, deps)
+    except RuntimeError:
+        return False
+    return True
+
+
+def claim_reply_warm_target(item, status_id, deps):
+    """目标已预热时占用预热标签页并在其上定位回复目标，返回 (tab, article, reply_btn, score)；未命中返回 None 并释放。"""
+    if not deps.REPLY_WARM_TAB_ENABLED:
+        return None
+    warm = deps.reply_warm_tab
+    tab = warm.claim(status_id, timeout=REPLY_WARM_CLAIM_WAIT_SEC)
+    if tab is None:
+        return None
+    try:
+        deps._prepare_reply_prompt_guard(tab, '预热页定位回复目标')
+        article, reply_btn, score = match_status_page_target(tab, item, status_id, deps)
+    except Exception as err:
+        deps.log_headless_debug(f'预热页定位失败: {err}')
+        article, reply_btn, score = None, None, 0
+    if article is None:
+        warm.release()
+        deps.log_to_ui('debug', f'🔥 预热页未命中回复目标(score={score})，回到通知页定位')
+        return None
+    return tab, article, reply_btn, score
+
+
+def release_reply_warm_tab(current_key, deps):
+    """回复阶段结束后归还预热标签页，并立即预热队列中的下一条目标。"""
+    deps.reply_warm_tab.release()
+    schedule_reply_warm_preload(current_key, deps)
@@ -0,0 +1,120 @@
+import collections
+import hashlib
+import re
+import threading
+
+
+WEB_STATUS_PATH_RE = re.compile(r'/(?:i/(?:web/)?status|web/status)/(\d{6,25})')
+USER_STATUS_PATH_RE = re.compile(r'/([A-Za-z0-9_]+)/status/(\d{6,25})')
+CONVERSATION_ID_RE = re.compile(r'conversation_id=(\d{6,25})')
+STATUS_ID_IN_URL_RE = re.compile(r'status/(\d+)')
+RELATIVE_STATUS_PATH_RE = re.compile(r'^/([A-Za-z0-9_]+)/status/\d+')
+RELATIVE_PROFILE_PATH_RE = re.compile(r'^/([A-Za-z0-9_]+)$')
+HANDLE_RE = re.compile(r'(@[\w_]+)')
+FIRST_NUMBER_RE = re.compile(r'(\d+)')
+CARD_ANCHOR_RE = re.compile(
+    r'<a\b[^>]*?\bhref=[\'"]([^\'"]+)[\'"][^>]*>(\s*<time\b)?',
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+CARD_LINKS_CACHE_MAX = 512
+_card_links_cache = collections.OrderedDict()
+_card_hrefs_cache = collections.OrderedDict()
+_card_links_lock = threading.Lock()
+
+
+def parse_status_href(href, *, pick_best_status_id_fn):
+    """从单个 href 提取 (status 用户, status_id)；用户未知时为 None。"""
+    raw = str(href or '').strip()
+    if not raw:
+        return None, None
+    match = WEB_STATUS_PATH_RE.search(raw)
+    if match:
+        sid = pick_best_status_id_fn(match.group(1), raw)
+        if sid:
+            return None, sid
+    best = None
+    best_len = -1
+    for match in USER_STATUS_PATH_RE.finditer(raw):
+        uname = str(match.group(1) or '').strip().lower()
+        if uname in {'i', 'web'}:
+            continue
+        sid = pick_best_status_id_fn(match.group(2), raw)
+        if sid and len(sid) > best_len:
+            best = (match.group(1), sid)
+            best_len = len(sid)
+    if best:
+        return f'@{best[0]}', best[1]
+    match = CONVERSATION_ID_RE.search(raw)
+    if match:
+        sid = pick_best_status_id_fn(match.group(1), raw)
+        if sid:
+            return None, sid
+    return None, None
+
+
+def card_fingerprint(raw_html):
+    """卡片 HTML 指纹，用于缓存解析结果。"""
+    return hashlib.md5(str(raw_html or '').encode('utf-8', 'ignore')).hexdigest()
+
+
+def _cache_get(cache, fingerprint):
+    with _card_links_lock:
+        cached = cache.get(fingerprint)
+        if cached is not None:
+            cache.move_to_end(fingerprint)
+        return cached
+
+
+def _cache_put(cache, fingerprint, value):
+    with _card_links_lock:
+        cache[fingerprint] = value
+        cache.move_to_end(fingerprint)
+        while len(cache) > CARD_LINKS_CACHE_MAX:
+            cache.popitem(last=False)
+
+
+def parse_card_hrefs(raw_html):
+    """一次扫描卡片 HTML，按文档顺序返回所有 (href, is_time_link)；结果按卡片指纹缓存。"""
+    raw = str(raw_html or '')
+    if not raw:
+        return ()
+    fingerprint = card_fingerprint(raw)
+    cached = _cache_get(_card_hrefs_cache, fingerprint)
+    if cached is not None:
+        return cached
+    hrefs = tuple(
+        (match.group(1).replace('&amp;', '&'), bool(match.group(2)))
+        for match in CARD_ANCHOR_RE.finditer(raw)
+    )
+    _cache_put(_card_hrefs_cache, fingerprint, hrefs)
+    return hrefs
+
+
+def _scan_card_status_links(raw_html, pick_best_status_id_fn):
+    links = []
+    for href, is_time_link in parse_card_hrefs(raw_html):
+        handle, status_id = parse_status_href(href, pick_best_status_id_fn=pick_best_status_id_fn)
+        if status_id:
+            links.append((handle, status_id, is_time_link))
+    return tuple(links)
+
+
+def parse_card_status_links(raw_html, *, pick_best_status_id_fn):
+    """一次扫描卡片 HTML，按文档顺序返回所有 (handle, status_id, is_time_link)；结果按卡片指纹缓存。"""
+    raw = str(raw_html or '')
+    if not raw:
+        return ()
+    fingerprint = card_fingerprint(raw)
+    cached = _cache_get(_card_links_cache, fingerprint)
+    if cached is not None:
+        return cached
+    links = _scan_card_status_links(raw, pick_best_status_id_fn)
+    _cache_put(_card_links_cache, fingerprint, links)
+    return links
+
+
+def clear_card_status_links_cache():
+    with _card_links_lock:
+        _card_links_cache.clear()
+        _card_hrefs_cache.clear()
@@ -0,0 +1,157 @@
+import hashlib
+from collections import deque
+
+
+def longest_common_substring_len(source_text, generated_text):
+    """后缀自动机求最长公共子串长度：对 source 建自动机 O(n)，再用 generated 走一遍 O(m)。"""
+    src = str(source_text or '')
+    dst = str(generated_text or '')
+    if not src or not dst:
+        return 0
+    if len(src) < len(dst):
+        src, dst = dst, src
+    trans = [{}]
+    link = [-1]
+    length = [0]
+    last = 0
+    for ch in src:
+        cur = len(trans)
+        trans.append({})
+        length.append(length[last] + 1)
+        link.append(0)
+        p = last
+        while p != -1 and ch not in trans[p]:
+            trans[p][ch] = cur
+            p = link[p]
+        if p != -1:
+            q = trans[p][ch]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                clone = len(trans)
+                trans.append(dict(trans[q]))
+                length.append(length[p] + 1)
+                link.append(link[q])
+                while p != -1 and trans[p].get(ch) == q:
+                    trans[p][ch] = clone
+                    p = link[p]
+                link[q] = clone
+                link[cur] = clone
+        last = cur
+    state = 0
+    cur_len = 0
+    best = 0
+    for ch in dst:
+        while state and ch not in trans[state]:
+            state = link[state]
+            cur_len = length[state]
+        nxt = trans[state].get(ch)
+        if nxt is None:
+            cur_len = 0
+            continue
+        state = nxt
+        cur_len += 1
+        if cur_len > best:
+            best = cur_len
+    return best
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = tuple(
+    (
+        int.from_bytes(hashlib.blake2b(f'a{idx}'.encode('ascii'), digest_size=8).digest(), 'big') % (_MERSENNE_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f'b{idx}'.encode('ascii'), digest_size=8).digest(), 'big') % _MERSENNE_PRIME,
+    )
+    for idx in range(64)
+)
+
+
+def _shingle_hashes(text, width):
+    text = str(text or '')
+    if len(text) <= width:
+        grams = {text} if text else set()
+    else:
+        grams = {text[idx: idx + width] for idx in range(len(text) - width + 1)}
+    return [int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big') for gram in grams]
+
+
+def minhash_signature(text, num_perm=30, width=3):
+    """字符 n-gram MinHash 签名；两段文本签名逐位相等的比例近似其 n-gram 集合的 Jaccard 相似度。"""
+    hashes = _shingle_hashes(text, width)
+    if not hashes:
+        return ()
+    prime = _MERSENNE_PRIME
+    return tuple(min((a * value + b) % prime for value in hashes) for a, b in _PERMUTATIONS[:num_perm])
+
+
+def estimated_jaccard(left, right):
+    if not left or not right or len(left) != len(right):
+        return 0.0
+    return sum(1 for x, y in zip(left, right) if x == y) / float(len(left))
+
+
+class MinHashIndex:
+    """MinHash LSH 近重复索引：签名切成 bands 段分桶，只与至少一段完全相同的候选比较。
+
+    rows = 签名长度 / bands；Jaccard 为 s 的条目成为候选的概率为 1 - (1 - s^rows)^bands，
+    默认 30 位签名、10 段时 s>=0.6 的召回约 0.9，s<=0.2 的误候选低于 0.1。查询开销与窗口大小基本无关，
+    容量满后按先进先出淘汰。
+    """
+
+    def __init__(self, max_items=200, bands=10):
+        self.max_items = max(1, int(max_items))
+        self.bands = max(1, int(bands))
+        self._order = deque()
+        self._buckets = {}
+        self._next_id = 0
+
+    def _band_keys(self, signature):
+        rows = max(1, len(signature) // self.bands)
+        return [(band, signature[band * rows: (band + 1) * rows]) for band in range(self.bands) if band * rows < len(signature)]
+
+    def add(self, signature):
+        if not signature:
+            return
+        item_id = self._next_id
+        self._next_id += 1
+        self._order.append((item_id, signature))
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, {})[item_id] = signature
+        self._evict()
+
+    def _evict(self):
+        while len(self._order) > self.max_items:
+            item_id, signature = self._order.popleft()
+            for band_key in self._band_keys(signature):
+                bucket = self._buckets.get(band_key)
+                if bucket is not None:
+                    bucket.pop(item_id, None)
+                    if not bucket:
+                        self._buckets.pop(band_key, None)
+
+    def set_max_items(self, max_items):
+        self.max_items = max(1, int(max_items))
+        self._evict()
+
+    def best_similarity(self, signature, min_similarity):
+        """返回窗口内最相近条目的估计 Jaccard（不低于 min_similarity 时），否则 None。"""
+        if not signature:
+            return None
+        best = None
+        seen = set()
+        for band_key in self._band_keys(signature):
+            for item_id, other in (self._buckets.get(band_key) or {}).items():
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                score = estimated_jaccard(signature, other)
+                if score >= min_similarity and (best is None or score > best):
+                    best = score
+        return best
+
+    def clear(self):
+        self._order.clear()
+        self._buckets.clear()
+
+    def __len__(self):
+        return len(self._order)
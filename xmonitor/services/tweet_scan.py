@@ -1,14 +1,16 @@
 import datetime
 import random
-import re
 import time
 
+from xmonitor.services.status_parsing import FIRST_NUMBER_RE, HANDLE_RE, STATUS_ID_IN_URL_RE
+
 
 def scan_page_content(page, url, blocked_list, deps):
     history_ids = deps.history_ids
     log_to_ui = deps.log_to_ui
     reorder_articles_for_scan = deps.reorder_articles_for_scan
     should_skip_content_by_policy = deps.should_skip_content_by_policy
+    should_skip_by_llm_filter_many = deps._should_skip_by_llm_filter_many
     get_effective_delegated_account = deps.get_effective_delegated_account
     """
     优化版本的推文评论抓取
@@ -21,7 +23,7 @@ def scan_page_content(page, url, blocked_list, deps):
     processed_article_hashes = set()  # 记录已处理的article
 
     try:
-        tweet_id_match = re.search(r'status/(\d+)', url)
+        tweet_id_match = STATUS_ID_IN_URL_RE.search(url)
         if not tweet_id_match:
             return [], "链接无效"
 
@@ -67,6 +69,7 @@ def scan_page_content(page, url, blocked_list, deps):
             "has_reply": 0,
             "emoji_only": 0,
             "blocked_mention": 0,
+            "llm_filter": 0,
         }
 
         initial_articles = page.eles('tag:article')
@@ -92,6 +95,7 @@ def scan_page_content(page, url, blocked_list, deps):
 
             # 处理新的articles
             new_count = 0
+            pass_candidates = []
             for article in articles:
                 try:
                     if random.random() < 0.18:
@@ -117,7 +121,7 @@ def scan_page_content(page, url, blocked_list, deps):
                         debug_skipped["no_user"] += 1
                         continue
 
-                    handle_match = re.search(r'(@[\w_]+)', user_ele.text)
+                    handle_match = HANDLE_RE.search(user_ele.text)
                     if not handle_match:
                         debug_skipped["no_handle"] += 1
                         continue
@@ -138,7 +142,8 @@ def scan_page_content(page, url, blocked_list, deps):
                     if not content:
                         debug_skipped["no_content"] += 1
                         continue
-                    should_skip_policy, skip_reason = should_skip_content_by_policy(content)
+                    # LLM 硬过滤留到本轮 articles 处理完后批量判定
+                    should_skip_policy, skip_reason = should_skip_content_by_policy(content, allow_llm_hard_filter=False)
                     if should_skip_policy:
                         if skip_reason == "emoji_only":
                             debug_skipped["emoji_only"] += 1
@@ -159,9 +164,9 @@ def scan_page_content(page, url, blocked_list, deps):
                     if reply_btn:
                         aria_label = (reply_btn.attr("aria-label") or "").lower()
                         reply_text = reply_btn.text.strip()
-                        if re.search(r'(\d+)', aria_label):
-                            match_num = re.search(r'(\d+)', aria_label)
-                            if match_num and int(match_num.group(1)) > 0:
+                        match_num = FIRST_NUMBER_RE.search(aria_label)
+                        if match_num:
+                            if int(match_num.group(1)) > 0:
                                 has_reply = True
                         elif reply_text.isdigit() and int(reply_text) > 0:
                             has_reply = True
@@ -172,21 +177,31 @@ def scan_page_content(page, url, blocked_list, deps):
                         debug_skipped["has_reply"] += 1
                         continue
 
-                    # 捕获成功
-                    total_captured += 1
-                    log_to_ui("success", f"✅ 捕获 [{total_captured}]: {handle} 内容: {content[:30]}...")
-                    results.append({
-                        "handle": handle,
-                        "content": content,
-                        "key": unique_key,
-                        "source": url,
-                        "time": datetime.datetime.now().strftime("%H:%M:%S")
-                    })
+                    pass_candidates.append((handle, content, unique_key))
 
                 except Exception as article_err:
                     log_to_ui("debug", f"处理article异常: {article_err}")
                     continue
 
+            if pass_candidates and deps.LLM_HARD_FILTER_ENABLED:
+                verdicts = should_skip_by_llm_filter_many([content for _, content, _ in pass_candidates])
+            else:
+                verdicts = [(False, "")] * len(pass_candidates)
+            for (handle, content, unique_key), (llm_skip, _) in zip(pass_candidates, verdicts):
+                if llm_skip:
+                    debug_skipped["llm_filter"] += 1
+                    continue
+                # 捕获成功
+                total_captured += 1
+                log_to_ui("success", f"✅ 捕获 [{total_captured}]: {handle} 内容: {content[:30]}...")
+                results.append({
+                    "handle": handle,
+                    "content": content,
+                    "key": unique_key,
+                    "source": url,
+                    "time": datetime.datetime.now().strftime("%H:%M:%S")
+                })
+
             # 判断是否有新内容
             if new_count == 0:
                 consecutive_empty += 1
@@ -268,7 +283,7 @@ def scan_page_content(page, url, blocked_list, deps):
         log_to_ui("info", f"📊 统计: 处理 {total_processed} 个articles")
         log_to_ui("info", f"   跳过: 无user({debug_skipped['no_user']}), 无handle({debug_skipped['no_handle']}), 无内容({debug_skipped['no_content']})")
         log_to_ui("info", f"   跳过: 保护名单({debug_skipped['blacklist']}), 重复({debug_skipped['duplicate']}), 有回复({debug_skipped['has_reply']})")
-        log_to_ui("info", f"   跳过: 纯表情({debug_skipped['emoji_only']}), 指定@过滤({debug_skipped['blocked_mention']})")
+        log_to_ui("info", f"   跳过: 纯表情({debug_skipped['emoji_only']}), 指定@过滤({debug_skipped['blocked_mention']}), LLM过滤({debug_skipped['llm_filter']})")
         log_to_ui("success", f"✨ 扫描完成: 捕获 {len(results)} 条评论")
 
     except Exception as e:
@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+from xmonitor.storage.storage_sqlite import (
+    load_llm_verdict as _load_sqlite_verdict,
+    prune_llm_verdicts as _prune_sqlite_verdicts,
+    save_llm_verdict as _save_sqlite_verdict,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_fingerprint(*parts):
+    """对 prompt 模板/默认规则文本取指纹，prompt 变化后旧判定自然失效。"""
+    raw = '\x1f'.join(str(part or '') for part in parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def llm_verdict_key(kind, normalized_content, model, prompt_fp, base_url=''):
+    """内容寻址的判定键：kind + 接口地址 + 模型 + prompt 指纹 + 标准化内容。
+
+    同名模型换到另一个接口后判定可能不同，base_url 也参与键计算。
+    """
+    content_sig = hashlib.md5(str(normalized_content or '').encode('utf-8')).hexdigest()
+    endpoint = str(base_url or '').strip().rstrip('/').lower()
+    raw = f'{kind}|{endpoint}|{str(model or "").strip()}|{prompt_fp}|{content_sig}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class LlmVerdictMemory:
+    """LLM 判定内存层：按最近使用淘汰的有界 LRU，条目带写入时间用于 TTL 判断。"""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max(1, int(max_entries))
+        self._items = OrderedDict()
+        self.writes = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def get(self, key, max_age_sec, now_ts):
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        ts, verdict = entry
+        if now_ts - ts > max_age_sec:
+            self._items.pop(key, None)
+            return None
+        self._items.move_to_end(key)
+        return verdict
+
+    def put(self, key, verdict, now_ts):
+        self._items[key] = (float(now_ts), verdict)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+        self.writes += 1
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+def lookup_llm_verdict(deps, cache_key, now_ts=None):
+    """先查内存层，未命中再查 SQLite；SQLite 命中回填内存层。返回判定 dict 或 None。"""
+    if now_ts is None:
+        now_ts = time.time()
+    ttl = float(deps.LLM_VERDICT_CACHE_TTL_SEC)
+    memory = deps.llm_verdict_memory
+    with deps.llm_verdict_lock:
+        verdict = memory.get(cache_key, ttl, now_ts)
+        if verdict is not None:
+            memory.stats['memory_hits'] += 1
+    if verdict is not None:
+        return dict(verdict)
+    if deps.LLM_VERDICT_CACHE_PERSIST:
+        try:
+            verdict = _load_sqlite_verdict(deps, cache_key, ttl, now_ts=now_ts)
+        except Exception as err:
+            logger.warning('llm verdict cache load failed: %s', err)
+            verdict = None
+    with deps.llm_verdict_lock:
+        if not isinstance(verdict, dict):
+            memory.stats['misses'] += 1
+            return None
+        memory.stats['disk_hits'] += 1
+        memory.put(cache_key, verdict, now_ts)
+    return dict(verdict)
+
+
+def store_llm_verdict(deps, cache_key, kind, verdict, now_ts=None):
+    """写入内存层与 SQLite；每累计 LLM_VERDICT_PRUNE_EVERY 次写入清理一次过期/超量行。"""
+    if now_ts is None:
+        now_ts = time.time()
+    verdict = dict(verdict)
+    with deps.llm_verdict_lock:
+        deps.llm_verdict_memory.put(cache_key, verdict, now_ts)
+        should_prune = deps.llm_verdict_memory.writes % max(1, int(deps.LLM_VERDICT_PRUNE_EVERY)) == 0
+    if not deps.LLM_VERDICT_CACHE_PERSIST:
+        return
+    try:
+        _save_sqlite_verdict(deps, cache_key, kind, verdict, now_ts=now_ts)
+        if should_prune:
+            _prune_sqlite_verdicts(deps, deps.LLM_VERDICT_CACHE_TTL_SEC, deps.LLM_VERDICT_CACHE_MAX_ROWS, now_ts=now_ts)
+    except Exception as err:
+        logger.warning('llm verdict cache save failed: %s', err)
@@ -107,20 +107,44 @@ class PendingResultsRepository:
         with self.deps.data_lock:
             for row in self.deps.pending_results:
                 if row.get('key') == key_text and row.get('source') == '通知页面':
-                    row['notify_reply_text'] = message
-                    row['notify_dm_text'] = dm_message
-                    row['notify_dm_text_generated'] = ''
-                    row['notify_dm_llm_used'] = bool(dm_llm_enabled)
-                    row['notify_dm_llm_latency_ms'] = 0
-                    row['notify_dm_llm_regen_attempt'] = 0
-                    row['notify_dm_llm_error_code'] = ''
-                    row['notify_dm_llm_error_detail'] = ''
-                    if not str(row.get('notify_flow_stage', '')).strip():
-                        row['notify_flow_stage'] = 'reply_pending'
+                    _apply_notify_manual_reply(row, message, dm_message, dm_llm_enabled)
                     updated = True
                     break
         return updated
 
+    def update_notify_manual_replies(self, entries, *, dm_llm_enabled=False):
+        """批量写入手动回复内容（一次加锁遍历），返回 {key: 更新后的行副本}，不存在的 key 不在结果中。"""
+        wanted = {}
+        for entry in entries:
+            key_text = str(entry.get('key', '') or '').strip()
+            if key_text and key_text not in wanted:
+                wanted[key_text] = entry
+        updated = {}
+        if not wanted:
+            return updated
+        with self.deps.data_lock:
+            for row in self.deps.pending_results:
+                key_text = row.get('key')
+                if key_text not in wanted or key_text in updated or row.get('source') != '通知页面':
+                    continue
+                entry = wanted[key_text]
+                _apply_notify_manual_reply(row, entry.get('message', ''), entry.get('dm_message', ''), dm_llm_enabled)
+                updated[key_text] = dict(row)
+        return updated
+
+
+def _apply_notify_manual_reply(row, message, dm_message, dm_llm_enabled):
+    row['notify_reply_text'] = message
+    row['notify_dm_text'] = dm_message
+    row['notify_dm_text_generated'] = ''
+    row['notify_dm_llm_used'] = bool(dm_llm_enabled)
+    row['notify_dm_llm_latency_ms'] = 0
+    row['notify_dm_llm_regen_attempt'] = 0
+    row['notify_dm_llm_error_code'] = ''
+    row['notify_dm_llm_error_detail'] = ''
+    if not str(row.get('notify_flow_stage', '')).strip():
+        row['notify_flow_stage'] = 'reply_pending'
+
 
 class ProcessedUsersRepository:
     def __init__(self, deps):
@@ -236,6 +236,16 @@ def _apply_structured_state_payload(deps, collections):
     return True
 
 
+def _requeue_pending_intent_upgrades(deps):
+    """重启前未完成异步意向分析的条目重新入队，避免一直停留在 rule_only 临时结果且不再播报判定。"""
+    waiting = [item for item in deps.pending_results if isinstance(item, dict) and item.get('intent_pending')]
+    for item in waiting:
+        deps.submit_intent_upgrade(item)
+    if waiting:
+        logging.info(f'🤖 已重新提交 {len(waiting)} 条未完成的异步意向分析')
+    return len(waiting)
+
+
 def _log_loaded_state_summary(deps):
     logging.info('✅ 状态加载成功:')
     logging.info(f"   - Token: {'已配置' if deps.global_token else '未配置'}")
@@ -344,6 +354,7 @@ def load_state(deps):
         if pending_changed:
             deps.save_state()
         _log_loaded_state_summary(deps)
+        _requeue_pending_intent_upgrades(deps)
         if state_data.get('is_running', False):
             deps.start_monitor_thread()
 
@@ -51,6 +51,41 @@ def _connect(deps):
         'user_value TEXT PRIMARY KEY'
         ')'
     )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS llm_verdict_cache ('
+        'cache_key TEXT PRIMARY KEY, '
+        'kind TEXT NOT NULL, '
+        'verdict_json TEXT NOT NULL, '
+        'created_at REAL NOT NULL, '
+        'hit_at REAL NOT NULL'
+        ')'
+    )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS intent_training_samples ('
+        'sample_key TEXT PRIMARY KEY, '
+        'content TEXT NOT NULL, '
+        'label INTEGER NOT NULL, '
+        'intent_score INTEGER NOT NULL, '
+        'intent_level TEXT NOT NULL, '
+        'updated_at REAL NOT NULL'
+        ')'
+    )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS dm_handle_state ('
+        'kind TEXT NOT NULL, '
+        'handle TEXT NOT NULL, '
+        'until_ts REAL NOT NULL, '
+        'task_key TEXT NOT NULL, '
+        'PRIMARY KEY(kind, handle)'
+        ')'
+    )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS dm_conversations ('
+        'handle TEXT PRIMARY KEY, '
+        'conversation_url TEXT NOT NULL, '
+        'updated_at REAL NOT NULL'
+        ')'
+    )
     return conn
 
 
@@ -237,3 +272,221 @@ def has_processed_users_table(deps):
     finally:
         conn.close()
     return bool(row)
+
+
+def load_llm_verdict(deps, cache_key, max_age_sec, now_ts=None):
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return None
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        row = conn.execute(
+            'SELECT verdict_json FROM llm_verdict_cache WHERE cache_key = ? AND created_at >= ?',
+            (str(cache_key), float(now_ts) - float(max_age_sec)),
+        ).fetchone()
+        if row:
+            conn.execute('UPDATE llm_verdict_cache SET hit_at = ? WHERE cache_key = ?', (float(now_ts), str(cache_key)))
+            conn.commit()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    try:
+        return json.loads(row[0])
+    except Exception:
+        return None
+
+
+def save_llm_verdict(deps, cache_key, kind, verdict, now_ts=None):
+    if now_ts is None:
+        now_ts = time.time()
+    payload = json.dumps(verdict, ensure_ascii=False)
+    conn = _connect(deps)
+    try:
+        conn.execute(
+            'INSERT INTO llm_verdict_cache(cache_key, kind, verdict_json, created_at, hit_at) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(cache_key) DO UPDATE SET verdict_json=excluded.verdict_json, '
+            'created_at=excluded.created_at, hit_at=excluded.hit_at',
+            (str(cache_key), str(kind), payload, float(now_ts), float(now_ts)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def prune_llm_verdicts(deps, max_age_sec, max_rows, now_ts=None):
+    """删除过期判定并按最近命中时间淘汰超出上限的行，返回删除行数。"""
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return 0
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        removed = conn.execute(
+            'DELETE FROM llm_verdict_cache WHERE created_at < ?',
+            (float(now_ts) - float(max_age_sec),),
+        ).rowcount
+        total = int(conn.execute('SELECT COUNT(*) FROM llm_verdict_cache').fetchone()[0])
+        overflow = total - max(0, int(max_rows))
+        if overflow > 0:
+            removed += conn.execute(
+                'DELETE FROM llm_verdict_cache WHERE cache_key IN ('
+                'SELECT cache_key FROM llm_verdict_cache ORDER BY hit_at ASC LIMIT ?'
+                ')',
+                (overflow,),
+            ).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    return int(removed or 0)
+
+
+def save_intent_training_sample(deps, sample_key, content, label, intent_score, intent_level, now_ts=None):
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        conn.execute(
+            'INSERT INTO intent_training_samples(sample_key, content, label, intent_score, intent_level, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(sample_key) DO UPDATE SET content=excluded.content, label=excluded.label, '
+            'intent_score=excluded.intent_score, intent_level=excluded.intent_level, updated_at=excluded.updated_at',
+            (str(sample_key), str(content), 1 if label else 0, int(intent_score), str(intent_level), float(now_ts)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_intent_training_samples(deps, limit):
+    """返回最近的 [(content, label)] 意向样本：LLM 判定样本表优先，再补充待处理结果中记录了 LLM 原始判定的条目。
+
+    两处标签均取与规则融合前的 LLM 原始等级，融合后的 intent_level 不参与训练。
+    """
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return []
+    conn = _connect(deps)
+    try:
+        sample_rows = conn.execute(
+            'SELECT content, label FROM intent_training_samples ORDER BY updated_at DESC LIMIT ?',
+            (max(0, int(limit)),),
+        ).fetchall()
+        pending_rows = conn.execute('SELECT item_json FROM pending_results ORDER BY sort_order DESC').fetchall()
+    finally:
+        conn.close()
+    samples = []
+    seen = set()
+    for content, label in sample_rows:
+        text = str(content or '').strip()
+        if text and text not in seen:
+            seen.add(text)
+            samples.append((text, 1 if label else 0))
+    for (item_json,) in pending_rows:
+        if len(samples) >= limit:
+            break
+        try:
+            item = json.loads(item_json)
+        except Exception:
+            continue
+        if not isinstance(item, dict) or not item.get('llm_used'):
+            continue
+        text = str(item.get('content') or '').strip()
+        level = str(item.get('intent_llm_level') or '').strip().lower()
+        if not text or text in seen or level not in {'high', 'medium', 'low', 'noise'}:
+            continue
+        seen.add(text)
+        samples.append((text, 1 if level in {'high', 'medium'} else 0))
+    return samples
+
+
+def load_dm_conversation_url(deps, handle, max_age_sec, now_ts=None):
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return ''
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        row = conn.execute(
+            'SELECT conversation_url FROM dm_conversations WHERE handle = ? AND updated_at >= ?',
+            (str(handle), float(now_ts) - float(max_age_sec)),
+        ).fetchone()
+    finally:
+        conn.close()
+    return str(row[0]) if row else ''
+
+
+def save_dm_conversation_url(deps, handle, conversation_url, now_ts=None):
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        conn.execute(
+            'INSERT INTO dm_conversations(handle, conversation_url, updated_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(handle) DO UPDATE SET conversation_url=excluded.conversation_url, updated_at=excluded.updated_at',
+            (str(handle), str(conversation_url), float(now_ts)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def delete_dm_conversation_url(deps, handle):
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return
+    conn = _connect(deps)
+    try:
+        conn.execute('DELETE FROM dm_conversations WHERE handle = ?', (str(handle),))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_dm_handle_states(deps, kind, now_ts=None):
+    """返回某类未过期的 handle 状态 {handle: (until_ts, task_key)}，并顺带清理所有已过期行。"""
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return {}
+    if now_ts is None:
+        now_ts = time.time()
+    conn = _connect(deps)
+    try:
+        conn.execute('DELETE FROM dm_handle_state WHERE until_ts <= ?', (float(now_ts),))
+        conn.commit()
+        rows = conn.execute(
+            'SELECT handle, until_ts, task_key FROM dm_handle_state WHERE kind = ?',
+            (str(kind),),
+        ).fetchall()
+    finally:
+        conn.close()
+    return {str(handle): (float(until_ts), str(task_key or '')) for handle, until_ts, task_key in rows}
+
+
+def save_dm_handle_state(deps, kind, handle, until_ts, task_key=''):
+    conn = _connect(deps)
+    try:
+        conn.execute(
+            'INSERT INTO dm_handle_state(kind, handle, until_ts, task_key) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(kind, handle) DO UPDATE SET until_ts=excluded.until_ts, task_key=excluded.task_key',
+            (str(kind), str(handle), float(until_ts), str(task_key or '')),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def delete_dm_handle_state(deps, kind, handle):
+    db_path = sqlite_state_file(deps)
+    if not os.path.exists(db_path):
+        return
+    conn = _connect(deps)
+    try:
+        conn.execute('DELETE FROM dm_handle_state WHERE kind = ? AND handle = ?', (str(kind), str(handle)))
+        conn.commit()
+    finally:
+        conn.close()
@@ -24,6 +24,7 @@ def register_ai_routes(app, deps):
         runtime = _extract_llm_runtime_from_payload(payload, deps)
         if not runtime['base_url'] or not runtime['model']:
             return jsonify({'status': 'err', 'msg': '请先填写 Base URL 和模型名'}), 400
+        deps.llm_breaker.force_half_open()
         start_ts = time.perf_counter()
         try:
             result_obj, raw_text = deps._call_openai_compatible_json(
@@ -136,12 +137,13 @@ def register_ai_routes(app, deps):
             if deps.DM_LLM_REWRITE_DEDUPE_SIZE != dm_llm_rewrite_dedupe_size:
                 deps.DM_LLM_REWRITE_DEDUPE_SIZE = dm_llm_rewrite_dedupe_size
                 deps.dm_llm_rewrite_history = deque(list(deps.dm_llm_rewrite_history), maxlen=deps.DM_LLM_REWRITE_DEDUPE_SIZE)
+                deps.dm_llm_rewrite_minhash_index.set_max_items(deps.DM_LLM_REWRITE_DEDUPE_SIZE)
             else:
                 deps.DM_LLM_REWRITE_DEDUPE_SIZE = dm_llm_rewrite_dedupe_size
             deps.NOTIFY_VOICE_BLOCK_KEYWORDS_TEXT = notify_voice_block_keywords_text
             deps.NOTIFY_VOICE_BLOCK_KEYWORDS = notify_voice_block_keywords
-        with deps.llm_filter_cache_lock:
-            deps.llm_filter_cache.clear()
+        deps.llm_transport.forget()
+        deps.llm_breaker.reset()
         deps.save_state()
         if deps.LLM_FILTER_ENABLED and deps._llm_filter_is_ready():
             deps.log_to_ui('info', f'🤖 [LLMFilter] 配置已更新并启用: model={deps.LLM_FILTER_MODEL}')
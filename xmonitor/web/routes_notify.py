@@ -1,9 +1,18 @@
 import datetime
-import random
-import time
 from flask import jsonify, request
 
 
+def _queued_job_payload(job, attempt, duplicate):
+    return {
+        'status': 'queued',
+        'job_id': job['job_id'],
+        'job_status': job['status'],
+        'flow_stage': job.get('flow_stage', 'reply_pending'),
+        'attempt': job.get('attempt', attempt),
+        'duplicate': bool(duplicate),
+    }
+
+
 def register_notify_routes(app, deps):
     @app.route('/api/notify_reply', methods=['POST'])
     def notify_reply():
@@ -15,6 +24,12 @@ def register_notify_routes(app, deps):
         if not message:
             return jsonify({'status': 'err', 'msg': 'missing message'}), 400
 
+        # 已有排队/执行中的任务时直接返回该任务：不改写回复内容、不递增尝试次数、不重置流程阶段
+        active_job_id = deps.notify_reply_jobs.active_for_key(key)
+        active_job = deps.notify_reply_jobs.get(active_job_id) if active_job_id else None
+        if active_job:
+            return jsonify(_queued_job_payload(active_job, active_job.get('attempt', 0), True)), 202
+
         _, target = deps.pending_results_repo.find_notify_by_key(key, copy_row=True)
         if not target:
             return jsonify({'status': 'err', 'msg': '通知记录不存在'}), 404
@@ -35,93 +50,47 @@ def register_notify_routes(app, deps):
             deps.log_to_ui('warn', f'⏸️ 触发失败预算熔断: {target_handle} - {budget_msg}')
             return jsonify({'status': 'err', 'msg': budget_msg}), 429
 
-        try:
-            base_attempt = int(target.get('notify_flow_attempt', 0) or 0)
-        except Exception:
-            base_attempt = 0
-        cur_attempt = max(1, base_attempt + 1)
-        deps.notify_state_facade.update_flow_state(
-            key,
-            stage='reply_pending',
-            attempt=cur_attempt,
-            error='',
-            retry_at=0,
-            extra={
-                'notify_resume_stage': 'reply_pending',
-                'notify_retry_reason': 'manual_notify_reply_execute',
-                'notify_share_link': '',
-            },
-            save=True,
-        )
+        cur_attempt = deps.next_notify_reply_attempt(target)
+        deps.mark_notify_reply_pending(key, cur_attempt, save=True)
 
-        max_attempts = 1 + (max(0, int(deps.UNHANDLED_PROMPT_AUTO_RETRY)) if deps.headless_mode else 0)
-        ok, err = False, '通知回复失败'
-        for attempt in range(1, max_attempts + 1):
-            ok, err = deps.send_notification_reply(target, message, dm_message=dm_message)
-            if ok:
-                break
-            if deps._is_unhandled_prompt_error(err) and attempt < max_attempts:
-                remaining = max_attempts - attempt
-                deps.log_to_ui('warn', f'⚠️ 检测到未处理提示框，自动恢复后重试（剩余{remaining}次）')
-                try:
-                    recover_tab = deps.ensure_reply_work_tab(force_recreate=(attempt >= 2))
-                    deps._prepare_reply_prompt_guard(recover_tab, f'自动恢复重试{attempt}')
-                    try:
-                        now_url = str(recover_tab.url or '')
-                    except Exception:
-                        now_url = ''
-                    if 'x.com/notifications' not in now_url:
-                        recover_tab.get('https://x.com/notifications')
-                        deps._wait_document_ready(recover_tab, timeout=5.0)
-                except Exception as recover_err:
-                    deps.log_to_ui('warn', f'⚠️ 提示框自动恢复失败: {recover_err}')
-                time.sleep(random.uniform(0.45, 1.1))
-                continue
-            break
-
-        deps._record_reply_outcome(target_handle, ok, err if not ok else '')
-        if not ok:
-            flow_err_code, flow_err_detail = deps._split_flow_error(err)
-            scheduled, retry_at, schedule_msg = deps.notify_state_facade.schedule_retry(
-                key,
-                err,
-                attempt=cur_attempt,
-                reason='manual_notify_reply',
-                save=True,
-            )
-            deps.log_to_ui('warn', f'⚠️ 通知回复失败: {err}')
-            if scheduled:
-                return jsonify({
-                    'status': 'retry_waiting',
-                    'msg': schedule_msg,
-                    'flow_stage': 'retry_waiting',
-                    'flow_error_code': flow_err_code,
-                    'flow_error_detail': flow_err_detail,
-                    'retry_at': retry_at,
-                    'retry_time': datetime.datetime.fromtimestamp(retry_at).strftime('%H:%M:%S'),
-                    'attempt': cur_attempt,
-                }), 202
-            return jsonify({
-                'status': 'err',
-                'msg': f'{err}（{schedule_msg}）',
-                'flow_stage': 'retry_waiting',
-                'flow_error_code': flow_err_code,
-                'flow_error_detail': flow_err_detail,
-                'retry_at': 0,
-                'retry_time': '',
-                'attempt': cur_attempt,
-            }), 500
+        job, created = deps.submit_notify_reply_job(target, message, dm_message, cur_attempt)
+        if created:
+            deps.log_to_ui('info', f"📥 通知回复已加入任务队列: {target_handle} (job={job['job_id']})")
+        if bool(request.json.get('wait', False)):
+            # 同步调用也登记为任务，保证同一通知同时只有一个进行中的回复
+            finished = deps.notify_reply_jobs.wait_finished(job['job_id'])
+            if finished and finished.get('result') is not None:
+                return jsonify(finished['result']), int(finished.get('http_status') or 500)
+        return jsonify(_queued_job_payload(job, cur_attempt, not created)), 202
+
+    @app.route('/api/notify_reply/batch', methods=['POST'])
+    def notify_reply_batch():
+        items = (request.json or {}).get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'status': 'err', 'msg': 'missing items'}), 400
+        result = deps.submit_notify_reply_batch(items)
+        queued = result.get('queued', [])
+        return jsonify({
+            'status': 'queued' if queued else 'err',
+            'msg': '' if queued else '没有可排队的回复',
+            'queued': queued,
+            'rejected': result.get('rejected', []),
+        }), (202 if queued else 400)
 
-        reply_time_text = datetime.datetime.now().strftime('%H:%M:%S')
-        deps.notify_state_facade.mark_reply_success(key, message, dm_message, reply_time_text=reply_time_text, save=True)
-        deps.log_to_ui('success', f'✅ 已发送通知回复: {target_handle} -> {message[:30]}')
+    @app.route('/api/notify_reply_job', methods=['GET'])
+    def notify_reply_job():
+        job_id = str(request.args.get('id', '') or '').strip()
+        job = deps.notify_reply_jobs.get(job_id) if job_id else None
+        if not job:
+            return jsonify({'status': 'err', 'msg': '回复任务不存在或已过期'}), 404
         return jsonify({
             'status': 'ok',
-            'reply_time': reply_time_text,
-            'flow_stage': 'done',
-            'retry_at': 0,
-            'retry_time': '',
-            'attempt': cur_attempt,
+            'job_id': job['job_id'],
+            'key': job['key'],
+            'job_status': job['status'],
+            'flow_stage': job.get('flow_stage', ''),
+            'attempt': job.get('attempt', 0),
+            'result': job.get('result'),
         })
 
     @app.route('/api/notify_retry', methods=['POST'])